@@ -0,0 +1,269 @@
+/**
+ * Lookup cost benchmark: 4x4 Catmull-Rom stencil vs bicubic coefficient tables
+ *
+ * Times the per-sample lookup schemes on a shipped LUT header:
+ *   stencil   16 scattered fetches from 4 table rows + 5 Catmull-Rom blends
+ *             (what the FAUST libraries do)
+ *   bicubic   one contiguous 16-coefficient block + Horner
+ *             (generate_ja_lut.py --lookup bicubic)
+ * plus JAHysteresisSchedulerLUT::process() with setLUT() (bilinear) and
+ * setBicubicLUT(), each also with the interleaved layout (--layout
+ * interleaved, one fused lookup for both tables), and process() with 1..4
+ * real substeps before the lookup (setRealSubsteps(), --real-substeps; the
+ * cost does not depend on the table values, so the K121 table serves all
+ * counts) against all substeps real, and process() with setSVDLUT() (--lookup
+ * svd) at rank 1 for M_end and 1..16 for sumM_rest (again value-independent,
+ * so the factors are filled from node values). Coefficients are built here from the node table with the
+ * same clamped stencil as ja_lut_export.bicubic_coefficients(), so the two
+ * Catmull-Rom lookups must agree to rounding.
+ *
+ * Build (from cpp_reference/):
+ *   g++ -std=c++20 -O2 JAHysteresisLUTBenchmark.cpp JAHysteresisSchedulerLUT.cpp -o ja_lut_benchmark
+ */
+
+#include "JAHysteresisSchedulerLUT.h"
+#include "../faust/JAHysteresisLUT_K121.h"
+
+#include <algorithm>
+#include <array>
+#include <chrono>
+#include <cmath>
+#include <cstdio>
+#include <random>
+#include <vector>
+
+namespace
+{
+namespace LUT = JAHysteresisLUT_K121;
+
+constexpr int kPoints = 1 << 16;
+constexpr int kRepeats = 20;
+
+double catmullRom(double p0, double p1, double p2, double p3, double t) noexcept
+{
+    return 0.5 * (2.0 * p1 + (-p0 + p2) * t
+                  + (2.0 * p0 - 5.0 * p1 + 4.0 * p2 - p3) * t * t
+                  + (-p0 + 3.0 * p1 - 3.0 * p2 + p3) * t * t * t);
+}
+
+int clampIndex(int i, int size) noexcept
+{
+    return std::clamp(i, 0, size - 1);
+}
+
+double gridPosition(double x, int size) noexcept
+{
+    return std::clamp((x + 1.0) * 0.5, 0.0, 1.0) * static_cast<double>(size - 1);
+}
+
+/** Separable 4x4 Catmull-Rom with clamped stencil (ja_lookup_*_k121) */
+double stencilLookup(const double* lut, double m, double h) noexcept
+{
+    const double mPos = gridPosition(m, LUT::M_SIZE);
+    const double hPos = gridPosition(h, LUT::H_SIZE);
+    const int mIdx = static_cast<int>(mPos);
+    const int hIdx = static_cast<int>(hPos);
+    const double mFrac = mPos - mIdx;
+    const double hFrac = hPos - hIdx;
+
+    double col[4];
+    for (int k = 0; k < 4; ++k)
+    {
+        const double* row = lut + clampIndex(mIdx + k - 1, LUT::M_SIZE) * LUT::H_SIZE;
+        col[k] = catmullRom(row[clampIndex(hIdx - 1, LUT::H_SIZE)], row[clampIndex(hIdx, LUT::H_SIZE)],
+                            row[clampIndex(hIdx + 1, LUT::H_SIZE)], row[clampIndex(hIdx + 2, LUT::H_SIZE)], hFrac);
+    }
+    return catmullRom(col[0], col[1], col[2], col[3], mFrac);
+}
+
+/** Horner evaluation of one cell's 16 coefficients */
+double bicubicLookup(const double* coeffs, double m, double h) noexcept
+{
+    const double mPos = gridPosition(m, LUT::M_SIZE);
+    const double hPos = gridPosition(h, LUT::H_SIZE);
+    const int mIdx = std::min(static_cast<int>(mPos), LUT::M_SIZE - 2);
+    const int hIdx = std::min(static_cast<int>(hPos), LUT::H_SIZE - 2);
+    const double mFrac = mPos - mIdx;
+    const double hFrac = hPos - hIdx;
+    const double* c = coeffs + (static_cast<std::size_t>(mIdx) * (LUT::H_SIZE - 1) + hIdx) * 16;
+
+    double result = 0.0;
+    for (int i = 12; i >= 0; i -= 4)
+        result = result * mFrac + (((c[i + 3] * hFrac + c[i + 2]) * hFrac + c[i + 1]) * hFrac + c[i]);
+    return result;
+}
+
+/** Per-cell power-basis coefficients of the clamped Catmull-Rom stencil */
+std::vector<double> bicubicCoefficients(const double* lut)
+{
+    static constexpr double basis[4][4] = {
+        { 0.0, 1.0, 0.0, 0.0 },
+        { -0.5, 0.0, 0.5, 0.0 },
+        { 1.0, -2.5, 2.0, -0.5 },
+        { -0.5, 1.5, -1.5, 0.5 },
+    };
+
+    std::vector<double> coeffs(static_cast<std::size_t>(LUT::M_SIZE - 1) * (LUT::H_SIZE - 1) * 16);
+
+    for (int mi = 0; mi < LUT::M_SIZE - 1; ++mi)
+        for (int hi = 0; hi < LUT::H_SIZE - 1; ++hi)
+        {
+            double* c = coeffs.data() + (static_cast<std::size_t>(mi) * (LUT::H_SIZE - 1) + hi) * 16;
+
+            for (int i = 0; i < 4; ++i)
+                for (int j = 0; j < 4; ++j)
+                {
+                    double sum = 0.0;
+                    for (int a = 0; a < 4; ++a)
+                        for (int b = 0; b < 4; ++b)
+                            sum += basis[i][a] * basis[j][b]
+                                 * lut[clampIndex(mi + a - 1, LUT::M_SIZE) * LUT::H_SIZE + clampIndex(hi + b - 1, LUT::H_SIZE)];
+                    c[i * 4 + j] = sum;
+                }
+        }
+
+    return coeffs;
+}
+
+/** Interleave two tables of equal size in blocks of `block` values (--layout interleaved) */
+std::vector<double> interleave(const double* a, const double* b, std::size_t size, std::size_t block)
+{
+    std::vector<double> out(2 * size);
+    for (std::size_t i = 0; i < size; i += block)
+    {
+        std::copy(a + i, a + i + block, out.begin() + 2 * i);
+        std::copy(b + i, b + i + block, out.begin() + 2 * i + block);
+    }
+    return out;
+}
+
+template <typename Fn>
+double bestNanosPerCall(Fn&& fn, int calls)
+{
+    double best = 1.0e30;
+    for (int r = 0; r < kRepeats; ++r)
+    {
+        const auto start = std::chrono::steady_clock::now();
+        fn();
+        const std::chrono::duration<double, std::nano> elapsed = std::chrono::steady_clock::now() - start;
+        best = std::min(best, elapsed.count() / calls);
+    }
+    return best;
+}
+} // namespace
+
+int main()
+{
+    const auto coeffsMEnd = bicubicCoefficients(LUT::LUT_M_END.data());
+    const auto coeffsSumMRest = bicubicCoefficients(LUT::LUT_SUM_M_REST.data());
+    const auto interleavedNodes = interleave(LUT::LUT_M_END.data(), LUT::LUT_SUM_M_REST.data(),
+                                             LUT::LUT_M_END.size(), 1);
+    const auto interleavedCoeffs = interleave(coeffsMEnd.data(), coeffsSumMRest.data(), coeffsMEnd.size(), 16);
+
+    std::mt19937 rng(1);
+    std::uniform_real_distribution<double> dist(-1.0, 1.0);
+    std::vector<double> m(kPoints), h(kPoints);
+    for (int i = 0; i < kPoints; ++i)
+    {
+        m[i] = dist(rng);
+        h[i] = dist(rng);
+    }
+
+    double maxDiff = 0.0;
+    for (int i = 0; i < kPoints; ++i)
+    {
+        maxDiff = std::max(maxDiff, std::abs(stencilLookup(LUT::LUT_M_END.data(), m[i], h[i])
+                                             - bicubicLookup(coeffsMEnd.data(), m[i], h[i])));
+        maxDiff = std::max(maxDiff, std::abs(stencilLookup(LUT::LUT_SUM_M_REST.data(), m[i], h[i])
+                                             - bicubicLookup(coeffsSumMRest.data(), m[i], h[i])));
+    }
+
+    volatile double sink = 0.0;
+
+    const double stencilNs = bestNanosPerCall([&] {
+        double acc = 0.0;
+        for (int i = 0; i < kPoints; ++i)
+            acc += stencilLookup(LUT::LUT_M_END.data(), m[i], h[i]) + stencilLookup(LUT::LUT_SUM_M_REST.data(), m[i], h[i]);
+        sink = acc;
+    }, kPoints);
+
+    const double bicubicNs = bestNanosPerCall([&] {
+        double acc = 0.0;
+        for (int i = 0; i < kPoints; ++i)
+            acc += bicubicLookup(coeffsMEnd.data(), m[i], h[i]) + bicubicLookup(coeffsSumMRest.data(), m[i], h[i]);
+        sink = acc;
+    }, kPoints);
+
+    // Full scheduler: feedback makes each sample depend on the last
+    JAHysteresisSchedulerLUT scheduler;
+    scheduler.initialise(48000.0, JAHysteresisSchedulerLUT::Mode::K121, {});
+
+    auto runScheduler = [&] {
+        scheduler.reset();
+        double acc = 0.0;
+        for (int i = 0; i < kPoints; ++i)
+            acc += scheduler.process(h[i]);
+        sink = acc;
+    };
+
+    scheduler.setLUT(LUT::LUT_M_END.data(), LUT::LUT_SUM_M_REST.data(), LUT::M_SIZE, LUT::H_SIZE);
+    const double bilinearProcessNs = bestNanosPerCall(runScheduler, kPoints);
+
+    scheduler.setBicubicLUT(coeffsMEnd.data(), coeffsSumMRest.data(), LUT::M_SIZE, LUT::H_SIZE);
+    const double bicubicProcessNs = bestNanosPerCall(runScheduler, kPoints);
+
+    scheduler.setInterleavedLUT(interleavedNodes.data(), LUT::M_SIZE, LUT::H_SIZE);
+    const double bilinearInterleavedNs = bestNanosPerCall(runScheduler, kPoints);
+
+    scheduler.setInterleavedBicubicLUT(interleavedCoeffs.data(), LUT::M_SIZE, LUT::H_SIZE);
+    const double bicubicInterleavedNs = bestNanosPerCall(runScheduler, kPoints);
+
+    // Real substeps before the lookup; all N real (plus the unused lookup) is the full-physics cost
+    scheduler.setLUT(LUT::LUT_M_END.data(), LUT::LUT_SUM_M_REST.data(), LUT::M_SIZE, LUT::H_SIZE);
+    constexpr int kMaxRealSubsteps = 4;
+    std::array<double, kMaxRealSubsteps + 1> realSubstepNs {};
+    for (int r = 1; r <= kMaxRealSubsteps; ++r)
+    {
+        scheduler.setRealSubsteps(r);
+        realSubstepNs[r] = bestNanosPerCall(runScheduler, kPoints);
+    }
+    scheduler.setRealSubsteps(LUT::Manifest::totalSubsteps);
+    const double allRealNs = bestNanosPerCall(runScheduler, kPoints);
+    scheduler.setRealSubsteps(1);
+
+    // SVD factors: (mSize + hSize) x rank per table; M_end is rank 1 in every shipped mode
+    constexpr std::array<int, 4> kSVDRanks { 1, 4, 8, 16 };
+    std::array<double, kSVDRanks.size()> svdProcessNs {};
+    const std::vector<double> factorsMEnd(LUT::LUT_M_END.begin(), LUT::LUT_M_END.begin() + LUT::M_SIZE + LUT::H_SIZE);
+    for (std::size_t i = 0; i < kSVDRanks.size(); ++i)
+    {
+        const std::size_t values = static_cast<std::size_t>(LUT::M_SIZE + LUT::H_SIZE) * kSVDRanks[i];
+        const std::vector<double> factorsSumMRest(LUT::LUT_SUM_M_REST.begin(), LUT::LUT_SUM_M_REST.begin() + values);
+        scheduler.setSVDLUT(factorsMEnd.data(), 1, factorsSumMRest.data(), kSVDRanks[i], LUT::M_SIZE, LUT::H_SIZE);
+        svdProcessNs[i] = bestNanosPerCall(runScheduler, kPoints);
+    }
+
+    const double nodeKB = 2.0 * LUT::M_SIZE * LUT::H_SIZE * sizeof(double) / 1024.0;
+    const double coeffKB = 2.0 * static_cast<double>(coeffsMEnd.size()) * sizeof(double) / 1024.0;
+
+    std::printf("JA LUT lookup benchmark (K121, %d x %d, %d random points, best of %d)\n",
+                LUT::M_SIZE, LUT::H_SIZE, kPoints, kRepeats);
+    std::printf("  Catmull-Rom stencil  %7.1f ns per (M_end, sumM_rest)  %8.1f KB\n", stencilNs, nodeKB);
+    std::printf("  bicubic coefficients %7.1f ns per (M_end, sumM_rest)  %8.1f KB  (%.2fx)\n",
+                bicubicNs, coeffKB, stencilNs / bicubicNs);
+    std::printf("  max |stencil - bicubic| = %.2e\n", maxDiff);
+    std::printf("  process(): bilinear %.1f ns/sample, bicubic %.1f ns/sample\n", bilinearProcessNs, bicubicProcessNs);
+    std::printf("  process() interleaved: bilinear %.1f ns/sample, bicubic %.1f ns/sample\n",
+                bilinearInterleavedNs, bicubicInterleavedNs);
+    std::printf("  process() real substeps:");
+    for (int r = 1; r <= kMaxRealSubsteps; ++r)
+        std::printf(" R=%d %.1f", r, realSubstepNs[r]);
+    std::printf(" ns/sample; all %d real %.1f ns/sample\n", LUT::Manifest::totalSubsteps, allRealNs);
+    std::printf("  process() SVD, M_end rank 1, sumM_rest rank:");
+    for (std::size_t i = 0; i < kSVDRanks.size(); ++i)
+        std::printf(" %d %.1f (%.1f KB)", kSVDRanks[i], svdProcessNs[i],
+                    (1 + kSVDRanks[i]) * (LUT::M_SIZE + LUT::H_SIZE) * sizeof(double) / 1024.0);
+    std::printf(" ns/sample\n");
+
+    return maxDiff < 1.0e-12 ? 0 : 1;
+}
@@ -0,0 +1,259 @@
+#include "JAHysteresisLUTFile.h"
+#include "JAHysteresisSchedulerLUT.h"
+
+#include <cstring>
+#include <utility>
+
+#if defined(_WIN32)
+ #define NOMINMAX
+ #include <windows.h>
+#else
+ #include <fcntl.h>
+ #include <sys/mman.h>
+ #include <sys/stat.h>
+ #include <unistd.h>
+#endif
+
+namespace
+{
+constexpr char kMagic[8] = { 'J', 'A', 'L', 'U', 'T', 'B', 'I', 'N' };
+constexpr std::size_t kFileHeaderSize = 64;
+constexpr std::size_t kEntrySize = 176;
+
+template <typename T>
+T readField(const std::uint8_t* base, std::size_t offset) noexcept
+{
+    T value;
+    std::memcpy(&value, base + offset, sizeof(T));
+    return value;
+}
+} // namespace
+
+JAHysteresisLUTFile::~JAHysteresisLUTFile()
+{
+    close();
+}
+
+bool JAHysteresisLUTFile::open(const std::string& path)
+{
+    close();
+
+    if (! mapFile(path) || ! parse())
+    {
+        close();
+        return false;
+    }
+
+    return true;
+}
+
+void JAHysteresisLUTFile::close() noexcept
+{
+    entries.clear();
+
+    if (mappedData == nullptr)
+        return;
+
+#if defined(_WIN32)
+    UnmapViewOfFile(mappedData);
+    CloseHandle(static_cast<HANDLE>(mappingHandle));
+    CloseHandle(static_cast<HANDLE>(fileHandle));
+    mappingHandle = nullptr;
+    fileHandle = nullptr;
+#else
+    munmap(const_cast<std::uint8_t*>(mappedData), mappedSize);
+#endif
+
+    mappedData = nullptr;
+    mappedSize = 0;
+}
+
+const JAHysteresisLUTFile::Entry* JAHysteresisLUTFile::find(const std::string& name) const noexcept
+{
+    for (const auto& entry : entries)
+        if (entry.name == name)
+            return &entry;
+
+    return nullptr;
+}
+
+void JAHysteresisLUTFile::prefetch(const Entry& entry) const noexcept
+{
+#if defined(_WIN32)
+    (void) entry;
+#else
+    const std::size_t bytes = static_cast<std::size_t>(entry.mSize) * static_cast<std::size_t>(entry.hSize) * sizeof(double);
+
+    for (const double* table : { entry.lutMEnd, entry.lutSumMRest })
+        madvise(const_cast<double*>(table), bytes, MADV_WILLNEED);
+#endif
+}
+
+bool JAHysteresisLUTFile::applyTo(JAHysteresisSchedulerLUT& scheduler, const Entry& entry) const noexcept
+{
+    scheduler.setLUT(entry.lutMEnd, entry.lutSumMRest, entry.mSize, entry.hSize);
+    scheduler.setAxisWarp(entry.mWarp, entry.warpSegments, entry.hWarp, entry.warpSegments);
+
+    JAHysteresisSchedulerLUT::LUTManifest manifest;
+    manifest.mSize = entry.mSize;
+    manifest.hSize = entry.hSize;
+    manifest.mMin = entry.mMin;
+    manifest.mMax = entry.mMax;
+    manifest.hMin = entry.hMin;
+    manifest.hMax = entry.hMax;
+    manifest.totalSubsteps = entry.totalSubsteps;
+    manifest.realSubsteps = entry.realSubsteps;
+    manifest.phaseSpan = entry.phaseSpan;
+    manifest.biasLevel = entry.biasLevel;
+    manifest.biasScale = entry.biasScale;
+    manifest.physics = { entry.Ms, entry.aDensity, entry.kPinning, entry.cReversibility, entry.alphaCoupling };
+    return scheduler.validateLUT(manifest);
+}
+
+// -----------------------------------------------------------------------------
+bool JAHysteresisLUTFile::mapFile(const std::string& path)
+{
+#if defined(_WIN32)
+    HANDLE file = CreateFileA(path.c_str(), GENERIC_READ, FILE_SHARE_READ, nullptr,
+                              OPEN_EXISTING, FILE_ATTRIBUTE_NORMAL | FILE_FLAG_RANDOM_ACCESS, nullptr);
+    if (file == INVALID_HANDLE_VALUE)
+        return false;
+
+    LARGE_INTEGER size {};
+    if (! GetFileSizeEx(file, &size) || size.QuadPart == 0)
+    {
+        CloseHandle(file);
+        return false;
+    }
+
+    HANDLE mapping = CreateFileMappingA(file, nullptr, PAGE_READONLY, 0, 0, nullptr);
+    if (mapping == nullptr)
+    {
+        CloseHandle(file);
+        return false;
+    }
+
+    void* view = MapViewOfFile(mapping, FILE_MAP_READ, 0, 0, 0);
+    if (view == nullptr)
+    {
+        CloseHandle(mapping);
+        CloseHandle(file);
+        return false;
+    }
+
+    fileHandle = file;
+    mappingHandle = mapping;
+    mappedData = static_cast<const std::uint8_t*>(view);
+    mappedSize = static_cast<std::size_t>(size.QuadPart);
+#else
+    const int fd = ::open(path.c_str(), O_RDONLY);
+    if (fd < 0)
+        return false;
+
+    struct stat info {};
+    if (fstat(fd, &info) != 0 || info.st_size <= 0)
+    {
+        ::close(fd);
+        return false;
+    }
+
+    void* view = mmap(nullptr, static_cast<std::size_t>(info.st_size), PROT_READ, MAP_PRIVATE, fd, 0);
+    ::close(fd);
+
+    if (view == MAP_FAILED)
+        return false;
+
+    // Lookups jump around the grid; don't read ahead into other modes
+    madvise(view, static_cast<std::size_t>(info.st_size), MADV_RANDOM);
+
+    mappedData = static_cast<const std::uint8_t*>(view);
+    mappedSize = static_cast<std::size_t>(info.st_size);
+#endif
+    return true;
+}
+
+bool JAHysteresisLUTFile::parse()
+{
+    if (mappedSize < kFileHeaderSize || std::memcmp(mappedData, kMagic, sizeof(kMagic)) != 0)
+        return false;
+
+    const auto version    = readField<std::uint32_t>(mappedData, 8);
+    const auto headerSize = readField<std::uint32_t>(mappedData, 12);
+    const auto count      = readField<std::uint32_t>(mappedData, 16);
+    const auto entrySize  = readField<std::uint32_t>(mappedData, 20);
+    const auto alignment  = readField<std::uint32_t>(mappedData, 24);
+
+    if (version != kVersion || headerSize < kFileHeaderSize || entrySize < kEntrySize
+        || alignment == 0 || alignment % alignof(double) != 0)
+        return false;
+
+    if (headerSize + static_cast<std::size_t>(count) * entrySize > mappedSize)
+        return false;
+
+    entries.reserve(count);
+
+    for (std::uint32_t i = 0; i < count; ++i)
+    {
+        const std::uint8_t* record = mappedData + headerSize + static_cast<std::size_t>(i) * entrySize;
+
+        Entry entry;
+        entry.name.assign(reinterpret_cast<const char*>(record), strnlen(reinterpret_cast<const char*>(record), 16));
+
+        const auto dtype = readField<std::uint32_t>(record, 16);
+        const auto mSize = readField<std::uint32_t>(record, 20);
+        const auto hSize = readField<std::uint32_t>(record, 24);
+        entry.totalSubsteps = static_cast<int>(readField<std::uint32_t>(record, 28));
+        const auto tableCount = readField<std::uint32_t>(record, 32);
+        const auto warpSegments = readField<std::uint32_t>(record, 36);
+        const auto realSubsteps = readField<std::uint32_t>(record, 40);
+
+        entry.mMin = readField<double>(record, 48);
+        entry.mMax = readField<double>(record, 56);
+        entry.hMin = readField<double>(record, 64);
+        entry.hMax = readField<double>(record, 72);
+        entry.phaseSpan = readField<double>(record, 80);
+        entry.biasLevel = readField<double>(record, 88);
+        entry.biasScale = readField<double>(record, 96);
+        entry.Ms = readField<double>(record, 104);
+        entry.aDensity = readField<double>(record, 112);
+        entry.kPinning = readField<double>(record, 120);
+        entry.cReversibility = readField<double>(record, 128);
+        entry.alphaCoupling = readField<double>(record, 136);
+
+        const auto offsetMEnd = readField<std::uint64_t>(record, 144);
+        const auto offsetSumMRest = readField<std::uint64_t>(record, 152);
+        const auto offsetMWarp = readField<std::uint64_t>(record, 160);
+        const auto offsetHWarp = readField<std::uint64_t>(record, 168);
+
+        if (dtype != static_cast<std::uint32_t>(DType::Float64) || tableCount < 2 || mSize < 2 || hSize < 2
+            || realSubsteps < 1 || realSubsteps >= static_cast<std::uint32_t>(entry.totalSubsteps))
+            return false;
+
+        const std::uint64_t tableBytes = static_cast<std::uint64_t>(mSize) * hSize * sizeof(double);
+
+        for (const std::uint64_t offset : { offsetMEnd, offsetSumMRest })
+            if (offset % alignof(double) != 0 || offset + tableBytes > mappedSize)
+                return false;
+
+        // Warp knot tables are optional (offset 0 = uniform axis)
+        const std::uint64_t warpBytes = (static_cast<std::uint64_t>(warpSegments) + 1) * sizeof(double);
+
+        for (const std::uint64_t offset : { offsetMWarp, offsetHWarp })
+            if (offset != 0 && (warpSegments == 0 || offset % alignof(double) != 0 || offset + warpBytes > mappedSize))
+                return false;
+
+        entry.warpSegments = static_cast<int>(warpSegments);
+        entry.realSubsteps = static_cast<int>(realSubsteps);
+        entry.mWarp = offsetMWarp != 0 ? reinterpret_cast<const double*>(mappedData + offsetMWarp) : nullptr;
+        entry.hWarp = offsetHWarp != 0 ? reinterpret_cast<const double*>(mappedData + offsetHWarp) : nullptr;
+        entry.dtype = DType::Float64;
+        entry.mSize = static_cast<int>(mSize);
+        entry.hSize = static_cast<int>(hSize);
+        entry.lutMEnd = reinterpret_cast<const double*>(mappedData + offsetMEnd);
+        entry.lutSumMRest = reinterpret_cast<const double*>(mappedData + offsetSumMRest);
+
+        entries.push_back(std::move(entry));
+    }
+
+    return true;
+}
@@ -0,0 +1,106 @@
+#pragma once
+
+#include <cstddef>
+#include <cstdint>
+#include <string>
+#include <vector>
+
+class JAHysteresisSchedulerLUT;
+
+/**
+ * JAHysteresisLUTFile
+ *
+ * Read-only, memory-mapped view of a binary LUT bank written by
+ * `scripts/generate_ja_lut.py --formats binary`.
+ *
+ * The bank holds one or more modes/variants. Every table starts on its own
+ * 4 KB page, so mapping the whole bank costs nothing up front: only the pages
+ * of the mode handed to the scheduler are ever touched and paged in.
+ * Table pointers are zero-copy views into the mapping and stay valid until
+ * close() or destruction.
+ *
+ * File layout (little-endian):
+ *   FileHeader (64 bytes) | Entry[entryCount] (176 bytes each) | aligned tables
+ *
+ * Version 2 entries record the physics and real substep count the tables
+ * were simulated with; version 1 banks (without them) are rejected.
+ */
+class JAHysteresisLUTFile
+{
+public:
+    static constexpr std::uint32_t kVersion = 2;
+
+    enum class DType : std::uint32_t
+    {
+        Float64 = 1
+    };
+
+    struct Entry
+    {
+        std::string name;
+        DType dtype { DType::Float64 };
+        int mSize = 0;
+        int hSize = 0;
+        int totalSubsteps = 0;
+        int realSubsteps = 1;              ///< Substeps computed before the lookup
+        double mMin = -1.0;
+        double mMax = 1.0;
+        double hMin = -1.0;
+        double hMax = 1.0;
+        double phaseSpan = 0.0;
+        double biasLevel = 0.0;
+        double biasScale = 0.0;
+        double Ms = 0.0;                   ///< Physics the tables were simulated with
+        double aDensity = 0.0;
+        double kPinning = 0.0;
+        double cReversibility = 0.0;
+        double alphaCoupling = 0.0;
+        const double* lutMEnd = nullptr;
+        const double* lutSumMRest = nullptr;
+        int warpSegments = 0;              ///< Segments of each warped axis
+        const double* mWarp = nullptr;     ///< M axis warp knots, nullptr = uniform
+        const double* hWarp = nullptr;     ///< H axis warp knots, nullptr = uniform
+    };
+
+    JAHysteresisLUTFile() = default;
+    ~JAHysteresisLUTFile();
+
+    JAHysteresisLUTFile(const JAHysteresisLUTFile&) = delete;
+    JAHysteresisLUTFile& operator=(const JAHysteresisLUTFile&) = delete;
+
+    /** Map a bank file and validate its header and entry table.
+     *  Call from a non-realtime thread. Returns false on any I/O or format error.
+     */
+    bool open(const std::string& path);
+    void close() noexcept;
+
+    bool isOpen() const noexcept { return mappedData != nullptr; }
+    int getNumEntries() const noexcept { return static_cast<int>(entries.size()); }
+    const Entry& getEntry(int index) const noexcept { return entries[static_cast<std::size_t>(index)]; }
+
+    /** Find an entry by LUT name (e.g. "K121"), or nullptr if absent. */
+    const Entry* find(const std::string& name) const noexcept;
+
+    /** Hint the OS to page in one entry's tables ahead of first use. */
+    void prefetch(const Entry& entry) const noexcept;
+
+    /** Hand an entry's tables to the scheduler without copying, with the
+     *  entry's grid ranges and warps.
+     *  Returns false if the entry was generated for another substep count,
+     *  real substep count, phase span, bias or physics than the scheduler's
+     *  current settings (JAHysteresisSchedulerLUT::validateLUT()).
+     */
+    bool applyTo(JAHysteresisSchedulerLUT& scheduler, const Entry& entry) const noexcept;
+
+private:
+    const std::uint8_t* mappedData { nullptr };
+    std::size_t mappedSize { 0 };
+#if defined(_WIN32)
+    void* fileHandle { nullptr };
+    void* mappingHandle { nullptr };
+#endif
+    std::vector<Entry> entries;
+
+    bool mapFile(const std::string& path);
+    bool parse();
+};
@@ -0,0 +1,30 @@
+// Auto-generated by generate_ja_lut.py --modes-header from its MODES table
+// Order matches JAHysteresisSchedulerLUT::Mode
+
+#pragma once
+
+#include <array>
+
+namespace JAHysteresisLUTModes {
+
+struct ModeInfo
+{
+    const char* name;
+    double biasCycles;   // bias cycles per sample (phase span / 2 pi)
+    int totalSubsteps;   // substeps per sample, including substep 0
+};
+
+constexpr std::array<ModeInfo, 10> MODES = {{
+    { "K28", 1.5, 27 },
+    { "K45", 2.5, 45 },
+    { "K63", 3.5, 63 },
+    { "K99", 4.5, 99 },
+    { "K121", 5.5, 121 },
+    { "K187", 8.5, 187 },
+    { "K253", 11.5, 253 },
+    { "K495", 22.5, 495 },
+    { "K1045", 47.5, 1045 },
+    { "K2101", 95.5, 2101 },
+}};
+
+} // namespace
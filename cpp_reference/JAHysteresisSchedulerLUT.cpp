@@ -1,4 +1,5 @@
 #include "JAHysteresisSchedulerLUT.h"
+#include "JAHysteresisLUTModes.h"
 
 #include <algorithm>
 #include <cmath>
@@ -6,7 +7,18 @@
 
 namespace
 {
+constexpr double kPi = std::numbers::pi;
 constexpr double kTwoPi = std::numbers::pi * 2.0;
+
+static_assert(JAHysteresisLUTModes::MODES.size() == static_cast<std::size_t>(JAHysteresisSchedulerLUT::Mode::K2101) + 1,
+              "JAHysteresisLUTModes.h does not match JAHysteresisSchedulerLUT::Mode; regenerate it "
+              "with generate_ja_lut.py --modes-header");
+
+/** Equal up to rounding of the generator's decimal output */
+bool nearlyEqual(double a, double b) noexcept
+{
+    return std::abs(a - b) <= 1.0e-9 * std::max({ 1.0, std::abs(a), std::abs(b) });
+}
 }
 
 void JAHysteresisSchedulerLUT::initialise(double newSampleRate,
@@ -26,6 +38,7 @@ void JAHysteresisSchedulerLUT::reset() noexcept
 {
     biasPhase = 0.0;
     substepPhase = 0.0;
+    phaseState = 0;
     MPrev = 0.0;
     HPrev = 0.0;
 }
@@ -47,8 +60,9 @@ void JAHysteresisSchedulerLUT::setPhysics(const PhysicsParams& newPhysics) noexc
 
 void JAHysteresisSchedulerLUT::setBiasControls(double level, double scale) noexcept
 {
-    // Note: LUT is precomputed for fixed bias values (0.41, 11.0)
-    // Changing these values will cause mismatch with LUT!
+    // Note: a 2D LUT is precomputed for fixed bias values (0.41, 11.0) and
+    // changing these values will cause mismatch with it! A bias-axis LUT
+    // (setBiasLUT) follows the bias amplitude within its slice range.
     biasLevel = std::clamp(level, 0.0, 1.0);
     biasScale = std::max(scale, 0.0);
     updateDerived();
@@ -59,8 +73,15 @@ void JAHysteresisSchedulerLUT::setLUT(const double* lutMEnd,
                                        int mSize,
                                        int hSize) noexcept
 {
+    lutConfig.dtype = LUTDType::Float64;
+    lutConfig.interp = LUTInterp::Bilinear;
+    lutConfig.tableStride = 1;
     lutConfig.lutMEnd = lutMEnd;
     lutConfig.lutSumMRest = lutSumMRest;
+    lutConfig.mEndScale = 1.0;
+    lutConfig.mEndOffset = 0.0;
+    lutConfig.sumMRestScale = 1.0;
+    lutConfig.sumMRestOffset = 0.0;
     lutConfig.mSize = mSize;
     lutConfig.hSize = hSize;
     // Default grid ranges (can be extended if needed)
@@ -68,33 +89,339 @@ void JAHysteresisSchedulerLUT::setLUT(const double* lutMEnd,
     lutConfig.mMax = 1.0;
     lutConfig.hMin = -1.0;
     lutConfig.hMax = 1.0;
+    lutConfig.mWarp = nullptr;
+    lutConfig.hWarp = nullptr;
+    lutConfig.mWarpSegments = 0;
+    lutConfig.hWarpSegments = 0;
+    lutConfig.biasSize = 1;
+    lutConfig.biasMin = 0.0;
+    lutConfig.biasMax = 0.0;
+    lutConfig.substepSize = 1;
+    lutConfig.substepMin = 0.0;
+    lutConfig.substepMax = 0.0;
+    substepCount = static_cast<double>(totalSubsteps);
+    invSubstepCount = invTotalSubsteps;
+    updateSlice();
+}
+
+void JAHysteresisSchedulerLUT::setLUT(const float* lutMEnd,
+                                       const float* lutSumMRest,
+                                       int mSize,
+                                       int hSize) noexcept
+{
+    setLUT(static_cast<const double*>(nullptr), static_cast<const double*>(nullptr), mSize, hSize);
+    lutConfig.dtype = LUTDType::Float32;
+    lutConfig.lutMEnd = lutMEnd;
+    lutConfig.lutSumMRest = lutSumMRest;
+}
+
+void JAHysteresisSchedulerLUT::setLUT(const std::int16_t* lutMEnd,
+                                       double mEndScale,
+                                       double mEndOffset,
+                                       const std::int16_t* lutSumMRest,
+                                       double sumMRestScale,
+                                       double sumMRestOffset,
+                                       int mSize,
+                                       int hSize) noexcept
+{
+    setLUT(static_cast<const double*>(nullptr), static_cast<const double*>(nullptr), mSize, hSize);
+    lutConfig.dtype = LUTDType::Int16;
+    lutConfig.lutMEnd = lutMEnd;
+    lutConfig.lutSumMRest = lutSumMRest;
+    lutConfig.mEndScale = mEndScale;
+    lutConfig.mEndOffset = mEndOffset;
+    lutConfig.sumMRestScale = sumMRestScale;
+    lutConfig.sumMRestOffset = sumMRestOffset;
+}
+
+void JAHysteresisSchedulerLUT::setBicubicLUT(const double* coeffsMEnd,
+                                              const double* coeffsSumMRest,
+                                              int mSize,
+                                              int hSize) noexcept
+{
+    setLUT(coeffsMEnd, coeffsSumMRest, mSize, hSize);
+    lutConfig.interp = LUTInterp::Bicubic;
+}
+
+void JAHysteresisSchedulerLUT::setBicubicLUT(const float* coeffsMEnd,
+                                              const float* coeffsSumMRest,
+                                              int mSize,
+                                              int hSize) noexcept
+{
+    setLUT(coeffsMEnd, coeffsSumMRest, mSize, hSize);
+    lutConfig.interp = LUTInterp::Bicubic;
+}
+
+void JAHysteresisSchedulerLUT::setSVDLUT(const double* factorsMEnd,
+                                          int rankMEnd,
+                                          const double* factorsSumMRest,
+                                          int rankSumMRest,
+                                          int mSize,
+                                          int hSize) noexcept
+{
+    setLUT(factorsMEnd, factorsSumMRest, mSize, hSize);
+    lutConfig.interp = LUTInterp::SVD;
+    lutConfig.mEndRank = std::max(rankMEnd, 0);
+    lutConfig.sumMRestRank = std::max(rankSumMRest, 0);
+}
+
+void JAHysteresisSchedulerLUT::setSVDLUT(const float* factorsMEnd,
+                                          int rankMEnd,
+                                          const float* factorsSumMRest,
+                                          int rankSumMRest,
+                                          int mSize,
+                                          int hSize) noexcept
+{
+    setLUT(factorsMEnd, factorsSumMRest, mSize, hSize);
+    lutConfig.interp = LUTInterp::SVD;
+    lutConfig.mEndRank = std::max(rankMEnd, 0);
+    lutConfig.sumMRestRank = std::max(rankSumMRest, 0);
+}
+
+void JAHysteresisSchedulerLUT::setHermiteLUT(const double* lutMEnd,
+                                              const double* lutSumMRest,
+                                              int mSize,
+                                              int hSize) noexcept
+{
+    setLUT(lutMEnd, lutSumMRest, mSize, hSize);
+    lutConfig.interp = LUTInterp::Hermite;
+}
+
+void JAHysteresisSchedulerLUT::setHermiteLUT(const float* lutMEnd,
+                                              const float* lutSumMRest,
+                                              int mSize,
+                                              int hSize) noexcept
+{
+    setLUT(lutMEnd, lutSumMRest, mSize, hSize);
+    lutConfig.interp = LUTInterp::Hermite;
+}
+
+void JAHysteresisSchedulerLUT::setInterleavedLUT(const double* lut,
+                                                  int mSize,
+                                                  int hSize) noexcept
+{
+    setLUT(lut, lut != nullptr ? lut + 1 : nullptr, mSize, hSize);
+    lutConfig.tableStride = 2;
+}
+
+void JAHysteresisSchedulerLUT::setInterleavedLUT(const float* lut,
+                                                  int mSize,
+                                                  int hSize) noexcept
+{
+    setLUT(lut, lut != nullptr ? lut + 1 : nullptr, mSize, hSize);
+    lutConfig.tableStride = 2;
+}
+
+void JAHysteresisSchedulerLUT::setInterleavedLUT(const std::int16_t* lut,
+                                                  double mEndScale,
+                                                  double mEndOffset,
+                                                  double sumMRestScale,
+                                                  double sumMRestOffset,
+                                                  int mSize,
+                                                  int hSize) noexcept
+{
+    setLUT(lut, mEndScale, mEndOffset, lut != nullptr ? lut + 1 : nullptr, sumMRestScale, sumMRestOffset,
+           mSize, hSize);
+    lutConfig.tableStride = 2;
+}
+
+void JAHysteresisSchedulerLUT::setInterleavedBicubicLUT(const double* coeffs,
+                                                         int mSize,
+                                                         int hSize) noexcept
+{
+    setBicubicLUT(coeffs, coeffs != nullptr ? coeffs + 16 : nullptr, mSize, hSize);
+    lutConfig.tableStride = 2;
+}
+
+void JAHysteresisSchedulerLUT::setInterleavedBicubicLUT(const float* coeffs,
+                                                         int mSize,
+                                                         int hSize) noexcept
+{
+    setBicubicLUT(coeffs, coeffs != nullptr ? coeffs + 16 : nullptr, mSize, hSize);
+    lutConfig.tableStride = 2;
+}
+
+void JAHysteresisSchedulerLUT::setInterleavedHermiteLUT(const double* lut,
+                                                         int mSize,
+                                                         int hSize) noexcept
+{
+    setHermiteLUT(lut, lut != nullptr ? lut + 4 : nullptr, mSize, hSize);
+    lutConfig.tableStride = 2;
+}
+
+void JAHysteresisSchedulerLUT::setInterleavedHermiteLUT(const float* lut,
+                                                         int mSize,
+                                                         int hSize) noexcept
+{
+    setHermiteLUT(lut, lut != nullptr ? lut + 4 : nullptr, mSize, hSize);
+    lutConfig.tableStride = 2;
+}
+
+void JAHysteresisSchedulerLUT::setAxisWarp(const double* mWarp,
+                                            int mWarpSegments,
+                                            const double* hWarp,
+                                            int hWarpSegments) noexcept
+{
+    // One segment is the identity map; skip the extra lookup entirely
+    const bool mWarped = mWarp != nullptr && mWarpSegments > 1;
+    const bool hWarped = hWarp != nullptr && hWarpSegments > 1;
+
+    lutConfig.mWarp = mWarped ? mWarp : nullptr;
+    lutConfig.mWarpSegments = mWarped ? mWarpSegments : 0;
+    lutConfig.hWarp = hWarped ? hWarp : nullptr;
+    lutConfig.hWarpSegments = hWarped ? hWarpSegments : 0;
+}
+
+void JAHysteresisSchedulerLUT::setBiasLUT(const double* lutMEnd,
+                                           const double* lutSumMRest,
+                                           int mSize,
+                                           int hSize,
+                                           int biasSize,
+                                           double biasMin,
+                                           double biasMax) noexcept
+{
+    setLUT(lutMEnd, lutSumMRest, mSize, hSize);
+
+    if (biasSize < 2 || ! (biasMax > biasMin) || ! sliceAxisSupported())
+        return;
+
+    lutConfig.biasSize = biasSize;
+    lutConfig.biasMin = biasMin;
+    lutConfig.biasMax = biasMax;
+    updateSlice();
+}
+
+void JAHysteresisSchedulerLUT::setSubstepLUT(const double* lutMEnd,
+                                              const double* lutSumMRest,
+                                              int mSize,
+                                              int hSize,
+                                              int substepSize,
+                                              double substepMin,
+                                              double substepMax) noexcept
+{
+    setLUT(lutMEnd, lutSumMRest, mSize, hSize);
+
+    if (substepSize < 2 || ! (substepMax > substepMin) || ! sliceAxisSupported())
+        return;
+
+    lutConfig.substepSize = substepSize;
+    lutConfig.substepMin = substepMin;
+    lutConfig.substepMax = substepMax;
+    setSubstepCount(static_cast<double>(totalSubsteps));
+}
+
+void JAHysteresisSchedulerLUT::setSubstepCount(double substeps) noexcept
+{
+    if (lutConfig.substepSize < 2)
+        return;
+
+    substepCount = std::clamp(substeps, lutConfig.substepMin, lutConfig.substepMax);
+    invSubstepCount = 1.0 / substepCount;
+    updateSlice();
+}
+
+void JAHysteresisSchedulerLUT::setRealSubsteps(int substeps) noexcept
+{
+    realSubsteps = std::max(1, substeps);
+}
+
+void JAHysteresisSchedulerLUT::setBiasPhaseTable(const double* phaseStart,
+                                                 const double* biasReal,
+                                                 const double* biasLast,
+                                                 int phaseStates,
+                                                 int substeps) noexcept
+{
+    biasPhaseStart = nullptr;
+    biasRealTable = nullptr;
+    biasLastTable = nullptr;
+    biasPhaseStates = 1;
+    biasTableSubsteps = 0;
+    phaseState = 0;
+
+    // q states must advance a whole number of bias cycles
+    const double cycles = biasCyclesPerSample * static_cast<double>(phaseStates);
+    if (phaseStart == nullptr || biasReal == nullptr || biasLast == nullptr || phaseStates < 1
+        || substeps < 1 || ! nearlyEqual(cycles, std::round(cycles)))
+        return;
+
+    biasPhaseStart = phaseStart;
+    biasRealTable = biasReal;
+    biasLastTable = biasLast;
+    biasPhaseStates = phaseStates;
+    biasTableSubsteps = substeps;
+
+    // Continue from the state closest to the running phase
+    double nearest = kTwoPi;
+    for (int state = 0; state < phaseStates; ++state)
+    {
+        const double d = std::abs(std::remainder(biasPhase - phaseStart[state], kTwoPi));
+        if (d < nearest)
+        {
+            nearest = d;
+            phaseState = state;
+        }
+    }
 }
 
 double JAHysteresisSchedulerLUT::process(double HAudio) noexcept
 {
     // Phase at start of this sample (before substeps)
     const double phaseStart = biasPhase;
+    const int state = phaseState;
+    phaseState = state + 1 < biasPhaseStates ? state + 1 : 0;
+
+    // Bias of this phase state from the table (fixed substep count only), else sin()
+    const bool useTable = biasRealTable != nullptr && biasTableSubsteps == realSubsteps
+                          && lutConfig.substepSize < 2;
+    const double* biasReal = useTable ? biasRealTable + state * realSubsteps : nullptr;
+
+    // Substep phase increment (the phase span is fixed, the substep count may be fractional)
+    const double dphi = kTwoPi / (substepCount / biasCyclesPerSample);
+
+    // Execute substeps 0..R-1 with real physics
+    double M = MPrev;
+    double H = HPrev;
+    double sumMReal = 0.0;
+    for (int i = 0; i < realSubsteps; ++i)
+    {
+        const double bias = useTable ? biasReal[i]
+                                     : std::sin(phaseStart + dphi * (static_cast<double>(i) + 0.5));
+        const double HNew = HAudio + biasAmplitude * bias;
+        M = executeSubstep(M, H, HNew);
+        H = HNew;
+        sumMReal += M;
+    }
 
-    // Substep phase increment
-    const double dphi = kTwoPi / static_cast<double>(lutConfig.totalSubsteps / biasCyclesPerSample);
-
-    // Execute substep 0 with real physics
-    const double biasOffset0 = std::sin(phaseStart + dphi * 0.5);
-    const double M1 = executeSubstep0(biasOffset0, HAudio);
-
-    // Look up remainder from LUT (substeps 1..N-1)
-    const double M_end = bilinearLookup(lutConfig.lutMEnd, M1, HAudio);
-    const double sumM_rest = bilinearLookup(lutConfig.lutSumMRest, M1, HAudio);
+    // Look up remainder from LUT (substeps R..N-1). The LUT is built for samples
+    // starting at bias phase 0; one starting at pi sees the negated bias, so its
+    // remainder is the phase-flip mirror T_pi(M, H) = -T_0(-M, -H)
+    double M_end = 0.0;
+    double sumM_rest = 0.0;
+    const bool mirror = std::abs(phaseStart - kPi) < 0.5 * kPi;
+    lookupRemainder(mirror ? -M : M, mirror ? -HAudio : HAudio, M_end, sumM_rest);
+    if (mirror)
+    {
+        M_end = -M_end;
+        sumM_rest = -sumM_rest;
+    }
 
     // Update state for next sample
     MPrev = M_end;
-    HPrev = HAudio + biasAmplitude * std::sin(phaseStart + dphi * (totalSubsteps - 0.5));
+    if (useTable)
+    {
+        HPrev = HAudio + biasAmplitude * biasLastTable[state];
+        biasPhase = biasPhaseStart[phaseState];
+    }
+    else
+    {
+        HPrev = HAudio + biasAmplitude * std::sin(phaseStart + dphi * (substepCount - 0.5));
 
-    // Advance phase by biasCycles full cycles
-    biasPhase = std::fmod(phaseStart + biasCyclesPerSample * kTwoPi, kTwoPi);
+        // Advance phase by biasCycles full cycles
+        biasPhase = std::fmod(phaseStart + biasCyclesPerSample * kTwoPi, kTwoPi);
+    }
 
-    // Return average magnetization: (M1 + sum of M2..MN) / N
-    return (M1 + sumM_rest) * invTotalSubsteps;
+    // Return average magnetization: (real substeps + looked-up remainder) / N
+    return (sumMReal + sumM_rest) * invSubstepCount;
 }
 
 // -----------------------------------------------------------------------------
@@ -107,61 +434,106 @@ void JAHysteresisSchedulerLUT::updateDerived() noexcept
     kNorm = physics.kPinning / MsSafe;
     cNorm = physics.cReversibility;
     biasAmplitude = biasLevel * biasScale;
+    updateSlice();
 }
 
-void JAHysteresisSchedulerLUT::updateModeDerived() noexcept
+bool JAHysteresisSchedulerLUT::sliceAxisSupported() const noexcept
+{
+    // lookupPair() blends slices of separate bilinear node tables only;
+    // any other table keeps the fixed 2D lookup rather than a silently wrong stride
+    return lutConfig.interp == LUTInterp::Bilinear && lutConfig.tableStride == 1;
+}
+
+void JAHysteresisSchedulerLUT::updateSlice() noexcept
 {
-    // Set mode-specific parameters
-    // These must match the LUT generator configuration!
-    switch (currentMode)
+    // Resolve the slice pair once per bias / substep-count change, not per lookup
+    sliceStride = static_cast<std::size_t>(lutConfig.mSize) * static_cast<std::size_t>(lutConfig.hSize);
+
+    double value = 0.0, lo = 0.0, hi = 0.0;
+    int size = 1;
+    if (lutConfig.biasSize >= 2)
     {
-        case Mode::K28:
-            biasCyclesPerSample = 1.5;
-            totalSubsteps = 27;
-            break;
-        case Mode::K45:
-            biasCyclesPerSample = 2.5;
-            totalSubsteps = 45;
-            break;
-        case Mode::K63:
-            biasCyclesPerSample = 3.5;
-            totalSubsteps = 63;
-            break;
-        case Mode::K99:
-            biasCyclesPerSample = 4.5;
-            totalSubsteps = 99;
-            break;
-        case Mode::K121:
-            biasCyclesPerSample = 5.5;
-            totalSubsteps = 121;
-            break;
-        case Mode::K187:
-            biasCyclesPerSample = 8.5;
-            totalSubsteps = 187;
-            break;
-        case Mode::K253:
-            biasCyclesPerSample = 11.5;
-            totalSubsteps = 253;
-            break;
-        case Mode::K495:
-            biasCyclesPerSample = 22.5;
-            totalSubsteps = 495;
-            break;
-        case Mode::K1045:
-            biasCyclesPerSample = 47.5;
-            totalSubsteps = 1045;
-            break;
-        case Mode::K2101:
-            biasCyclesPerSample = 95.5;
-            totalSubsteps = 2101;
-            break;
+        value = biasAmplitude;
+        lo = lutConfig.biasMin;
+        hi = lutConfig.biasMax;
+        size = lutConfig.biasSize;
+    }
+    else if (lutConfig.substepSize >= 2)
+    {
+        value = substepCount;
+        lo = lutConfig.substepMin;
+        hi = lutConfig.substepMax;
+        size = lutConfig.substepSize;
     }
+    else
+    {
+        sliceOffset = 0;
+        sliceFrac = 0.0;
+        return;
+    }
+
+    const double norm = std::clamp((value - lo) / (hi - lo), 0.0, 1.0);
+    const double scaled = norm * static_cast<double>(size - 1);
+    const int slice = std::min(static_cast<int>(std::floor(scaled)), size - 2);
+
+    sliceOffset = static_cast<std::size_t>(slice) * sliceStride;
+    sliceFrac = scaled - static_cast<double>(slice);
+}
+
+void JAHysteresisSchedulerLUT::updateModeDerived() noexcept
+{
+    // Mode table generated from the LUT generator's MODES (JAHysteresisLUTModes.h)
+    const auto& mode = JAHysteresisLUTModes::MODES[static_cast<std::size_t>(currentMode)];
+    biasCyclesPerSample = mode.biasCycles;
+    totalSubsteps = mode.totalSubsteps;
 
     invTotalSubsteps = 1.0 / static_cast<double>(totalSubsteps);
+    substepCount = static_cast<double>(totalSubsteps);
+    invSubstepCount = invTotalSubsteps;
+    setSubstepCount(substepCount);
 
     // Update LUT config - this should point to the appropriate LUT data
     lutConfig.totalSubsteps = totalSubsteps;
     lutConfig.biasCycles = biasCyclesPerSample;
+
+    // The bias phase table belongs to the previous mode
+    setBiasPhaseTable(nullptr, nullptr, nullptr, 1, 0);
+}
+
+bool JAHysteresisSchedulerLUT::validateLUT(const LUTManifest& manifest) noexcept
+{
+    // The manifest describes the LUT, so its ranges apply even if the check fails
+    lutConfig.mMin = manifest.mMin;
+    lutConfig.mMax = manifest.mMax;
+    lutConfig.hMin = manifest.hMin;
+    lutConfig.hMax = manifest.hMax;
+
+    if (manifest.mSize != lutConfig.mSize || manifest.hSize != lutConfig.hSize
+        || manifest.totalSubsteps != totalSubsteps || manifest.realSubsteps != realSubsteps
+        || ! nearlyEqual(manifest.phaseSpan, kTwoPi * biasCyclesPerSample))
+        return false;
+
+    // process() reads pi-state samples at (-M, -H): with a fractional bias cycle
+    // count some samples do, and an asymmetric range would clamp them at the wrong edge
+    if (! nearlyEqual(biasCyclesPerSample, std::round(biasCyclesPerSample))
+        && (! nearlyEqual(manifest.mMin, -manifest.mMax) || ! nearlyEqual(manifest.hMin, -manifest.hMax)))
+        return false;
+
+    // Bias-axis LUTs follow the bias amplitude; fixed-bias LUTs only hold for theirs
+    if (lutConfig.biasSize < 2 && ! nearlyEqual(manifest.biasLevel * manifest.biasScale, biasAmplitude))
+        return false;
+
+    if (manifest.hasPhysics)
+    {
+        const PhysicsParams& p = manifest.physics;
+        if (! nearlyEqual(p.Ms, physics.Ms) || ! nearlyEqual(p.aDensity, physics.aDensity)
+            || ! nearlyEqual(p.kPinning, physics.kPinning)
+            || ! nearlyEqual(p.cReversibility, physics.cReversibility)
+            || ! nearlyEqual(p.alphaCoupling, physics.alphaCoupling))
+            return false;
+    }
+
+    return true;
 }
 
 double JAHysteresisSchedulerLUT::fastTanh(double x) const noexcept
@@ -171,13 +543,13 @@ double JAHysteresisSchedulerLUT::fastTanh(double x) const noexcept
     return clamped * (27.0 + x2) / (27.0 + 9.0 * x2);
 }
 
-double JAHysteresisSchedulerLUT::executeSubstep0(double biasOffset,
-                                                  double HAudio) noexcept
+double JAHysteresisSchedulerLUT::executeSubstep(double MIn,
+                                                 double HIn,
+                                                 double HNew) const noexcept
 {
     // Execute one JA substep (identical to original executeSubstep)
-    const double HNew = HAudio + biasAmplitude * biasOffset;
-    const double dH = HNew - HPrev;
-    const double He = HNew + alphaNorm * MPrev;
+    const double dH = HNew - HIn;
+    const double He = HNew + alphaNorm * MIn;
 
     const double xMan = He * invANorm;
     const double ManE = fastTanh(xMan);
@@ -185,60 +557,267 @@ double JAHysteresisSchedulerLUT::executeSubstep0(double biasOffset,
     const double dMan_dH = (1.0 - ManE2) * invANorm;
 
     const double dir = (dH >= 0.0) ? 1.0 : -1.0;
-    const double pin = dir * kNorm - alphaNorm * (ManE - MPrev);
+    const double pin = dir * kNorm - alphaNorm * (ManE - MIn);
     const double invPin = 1.0 / (pin + 1.0e-6);
 
     const double denom = 1.0 - cNorm * alphaNorm * dMan_dH;
     const double invDenom = 1.0 / (denom + 1.0e-9);
-    const double dMdH = (cNorm * dMan_dH + (ManE - MPrev) * invPin) * invDenom;
+    const double dMdH = (cNorm * dMan_dH + (ManE - MIn) * invPin) * invDenom;
     const double dMStep = dMdH * dH;
 
-    const double MNew = std::clamp(MPrev + dMStep, -1.0, 1.0);
+    const double MNew = std::clamp(MIn + dMStep, -1.0, 1.0);
 
-    // Note: We don't update MPrev/HPrev here - that's done in process() after LUT lookup
+    // Note: MPrev/HPrev are only updated in process() after the LUT lookup
     return MNew;
 }
 
-double JAHysteresisSchedulerLUT::bilinearLookup(const double* lut,
-                                                 double m,
-                                                 double h) const noexcept
+double JAHysteresisSchedulerLUT::axisCoordinate(double x,
+                                                double lo,
+                                                double hi,
+                                                const double* warp,
+                                                int warpSegments) noexcept
 {
-    if (lut == nullptr)
-        return 0.0;
+    const double n = std::clamp((x - lo) / (hi - lo), 0.0, 1.0);
+
+    if (warp == nullptr)
+        return n;
 
-    // Normalize coordinates to [0, 1]
-    const double mNorm = std::clamp(
-        (m - lutConfig.mMin) / (lutConfig.mMax - lutConfig.mMin), 0.0, 1.0);
-    const double hNorm = std::clamp(
-        (h - lutConfig.hMin) / (lutConfig.hMax - lutConfig.hMin), 0.0, 1.0);
+    // Piecewise-linear warp over uniform segments: one knot pair and a lerp
+    const double s = n * static_cast<double>(warpSegments);
+    const int i = std::min(static_cast<int>(s), warpSegments - 1);
+    return warp[i] + (warp[i + 1] - warp[i]) * (s - static_cast<double>(i));
+}
+
+JAHysteresisSchedulerLUT::GridCell JAHysteresisSchedulerLUT::gridCell(double m, double h) const noexcept
+{
+    // Normalize coordinates to [0, 1] (through the axis warp, if any)
+    const double mNorm = axisCoordinate(m, lutConfig.mMin, lutConfig.mMax,
+                                        lutConfig.mWarp, lutConfig.mWarpSegments);
+    const double hNorm = axisCoordinate(h, lutConfig.hMin, lutConfig.hMax,
+                                        lutConfig.hWarp, lutConfig.hWarpSegments);
 
     // Scale to grid indices
     const double mScaled = mNorm * static_cast<double>(lutConfig.mSize - 1);
     const double hScaled = hNorm * static_cast<double>(lutConfig.hSize - 1);
 
-    // Get integer indices (clamped to safe range)
-    const int mIdx = std::min(static_cast<int>(std::floor(mScaled)), lutConfig.mSize - 2);
-    const int hIdx = std::min(static_cast<int>(std::floor(hScaled)), lutConfig.hSize - 2);
+    // Cell indices, clamped so the last node falls into the last cell at frac 1
+    GridCell cell;
+    cell.mIdx = std::min(static_cast<int>(mScaled), lutConfig.mSize - 2);
+    cell.hIdx = std::min(static_cast<int>(hScaled), lutConfig.hSize - 2);
 
     // Fractional parts for interpolation
-    const double mFrac = mScaled - static_cast<double>(mIdx);
-    const double hFrac = hScaled - static_cast<double>(hIdx);
-
-    // 2D index computation: row-major order
-    const int idx00 = mIdx * lutConfig.hSize + hIdx;
-    const int idx01 = mIdx * lutConfig.hSize + (hIdx + 1);
-    const int idx10 = (mIdx + 1) * lutConfig.hSize + hIdx;
-    const int idx11 = (mIdx + 1) * lutConfig.hSize + (hIdx + 1);
-
-    // Fetch corner values
-    const double v00 = lut[idx00];
-    const double v01 = lut[idx01];
-    const double v10 = lut[idx10];
-    const double v11 = lut[idx11];
-
-    // Bilinear interpolation
-    return v00 * (1.0 - mFrac) * (1.0 - hFrac)
-         + v01 * (1.0 - mFrac) * hFrac
-         + v10 * mFrac * (1.0 - hFrac)
-         + v11 * mFrac * hFrac;
+    cell.mFrac = mScaled - static_cast<double>(cell.mIdx);
+    cell.hFrac = hScaled - static_cast<double>(cell.hIdx);
+    return cell;
+}
+
+template <typename T>
+void JAHysteresisSchedulerLUT::bilinearPair(const T* lutA,
+                                            const T* lutB,
+                                            const GridCell& cell,
+                                            double& a,
+                                            double& b) const noexcept
+{
+    // 2D index computation: row-major order, tableStride slots per node
+    const std::size_t stride = static_cast<std::size_t>(lutConfig.tableStride);
+    const std::size_t idx00 = (static_cast<std::size_t>(cell.mIdx) * static_cast<std::size_t>(lutConfig.hSize)
+                               + static_cast<std::size_t>(cell.hIdx)) * stride;
+    const std::size_t idx01 = idx00 + stride;
+    const std::size_t idx10 = idx00 + static_cast<std::size_t>(lutConfig.hSize) * stride;
+    const std::size_t idx11 = idx10 + stride;
+
+    // Weights shared by both tables
+    const double w00 = (1.0 - cell.mFrac) * (1.0 - cell.hFrac);
+    const double w01 = (1.0 - cell.mFrac) * cell.hFrac;
+    const double w10 = cell.mFrac * (1.0 - cell.hFrac);
+    const double w11 = cell.mFrac * cell.hFrac;
+
+    a = static_cast<double>(lutA[idx00]) * w00 + static_cast<double>(lutA[idx01]) * w01
+      + static_cast<double>(lutA[idx10]) * w10 + static_cast<double>(lutA[idx11]) * w11;
+    b = static_cast<double>(lutB[idx00]) * w00 + static_cast<double>(lutB[idx01]) * w01
+      + static_cast<double>(lutB[idx10]) * w10 + static_cast<double>(lutB[idx11]) * w11;
+}
+
+template <typename T>
+void JAHysteresisSchedulerLUT::bicubicPair(const T* coeffsA,
+                                           const T* coeffsB,
+                                           const GridCell& cell,
+                                           double& a,
+                                           double& b) const noexcept
+{
+    // One contiguous block per table: c[i * 4 + j] multiplies mFrac^i * hFrac^j
+    const std::size_t offset = (static_cast<std::size_t>(cell.mIdx) * static_cast<std::size_t>(lutConfig.hSize - 1)
+                                + static_cast<std::size_t>(cell.hIdx))
+                             * 16 * static_cast<std::size_t>(lutConfig.tableStride);
+    const T* ca = coeffsA + offset;
+    const T* cb = coeffsB + offset;
+
+    a = 0.0;
+    b = 0.0;
+    for (int i = 12; i >= 0; i -= 4)
+    {
+        const double rowA = ((static_cast<double>(ca[i + 3]) * cell.hFrac + static_cast<double>(ca[i + 2])) * cell.hFrac
+                             + static_cast<double>(ca[i + 1])) * cell.hFrac + static_cast<double>(ca[i]);
+        const double rowB = ((static_cast<double>(cb[i + 3]) * cell.hFrac + static_cast<double>(cb[i + 2])) * cell.hFrac
+                             + static_cast<double>(cb[i + 1])) * cell.hFrac + static_cast<double>(cb[i]);
+        a = a * cell.mFrac + rowA;
+        b = b * cell.mFrac + rowB;
+    }
+}
+
+template <typename T>
+void JAHysteresisSchedulerLUT::hermitePair(const T* lutA,
+                                           const T* lutB,
+                                           const GridCell& cell,
+                                           double& a,
+                                           double& b) const noexcept
+{
+    // Cubic Hermite basis per axis: weights of (f0, slope0, f1, slope1)
+    auto basis = [](double t, double (&w)[4]) noexcept
+    {
+        const double t2 = t * t;
+        const double t3 = t2 * t;
+        w[0] = 2.0 * t3 - 3.0 * t2 + 1.0;
+        w[1] = t3 - 2.0 * t2 + t;
+        w[2] = 3.0 * t2 - 2.0 * t3;
+        w[3] = t3 - t2;
+    };
+    double wm[4];
+    double wh[4];
+    basis(cell.mFrac, wm);
+    basis(cell.hFrac, wh);
+
+    // Corner nodes: f, df/dm, df/dh, d2f/dm dh (4 * tableStride slots per node)
+    const std::size_t node = 4 * static_cast<std::size_t>(lutConfig.tableStride);
+    const std::size_t idx00 = (static_cast<std::size_t>(cell.mIdx) * static_cast<std::size_t>(lutConfig.hSize)
+                               + static_cast<std::size_t>(cell.hIdx)) * node;
+    const std::size_t idx10 = idx00 + static_cast<std::size_t>(lutConfig.hSize) * node;
+
+    auto patch = [&](const T* lut) noexcept
+    {
+        const T* n00 = lut + idx00;
+        const T* n01 = n00 + node;
+        const T* n10 = lut + idx10;
+        const T* n11 = n10 + node;
+
+        // Along H for the value and the M slope of both rows, then along M
+        auto alongH = [&](const T* p0, const T* p1, int k) noexcept
+        {
+            return wh[0] * static_cast<double>(p0[k]) + wh[1] * static_cast<double>(p0[k + 2])
+                 + wh[2] * static_cast<double>(p1[k]) + wh[3] * static_cast<double>(p1[k + 2]);
+        };
+        return wm[0] * alongH(n00, n01, 0) + wm[1] * alongH(n00, n01, 1)
+             + wm[2] * alongH(n10, n11, 0) + wm[3] * alongH(n10, n11, 1);
+    };
+
+    a = patch(lutA);
+    b = patch(lutB);
+}
+
+template <typename T>
+void JAHysteresisSchedulerLUT::svdPair(const T* factorsA,
+                                       const T* factorsB,
+                                       const GridCell& cell,
+                                       double& a,
+                                       double& b) const noexcept
+{
+    // mSize x rank M factors, then hSize x rank H factors: both rows of a cell are contiguous
+    auto lowRank = [&](const T* factors, int rank) noexcept
+    {
+        const std::size_t r = static_cast<std::size_t>(rank);
+        const T* m0 = factors + static_cast<std::size_t>(cell.mIdx) * r;
+        const T* m1 = m0 + r;
+        const T* h0 = factors + (static_cast<std::size_t>(lutConfig.mSize) + static_cast<std::size_t>(cell.hIdx)) * r;
+        const T* h1 = h0 + r;
+
+        double sum = 0.0;
+        for (std::size_t k = 0; k < r; ++k)
+        {
+            const double u = static_cast<double>(m0[k]) * (1.0 - cell.mFrac) + static_cast<double>(m1[k]) * cell.mFrac;
+            const double v = static_cast<double>(h0[k]) * (1.0 - cell.hFrac) + static_cast<double>(h1[k]) * cell.hFrac;
+            sum += u * v;
+        }
+        return sum;
+    };
+
+    a = lowRank(factorsA, lutConfig.mEndRank);
+    b = lowRank(factorsB, lutConfig.sumMRestRank);
+}
+
+template <typename T>
+void JAHysteresisSchedulerLUT::lookupPair(const T* lutA,
+                                          const T* lutB,
+                                          double m,
+                                          double h,
+                                          double& a,
+                                          double& b) const noexcept
+{
+    if (lutA == nullptr || lutB == nullptr)
+    {
+        a = 0.0;
+        b = 0.0;
+        return;
+    }
+
+    // Indices and weights once per sample, shared by both tables and slices
+    const GridCell cell = gridCell(m, h);
+
+    if (lutConfig.biasSize >= 2 || lutConfig.substepSize >= 2)
+    {
+        // Slice axes exist only on bilinear node tables (sliceAxisSupported());
+        // only the two neighbouring slices are read
+        double a1 = 0.0;
+        double b1 = 0.0;
+        bilinearPair(lutA + sliceOffset, lutB + sliceOffset, cell, a, b);
+        bilinearPair(lutA + sliceOffset + sliceStride, lutB + sliceOffset + sliceStride, cell, a1, b1);
+        a += (a1 - a) * sliceFrac;
+        b += (b1 - b) * sliceFrac;
+        return;
+    }
+
+    if (lutConfig.interp == LUTInterp::Bicubic)
+    {
+        bicubicPair(lutA, lutB, cell, a, b);
+        return;
+    }
+
+    if (lutConfig.interp == LUTInterp::Hermite)
+    {
+        hermitePair(lutA, lutB, cell, a, b);
+        return;
+    }
+
+    if (lutConfig.interp == LUTInterp::SVD)
+    {
+        svdPair(lutA, lutB, cell, a, b);
+        return;
+    }
+
+    bilinearPair(lutA, lutB, cell, a, b);
+}
+
+void JAHysteresisSchedulerLUT::lookupRemainder(double m,
+                                                double h,
+                                                double& mEnd,
+                                                double& sumMRest) const noexcept
+{
+    // One predictable branch per sample; the storage type only changes on setLUT()
+    switch (lutConfig.dtype)
+    {
+        case LUTDType::Float32:
+            lookupPair(static_cast<const float*>(lutConfig.lutMEnd),
+                       static_cast<const float*>(lutConfig.lutSumMRest), m, h, mEnd, sumMRest);
+            break;
+        case LUTDType::Int16:
+            lookupPair(static_cast<const std::int16_t*>(lutConfig.lutMEnd),
+                       static_cast<const std::int16_t*>(lutConfig.lutSumMRest), m, h, mEnd, sumMRest);
+            mEnd = mEnd * lutConfig.mEndScale + lutConfig.mEndOffset;
+            sumMRest = sumMRest * lutConfig.sumMRestScale + lutConfig.sumMRestOffset;
+            break;
+        case LUTDType::Float64:
+        default:
+            lookupPair(static_cast<const double*>(lutConfig.lutMEnd),
+                       static_cast<const double*>(lutConfig.lutSumMRest), m, h, mEnd, sumMRest);
+            break;
+    }
 }
@@ -3,13 +3,15 @@
 #include <array>
 #include <cmath>
 #include <cstddef>
+#include <cstdint>
 
 /**
  * JAHysteresisSchedulerLUT
  *
  * LUT-optimized version of the JA hysteresis scheduler.
  * Only computes substep 0 (cross-sample dependency), then uses
- * precomputed 2D LUT for the remainder.
+ * precomputed 2D LUT for the remainder. setRealSubsteps() computes
+ * more leading substeps for LUTs built with --real-substeps.
  *
  * Expected CPU reduction: ~11% → ~1%
  */
@@ -39,6 +41,23 @@ public:
         double alphaCoupling = 0.015;
     };
 
+    /** Table storage (generate_ja_lut.py --dtype) */
+    enum class LUTDType
+    {
+        Float64 = 0,
+        Float32,
+        Int16    ///< value = stored * scale + offset, per table
+    };
+
+    /** Table interpolation (generate_ja_lut.py --lookup) */
+    enum class LUTInterp
+    {
+        Bilinear = 0,  ///< Node values, 2x2 bilinear
+        Bicubic,       ///< 16 Catmull-Rom coefficients per cell, Horner evaluation
+        Hermite,       ///< Value + exact derivatives per node, bicubic Hermite patch
+        SVD            ///< Truncated-SVD factors, linear per factor, rank products summed
+    };
+
     // LUT configuration (must match generated LUT)
     struct LUTConfig
     {
@@ -48,12 +67,52 @@ public:
         double mMax = 1.0;
         double hMin = -1.0;
         double hMax = 1.0;
-        const double* lutMEnd = nullptr;
-        const double* lutSumMRest = nullptr;
+        LUTDType dtype = LUTDType::Float64;
+        LUTInterp interp = LUTInterp::Bilinear;
+        int tableStride = 1;                ///< Slots per entry: 1 separate tables, 2 interleaved
+        const void* lutMEnd = nullptr;      ///< M_end table, element type per dtype
+        const void* lutSumMRest = nullptr;  ///< sumM_rest table, element type per dtype
+        double mEndScale = 1.0;             ///< Int16 dequantisation of M_end
+        double mEndOffset = 0.0;
+        double sumMRestScale = 1.0;         ///< Int16 dequantisation of sumM_rest
+        double sumMRestOffset = 0.0;
+        int mEndRank = 0;                   ///< SVD rank of M_end (LUTInterp::SVD)
+        int sumMRestRank = 0;               ///< SVD rank of sumM_rest (LUTInterp::SVD)
+        const double* mWarp = nullptr;  ///< M axis warp knots (mWarpSegments + 1), nullptr = uniform
+        const double* hWarp = nullptr;  ///< H axis warp knots (hWarpSegments + 1), nullptr = uniform
+        int mWarpSegments = 0;
+        int hWarpSegments = 0;
+        int biasSize = 1;          ///< Bias-amplitude slices (1 = fixed-bias 2D LUT)
+        double biasMin = 0.0;      ///< Bias amplitude of slice 0
+        double biasMax = 0.0;      ///< Bias amplitude of slice biasSize - 1
+        int substepSize = 1;       ///< Substep-count slices (1 = fixed substep count)
+        double substepMin = 0.0;   ///< Substep count of slice 0
+        double substepMax = 0.0;   ///< Substep count of slice substepSize - 1
         int totalSubsteps = 121;
         double biasCycles = 5.5;
     };
 
+    /** Settings a LUT was generated with (generate_ja_lut.py writes them to a
+     *  JSON manifest, a Manifest struct in every C++ header and the binary
+     *  bank entries), see validateLUT().
+     */
+    struct LUTManifest
+    {
+        int mSize = 65;
+        int hSize = 129;
+        double mMin = -1.0;
+        double mMax = 1.0;
+        double hMin = -1.0;
+        double hMax = 1.0;
+        int totalSubsteps = 121;
+        int realSubsteps = 1;      ///< Substeps computed before the lookup (--real-substeps)
+        double phaseSpan = 0.0;    ///< Radians over one sample (2 pi * bias cycles)
+        double biasLevel = 0.41;
+        double biasScale = 11.0;
+        bool hasPhysics = true;    ///< false skips the physics check (every generated LUT records it)
+        PhysicsParams physics {};
+    };
+
     void initialise(double sampleRate, Mode mode, const PhysicsParams& physics);
     void reset() noexcept;
 
@@ -71,7 +130,203 @@ public:
     void setLUT(const double* lutMEnd, const double* lutSumMRest,
                 int mSize = 65, int hSize = 129) noexcept;
 
-    /** Process one host sample worth of audio field and return averaged magnetisation. */
+    /** Float32 tables (header exported with --dtype float32). */
+    void setLUT(const float* lutMEnd, const float* lutSumMRest,
+                int mSize = 65, int hSize = 129) noexcept;
+
+    /** Int16 tables (header exported with --dtype int16) with their
+     *  LUT_M_END_SCALE/_OFFSET and LUT_SUM_M_REST_SCALE/_OFFSET constants.
+     *  Both interpolation weights sum to one, so scale/offset are applied
+     *  once per lookup rather than per table entry.
+     */
+    void setLUT(const std::int16_t* lutMEnd, double mEndScale, double mEndOffset,
+                const std::int16_t* lutSumMRest, double sumMRestScale, double sumMRestOffset,
+                int mSize = 65, int hSize = 129) noexcept;
+
+    /** Bicubic coefficient tables (header exported with --lookup bicubic):
+     *  pass LUT_M_END_BICUBIC / LUT_SUM_M_REST_BICUBIC with the node grid
+     *  M_SIZE x H_SIZE. Each lookup reads one contiguous block of 16
+     *  coefficients per table; the result is the same Catmull-Rom surface
+     *  as FAUST libraries exported with --faust-kernel catmull-rom, at 16x
+     *  the memory of the node tables.
+     */
+    void setBicubicLUT(const double* coeffsMEnd, const double* coeffsSumMRest,
+                       int mSize = 65, int hSize = 129) noexcept;
+
+    /** Float32 bicubic coefficient tables (--lookup bicubic --dtype float32). */
+    void setBicubicLUT(const float* coeffsMEnd, const float* coeffsSumMRest,
+                       int mSize = 65, int hSize = 129) noexcept;
+
+    /** Hermite node tables (header exported with --lookup hermite):
+     *  pass LUT_M_END_HERMITE / LUT_SUM_M_REST_HERMITE, which hold
+     *  f, df/dm, df/dh, d2f/dm dh per node (derivatives in grid units).
+     *  Exact derivatives keep the error of a much smaller grid below
+     *  the Catmull-Rom error of the default 65 x 129 grid.
+     */
+    void setHermiteLUT(const double* lutMEnd, const double* lutSumMRest,
+                       int mSize = 65, int hSize = 129) noexcept;
+
+    /** Float32 Hermite node tables (--lookup hermite --dtype float32). */
+    void setHermiteLUT(const float* lutMEnd, const float* lutSumMRest,
+                       int mSize = 65, int hSize = 129) noexcept;
+
+    /** Truncated-SVD factor tables (header exported with --lookup svd):
+     *  pass LUT_M_END_SVD / LUT_M_END_RANK and LUT_SUM_M_REST_SVD /
+     *  LUT_SUM_M_REST_RANK. Each holds mSize x rank M factors, then
+     *  hSize x rank H factors; a lookup interpolates every factor along its
+     *  axis and sums the rank products, which is the bilinear lookup of the
+     *  rank-r table at (mSize + hSize) * rank values instead of mSize * hSize.
+     */
+    void setSVDLUT(const double* factorsMEnd, int rankMEnd,
+                   const double* factorsSumMRest, int rankSumMRest,
+                   int mSize = 65, int hSize = 129) noexcept;
+
+    /** Float32 truncated-SVD factor tables (--lookup svd --dtype float32). */
+    void setSVDLUT(const float* factorsMEnd, int rankMEnd,
+                   const float* factorsSumMRest, int rankSumMRest,
+                   int mSize = 65, int hSize = 129) noexcept;
+
+    /** Interleaved table (header exported with --layout interleaved):
+     *  pass LUT_INTERLEAVED, which holds one (M_end, sumM_rest) pair per node.
+     *  Both values of a lookup come from the same cache lines.
+     */
+    void setInterleavedLUT(const double* lut, int mSize = 65, int hSize = 129) noexcept;
+
+    /** Float32 interleaved table (--layout interleaved --dtype float32). */
+    void setInterleavedLUT(const float* lut, int mSize = 65, int hSize = 129) noexcept;
+
+    /** Int16 interleaved table (--layout interleaved --dtype int16) with the
+     *  LUT_M_END_SCALE/_OFFSET and LUT_SUM_M_REST_SCALE/_OFFSET constants.
+     */
+    void setInterleavedLUT(const std::int16_t* lut,
+                           double mEndScale, double mEndOffset,
+                           double sumMRestScale, double sumMRestOffset,
+                           int mSize = 65, int hSize = 129) noexcept;
+
+    /** Interleaved bicubic coefficients (--layout interleaved --lookup bicubic):
+     *  pass LUT_INTERLEAVED_BICUBIC, 16 M_end then 16 sumM_rest coefficients per cell.
+     */
+    void setInterleavedBicubicLUT(const double* coeffs, int mSize = 65, int hSize = 129) noexcept;
+
+    /** Float32 interleaved bicubic coefficients. */
+    void setInterleavedBicubicLUT(const float* coeffs, int mSize = 65, int hSize = 129) noexcept;
+
+    /** Interleaved Hermite nodes (--layout interleaved --lookup hermite):
+     *  pass LUT_INTERLEAVED_HERMITE, 4 M_end then 4 sumM_rest values per node.
+     */
+    void setInterleavedHermiteLUT(const double* lut, int mSize = 65, int hSize = 129) noexcept;
+
+    /** Float32 interleaved Hermite nodes. */
+    void setInterleavedHermiteLUT(const float* lut, int mSize = 65, int hSize = 129) noexcept;
+
+    /** Use non-uniform LUT axes (generate_ja_lut.py --warp auto).
+     *  Pass the M_WARP/H_WARP knot arrays and their *_WARP_SEGMENTS from the
+     *  LUT header; a segment count of 1 or a nullptr keeps that axis uniform.
+     *  Call after the setLUT()/setBicubicLUT()/setHermiteLUT()/setSVDLUT()/setInterleaved*()/setBiasLUT()/
+     *  setSubstepLUT() setters, which reset both axes to uniform.
+     */
+    void setAxisWarp(const double* mWarp, int mWarpSegments,
+                     const double* hWarp, int hWarpSegments) noexcept;
+
+    /** Set a bias-axis LUT (generate_ja_lut.py --bias-slices) for the current mode.
+     *  Tables are slice-major [bias][M][H]. With this LUT, setBiasControls()
+     *  may change the bias live: each lookup blends the two slices around
+     *  the current bias amplitude (clamped to [biasMin, biasMax]).
+     *  Slice axes are bilinear node tables only: the bicubic, Hermite, SVD
+     *  and interleaved setters clear them, and a slice axis is never
+     *  attached to such a table.
+     *  @param biasSize Number of bias slices (>= 2)
+     *  @param biasMin Bias amplitude (level * scale) of the first slice
+     *  @param biasMax Bias amplitude of the last slice
+     */
+    void setBiasLUT(const double* lutMEnd, const double* lutSumMRest,
+                    int mSize, int hSize,
+                    int biasSize, double biasMin, double biasMax) noexcept;
+
+    /** Set a substep-axis LUT (generate_ja_lut.py --substep-axis) for the current mode.
+     *  Tables are slice-major [substeps][M][H], one slice per integer substep
+     *  count over the mode's phase span. With this LUT, setSubstepCount()
+     *  may change the substep count every sample (a fractional substep
+     *  cursor): each lookup blends the two slices around it, replacing
+     *  separate N-1/N/N+1 variant LUTs and their crossfade. Bilinear node
+     *  tables only, like setBiasLUT().
+     *  @param substepSize Number of substep slices (>= 2)
+     *  @param substepMin Substep count of the first slice
+     *  @param substepMax Substep count of the last slice
+     */
+    void setSubstepLUT(const double* lutMEnd, const double* lutSumMRest,
+                       int mSize, int hSize,
+                       int substepSize, double substepMin, double substepMax) noexcept;
+
+    /** Substep count of the following process() calls, clamped to the
+     *  substep-axis LUT range (ignored without one). Substep 0, the final
+     *  bias phase and the averaging use the same continuous count.
+     */
+    void setSubstepCount(double substeps) noexcept;
+
+    /** Number of leading substeps computed with real physics before the
+     *  lookup (default 1). Must match the LUT's generate_ja_lut.py
+     *  --real-substeps (Manifest::realSubsteps); each extra substep costs
+     *  one JA step per sample (and one sin() without a bias phase table).
+     */
+    void setRealSubsteps(int substeps) noexcept;
+
+    /** Set the bias phase table of the current mode (BIAS_PHASE_START,
+     *  BIAS_REAL and BIAS_LAST of a generated LUT header). With p/q bias
+     *  cycles per sample the bias starts each sample in one of q phase
+     *  states; process() then reads the bias of the real substeps and of
+     *  substep N-1 for the sample's state instead of calling sin(). Used
+     *  while realSubsteps matches setRealSubsteps() and no substep-axis LUT
+     *  is set (process() falls back to sin() otherwise). Ignored if q states
+     *  do not span whole bias cycles; setMode() clears it.
+     *  @param phaseStart Start phase of each state (phaseStates values)
+     *  @param biasReal Bias of substeps 0..realSubsteps-1, state-major
+     *  @param biasLast Bias of substep N-1 of each state
+     *  @param phaseStates Number of states q (BIAS_PHASE_STATES)
+     *  @param realSubsteps Real substeps per state (BIAS_REAL_SUBSTEPS)
+     */
+    void setBiasPhaseTable(const double* phaseStart, const double* biasReal, const double* biasLast,
+                           int phaseStates, int realSubsteps) noexcept;
+
+    /** Check the LUT set last against the settings it was generated with, and
+     *  adopt its grid ranges (the setters assume [-1, 1] x [-1, 1]).
+     *  Call once after the LUT setters and setAxisWarp(), and again after
+     *  setMode(), setPhysics() or setBiasControls(); nothing is checked per sample.
+     *  @return false if the grid size, substep count, real substeps, phase span, bias
+     *          amplitude (fixed-bias LUTs) or physics differ from the
+     *          scheduler's, or if the M/H ranges are not symmetric about 0 while
+     *          the mode has samples starting at bias phase pi (process() reads
+     *          those at (-M, -H)); the output would then be silently wrong.
+     */
+    bool validateLUT(const LUTManifest& manifest) noexcept;
+
+    /** validateLUT() with the Manifest struct of a generated LUT header,
+     *  e.g. validateLUT<JAHysteresisLUT_K121::Manifest>().
+     */
+    template <typename Manifest>
+    bool validateLUT() noexcept
+    {
+        LUTManifest manifest;
+        manifest.mSize = Manifest::mSize;
+        manifest.hSize = Manifest::hSize;
+        manifest.mMin = Manifest::mMin;
+        manifest.mMax = Manifest::mMax;
+        manifest.hMin = Manifest::hMin;
+        manifest.hMax = Manifest::hMax;
+        manifest.totalSubsteps = Manifest::totalSubsteps;
+        manifest.realSubsteps = Manifest::realSubsteps;
+        manifest.phaseSpan = Manifest::phaseSpan;
+        manifest.biasLevel = Manifest::biasLevel;
+        manifest.biasScale = Manifest::biasScale;
+        manifest.physics = { Manifest::Ms, Manifest::aDensity, Manifest::kPinning,
+                             Manifest::cReversibility, Manifest::alphaCoupling };
+        return validateLUT(manifest);
+    }
+
+    /** Process one host sample worth of audio field and return averaged magnetisation.
+     *  The LUT is built for samples starting at bias phase 0; samples starting
+     *  nearer pi read its phase-flip mirror -T(-M, -H).
+     */
     double process(double HAudio) noexcept;
 
 private:
@@ -79,8 +334,8 @@ private:
     double sampleRate { 48000.0 };
     Mode currentMode { Mode::K121 };
     PhysicsParams physics {};
-    double biasLevel { 0.41 };  // Fixed for LUT compatibility
-    double biasScale { 11.0 };  // Fixed for LUT compatibility
+    double biasLevel { 0.41 };  // Fixed for 2D LUT compatibility (live with setBiasLUT)
+    double biasScale { 11.0 };  // Fixed for 2D LUT compatibility (live with setBiasLUT)
     LUTConfig lutConfig {};
 
     // --- derived constants -------------------------------------------------
@@ -92,12 +347,28 @@ private:
     double cNorm { 0.0 };
     double biasAmplitude { 0.0 };
 
+    // Third-axis slice selection (derived from biasAmplitude or substepCount)
+    std::size_t sliceOffset { 0 };
+    std::size_t sliceStride { 0 };
+    double sliceFrac { 0.0 };
+
     // Bias oscillator
     double biasCyclesPerSample { 5.5 };
     int totalSubsteps { 121 };
     double biasPhase { 0.0 };
     double substepPhase { 0.0 };
     double invTotalSubsteps { 1.0 / 121.0 };
+    double substepCount { 121.0 };  // totalSubsteps unless a substep-axis LUT is set
+    double invSubstepCount { 1.0 / 121.0 };
+    int realSubsteps { 1 };         // substeps 0..realSubsteps-1 run before the lookup
+
+    // Bias phase table (setBiasPhaseTable): sin() of each phase state
+    const double* biasPhaseStart { nullptr };
+    const double* biasRealTable { nullptr };
+    const double* biasLastTable { nullptr };
+    int biasPhaseStates { 1 };
+    int biasTableSubsteps { 0 };
+    int phaseState { 0 };
 
     // JA state
     double MPrev { 0.0 };
@@ -106,11 +377,54 @@ private:
     // --- helpers -----------------------------------------------------------
     void updateDerived() noexcept;
     void updateModeDerived() noexcept;
+    /** True if the installed table can carry a bias or substep slice axis */
+    bool sliceAxisSupported() const noexcept;
+    void updateSlice() noexcept;
     double fastTanh(double x) const noexcept;
 
-    /** Execute substep 0 and return M1 */
-    double executeSubstep0(double biasOffset, double HAudio) noexcept;
+    /** Normalised grid coordinate in [0, 1] of x on a (possibly warped) axis */
+    static double axisCoordinate(double x, double lo, double hi,
+                                 const double* warp, int warpSegments) noexcept;
+
+    /** Execute one real substep from (MIn, HIn) to the field HNew and return the new M */
+    double executeSubstep(double MIn, double HIn, double HNew) const noexcept;
+
+    /** Cell indices and fractions of (m, h), computed once per lookup */
+    struct GridCell
+    {
+        int mIdx = 0;
+        int hIdx = 0;
+        double mFrac = 0.0;
+        double hFrac = 0.0;
+    };
+
+    GridCell gridCell(double m, double h) const noexcept;
+
+    /** Bilinear interpolation of two tables with shared weights */
+    template <typename T>
+    void bilinearPair(const T* lutA, const T* lutB, const GridCell& cell,
+                      double& a, double& b) const noexcept;
+
+    /** Bicubic coefficient lookup of two tables: one 16-value block each, Horner in h then m */
+    template <typename T>
+    void bicubicPair(const T* coeffsA, const T* coeffsB, const GridCell& cell,
+                     double& a, double& b) const noexcept;
+
+    /** Bicubic Hermite lookup of two tables: 4 values at each cell corner */
+    template <typename T>
+    void hermitePair(const T* lutA, const T* lutB, const GridCell& cell,
+                     double& a, double& b) const noexcept;
+
+    /** Truncated-SVD lookup of two tables: per rank term, M and H factors lerped and multiplied */
+    template <typename T>
+    void svdPair(const T* factorsA, const T* factorsB, const GridCell& cell,
+                 double& a, double& b) const noexcept;
+
+    /** Fused lookup of both tables, blended between the two bias or substep slices around the current value */
+    template <typename T>
+    void lookupPair(const T* lutA, const T* lutB, double m, double h,
+                    double& a, double& b) const noexcept;
 
-    /** Bilinear interpolation lookup */
-    double bilinearLookup(const double* lut, double m, double h) const noexcept;
+    /** M_end and sumM_rest at (m, h) in the configured table storage */
+    void lookupRemainder(double m, double h, double& mEnd, double& sumMRest) const noexcept;
 };
@@ -38,8 +38,23 @@ public:
             JAHysteresisLUT_K121::H_SIZE
         );
 
+        // Tables built with --real-substeps R expect R real substeps first
+        scheduler.setRealSubsteps(JAHysteresisLUT_K121::Manifest::realSubsteps);
+
+        // Bias of each phase state, so process() needs no sin() per sample
+        scheduler.setBiasPhaseTable(
+            JAHysteresisLUT_K121::BIAS_PHASE_START.data(),
+            JAHysteresisLUT_K121::BIAS_REAL.data(),
+            JAHysteresisLUT_K121::BIAS_LAST.data(),
+            JAHysteresisLUT_K121::BIAS_PHASE_STATES,
+            JAHysteresisLUT_K121::BIAS_REAL_SUBSTEPS
+        );
+
         // Note: LUTs are precomputed for bias_level=0.41, bias_scale=11.0
-        // These values are fixed and changing them will cause incorrect results
+        // These values are fixed and changing them will cause incorrect results.
+        // The header's Manifest records them (with the grid ranges, substeps and
+        // physics); validateLUT() checks them once and adopts the grid ranges.
+        lutValid = scheduler.validateLUT<JAHysteresisLUT_K121::Manifest>();
     }
 
     void processBlock(float* buffer, int numSamples)
@@ -101,12 +116,18 @@ public:
                 );
                 break;
         }
+
+        // False for the K121 fallback on any other mode: its substep count differs
+        lutValid = scheduler.validateLUT<JAHysteresisLUT_K121::Manifest>();
     }
 
+    bool isLUTValid() const { return lutValid; }
+
 private:
     JAHysteresisSchedulerLUT scheduler;
     double driveGain = 1.0;
     double outputGain = 1.0;
+    bool lutValid = false;
 };
 
 /**
@@ -15,6 +15,56 @@ constexpr double M_MAX = 1.000000;
 constexpr double H_MIN = -1.000000;
 constexpr double H_MAX = 1.000000;
 
+// M axis warp: normalised M -> grid coordinate, M_WARP_SEGMENTS linear segments (1 = uniform)
+constexpr int M_WARP_SEGMENTS = 1;
+constexpr std::array<double, 2> M_WARP = {
+    0.0000000000e+00,    1.0000000000e+00
+};
+
+// H axis warp: normalised H -> grid coordinate, H_WARP_SEGMENTS linear segments (1 = uniform)
+constexpr int H_WARP_SEGMENTS = 1;
+constexpr std::array<double, 2> H_WARP = {
+    0.0000000000e+00,    1.0000000000e+00
+};
+
+// Generator settings (JSON manifest JAHysteresisLUT_K121.json), checked once at load time by
+// JAHysteresisSchedulerLUT::validateLUT<Manifest>()
+struct Manifest
+{
+    static constexpr int mSize = 65;
+    static constexpr int hSize = 129;
+    static constexpr double mMin = -1.0;
+    static constexpr double mMax = 1.0;
+    static constexpr double hMin = -1.0;
+    static constexpr double hMax = 1.0;
+    static constexpr int totalSubsteps = 121;
+    static constexpr int realSubsteps = 1;
+    static constexpr double phaseSpan = 34.55751918948772;
+    static constexpr double biasLevel = 0.41;
+    static constexpr double biasScale = 11.0;
+    static constexpr double Ms = 320.0;
+    static constexpr double aDensity = 720.0;
+    static constexpr double kPinning = 280.0;
+    static constexpr double cReversibility = 0.18;
+    static constexpr double alphaCoupling = 0.015;
+    static constexpr const char* tableHash = "60ad4161cb67bb23";
+};
+
+// Bias phase states, for JAHysteresisSchedulerLUT::setBiasPhaseTable(): the bias starts
+// sample k at BIAS_PHASE_START[k % BIAS_PHASE_STATES]; BIAS_REAL holds sin() at the real
+// substeps of each state (state-major), BIAS_LAST at substep N-1
+constexpr int BIAS_PHASE_STATES = 2;
+constexpr int BIAS_REAL_SUBSTEPS = 1;
+constexpr std::array<double, 2> BIAS_PHASE_START = {
+    0,    3.1415926535897931
+};
+constexpr std::array<double, 2> BIAS_REAL = {
+    0.14231483827328514,    -0.14231483827328492
+};
+constexpr std::array<double, 2> BIAS_LAST = {
+    0.14231483827328376,    -0.14231483827328739
+};
+
 constexpr std::array<double, 8385> LUT_M_END = {
     -4.1287760252e-01,    -4.0629811508e-01,    -3.9967806904e-01,    -3.9301805062e-01,
     -3.8631866148e-01,    -3.7958051851e-01,    -3.7280425359e-01,    -3.6599051333e-01,
@@ -0,0 +1,145 @@
+// Substep-Axis LUT Test
+// Same tape channel as test_var_subst_lut.dsp, but the K120/K121/K122
+// tables are replaced by one LUT with a continuous substep-count axis
+// (generate_ja_lut.py --mode K121 --substep-axis -1 1 --m-size 5 --h-size 9).
+// The committed library is that 5x9 grid, enough to check the wiring and
+// compile; regenerate it at the default 65x129 to listen.
+//
+// For K121 mode (5.5 cycles per sample):
+// - Fractional part = 0.5
+// - The cursor maps to a substep count n in [120, 122] and a single
+//   lookup blends the two neighbouring integer slices
+// - dphi follows n, matching the C++ scheduler's setSubstepCount()
+
+import("stdfaust.lib");
+import("ja_lut_k121_substeps.lib");  // n = 120..122 substeps over 11π
+
+//==============================================================================
+// tape_channel: Main processing function with substep-axis LUT
+//==============================================================================
+tape_channel(input_gain_db, output_gain_db, drive_db, mix_val) =
+  ef.dryWetMixer(mix_val, wet_gained)
+with {
+  // ===== Gains from function parameters =====
+  input_gain  = ba.db2linear(input_gain_db) : si.smoo;
+  output_gain = ba.db2linear(output_gain_db) : si.smoo;
+  drive_gain  = ba.db2linear(drive_db) : si.smoo;
+  drive_comp  = 1.0 / drive_gain;
+
+  // ===== Physics parameters (fixed for prototype) =====
+  Ms              = 320.0;
+  a_density       = 720.0;
+  k_pinning       = 280.0;
+  c_reversibility = 0.18;
+  alpha_coupling  = 0.015;
+
+  // ===== Derived constants =====
+  Ms_safe    = ba.if(Ms > 1e-6, Ms, 1e-6);
+  alpha_norm = alpha_coupling;
+  a_norm     = a_density / Ms_safe;
+  k_norm     = k_pinning / Ms_safe;
+  c_norm     = c_reversibility;
+  bias_amp   = 0.41 * 11.0;
+
+  // ===== Substep-count axis range =====
+  sigma      = 1e-6;
+  n_min      = ja_lut_k121_substeps_n_min;
+  n_max      = ja_lut_k121_substeps_n_max;
+  inv_a_norm = 1.0 / a_norm;
+
+  // ===== Real tanh =====
+  fast_tanh(x) = ma.tanh(x);
+
+  // ===== Substep 0 (computed in real-time) =====
+  ja_substep0(bias_val, M_prev, H_prev, H_audio) = M1, H1
+  with {
+    H1 = H_audio + bias_amp * bias_val;
+    dH = H1 - H_prev;
+    He = H1 + alpha_norm * M_prev;
+
+    x_man   = He * inv_a_norm;
+    Man_e   = fast_tanh(x_man);
+    Man_e2  = Man_e * Man_e;
+    dMan_dH = (1.0 - Man_e2) * inv_a_norm;
+
+    dir      = ba.if(dH >= 0.0, 1.0, -1.0);
+    pin      = dir * k_norm - alpha_norm * (Man_e - M_prev);
+    inv_pin  = 1.0 / (pin + sigma);
+
+    denom     = 1.0 - c_norm * alpha_norm * dMan_dH;
+    inv_denom = 1.0 / (denom + 1e-9);
+    dMdH      = (c_norm * dMan_dH + (Man_e - M_prev) * inv_pin) * inv_denom;
+    dM_step   = dMdH * dH;
+
+    M_unclamped = M_prev + dM_step;
+    M1          = max(-1.0, min(1.0, M_unclamped));
+  };
+
+  // ===== Substep-Axis LUT Loop =====
+  // cursor 0.0 -> n = 120, 0.5 -> n = 121, 1.0 -> n = 122
+  // One lookup per output blends the two bracketing slices linearly
+  ja_loop_variable(M_prev, H_prev, H_audio, cursor) = M_end, H_end, Mavg
+  with {
+    n    = n_min + cursor * (n_max - n_min);
+    dphi = 11.0 * ma.PI / n;
+
+    // Compute substep 0 at the first substep midpoint for this count
+    M1_H1 = ja_substep0(sin(0.5 * dphi), M_prev, H_prev, H_audio);
+    M1 = ba.selector(0, 2, M1_H1);
+
+    M_end     = ja_lookup_m_end_k121_substeps(n, M1, H_audio);
+    sumM_rest = ja_lookup_sum_m_rest_k121_substeps(n, M1, H_audio);
+
+    // Compute average magnetization
+    Mavg = (M1 + sumM_rest) / n;
+
+    // H_end uses last bias value
+    H_end = H_audio + bias_amp * sin((n - 0.5) * dphi);
+  };
+
+  // ===== Streaming JA hysteresis with fractional cursor =====
+  // Cursor accumulates fractional part (0.5 for K121 = 5.5 cycles)
+  // Wraps at 1.0, sweeping the full substep axis
+  ja_hysteresis(H_in) = (loop ~ (mem, mem, mem)) : ba.selector(2, 4)
+  with {
+    frac_increment = 0.5;  // 5.5 cycles → 0.5 fractional part
+
+    loop(recM, recH, recCursor) = M_end, H_end, Mavg, nextCursor
+    with {
+      // Accumulate cursor, wrap at 1.0
+      nextCursor = ma.frac(recCursor + frac_increment);
+
+      // Run the substep-axis LUT loop with current cursor
+      result = ja_loop_variable(recM, recH, H_in, recCursor);
+      M_end = ba.selector(0, 3, result);
+      H_end = ba.selector(1, 3, result);
+      Mavg = ba.selector(2, 3, result);
+    };
+  };
+
+  // ===== Tape stage =====
+  dc_blocker = fi.SVFTPT.HP2(10.0, 0.7071);
+
+  tape_stage(x) =
+    x * input_gain
+    : *(drive_gain)
+    : ja_hysteresis
+    : dc_blocker
+    : *(drive_comp);
+
+  wet_gained = tape_stage : *(output_gain);
+};
+
+//==============================================================================
+// tape_channel_ui: UI wrapper with sliders
+//==============================================================================
+tape_channel_ui =
+  tape_channel(input_gain_db, output_gain_db, drive_db, mix)
+with {
+  input_gain_db  = hslider("Input Gain [dB]", 0.0, -24.0, 24.0, 0.1);
+  output_gain_db = hslider("Output Gain [dB]", 15.9, -24.0, 48.0, 0.1);
+  drive_db       = hslider("Drive [dB]", 0.0, -18.0, 18.0, 0.1);
+  mix            = hslider("Mix [Dry->Wet]", 1.0, 0.0, 1.0, 0.01);
+};
+
+process = par(i, 2, tape_channel_ui);
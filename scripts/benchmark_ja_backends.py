@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Parity and timing check of the JA substep simulation backends
+
+For each mode, compares every available backend of
+compute_remainder_response_grid() against the scalar ja_substep() reference
+(compute_remainder_response) at random (M1, H_audio) points, then times a
+full LUT grid per backend.
+
+  numpy         lockstep NumPy arrays (default without numba)
+  numba         compiled parallel kernel (compile time reported separately)
+  kernel-python the same kernel uncompiled; run when numba is missing so the
+                kernel logic is still checked (parity only, not timed)
+
+Usage:
+    python benchmark_ja_backends.py [--modes K121,K2101] [--m-size 65] [--h-size 129]
+    python benchmark_ja_backends.py --points 512 --tolerance 1e-12 --output backends.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from generate_ja_lut import (
+    PhysicsParams,
+    axis_grid,
+    compute_remainder_response,
+    compute_remainder_response_grid,
+    generate_bias_lut,
+    numba,
+    resolve_jobs,
+)
+from ja_lut_modes import MODES
+import generate_ja_lut
+
+
+def run_backend(name: str, M1, H_audio, bias_lut, bias_amplitude, physics):
+    """(M_end, sumM_rest) from one backend"""
+    if name == 'kernel-python':
+        # Force the uncompiled kernel even if numba is installed
+        jit = generate_ja_lut._remainder_response_jit
+        generate_ja_lut._remainder_response_jit = None
+        try:
+            return generate_ja_lut.compute_remainder_response_compiled(M1, H_audio, bias_lut,
+                                                                       bias_amplitude, physics)
+        finally:
+            generate_ja_lut._remainder_response_jit = jit
+    return compute_remainder_response_grid(M1, H_audio, bias_lut, bias_amplitude, physics, backend=name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check parity and speed of the JA simulation backends')
+    parser.add_argument('--modes', type=str, default='K121,K2101',
+                        help='Comma-separated modes (default: K121,K2101)')
+    parser.add_argument('--m-size', type=int, default=65,
+                        help='M grid size of the timed build (default: 65)')
+    parser.add_argument('--h-size', type=int, default=129,
+                        help='H grid size of the timed build (default: 129)')
+    parser.add_argument('--points', type=int, default=256,
+                        help='Random points checked against the scalar reference (default: 256)')
+    parser.add_argument('--repeats', type=int, default=3,
+                        help='Timed builds per backend, best is reported (default: 3)')
+    parser.add_argument('--tolerance', type=float, default=1e-9,
+                        help='Max allowed |backend - scalar| (default: 1e-9)')
+    parser.add_argument('--bias-level', type=float, default=0.41,
+                        help='Bias level (default: 0.41)')
+    parser.add_argument('--bias-scale', type=float, default=11.0,
+                        help='Bias scale (default: 11.0)')
+    parser.add_argument('--output', type=Path,
+                        help='Optional JSON result file')
+
+    args = parser.parse_args()
+
+    mode_names = [m.strip() for m in args.modes.split(',') if m.strip()]
+    unknown = [m for m in mode_names if m not in MODES]
+    if unknown:
+        parser.error(f"unknown mode(s): {', '.join(unknown)} (choose from {', '.join(MODES)})")
+
+    physics = PhysicsParams()
+    bias_amplitude = args.bias_level * args.bias_scale
+    backends = ['numpy', 'numba'] if numba is not None else ['numpy', 'kernel-python']
+
+    rng = np.random.default_rng(0)
+    m_check = rng.uniform(-1.0, 1.0, args.points)
+    h_check = rng.uniform(-1.0, 1.0, args.points)
+    m_grid = axis_grid(-1.0, 1.0, args.m_size)[:, np.newaxis]
+    h_grid = axis_grid(-1.0, 1.0, args.h_size)[np.newaxis, :]
+
+    print(f"\n=== JA Substep Backend Check ===")
+    print(f"Numba: {numba.__version__ if numba is not None else 'not installed'}")
+    print(f"Backends: {', '.join(backends)}")
+    print(f"Parity: {args.points} points vs scalar ja_substep(), tolerance {args.tolerance:.0e}")
+    print(f"Timing: {args.m_size}x{args.h_size} grid, best of {args.repeats}")
+
+    if numba is not None:
+        start = time.perf_counter()
+        run_backend('numba', m_check[:2], h_check[:2], generate_bias_lut(np.pi, 3), bias_amplitude, physics)
+        print(f"Numba compile (or cache load): {time.perf_counter() - start:.2f} s")
+
+    results = []
+    failed = False
+    for job in resolve_jobs(mode_names, variants=False):
+        bias_lut = generate_bias_lut(job.phase_span, job.total_substeps)
+        print(f"\n--- {job.name} ({job.total_substeps} substeps) ---")
+
+        start = time.perf_counter()
+        reference = np.array([compute_remainder_response(m, h, bias_lut, bias_amplitude, physics)
+                              for m, h in zip(m_check, h_check)]).T
+        print(f"  scalar reference: {args.points} points in {time.perf_counter() - start:.2f} s")
+
+        timings = {}
+        for backend in backends:
+            M_end, sumM_rest = run_backend(backend, m_check, h_check, bias_lut, bias_amplitude, physics)
+            err_M_end = float(np.max(np.abs(M_end - reference[0])))
+            err_sum = float(np.max(np.abs(sumM_rest - reference[1])))
+            ok = max(err_M_end, err_sum) <= args.tolerance
+            failed |= not ok
+
+            entry = {'mode': job.name, 'total_substeps': job.total_substeps, 'backend': backend,
+                     'max_err_M_end': err_M_end, 'max_err_sumM_rest': err_sum, 'parity_ok': ok}
+            line = f"  {backend:<13} parity M_end {err_M_end:.1e}  sumM_rest {err_sum:.1e}  {'OK' if ok else 'FAIL'}"
+
+            if backend != 'kernel-python':
+                best = float('inf')
+                for _ in range(args.repeats):
+                    start = time.perf_counter()
+                    run_backend(backend, m_grid, h_grid, bias_lut, bias_amplitude, physics)
+                    best = min(best, time.perf_counter() - start)
+                timings[backend] = best
+                entry['grid_seconds'] = best
+                line += f"  grid {best * 1000:9.1f} ms"
+                if backend != 'numpy':
+                    line += f" ({timings['numpy'] / best:.1f}x vs numpy)"
+            results.append(entry)
+            print(line)
+
+    if args.output:
+        args.output.write_text(json.dumps({
+            'numba': numba.__version__ if numba is not None else None,
+            'numpy': np.__version__,
+            'grid': [args.m_size, args.h_size],
+            'points': args.points,
+            'tolerance': args.tolerance,
+            'results': results,
+        }, indent=2) + "\n")
+        print(f"\nWrote {args.output}")
+
+    if failed:
+        print("\nParity FAILED")
+        sys.exit(1)
+    print("\nAll backends match the scalar reference")
+
+
+if __name__ == '__main__':
+    main()
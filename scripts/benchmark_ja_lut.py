@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Benchmark JA Hysteresis LUT accuracy and cost against full substep physics
+
+For every mode, grid size and interpolation scheme this measures:
+  * Static lookup error of M_end / sumM_rest at random and off-grid
+    (cell centre) (M1, H_audio) points against compute_remainder_response
+  * Feedback drift: long sample sequences where the looked-up M_end feeds the
+    next sample, compared with the all-substeps-real reference chain
+    (--real-substeps 1,2,3,4 repeats everything with R real substeps before
+    the lookup; the C++ cost per R is timed by JAHysteresisLUTBenchmark.cpp)
+  * Cost: table memory, build time and lookup throughput (NumPy)
+
+The bicubic scheme is the Catmull-Rom interpolant evaluated from per-cell
+coefficient tables (--lookup bicubic); its errors should match catmull-rom
+to rounding while table_bytes shows the 16x memory it trades for one fetch.
+The hermite scheme (--lookup hermite) interpolates node values with exact
+forward-mode derivatives, so compare it at grids 4-8x smaller than the
+Catmull-Rom ones; it needs uniform axes and is left out with --warp auto.
+
+Results are written to JSON; --compare fails the run when errors regress
+against an earlier result file.
+
+Usage:
+    python benchmark_ja_lut.py [--modes K28,K121] [--sizes 33x65,65x129]
+    python benchmark_ja_lut.py --schemes catmull-rom,bilinear --warp auto --output bench.json
+    python benchmark_ja_lut.py --compare bench_baseline.json --tolerance 1.1
+    python benchmark_ja_lut.py --schemes catmull-rom,hermite --sizes 17x33,17x65,33x65,65x129
+    python benchmark_ja_lut.py --real-substeps 1,2,3,4 --schemes catmull-rom,bilinear --sizes 65x129
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Tuple
+
+import numpy as np
+
+from generate_ja_lut import (
+    BACKENDS,
+    LOOKUP_SCHEMES,
+    LUTCache,
+    PhysicsParams,
+    build_luts,
+    compute_remainder_response_grid,
+    feedback_test_signals,
+    generate_bias_lut,
+    generator_fingerprint,
+    ja_substep_grid,
+    lut_lookup,
+    remainder_bias_lut,
+    resolve_backend,
+    resolve_jobs,
+    run_lut_chain,
+    select_axis_warp,
+)
+from ja_lut_export import bicubic_coefficients, hermite_node_table
+from ja_lut_modes import MODES
+
+
+class GridSize(NamedTuple):
+    """LUT grid resolution"""
+    m_size: int
+    h_size: int
+
+    def __str__(self) -> str:
+        return f"{self.m_size}x{self.h_size}"
+
+
+def parse_sizes(text: str) -> List[GridSize]:
+    """Parse '33x65,65x129' into grid sizes"""
+    sizes = []
+    for item in text.split(','):
+        m_size, h_size = item.strip().lower().split('x')
+        sizes.append(GridSize(int(m_size), int(h_size)))
+    return sizes
+
+
+def error_stats(approx: np.ndarray, exact: np.ndarray) -> Dict[str, float]:
+    """Max / RMS absolute error, plus max relative to the exact value range"""
+    err = np.abs(approx - exact)
+    return {
+        'max': float(err.max()),
+        'rms': float(np.sqrt(np.mean(err * err))),
+        'max_rel': float(err.max() / max(np.ptp(exact), 1e-12)),
+    }
+
+
+def random_points(n: int, h_range: Tuple[float, float], rng: np.random.Generator
+                  ) -> Tuple[np.ndarray, np.ndarray]:
+    """Uniform random (M1, H_audio) points over the LUT domain"""
+    return rng.uniform(-1.0, 1.0, n), rng.uniform(h_range[0], h_range[1], n)
+
+
+def off_grid_points(m_grid: np.ndarray, h_grid: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Centres of every grid cell: the points farthest from any table node"""
+    m_mid = 0.5 * (m_grid[1:] + m_grid[:-1])
+    h_mid = 0.5 * (h_grid[1:] + h_grid[:-1])
+    m, h = np.meshgrid(m_mid, h_mid, indexing='ij')
+    return m.ravel(), h.ravel()
+
+
+def run_reference_chain(H_in: np.ndarray, bias_lut: np.ndarray, bias_amplitude: float,
+                        physics: PhysicsParams) -> np.ndarray:
+    """
+    Full physics streaming loop: every substep of every sample is real.
+    H_in is (signals, samples); returns Mavg with the same shape.
+    """
+    n = len(bias_lut)
+    M = np.zeros(H_in.shape[0])
+    H = np.zeros(H_in.shape[0])
+    out = np.zeros_like(H_in)
+    for t in range(H_in.shape[1]):
+        H_audio = H_in[:, t]
+        sum_M = np.zeros_like(M)
+        for i in range(n):
+            M, H = ja_substep_grid(M, H, H_audio, bias_lut[i], bias_amplitude, physics)
+            sum_M += M
+        out[:, t] = sum_M / n
+    return out
+
+
+def drift_stats(approx: np.ndarray, exact: np.ndarray, block: int) -> Dict[str, float]:
+    """Output error overall, in the first block and in the last block (accumulated drift)"""
+    stats = error_stats(approx, exact)
+    stats['max_first_block'] = float(np.abs(approx[:, :block] - exact[:, :block]).max())
+    stats['max_last_block'] = float(np.abs(approx[:, -block:] - exact[:, -block:]).max())
+    return stats
+
+
+def time_lookup(table: np.ndarray, m: np.ndarray, h: np.ndarray, h_range, axis_warp,
+                scheme: str, repeats: int = 3) -> float:
+    """Best-of-N NumPy lookup time in ns per point"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        lut_lookup(table, m, h, (-1.0, 1.0), h_range, axis_warp, scheme)
+        best = min(best, time.perf_counter() - start)
+    return best / len(m) * 1e9
+
+
+def benchmark(args) -> dict:
+    physics = PhysicsParams()
+    h_range = tuple(args.h_range)
+    bias_amplitude = args.bias_level * args.bias_scale
+    cache = None if args.no_cache else LUTCache(args.cache_dir, int(args.cache_max_mb * 1024 * 1024))
+    rng = np.random.default_rng(args.seed)
+    m_rand, h_rand = random_points(args.points, h_range, rng)
+    h_peak = max(abs(h_range[0]), abs(h_range[1]))
+    H_feedback = feedback_test_signals(args.feedback_samples, args.sample_rate, args.feedback_amplitudes) * h_peak
+    block = max(1, args.feedback_samples // 10)
+
+    results = []
+    references = {}
+    jobs = [job._replace(real_substeps=real_substeps)
+            for job in resolve_jobs(args.modes, variants=False) for real_substeps in args.real_substeps]
+    for job in jobs:
+        bias_lut = generate_bias_lut(job.phase_span, job.total_substeps)
+        remainder = remainder_bias_lut(job.phase_span, job.total_substeps, job.real_substeps)
+        print(f"\n=== {job.name} ({job.total_substeps} substeps, {job.real_substeps} real) ===")
+
+        exact_rand = compute_remainder_response_grid(m_rand, h_rand, remainder, bias_amplitude, physics,
+                                                     backend=args.backend)
+
+        # The all-substeps-real chain does not depend on the real substep count
+        reference = None
+        if args.feedback_samples:
+            if job.name not in references:
+                start = time.perf_counter()
+                references[job.name] = run_reference_chain(H_feedback, bias_lut, bias_amplitude, physics)
+                print(f"Reference chain: {H_feedback.shape[0]} x {args.feedback_samples} samples "
+                      f"in {time.perf_counter() - start:.2f} s")
+            reference = references[job.name]
+
+        for size in args.sizes:
+            build_args = argparse.Namespace(
+                m_size=size.m_size, h_size=size.h_size, h_range=list(h_range),
+                bias_level=args.bias_level, bias_scale=args.bias_scale,
+                workers=args.workers, engine='vector', backend=args.backend,
+                warp_segments=args.warp_segments
+            )
+            axis_warp = (None, None)
+            if args.warp == 'auto':
+                axis_warp = select_axis_warp([job], physics, build_args, cache)
+
+            # Derivative channels for hermite; channel 0 is the plain value table
+            derivatives = 'hermite' in args.schemes
+            start = time.perf_counter()
+            m_grid, h_grid, lut_M_end, lut_sumM_rest = build_luts([job], physics, build_args, cache,
+                                                                  axis_warp=axis_warp,
+                                                                  derivatives=derivatives)[job.name]
+            build_seconds = time.perf_counter() - start
+            derivative_tables = (lut_M_end, lut_sumM_rest)
+            if derivatives:
+                lut_M_end, lut_sumM_rest = lut_M_end[..., 0], lut_sumM_rest[..., 0]
+
+            m_off, h_off = off_grid_points(m_grid, h_grid)
+            exact_off = compute_remainder_response_grid(m_off, h_off, remainder, bias_amplitude, physics,
+                                                        backend=args.backend)
+
+            for scheme in args.schemes:
+                # bicubic evaluates per-cell coefficients, hermite nodes with derivatives
+                tables = (lut_M_end, lut_sumM_rest)
+                if scheme == 'bicubic':
+                    tables = tuple(bicubic_coefficients(lut) for lut in tables)
+                elif scheme == 'hermite':
+                    tables = tuple(hermite_node_table(lut, m_grid, h_grid) for lut in derivative_tables)
+                entry = {
+                    'mode': job.name,
+                    'total_substeps': job.total_substeps,
+                    'real_substeps': job.real_substeps,
+                    'grid': str(size),
+                    'warp': args.warp,
+                    'scheme': scheme,
+                    'table_bytes': int(tables[0].nbytes + tables[1].nbytes),
+                    'build_seconds': build_seconds,
+                    'lookup_ns_per_point': time_lookup(tables[0], m_rand, h_rand, h_range, axis_warp, scheme),
+                }
+                for label, (m, h, exact) in (('random', (m_rand, h_rand, exact_rand)),
+                                             ('off_grid', (m_off, h_off, exact_off))):
+                    entry[label] = {
+                        table: error_stats(lut_lookup(lut, m, h, (-1.0, 1.0), h_range, axis_warp, scheme), ref)
+                        for table, lut, ref in (('M_end', tables[0], exact[0]),
+                                                ('sumM_rest', tables[1], exact[1]))
+                    }
+
+                if reference is not None:
+                    approx = run_lut_chain(H_feedback, bias_lut, bias_amplitude, physics,
+                                           *tables, h_range, axis_warp, scheme, job.real_substeps)
+                    entry['feedback'] = drift_stats(approx, reference, block)
+
+                results.append(entry)
+                line = (f"  {size!s:>8} {scheme:<12} "
+                        f"M_end max {entry['random']['M_end']['max']:.2e} / off-grid {entry['off_grid']['M_end']['max']:.2e}  "
+                        f"sumM_rest max {entry['random']['sumM_rest']['max']:.2e} / off-grid {entry['off_grid']['sumM_rest']['max']:.2e}")
+                if 'feedback' in entry:
+                    line += (f"  feedback max {entry['feedback']['max']:.2e} "
+                             f"(last block {entry['feedback']['max_last_block']:.2e})")
+                print(line)
+
+    return {
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'generator': generator_fingerprint(),
+        'numpy': np.__version__,
+        'backend': args.backend,
+        'physics': physics._asdict(),
+        'bias_level': args.bias_level,
+        'bias_scale': args.bias_scale,
+        'h_range': list(h_range),
+        'points': args.points,
+        'seed': args.seed,
+        'feedback': {
+            'samples': args.feedback_samples,
+            'sample_rate': args.sample_rate,
+            'amplitudes': args.feedback_amplitudes,
+        },
+        'results': results,
+    }
+
+
+def compare_results(current: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Max errors that grew beyond tolerance x baseline, matched by mode/grid/warp/scheme/real substeps"""
+    def key(entry):
+        return entry['mode'], entry['grid'], entry['warp'], entry['scheme'], f"R{entry.get('real_substeps', 1)}"
+
+    def metrics(entry):
+        for label in ('random', 'off_grid'):
+            for table, stats in entry.get(label, {}).items():
+                yield f"{label}.{table}.max", stats['max']
+        if 'feedback' in entry:
+            yield 'feedback.max', entry['feedback']['max']
+
+    base = {key(e): dict(metrics(e)) for e in baseline.get('results', [])}
+    regressions = []
+    for entry in current['results']:
+        old = base.get(key(entry))
+        if old is None:
+            continue
+        for name, value in metrics(entry):
+            if name in old and value > old[name] * tolerance + 1e-15:
+                regressions.append(f"{'/'.join(key(entry))} {name}: {old[name]:.3e} -> {value:.3e}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark JA Hysteresis LUT accuracy and cost')
+    parser.add_argument('--modes', type=str, default='K28,K121',
+                        help='Comma-separated modes (default: K28,K121)')
+    parser.add_argument('--sizes', type=str, default='17x33,33x65,65x129',
+                        help='Comma-separated MxH grid sizes (default: 17x33,33x65,65x129)')
+    parser.add_argument('--real-substeps', type=str, default='1',
+                        help='Comma-separated counts of real substeps before the lookup, e.g. 1,2,3,4: '
+                             'tables cover substeps R..N-1 and the feedback chain runs R real substeps '
+                             '(default: 1)')
+    parser.add_argument('--schemes', type=str,
+                        help=f"Comma-separated lookup schemes: {', '.join(LOOKUP_SCHEMES)} "
+                             f"(default: all; without hermite under --warp auto)")
+    parser.add_argument('--warp', choices=['none', 'auto'], default='none',
+                        help='Axis spacing of the benchmarked tables (default: none)')
+    parser.add_argument('--warp-segments', type=int, default=16,
+                        help='Piecewise-linear segments per warped axis (default: 16)')
+    parser.add_argument('--points', type=int, default=20000,
+                        help='Random (M1, H_audio) test points (default: 20000)')
+    parser.add_argument('--seed', type=int, default=1,
+                        help='Random seed (default: 1)')
+    parser.add_argument('--feedback-samples', type=int, default=4800,
+                        help='Samples per feedback sequence, 0 to skip (default: 4800)')
+    parser.add_argument('--feedback-amplitudes', type=float, nargs='+', default=[0.1, 0.5, 1.0],
+                        help='Peak input levels of the feedback sequences (default: 0.1 0.5 1.0)')
+    parser.add_argument('--sample-rate', type=float, default=48000.0,
+                        help='Sample rate of the feedback test signal (default: 48000)')
+    parser.add_argument('--h-range', type=float, nargs=2, default=[-1.0, 1.0],
+                        help='H audio range (default: -1.0 1.0)')
+    parser.add_argument('--bias-level', type=float, default=0.41,
+                        help='Bias level (default: 0.41)')
+    parser.add_argument('--bias-scale', type=float, default=11.0,
+                        help='Bias scale (default: 11.0)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Worker processes for table builds (default: 1)')
+    parser.add_argument('--backend', choices=['auto', *BACKENDS], default='auto',
+                        help='Simulation backend for tables and references (default: auto)')
+    parser.add_argument('--cache-dir', type=Path, default=Path(__file__).parent / '.lut_cache',
+                        help='LUT array cache directory (default: scripts/.lut_cache)')
+    parser.add_argument('--cache-max-mb', type=float, default=512.0,
+                        help='Evict least recently used cache entries above this size (default: 512)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Always re-simulate and do not touch the cache')
+    parser.add_argument('--output', type=Path, default=Path('ja_lut_benchmark.json'),
+                        help='JSON result file (default: ja_lut_benchmark.json)')
+    parser.add_argument('--compare', type=Path,
+                        help='Earlier JSON result; exit with status 1 if any max error regressed')
+    parser.add_argument('--tolerance', type=float, default=1.05,
+                        help='Allowed growth factor for --compare (default: 1.05)')
+
+    args = parser.parse_args()
+
+    args.modes = [m.strip() for m in args.modes.split(',') if m.strip()]
+    unknown = [m for m in args.modes if m not in MODES]
+    if unknown:
+        parser.error(f"unknown mode(s): {', '.join(unknown)} (choose from {', '.join(MODES)})")
+    try:
+        args.sizes = parse_sizes(args.sizes)
+    except ValueError:
+        parser.error("--sizes must look like 33x65,65x129")
+    if any(s.m_size < 4 or s.h_size < 4 for s in args.sizes):
+        parser.error("grid sizes must be at least 4x4")
+    try:
+        args.real_substeps = [int(r) for r in args.real_substeps.split(',') if r.strip()]
+    except ValueError:
+        parser.error("--real-substeps must look like 1,2,3,4")
+    fewest = min(MODES[m].total_substeps for m in args.modes)
+    if not args.real_substeps or min(args.real_substeps) < 1 or max(args.real_substeps) >= fewest:
+        parser.error(f"--real-substeps must be between 1 and {fewest - 1} (fewest substeps: {fewest})")
+    try:
+        args.backend = resolve_backend(args.backend)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.schemes is None:
+        args.schemes = [s for s in LOOKUP_SCHEMES if not (s == 'hermite' and args.warp == 'auto')]
+    else:
+        args.schemes = [s.strip() for s in args.schemes.split(',') if s.strip()]
+    unknown = [s for s in args.schemes if s not in LOOKUP_SCHEMES]
+    if unknown:
+        parser.error(f"unknown scheme(s): {', '.join(unknown)} (choose from {', '.join(LOOKUP_SCHEMES)})")
+    if 'hermite' in args.schemes and args.warp == 'auto':
+        parser.error("the hermite scheme needs uniform axes (no --warp auto)")
+
+    print(f"\n=== JA Hysteresis LUT Benchmark ===")
+    print(f"Modes: {', '.join(args.modes)}")
+    print(f"Grids: {', '.join(str(s) for s in args.sizes)} (warp: {args.warp})")
+    print(f"Schemes: {', '.join(args.schemes)}")
+    print(f"Points: {args.points} random + all cell centres")
+    print(f"Feedback: {len(args.feedback_amplitudes)} x {args.feedback_samples} samples")
+
+    report = benchmark(args)
+
+    args.output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"\nWrote {args.output} ({len(report['results'])} results)")
+
+    if args.compare:
+        regressions = compare_results(report, json.loads(args.compare.read_text()), args.tolerance)
+        if regressions:
+            print(f"\n=== {len(regressions)} regression(s) vs {args.compare} ===")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"No regressions vs {args.compare} (tolerance x{args.tolerance})")
+
+
+if __name__ == '__main__':
+    main()
@@ -4,18 +4,95 @@ Generate 2D Lookup Table for JA Hysteresis Optimization
 
 This script precomputes the JA hysteresis response for substeps 1..N-1,
 allowing the audio loop to compute only substep 0 (cross-sample dependency)
-and look up the remainder.
+and look up the remainder. With --real-substeps R the loop computes
+substeps 0..R-1 and the LUT covers R..N-1.
 
 The LUT maps (M_in, HAudio) -> (M_end, sumM_rest)
 
+This script simulates the tables; their C++, FAUST, binary and manifest
+exports live in ja_lut_export.py and the bias modes in ja_lut_modes.py.
+
 Usage:
     python generate_ja_lut.py [--mode K60] [--output-dir ../faust]
+    python generate_ja_lut.py --all-modes --workers 8 [--variants] [--output-dir ../faust]
+    python generate_ja_lut.py --all-modes --formats faust-unified --output-dir ../faust
+    python generate_ja_lut.py --mode K121 --bias-slices 8 [--bias-level-range 0.0 1.0]
+    python generate_ja_lut.py --mode K121 --substep-axis -1 1   # one LUT for a fractional substep cursor
+    python generate_ja_lut.py --all-modes --real-substeps 2 --formats cpp,faust-unified  # 2 real substeps, then lookup
+    python generate_ja_lut.py --mode K121 --m-size 17 --h-size 33 --warp auto
+    python generate_ja_lut.py --mode K121 --refine 1e-3   # coarse-to-fine, only where the error needs it
+    python generate_ja_lut.py --all-modes --backend numba   # compiled kernel (pip install numba)
+    python generate_ja_lut.py --mode K121 --dtype int16     # smaller tables + precision error report
+    python generate_ja_lut.py --mode K121 --lookup bicubic  # per-cell coefficients, one fetch per lookup
+    python generate_ja_lut.py --mode K121 --layout interleaved  # one table, fused M_end/sumM_rest lookup
+    python generate_ja_lut.py --mode K121 --lookup hermite --m-size 17 --h-size 65  # exact derivatives, small grid
+    python generate_ja_lut.py --all-modes --lookup svd [--svd-tol 2.5e-4]  # low-rank factors + compression report
+    python generate_ja_lut.py --mode K121 --symmetry-report  # phase-flip residual of the pi-state mirror
+    python generate_ja_lut.py --mode K2101 --m-size 513 --h-size 1025 --checkpoint-dir ckpt --no-cache  # resumable
+    python generate_ja_lut.py --all-modes --profile ja_lut_profile.json [--cprofile gen.prof]  # per-phase timing report
+    python generate_ja_lut.py --modes-header ../cpp_reference/JAHysteresisLUTModes.h  # C++ mode table from MODES
+    python generate_ja_lut.py --all-modes --workers 8 --sweep tape_formulations.json  # one bank per formulation
+
+Every LUT export also writes a JSON manifest (JAHysteresisLUT_<mode>.json) with
+the settings the runtime must match; the C++ headers embed it as a Manifest
+struct for JAHysteresisSchedulerLUT::validateLUT().
 """
 
 import numpy as np
 import argparse
+import contextlib
+import cProfile
+import hashlib
+import io
+import itertools
+import json
+import os
+import pstats
+import sys
+import time
+import tracemalloc
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Tuple, NamedTuple
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import ja_lut_export
+from ja_lut_export import (
+    FAUST_KERNELS,
+    LOOKUP_ENTRY_SIZES,
+    LUT_DTYPES,
+    LUT_LAYOUTS,
+    LUT_LOOKUPS,
+    SLICE_AXES,
+    SVD_TOL,
+    AxisWarp,
+    export_binary_bank,
+    export_cpp_header,
+    export_cpp_header_slices,
+    export_cpp_modes_header,
+    export_faust_lib,
+    export_faust_lib_slices,
+    export_faust_unified_lib,
+    export_manifest,
+    hermite_node_table,
+    lookup_table,
+    quantize_table,
+    svd_factors,
+    svd_table,
+    write_export,
+)
+import ja_lut_modes
+from ja_lut_modes import MODES, bias_phase_states
+
+try:
+    import numba  # optional: compiled substep kernel for --backend numba
+except ImportError:
+    numba = None
+
+try:
+    import resource  # POSIX only: process max RSS for --profile
+except ImportError:
+    resource = None
 
 
 class PhysicsParams(NamedTuple):
@@ -27,61 +104,6 @@ class PhysicsParams(NamedTuple):
     alpha_coupling: float = 0.015  # Mean field coupling
 
 
-class ModeConfig(NamedTuple):
-    """Bias mode configuration"""
-    name: str
-    cycles_per_sample: float
-    substeps_per_cycle: int
-
-    @property
-    def total_substeps(self) -> int:
-        return int(self.cycles_per_sample * self.substeps_per_cycle)
-
-    @property
-    def phase_span(self) -> float:
-        """Total phase span in radians"""
-        return 2.0 * np.pi * self.cycles_per_sample
-
-    def get_variants(self) -> list:
-        """
-        Returns variants with N-1, N, N+1 substeps.
-        Each variant has the SAME phase span but different substep count.
-        This changes the phase step size (dphi = phase_span / substeps).
-        """
-        base = self.total_substeps
-        return [
-            ModeConfigVariant(f"K{base-1}", self.phase_span, base - 1),
-            ModeConfigVariant(f"K{base}", self.phase_span, base),
-            ModeConfigVariant(f"K{base+1}", self.phase_span, base + 1),
-        ]
-
-
-class ModeConfigVariant(NamedTuple):
-    """Variant mode config with fixed phase span and variable substeps"""
-    name: str
-    phase_span: float
-    total_substeps: int
-
-
-# Mode configurations
-# Pattern: half-integer cycles + odd substeps = rich harmonic content
-# This ensures opposite bias polarity between adjacent samples
-MODES = {
-    # Low-res group (18 steps/cycle) - lofi character
-    'K28': ModeConfig('K28', 1.5, 18),      # 27 substeps (ultra lofi)
-    'K45': ModeConfig('K45', 2.5, 18),      # 45 substeps (lofi)
-    'K63': ModeConfig('K63', 3.5, 18),      # 63 substeps (vintage)
-    # High-res group (22 steps/cycle) - cleaner character
-    'K99': ModeConfig('K99', 4.5, 22),      # 99 substeps (warm)
-    'K121': ModeConfig('K121', 5.5, 22),    # 121 substeps (standard)
-    'K187': ModeConfig('K187', 8.5, 22),    # 187 substeps (high quality)
-    'K253': ModeConfig('K253', 11.5, 22),   # 253 substeps (detailed)
-    'K495': ModeConfig('K495', 22.5, 22),   # 495 substeps (ultra detailed)
-    'K1045': ModeConfig('K1045', 47.5, 22), # 1045 substeps (extreme)
-    'K2101': ModeConfig('K2101', 95.5, 22), # 2101 substeps (beyond physical)
-}
-
-
 def fast_tanh(x: np.ndarray) -> np.ndarray:
     """Real tanh (matching upgraded FAUST implementation)"""
     return np.tanh(x)
@@ -96,6 +118,15 @@ def generate_bias_lut(phase_span: float, total_substeps: int) -> np.ndarray:
     return np.sin((indices + 0.5) * dphi)
 
 
+def remainder_bias_lut(phase_span: float, total_substeps: int, real_substeps: int = 1) -> np.ndarray:
+    """
+    Bias values a LUT integrates when the runtime computes the first
+    real_substeps substeps itself: entry 0 is the bias of the last real
+    substep (it sets H on entry), the rest drive substeps real_substeps..N-1.
+    """
+    return generate_bias_lut(phase_span, total_substeps)[real_substeps - 1:]
+
+
 def ja_substep(
     M_prev: float,
     H_prev: float,
@@ -149,21 +180,23 @@ def compute_remainder_response(
     physics: PhysicsParams
 ) -> Tuple[float, float]:
     """
-    Compute substeps 1..N-1 given the state after substep 0.
+    Compute substeps R..N-1 given the state after the R real substeps
+    (bias_lut from remainder_bias_lut(..., R); R = 1 by default, so
+    substeps 1..N-1 after substep 0).
 
     Returns (M_end, sumM_rest) where:
     - M_end: final magnetization after all substeps
-    - sumM_rest: sum of magnetizations from substeps 1..N-1
+    - sumM_rest: sum of magnetizations from substeps R..N-1
     """
     n = len(bias_lut)
 
-    # Initialize with post-substep-0 state
+    # Initialize with the state after the last real substep
     M = M1
-    H = H_audio + bias_amplitude * bias_lut[0]  # H after substep 0
+    H = H_audio + bias_amplitude * bias_lut[0]  # H after substep R-1
 
     sum_M = 0.0
 
-    # Run substeps 1 to N-1
+    # Run substeps R to N-1
     for i in range(1, n):
         M, H = ja_substep(M, H, H_audio, bias_lut[i], bias_amplitude, physics)
         sum_M += M
@@ -171,6 +204,643 @@ def compute_remainder_response(
     return M, sum_M
 
 
+def ja_substep_grid(
+    M_prev: np.ndarray,
+    H_prev: np.ndarray,
+    H_audio: np.ndarray,
+    bias_offset: float,
+    bias_amplitude: float,
+    physics: PhysicsParams
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Execute one JA substep for a whole array of independent states.
+
+    Element-wise identical to ja_substep() (same operation order), so the
+    vectorized engine matches the scalar reference to float64 round-off.
+    """
+    # Derived constants
+    Ms_safe = max(physics.Ms, 1e-6)
+    alpha_norm = physics.alpha_coupling
+    a_norm = physics.a_density / Ms_safe
+    inv_a_norm = 1.0 / max(a_norm, 1e-9)
+    k_norm = physics.k_pinning / Ms_safe
+    c_norm = physics.c_reversibility
+
+    # JA physics
+    H_new = H_audio + bias_amplitude * bias_offset
+    dH = H_new - H_prev
+    He = H_new + alpha_norm * M_prev
+
+    x_man = He * inv_a_norm
+    Man_e = fast_tanh(x_man)
+    Man_e2 = Man_e * Man_e
+    dMan_dH = (1.0 - Man_e2) * inv_a_norm
+
+    direction = np.where(dH >= 0.0, 1.0, -1.0)
+    pin = direction * k_norm - alpha_norm * (Man_e - M_prev)
+    inv_pin = 1.0 / (pin + 1e-6)
+
+    denom = 1.0 - c_norm * alpha_norm * dMan_dH
+    inv_denom = 1.0 / (denom + 1e-9)
+    dMdH = (c_norm * dMan_dH + (Man_e - M_prev) * inv_pin) * inv_denom
+    dM_step = dMdH * dH
+
+    M_new = np.clip(M_prev + dM_step, -1.0, 1.0)
+
+    return M_new, H_new
+
+
+def compute_remainder_response_grid(
+    M1: np.ndarray,
+    H_audio: np.ndarray,
+    bias_lut: np.ndarray,
+    bias_amplitude: float,
+    physics: PhysicsParams,
+    progress: bool = False,
+    backend: str = 'numpy'
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Lockstep version of compute_remainder_response().
+
+    Advances every (M1, H_audio) pair one substep at a time as arrays, so the
+    Python-level loop runs N-1 times per LUT instead of N-1 times per point.
+    Inputs are broadcast against each other; returns (M_end, sumM_rest).
+
+    backend='numba' runs the compiled per-point kernel instead (see
+    remainder_response_kernel()); progress is not reported there.
+    """
+    n = len(bias_lut)
+    M1, H_audio = np.broadcast_arrays(
+        np.asarray(M1, dtype=np.float64), np.asarray(H_audio, dtype=np.float64)
+    )
+
+    if backend == 'numba':
+        return compute_remainder_response_compiled(M1, H_audio, bias_lut, bias_amplitude, physics)
+    if backend != 'numpy':
+        raise ValueError(f"Unknown backend: {backend}")
+
+    # Initialize with the state after the last real substep
+    M = M1.copy()
+    H = H_audio + bias_amplitude * bias_lut[0]  # H after substep R-1
+
+    sum_M = np.zeros_like(M)
+    report_every = max(1, (n - 1) // 10)
+
+    # Run substeps R to N-1
+    for i in range(1, n):
+        M, H = ja_substep_grid(M, H, H_audio, bias_lut[i], bias_amplitude, physics)
+        sum_M += M
+
+        if progress and i % report_every == 0:
+            print(f"  Progress: substep {i}/{n - 1} ({100 * i / (n - 1):.1f}%)")
+
+    return M, sum_M
+
+
+# Hyper-dual arithmetic on (value, d/dM1, d/dH_audio, d2/dM1 dH_audio) tuples
+def _dual_mul(x, y):
+    return (x[0] * y[0],
+            x[1] * y[0] + x[0] * y[1],
+            x[2] * y[0] + x[0] * y[2],
+            x[3] * y[0] + x[1] * y[2] + x[2] * y[1] + x[0] * y[3])
+
+
+def _dual_reciprocal(x):
+    r = 1.0 / x[0]
+    r2 = r * r
+    return (r, -r2 * x[1], -r2 * x[2], 2.0 * r2 * r * x[1] * x[2] - r2 * x[3])
+
+
+def _dual_tanh(x):
+    t = fast_tanh(x[0])
+    d1 = 1.0 - t * t
+    d2 = -2.0 * t * d1
+    return (t, d1 * x[1], d1 * x[2], d2 * x[1] * x[2] + d1 * x[3])
+
+
+def compute_remainder_sensitivities_grid(
+    M1: np.ndarray,
+    H_audio: np.ndarray,
+    bias_lut: np.ndarray,
+    bias_amplitude: float,
+    physics: PhysicsParams,
+    progress: bool = False
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    compute_remainder_response_grid() with forward-mode sensitivities.
+
+    Every point carries M together with dM/dM1, dM/dH_audio and
+    d2M/dM1 dH_audio through the substep recurrence (hyper-dual numbers),
+    so the partial derivatives are exact to round-off, not finite
+    differences. dH = H_new - H_prev does not depend on either input
+    (H_audio cancels), so the hysteresis direction and dH are constants of
+    each substep; a clipped M has zero derivatives. The value channel uses
+    the same operation order as ja_substep_grid().
+
+    Returns (M_end, sumM_rest), each shaped (..., 4):
+    [value, d/dM1, d/dH_audio, d2/dM1 dH_audio].
+    """
+    n = len(bias_lut)
+    M1, H_audio = np.broadcast_arrays(
+        np.asarray(M1, dtype=np.float64), np.asarray(H_audio, dtype=np.float64)
+    )
+
+    Ms_safe = max(physics.Ms, 1e-6)
+    alpha_norm = physics.alpha_coupling
+    a_norm = physics.a_density / Ms_safe
+    inv_a_norm = 1.0 / max(a_norm, 1e-9)
+    k_norm = physics.k_pinning / Ms_safe
+    c_norm = physics.c_reversibility
+
+    zeros = np.zeros_like(M1)
+    M = (M1.copy(), np.ones_like(M1), zeros, zeros)
+    H = H_audio + bias_amplitude * bias_lut[0]  # H after substep R-1
+
+    sum_M = [zeros.copy() for _ in range(4)]
+    report_every = max(1, (n - 1) // 10)
+
+    for i in range(1, n):
+        H_new = H_audio + bias_amplitude * bias_lut[i]
+        dH = H_new - H
+
+        # He = H_new + alpha * M, with dH_new/dH_audio = 1
+        He = (H_new + alpha_norm * M[0], alpha_norm * M[1], 1.0 + alpha_norm * M[2], alpha_norm * M[3])
+        Man_e = _dual_tanh(tuple(d * inv_a_norm for d in He))
+        Man_e2 = _dual_mul(Man_e, Man_e)
+        dMan_dH = ((1.0 - Man_e2[0]) * inv_a_norm, *(-d * inv_a_norm for d in Man_e2[1:]))
+
+        direction = np.where(dH >= 0.0, 1.0, -1.0)
+        diff = tuple(a - b for a, b in zip(Man_e, M))
+        pin = (direction * k_norm - alpha_norm * diff[0], *(-alpha_norm * d for d in diff[1:]))
+        inv_pin = _dual_reciprocal((pin[0] + 1e-6, *pin[1:]))
+
+        denom = (1.0 - c_norm * alpha_norm * dMan_dH[0], *(-c_norm * alpha_norm * d for d in dMan_dH[1:]))
+        inv_denom = _dual_reciprocal((denom[0] + 1e-9, *denom[1:]))
+        pinned = _dual_mul(diff, inv_pin)
+        dMdH = _dual_mul(tuple(c_norm * a + b for a, b in zip(dMan_dH, pinned)), inv_denom)
+
+        M_new = M[0] + dMdH[0] * dH
+        free = np.abs(M_new) <= 1.0
+        M = (np.clip(M_new, -1.0, 1.0),
+             *(np.where(free, m + d * dH, 0.0) for m, d in zip(M[1:], dMdH[1:])))
+        H = H_new
+        for k in range(4):
+            sum_M[k] += M[k]
+
+        if progress and i % report_every == 0:
+            print(f"  Progress: substep {i}/{n - 1} ({100 * i / (n - 1):.1f}%)")
+
+    return np.stack(M, axis=-1), np.stack(sum_M, axis=-1)
+
+
+BACKENDS = ('numpy', 'numba')
+
+
+def resolve_backend(name: str) -> str:
+    """
+    Map a --backend choice to an available backend: 'auto' picks numba when
+    it is installed. An explicit 'numba' without numba raises ValueError.
+    """
+    if name == 'auto':
+        return 'numba' if numba is not None else 'numpy'
+    if name == 'numba' and numba is None:
+        raise ValueError("--backend numba needs the numba package (pip install numba); "
+                         "use --backend numpy or auto")
+    return name
+
+
+def remainder_response_kernel(
+    M1: np.ndarray,
+    H_audio: np.ndarray,
+    bias_lut: np.ndarray,
+    bias_amplitude: float,
+    alpha_norm: float,
+    inv_a_norm: float,
+    k_norm: float,
+    c_norm: float,
+    M_end: np.ndarray,
+    sum_M_rest: np.ndarray
+):
+    """
+    Substeps R..N-1 for flat arrays of points, one point per (parallel) loop
+    iteration with the whole recurrence kept in registers. Same operation
+    order as ja_substep_grid(); compiled with numba.njit when available.
+    """
+    n = bias_lut.shape[0]
+    for p in _prange(M1.shape[0]):
+        h_audio = H_audio[p]
+        M = M1[p]
+        H = h_audio + bias_amplitude * bias_lut[0]
+        sum_M = 0.0
+        for i in range(1, n):
+            H_new = h_audio + bias_amplitude * bias_lut[i]
+            dH = H_new - H
+            He = H_new + alpha_norm * M
+
+            Man_e = np.tanh(He * inv_a_norm)
+            Man_e2 = Man_e * Man_e
+            dMan_dH = (1.0 - Man_e2) * inv_a_norm
+
+            direction = 1.0 if dH >= 0.0 else -1.0
+            pin = direction * k_norm - alpha_norm * (Man_e - M)
+            inv_pin = 1.0 / (pin + 1e-6)
+
+            denom = 1.0 - c_norm * alpha_norm * dMan_dH
+            inv_denom = 1.0 / (denom + 1e-9)
+            dMdH = (c_norm * dMan_dH + (Man_e - M) * inv_pin) * inv_denom
+
+            M = min(max(M + dMdH * dH, -1.0), 1.0)
+            H = H_new
+            sum_M += M
+        M_end[p] = M
+        sum_M_rest[p] = sum_M
+
+
+_prange = numba.prange if numba is not None else range
+_remainder_response_jit = (numba.njit(parallel=True, cache=True)(remainder_response_kernel)
+                           if numba is not None else None)
+
+
+def compute_remainder_response_compiled(
+    M1: np.ndarray,
+    H_audio: np.ndarray,
+    bias_lut: np.ndarray,
+    bias_amplitude: float,
+    physics: PhysicsParams
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    compute_remainder_response_grid() on the compiled kernel. Without numba
+    the same kernel runs as plain Python (slow; parity checks only).
+    """
+    Ms_safe = max(physics.Ms, 1e-6)
+    a_norm = physics.a_density / Ms_safe
+    shape = np.broadcast_shapes(np.shape(M1), np.shape(H_audio))
+    M1 = np.ascontiguousarray(np.broadcast_to(M1, shape), dtype=np.float64).ravel()
+    H_audio = np.ascontiguousarray(np.broadcast_to(H_audio, shape), dtype=np.float64).ravel()
+    M_end = np.empty_like(M1)
+    sum_M_rest = np.empty_like(M1)
+
+    kernel = _remainder_response_jit if _remainder_response_jit is not None else remainder_response_kernel
+    kernel(M1, H_audio, np.ascontiguousarray(bias_lut, dtype=np.float64), float(bias_amplitude),
+           float(physics.alpha_coupling), 1.0 / max(a_norm, 1e-9),
+           physics.k_pinning / Ms_safe, float(physics.c_reversibility),
+           M_end, sum_M_rest)
+    return M_end.reshape(shape), sum_M_rest.reshape(shape)
+
+
+def axis_grid(lo: float, hi: float, size: int, warp: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Sample points of one LUT axis.
+
+    warp=None is the uniform grid. Otherwise warp holds S+1 increasing knots
+    g_k (g_0=0, g_S=1) of a piecewise-linear map from the normalised value
+    n = (x - lo) / (hi - lo), split into S uniform segments, to the normalised
+    grid coordinate g = index / (size - 1). Grid points are that map inverted,
+    so cells are narrow where the knots rise steeply.
+    """
+    if warp is None:
+        return np.linspace(lo, hi, size)
+    n = np.interp(np.linspace(0.0, 1.0, size), warp, np.linspace(0.0, 1.0, len(warp)))
+    grid = lo + (hi - lo) * n
+    grid[0], grid[-1] = lo, hi
+    return grid
+
+
+def axis_position(x: np.ndarray, lo: float, hi: float, size: int,
+                  warp: Optional[np.ndarray] = None) -> np.ndarray:
+    """Inverse of axis_grid(): fractional grid index of x, clamped to the axis"""
+    n = np.clip((np.asarray(x, dtype=np.float64) - lo) / (hi - lo), 0.0, 1.0)
+    if warp is not None:
+        segments = len(warp) - 1
+        s = n * segments
+        i = np.minimum(np.floor(s).astype(int), segments - 1)
+        n = warp[i] + (warp[i + 1] - warp[i]) * (s - i)
+    return n * (size - 1)
+
+
+def axis_curvature(table: np.ndarray, grid: np.ndarray, axis: int) -> np.ndarray:
+    """
+    |second derivative| of a table along one axis at the interior grid points,
+    relative to the table's value range and maximised over the other axis.
+    """
+    d1 = np.diff(table, axis=axis) / np.expand_dims(np.diff(grid), 1 - axis)
+    spacing = 0.5 * (grid[2:] - grid[:-2])
+    d2 = np.diff(d1, axis=axis) / np.expand_dims(spacing, 1 - axis)
+    scale = max(float(np.ptp(table)), 1e-12)
+    return np.abs(d2).max(axis=1 - axis) / scale
+
+
+def warp_from_curvature(curvature: np.ndarray, probe_grid: np.ndarray, segments: int = 16,
+                        max_density_ratio: float = 8.0, edge_boost: float = 0.0,
+                        edge_width: float = 0.1) -> Optional[np.ndarray]:
+    """
+    Warp knots whose point density follows a curvature profile measured on
+    probe_grid (interior points).
+
+    Cell error scales with width^2 * |f''|, so equal error per cell needs
+    point density ~ sqrt(|f''|). The density is floored at 1/max_density_ratio
+    of its peak to keep flat regions covered. The outermost cells use a
+    clamped stencil whose error is only first order, so edge_boost adds
+    density decaying over edge_width (fraction of the axis) from both ends.
+    The density is integrated and sampled at the segment boundaries.
+    Returns None (uniform) when there is nothing to adapt to.
+    """
+    n = (probe_grid - probe_grid[0]) / (probe_grid[-1] - probe_grid[0])
+
+    # Widen peaks by one probe point: the estimate is sampled, not exact
+    density = np.sqrt(curvature)
+    density = np.maximum(density, np.maximum(np.roll(density, 1), np.roll(density, -1)))
+    if density.max() > 0.0:
+        density = np.maximum(density / density.max(), 1.0 / max_density_ratio)
+    elif edge_boost > 0.0:
+        density = np.ones_like(density)
+    else:
+        return None
+    density = np.concatenate(([density[0]], density, [density[-1]]))
+    density = density * (1.0 + edge_boost * np.exp(-np.minimum(n, 1.0 - n) / edge_width))
+
+    cumulative = np.concatenate(([0.0], np.cumsum(0.5 * (density[1:] + density[:-1]) * np.diff(n))))
+    knots = np.interp(np.linspace(0.0, 1.0, segments + 1), n, cumulative / cumulative[-1])
+    knots[0], knots[-1] = 0.0, 1.0
+    return knots
+
+
+def warp_from_lattice(positions: np.ndarray, lattice: int) -> Optional[np.ndarray]:
+    """
+    Warp knots that reproduce an axis whose points sit at integer positions
+    0..lattice of a uniform lattice (see refine_luts()).
+
+    Every point is a multiple of the smallest spacing, so one segment per
+    smallest interval represents the axis exactly. Returns None (uniform)
+    when all spacings are equal.
+    """
+    spacing = np.diff(positions)
+    step = int(spacing.min())
+    if np.all(spacing == step):
+        return None
+    segments = lattice // step
+    knots = np.interp(np.arange(segments + 1) * step, positions, np.arange(len(positions)))
+    return knots / (len(positions) - 1)
+
+
+def catmull_rom(p0, p1, p2, p3, t):
+    """1D Catmull-Rom interpolation (same polynomial as the exported lookups)"""
+    return 0.5 * (2.0 * p1 + (-p0 + p2) * t
+                  + (2.0 * p0 - 5.0 * p1 + 4.0 * p2 - p3) * t * t
+                  + (-p0 + 3.0 * p1 - 3.0 * p2 + p3) * t * t * t)
+
+
+def hermite(p0, d0, p1, d1, t):
+    """1D cubic Hermite interpolation from end values and slopes (t in [0, 1])"""
+    t2 = t * t
+    t3 = t2 * t
+    return ((2.0 * t3 - 3.0 * t2 + 1.0) * p0 + (t3 - 2.0 * t2 + t) * d0
+            + (3.0 * t2 - 2.0 * t3) * p1 + (t3 - t2) * d1)
+
+
+LOOKUP_SCHEMES = ('catmull-rom', 'bilinear', 'bicubic', 'hermite')
+
+
+def lut_lookup(table: np.ndarray, m: np.ndarray, h: np.ndarray,
+               m_range: Tuple[float, float] = (-1.0, 1.0),
+               h_range: Tuple[float, float] = (-1.0, 1.0),
+               axis_warp: AxisWarp = (None, None),
+               scheme: str = 'catmull-rom') -> np.ndarray:
+    """
+    Interpolated lookup of a 2D table, mirroring the runtime lookups
+    (clamped inputs, warped axes):
+
+    scheme='catmull-rom': separable 4x4 Catmull-Rom with clamped stencil,
+    as written by export_faust_lib().
+    scheme='bilinear': the bilinear JAHysteresisSchedulerLUT lookup.
+    scheme='bicubic': the Catmull-Rom polynomial evaluated from the
+    per-cell coefficients of ja_lut_export.bicubic_coefficients(),
+    passed as table.
+    scheme='hermite': bicubic Hermite patch from the four corner nodes of
+    a hermite_node_table(), passed as table.
+    """
+    if scheme == 'hermite':
+        m_size, h_size, _ = table.shape
+        m_pos = axis_position(m, m_range[0], m_range[1], m_size, axis_warp[0])
+        h_pos = axis_position(h, h_range[0], h_range[1], h_size, axis_warp[1])
+        m_idx = np.minimum(np.floor(m_pos).astype(int), m_size - 2)
+        h_idx = np.minimum(np.floor(h_pos).astype(int), h_size - 2)
+        m_frac = m_pos - m_idx
+        h_frac = h_pos - h_idx
+        # Along H for the value and the M slope of both rows, then along M
+        rows = [[hermite(table[m_idx + r, h_idx, k], table[m_idx + r, h_idx, k + 2],
+                         table[m_idx + r, h_idx + 1, k], table[m_idx + r, h_idx + 1, k + 2], h_frac)
+                 for k in (0, 1)] for r in (0, 1)]
+        return hermite(rows[0][0], rows[0][1], rows[1][0], rows[1][1], m_frac)
+
+    if scheme == 'bicubic':
+        m_cells, h_cells, _ = table.shape
+        m_pos = axis_position(m, m_range[0], m_range[1], m_cells + 1, axis_warp[0])
+        h_pos = axis_position(h, h_range[0], h_range[1], h_cells + 1, axis_warp[1])
+        m_idx = np.minimum(np.floor(m_pos).astype(int), m_cells - 1)
+        h_idx = np.minimum(np.floor(h_pos).astype(int), h_cells - 1)
+        m_frac = m_pos - m_idx
+        h_frac = h_pos - h_idx
+        c = table[m_idx, h_idx]
+        along_h = [((c[..., 4 * i + 3] * h_frac + c[..., 4 * i + 2]) * h_frac + c[..., 4 * i + 1]) * h_frac
+                   + c[..., 4 * i] for i in range(4)]
+        return ((along_h[3] * m_frac + along_h[2]) * m_frac + along_h[1]) * m_frac + along_h[0]
+
+    m_size, h_size = table.shape
+    m_pos = axis_position(m, m_range[0], m_range[1], m_size, axis_warp[0])
+    h_pos = axis_position(h, h_range[0], h_range[1], h_size, axis_warp[1])
+
+    if scheme == 'bilinear':
+        m_idx = np.minimum(np.floor(m_pos).astype(int), m_size - 2)
+        h_idx = np.minimum(np.floor(h_pos).astype(int), h_size - 2)
+        m_frac = m_pos - m_idx
+        h_frac = h_pos - h_idx
+        return (table[m_idx, h_idx] * (1.0 - m_frac) * (1.0 - h_frac)
+                + table[m_idx, h_idx + 1] * (1.0 - m_frac) * h_frac
+                + table[m_idx + 1, h_idx] * m_frac * (1.0 - h_frac)
+                + table[m_idx + 1, h_idx + 1] * m_frac * h_frac)
+    if scheme != 'catmull-rom':
+        raise ValueError(f"Unknown lookup scheme: {scheme}")
+
+    m_idx = np.floor(m_pos).astype(int)
+    h_idx = np.floor(h_pos).astype(int)
+    m_frac = m_pos - m_idx
+    h_frac = h_pos - h_idx
+
+    rows = [np.clip(m_idx + k, 0, m_size - 1) for k in (-1, 0, 1, 2)]
+    cols = [np.clip(h_idx + k, 0, h_size - 1) for k in (-1, 0, 1, 2)]
+    along_h = [catmull_rom(*(table[r, c] for c in cols), h_frac) for r in rows]
+    return catmull_rom(*along_h, m_frac)
+
+
+def export_lookup_schemes(formats: Tuple[str, ...], lookup: str = 'stencil',
+                          faust_kernel: str = 'bilinear') -> Tuple[str, ...]:
+    """
+    lut_lookup() schemes of the runtime lookups that read an export: the
+    bilinear JAHysteresisSchedulerLUT (cpp, binary) and the FAUST lookup
+    (faust, faust-unified: faust_kernel on node tables, Catmull-Rom on SVD
+    factors). Bicubic coefficients hold the Catmull-Rom polynomial and
+    Hermite tables their own patch in every runtime.
+    """
+    if lookup == 'bicubic':
+        return ('catmull-rom',)
+    if lookup == 'hermite':
+        return ('hermite',)
+    schemes = []
+    if any(f in ('cpp', 'binary') for f in formats):
+        schemes.append('bilinear')
+    if any(f in ('faust', 'faust-unified') for f in formats):
+        schemes.append('catmull-rom' if lookup == 'svd' else faust_kernel)
+    return tuple(dict.fromkeys(schemes)) or ('bilinear',)
+
+
+# Largest phase-flip residual the pi-state mirror accepts: float64 builds
+# reach about 1e-6 of the table range (the pinning denominator's epsilon)
+SYMMETRY_TOL = 1e-5
+
+
+def feedback_test_signals(n_samples: int, sample_rate: float, amplitudes: List[float]) -> np.ndarray:
+    """
+    Feedback test inputs, one row per amplitude: a 110 Hz tone with a slow
+    3 Hz swell, so the loop sweeps through saturation and back.
+    """
+    t = np.arange(n_samples) / sample_rate
+    shape = np.sin(2.0 * np.pi * 110.0 * t) * (0.6 + 0.4 * np.sin(2.0 * np.pi * 3.0 * t))
+    return np.asarray(amplitudes)[:, np.newaxis] * shape[np.newaxis, :]
+
+
+def run_lut_chain(H_in: np.ndarray, bias_lut: np.ndarray, bias_amplitude: float,
+                  physics: PhysicsParams, lut_M_end: np.ndarray, lut_sumM_rest: np.ndarray,
+                  h_range: Tuple[float, float], axis_warp: AxisWarp = (None, None),
+                  scheme: str = 'catmull-rom', real_substeps: int = 1,
+                  phase_states: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None) -> np.ndarray:
+    """
+    LUT streaming loop over (signals, samples) inputs: real substeps
+    0..real_substeps-1, looked-up remainder, M_end fed back. bias_lut is
+    the full generate_bias_lut(). Returns Mavg, shaped like H_in.
+
+    Without phase_states every sample starts the bias at phase 0 (the
+    phase-locked ja_loop path). With the (start, real, last) of
+    bias_phase_states() the samples step through the bias phase states
+    from state 0, like JAHysteresisSchedulerLUT::process() and
+    ja_hysteresis_free_running: each state's real substep and end-of-sample
+    bias, and the phase-flip mirror -T(-M, -H) for states starting at pi.
+    """
+    n = len(bias_lut)
+    if phase_states is None:
+        phase_states = (np.zeros(1), bias_lut[np.newaxis, :real_substeps], bias_lut[-1:])
+    start, real, last = phase_states
+    signs = np.where(np.abs(start - np.pi) < 0.5 * np.pi, -1.0, 1.0)
+    M = np.zeros(H_in.shape[0])
+    H = np.zeros(H_in.shape[0])
+    out = np.zeros_like(H_in)
+    for t in range(H_in.shape[1]):
+        state = t % len(start)
+        sign = signs[state]
+        H_audio = H_in[:, t]
+        sum_M = np.zeros_like(M)
+        for i in range(real_substeps):
+            M, H = ja_substep_grid(M, H, H_audio, real[state, i], bias_amplitude, physics)
+            sum_M += M
+        M_real = M
+        M = sign * lut_lookup(lut_M_end, sign * M_real, sign * H_audio, (-1.0, 1.0), h_range, axis_warp, scheme)
+        sumM_rest = sign * lut_lookup(lut_sumM_rest, sign * M_real, sign * H_audio, (-1.0, 1.0), h_range,
+                                      axis_warp, scheme)
+        H = H_audio + bias_amplitude * last[state]
+        out[:, t] = (sum_M + sumM_rest) / n
+    return out
+
+
+# Largest sum of |interpolation weights| per lookup scheme: how far a node
+# error can grow in a looked-up value (Catmull-Rom and the Hermite basis
+# overshoot by up to 1.25 per axis)
+LOOKUP_WEIGHT_BOUNDS = {'bilinear': 1.0, 'catmull-rom': 1.5625, 'bicubic': 1.5625, 'hermite': 1.5625}
+
+
+def report_dtype_errors(job, m_grid: np.ndarray, h_grid: np.ndarray,
+                        lut_M_end: np.ndarray, lut_sumM_rest: np.ndarray,
+                        physics: PhysicsParams, bias_amplitude: float,
+                        axis_warp: AxisWarp = (None, None), n_samples: int = 2400,
+                        lookup: str = 'stencil', schemes: Tuple[str, ...] = ('bilinear',)):
+    """
+    Print the error each reduced export precision adds over the float64 table,
+    per runtime lookup in schemes (export_lookup_schemes()): worst node error
+    per table, the direct output bound it implies (|d sumM_rest| times the
+    scheme's LOOKUP_WEIGHT_BOUNDS / N) and the worst output error measured
+    on feedback test signals (M_end feeding the next sample, bias phase
+    states as in the free-running runtimes).
+    lookup 'hermite' checks the Hermite node tables instead (no int16).
+    """
+    bias_lut = generate_bias_lut(job.phase_span, job.total_substeps)
+    h_range = (float(h_grid[0]), float(h_grid[-1]))
+    H_in = feedback_test_signals(n_samples, 48000.0, [0.1, 0.5, 1.0]) * max(abs(h_range[0]), abs(h_range[1]))
+    dtypes = LUT_DTYPES[1:]
+    if lookup == 'hermite':
+        dtypes = ('float32',)
+        lut_M_end = hermite_node_table(lut_M_end, m_grid, h_grid)
+        lut_sumM_rest = hermite_node_table(lut_sumM_rest, m_grid, h_grid)
+    phase_states = bias_phase_states(job.phase_span, job.total_substeps, job.real_substeps)
+    references = {scheme: run_lut_chain(H_in, bias_lut, bias_amplitude, physics, lut_M_end, lut_sumM_rest,
+                                        h_range, axis_warp, scheme, job.real_substeps, phase_states)
+                  for scheme in schemes}
+
+    def db(x):
+        return 20.0 * np.log10(max(x, 1e-20))
+
+    print(f"  Precision error vs float64 ({job.name}):")
+    print(f"    {'dtype':<8} {'lookup':<12} {'KB':>7} {'max dM_end':>11} {'max dsumM':>11} "
+          f"{'out bound':>10} {'out measured':>13}")
+    for dtype in dtypes:
+        q_M_end, q_sumM_rest = quantize_table(lut_M_end, dtype), quantize_table(lut_sumM_rest, dtype)
+        d_M_end = q_M_end.dequantize()
+        d_sumM_rest = q_sumM_rest.dequantize()
+        err_M_end = float(np.max(np.abs(d_M_end - lut_M_end)))
+        err_sum = float(np.max(np.abs(d_sumM_rest - lut_sumM_rest)))
+        kb = (q_M_end.data.nbytes + q_sumM_rest.data.nbytes) / 1024
+        for scheme in schemes:
+            bound = err_sum * LOOKUP_WEIGHT_BOUNDS[scheme] / job.total_substeps
+            measured = run_lut_chain(H_in, bias_lut, bias_amplitude, physics, d_M_end, d_sumM_rest,
+                                     h_range, axis_warp, scheme, job.real_substeps, phase_states)
+            err_out = float(np.max(np.abs(measured - references[scheme])))
+            print(f"    {dtype:<8} {scheme:<12} {kb:7.1f} {err_M_end:11.2e} {err_sum:11.2e} "
+                  f"{db(bound):7.1f} dB {db(err_out):10.1f} dB")
+
+
+def lookup_error_stats(job, m_grid: np.ndarray, h_grid: np.ndarray,
+                       lut_M_end: np.ndarray, lut_sumM_rest: np.ndarray,
+                       physics: PhysicsParams, bias_amplitude: float,
+                       axis_warp: AxisWarp = (None, None), dtype: str = 'float64',
+                       lookup: str = 'stencil', n_points: int = 2000, backend: str = 'numpy',
+                       svd_tol: float = SVD_TOL) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """
+    Max / RMS error of the exported lookups at random points against exact
+    simulation, with the tables at export precision: Catmull-Rom (FAUST
+    --faust-kernel catmull-rom) and bilinear (C++, default FAUST) for node tables and SVD factors (on the rank-r
+    table they represent), otherwise the bicubic or Hermite lookup.
+    Returns {scheme: {'M_end' | 'sumM_rest': {'max', 'rms'}}}.
+    """
+    rng = np.random.default_rng(0)
+    m_range = (float(m_grid[0]), float(m_grid[-1]))
+    h_range = (float(h_grid[0]), float(h_grid[-1]))
+    m = rng.uniform(m_range[0], m_range[1], n_points)
+    h = rng.uniform(h_range[0], h_range[1], n_points)
+    exact = compute_remainder_response_grid(m, h, remainder_bias_lut(job.phase_span, job.total_substeps,
+                                                                     job.real_substeps),
+                                            bias_amplitude, physics, backend=backend)
+    stored = [quantize_table(lookup_table(table, lookup, m_grid, h_grid, svd_tol), dtype).dequantize()
+              for table in (lut_M_end, lut_sumM_rest)]
+    if lookup == 'svd':
+        stored = [svd_table(factors, len(m_grid)) for factors in stored]
+
+    stats = {}
+    for scheme in ('catmull-rom', 'bilinear') if lookup in ('stencil', 'svd') else (lookup,):
+        stats[scheme] = {}
+        for label, table, ref in zip(('M_end', 'sumM_rest'), stored, exact):
+            err = np.abs(lut_lookup(table, m, h, m_range, h_range, axis_warp, scheme) - ref)
+            stats[scheme][label] = {'max': float(err.max()), 'rms': float(np.sqrt(np.mean(err * err)))}
+    return stats
+
+
 def generate_2d_lut(
     name: str,
     phase_span: float,
@@ -180,11 +850,25 @@ def generate_2d_lut(
     bias_scale: float = 11.0,
     m_size: int = 65,
     h_size: int = 129,
-    h_range: Tuple[float, float] = (-1.0, 1.0)
+    h_range: Tuple[float, float] = (-1.0, 1.0),
+    engine: str = 'vector',
+    axis_warp: AxisWarp = (None, None),
+    backend: str = 'numpy',
+    derivatives: bool = False,
+    real_substeps: int = 1
 ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
     """
     Generate the 2D LUT for (M_in, HAudio) -> (M_end, sumM_rest).
 
+    engine='vector' advances the whole grid in lockstep (backend 'numpy' or
+    the compiled 'numba' kernel); engine='scalar' visits every point with
+    the reference ja_substep().
+    axis_warp gives the (M, H) warp knots (None = uniform), see axis_grid().
+    derivatives=True runs compute_remainder_sensitivities_grid() instead
+    (NumPy, any engine/backend): tables gain a trailing axis of 4, see there.
+    real_substeps > 1 tabulates substeps real_substeps..N-1 from the state
+    after that many real substeps (see remainder_bias_lut()).
+
     Returns:
         m_grid: M axis values
         h_grid: H axis values
@@ -192,27 +876,49 @@ def generate_2d_lut(
         lut_sumM_rest: 2D array of sumM_rest values
     """
     bias_amplitude = bias_level * bias_scale
-    bias_lut = generate_bias_lut(phase_span, total_substeps)
+    bias_lut = remainder_bias_lut(phase_span, total_substeps, real_substeps)
 
     # Create grids
-    m_grid = np.linspace(-1.0, 1.0, m_size)
-    h_grid = np.linspace(h_range[0], h_range[1], h_size)
-
-    # Initialize output arrays
-    lut_M_end = np.zeros((m_size, h_size))
-    lut_sumM_rest = np.zeros((m_size, h_size))
+    m_grid = axis_grid(-1.0, 1.0, m_size, axis_warp[0])
+    h_grid = axis_grid(h_range[0], h_range[1], h_size, axis_warp[1])
 
     total_points = m_size * h_size
-    count = 0
 
     print(f"Generating LUT for {name}: {m_size}x{h_size} = {total_points} points")
     print(f"Phase span: {phase_span:.4f} rad ({phase_span/np.pi:.2f}π)")
     print(f"Bias amplitude: {bias_amplitude:.3f}")
-    print(f"Substeps: {total_substeps} (computing 1..{total_substeps-1})")
+    print(f"Substeps: {total_substeps} (computing {real_substeps}..{total_substeps-1})")
+    if derivatives:
+        print("Engine: vector (numpy, forward-mode derivatives)")
+        lut_M_end, lut_sumM_rest = compute_remainder_sensitivities_grid(
+            m_grid[:, np.newaxis], h_grid[np.newaxis, :],
+            bias_lut, bias_amplitude, physics, progress=True
+        )
+        print(f"Done! LUT shape: {lut_M_end.shape}")
+        return m_grid, h_grid, lut_M_end, lut_sumM_rest
+
+    print(f"Engine: {engine}" + (f" ({backend})" if engine == 'vector' else ""))
+
+    if engine == 'vector':
+        # M_in represents M1 (magnetization after the real substeps)
+        lut_M_end, lut_sumM_rest = compute_remainder_response_grid(
+            m_grid[:, np.newaxis], h_grid[np.newaxis, :],
+            bias_lut, bias_amplitude, physics, progress=True, backend=backend
+        )
+        print(f"Done! LUT shape: {lut_M_end.shape}")
+        return m_grid, h_grid, lut_M_end, lut_sumM_rest
+
+    if engine != 'scalar':
+        raise ValueError(f"Unknown engine: {engine}")
+
+    # Initialize output arrays
+    lut_M_end = np.zeros((m_size, h_size))
+    lut_sumM_rest = np.zeros((m_size, h_size))
+    count = 0
 
     for i, M_in in enumerate(m_grid):
         for j, H_audio in enumerate(h_grid):
-            # M_in represents M1 (magnetization after substep 0)
+            # M_in represents M1 (magnetization after the real substeps)
             M_end, sumM_rest = compute_remainder_response(
                 M_in, H_audio, bias_lut, bias_amplitude, physics
             )
@@ -228,312 +934,1754 @@ def generate_2d_lut(
     return m_grid, h_grid, lut_M_end, lut_sumM_rest
 
 
-def export_cpp_header(
+class GeneratorProfile:
+    """
+    Per-phase wall time, throughput and peak memory of one generator run (--profile).
+
+    Phases are recorded through profile_phase() and may nest (the curvature
+    probe of --warp auto records its own simulate phases). `work` counts
+    simulated point-substeps (grid points x substeps R..N-1), so throughput
+    is comparable across grid sizes and modes. Disk writes made inside a
+    phase (ja_lut_export.write_if_changed(), through its write_hook) are
+    timed separately, which splits export phases into text formatting and
+    writing. Peak memory is the tracemalloc peak of this process (Python
+    objects and NumPy arrays); pool workers only show up in the children's
+    max RSS.
+    """
+
+    def __init__(self, cprofile: bool = False):
+        self.records: List[dict] = []
+        self._active: List[dict] = []
+        self.peak_bytes = 0
+        self.profiler = cProfile.Profile() if cprofile else None
+        tracemalloc.start()
+        self.start = time.perf_counter()
+        if self.profiler is not None:
+            self.profiler.enable()
+
+    def _update_peaks(self):
+        peak = tracemalloc.get_traced_memory()[1]
+        self.peak_bytes = max(self.peak_bytes, peak)
+        for record in self._active:
+            record['peak_bytes'] = max(record['peak_bytes'], peak)
+
+    @contextlib.contextmanager
+    def phase(self, name: str, job: str = '', work: int = 0):
+        # Outer phases keep their peak so far; the tracemalloc peak restarts for this one
+        self._update_peaks()
+        tracemalloc.reset_peak()
+        record = {'phase': name, 'job': job, 'depth': len(self._active),
+                  'start_s': time.perf_counter() - self.start, 'wall_s': 0.0, 'work': work,
+                  'write_s': 0.0, 'bytes_written': 0, 'files_written': 0, 'files_unchanged': 0,
+                  'peak_bytes': 0}
+        self.records.append(record)
+        self._active.append(record)
+        try:
+            yield record
+        finally:
+            record['wall_s'] = time.perf_counter() - self.start - record['start_s']
+            self._update_peaks()
+            self._active.pop()
+
+    def record_write(self, seconds: float, nbytes: int, changed: bool):
+        for record in self._active:
+            record['write_s'] += seconds
+            if changed:
+                record['bytes_written'] += nbytes
+                record['files_written'] += 1
+            else:
+                record['files_unchanged'] += 1
+
+    def finish(self, args, cprofile_path: Optional[Path] = None, top: int = 25) -> dict:
+        """Stop profiling and return the machine-readable report (also dumps cProfile stats)"""
+        total = time.perf_counter() - self.start
+        if self.profiler is not None:
+            self.profiler.disable()
+        self._update_peaks()
+        tracemalloc.stop()
+
+        phases = []
+        totals: Dict[str, dict] = {}
+        for record in self.records:
+            entry = {key: record[key] for key in ('phase', 'job', 'depth', 'start_s', 'wall_s')}
+            entry['peak_mb'] = record['peak_bytes'] / 2**20
+            if record['work']:
+                entry['point_substeps'] = record['work']
+                entry['point_substeps_per_s'] = record['work'] / max(record['wall_s'], 1e-12)
+            if record['files_written'] or record['files_unchanged']:
+                entry['format_s'] = record['wall_s'] - record['write_s']
+                entry.update({key: record[key] for key in
+                              ('write_s', 'bytes_written', 'files_written', 'files_unchanged')})
+            phases.append(entry)
+
+            total_entry = totals.setdefault(record['phase'], {'count': 0, 'wall_s': 0.0, 'point_substeps': 0,
+                                                              'write_s': 0.0, 'peak_mb': 0.0})
+            total_entry['count'] += 1
+            total_entry['wall_s'] += record['wall_s']
+            total_entry['point_substeps'] += record['work']
+            total_entry['write_s'] += record['write_s']
+            total_entry['peak_mb'] = max(total_entry['peak_mb'], entry['peak_mb'])
+        for total_entry in totals.values():
+            total_entry['point_substeps_per_s'] = total_entry['point_substeps'] / max(total_entry['wall_s'], 1e-12)
+
+        report = {
+            'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'generator': generator_fingerprint(),
+            'python': sys.version.split()[0],
+            'numpy': np.__version__,
+            'args': {key: str(value) if isinstance(value, Path) else value for key, value in vars(args).items()},
+            'total_s': total,
+            'peak_traced_mb': self.peak_bytes / 2**20,
+            'phases': phases,
+            'totals': totals,
+        }
+        if resource is not None:
+            # ru_maxrss is in KB on Linux, bytes on macOS
+            unit = 1 if sys.platform == 'darwin' else 1024
+            report['max_rss_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit / 2**20
+            report['max_rss_children_mb'] = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * unit / 2**20
+
+        if self.profiler is not None:
+            stats = pstats.Stats(self.profiler)
+            if cprofile_path is not None:
+                stats.dump_stats(cprofile_path)
+            hotspots = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:top]
+            report['hotspots'] = [
+                {'function': f"{Path(filename).name}:{line}({func})", 'calls': calls,
+                 'tottime_s': tottime, 'cumtime_s': cumtime}
+                for (filename, line, func), (_, calls, tottime, cumtime, _) in hotspots
+            ]
+        return report
+
+
+_active_profile: Optional[GeneratorProfile] = None
+
+
+def profile_phase(name: str, job: str = '', work: int = 0):
+    """Record a phase in the active --profile report; a no-op when not profiling"""
+    if _active_profile is None:
+        return contextlib.nullcontext()
+    return _active_profile.phase(name, job, work)
+
+
+def simulation_work(job: 'LUTJob', m_size: int, h_size: int) -> int:
+    """Point-substeps simulated for one LUT: every grid point runs substeps R..N-1"""
+    return m_size * h_size * (job.total_substeps - job.real_substeps)
+
+
+def print_profile(report: dict):
+    """Print the per-phase totals of a --profile report"""
+    print(f"\n=== Profile: {report['total_s']:.2f} s total, peak traced {report['peak_traced_mb']:.1f} MB" +
+          (f", max RSS {report['max_rss_mb']:.1f} MB" if 'max_rss_mb' in report else "") + " ===")
+    print(f"  {'phase':<22} {'count':>5} {'wall s':>9} {'write s':>9} {'Mpt-substeps/s':>15} {'peak MB':>9}")
+    for name, entry in report['totals'].items():
+        rate = f"{entry['point_substeps_per_s'] / 1e6:.2f}" if entry['point_substeps'] else "-"
+        print(f"  {name:<22} {entry['count']:>5} {entry['wall_s']:>9.3f} {entry['write_s']:>9.3f} "
+              f"{rate:>15} {entry['peak_mb']:>9.1f}")
+    for entry in report.get('hotspots', [])[:10]:
+        print(f"  {entry['tottime_s']:>9.3f} s self  {entry['cumtime_s']:>9.3f} s cum  {entry['function']}")
+
+
+def generator_fingerprint() -> str:
+    """
+    Hash of the generator source and every local module it imports; any
+    code change invalidates cached LUTs
+    """
+    digest = hashlib.sha256()
+    for source in (__file__, ja_lut_export.__file__, ja_lut_modes.__file__):
+        digest.update(Path(source).read_bytes())
+    return digest.hexdigest()
+
+
+def lut_cache_key(
+    phase_span: float,
+    total_substeps: int,
+    physics: PhysicsParams,
+    bias_level: float,
+    bias_scale: float,
+    m_size: int,
+    h_size: int,
+    h_range: Tuple[float, float],
+    axis_warp: AxisWarp = (None, None),
+    backend: str = 'numpy',
+    derivatives: bool = False,
+    real_substeps: int = 1
+) -> str:
+    """
+    Content address of one LUT: a hash of exactly the inputs that determine
+    its arrays (physics, mode/variant geometry, real substeps, bias, grid,
+    simulation backend, derivative channels) plus generator_fingerprint(). The mode name is left out so
+    identical tables share an entry.
+    """
+    payload = {
+        'physics': physics._asdict(),
+        'phase_span': float(phase_span),
+        'total_substeps': int(total_substeps),
+        'real_substeps': int(real_substeps),
+        'bias_level': float(bias_level),
+        'bias_scale': float(bias_scale),
+        'm_size': int(m_size),
+        'h_size': int(h_size),
+        'h_range': [float(h_range[0]), float(h_range[1])],
+        'axis_warp': [None if w is None else [float(k) for k in w] for w in axis_warp],
+        'backend': backend,
+        'derivatives': bool(derivatives),
+        'generator': generator_fingerprint(),
+    }
+    blob = json.dumps(payload, sort_keys=True).encode()
+    return hashlib.sha256(blob).hexdigest()
+
+
+class LUTCache:
+    """
+    Content-addressed on-disk store of raw LUT arrays (.npz per key).
+
+    Entries are touched on every hit; once the directory exceeds max_bytes
+    the least recently used entries are evicted.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.evict()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.npz"
+
+    def get(self, key: str) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            with np.load(path) as data:
+                entry = (data['m_grid'], data['h_grid'], data['lut_M_end'], data['lut_sumM_rest'])
+        except (OSError, KeyError, ValueError):
+            path.unlink(missing_ok=True)
+            return None
+        os.utime(path)
+        return entry
+
+    def put(self, key: str, m_grid: np.ndarray, h_grid: np.ndarray,
+            lut_M_end: np.ndarray, lut_sumM_rest: np.ndarray):
+        path = self._path(key)
+        # Per-process name outside the *.npz glob, so neither a concurrent put
+        # nor evict() sees the entry before it is complete
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, m_grid=m_grid, h_grid=h_grid,
+                     lut_M_end=lut_M_end, lut_sumM_rest=lut_sumM_rest)
+        os.replace(tmp_path, path)
+        self.evict(keep=path)
+
+    def evict(self, keep: Optional[Path] = None):
+        """Drop least recently used entries until the cache fits max_bytes"""
+        entries = sorted(self.cache_dir.glob('*.npz'), key=lambda p: p.stat().st_mtime)
+        total = sum(p.stat().st_size for p in entries)
+        for path in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            total -= path.stat().st_size
+            path.unlink(missing_ok=True)
+            print(f"  Cache evict: {path.name}")
+
+
+CHECKPOINT_TABLES = ('lut_M_end', 'lut_sumM_rest')
+CHECKPOINT_ROWS = 8
+
+
+class LUTCheckpoint:
+    """
+    Out-of-core build of one LUT (--checkpoint-dir): memory-mapped .npy
+    outputs under root/<cache key>/ filled one block of M rows at a time,
+    plus rows.json listing the finished row ranges.
+
+    A block's rows are flushed to disk before rows.json is replaced, so an
+    interrupted build loses at most the blocks in flight and resumes from
+    the record. The finished tables are read back as memmaps, so neither
+    the build nor the export holds more than a block in RAM. The directory
+    is named by lut_cache_key(), so changed settings start a fresh build
+    and an unchanged finished build is reused as is.
+    """
+
+    def __init__(self, root: Path, key: str, m_grid: np.ndarray, h_grid: np.ndarray,
+                 shape: Tuple[int, ...]):
+        self.path = Path(root) / key
+        self.key = key
+        self.shape = tuple(shape)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.done = self._load_record()
+        if not self.done:
+            np.save(self.path / 'm_grid.npy', m_grid)
+            np.save(self.path / 'h_grid.npy', h_grid)
+        mode = 'r+' if self.done else 'w+'
+        self.tables = [np.lib.format.open_memmap(self.path / f"{name}.npy", mode=mode,
+                                                 dtype=np.float64, shape=self.shape)
+                       for name in CHECKPOINT_TABLES]
+
+    def _load_record(self) -> List[Tuple[int, int]]:
+        """Finished (start, stop) row ranges of a matching earlier run, else []"""
+        try:
+            record = json.loads((self.path / 'rows.json').read_text())
+            if record['key'] != self.key or tuple(record['shape']) != self.shape:
+                return []
+            for name in CHECKPOINT_TABLES:
+                stored = np.load(self.path / f"{name}.npy", mmap_mode='r')
+                if stored.shape != self.shape or stored.dtype != np.float64:
+                    return []
+            return [(int(lo), int(hi)) for lo, hi in record['done']]
+        except (OSError, ValueError, KeyError, TypeError):
+            return []
+
+    def _save_record(self):
+        tmp_path = self.path / 'rows.json.tmp'
+        tmp_path.write_text(json.dumps({'key': self.key, 'shape': list(self.shape),
+                                        'done': sorted(self.done)}) + "\n")
+        os.replace(tmp_path, self.path / 'rows.json')
+
+    @property
+    def rows_done(self) -> int:
+        return sum(hi - lo for lo, hi in self.done)
+
+    def pending_blocks(self, block_rows: int) -> List[slice]:
+        """Unfinished M rows in blocks of at most block_rows"""
+        finished = np.zeros(self.shape[0], dtype=bool)
+        for lo, hi in self.done:
+            finished[lo:hi] = True
+        blocks = []
+        row = 0
+        while row < self.shape[0]:
+            if finished[row]:
+                row += 1
+                continue
+            stop = row + 1
+            while stop < self.shape[0] and not finished[stop] and stop - row < block_rows:
+                stop += 1
+            blocks.append(slice(row, stop))
+            row = stop
+        return blocks
+
+    def store(self, rows: slice, lut_M_end: np.ndarray, lut_sumM_rest: np.ndarray):
+        """Write one finished block to disk, then record it"""
+        for table, values in zip(self.tables, (lut_M_end, lut_sumM_rest)):
+            table[rows] = values
+            table.flush()
+        self.done.append((rows.start, rows.stop))
+        self._save_record()
+
+    def result(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """(m_grid, h_grid, lut_M_end, lut_sumM_rest), the tables as read-only memmaps"""
+        self.tables = None
+        return (np.load(self.path / 'm_grid.npy'), np.load(self.path / 'h_grid.npy'),
+                *(np.load(self.path / f"{name}.npy", mmap_mode='r') for name in CHECKPOINT_TABLES))
+
+
+EXPORT_FORMATS = ('cpp', 'faust', 'faust-unified', 'binary')
+
+
+class LUTJob(NamedTuple):
+    """One LUT to build: a base mode or one of its N-1/N/N+1 variants"""
+    name: str
+    phase_span: float
+    total_substeps: int
+    real_substeps: int = 1   # substeps the runtime computes before the lookup
+
+
+def resolve_jobs(mode_names: List[str], variants: bool, real_substeps: int = 1) -> List[LUTJob]:
+    """
+    Expand mode names into LUT jobs (three per mode with --variants).
+    Job names are output file names, so a name produced twice (a repeated
+    mode or overlapping variants) raises ValueError.
+    """
+    jobs = []
+    for mode_name in mode_names:
+        mode = MODES[mode_name]
+        if variants:
+            jobs.extend(LUTJob(*v, real_substeps) for v in mode.get_variants())
+        else:
+            jobs.append(LUTJob(mode.name, mode.phase_span, mode.total_substeps, real_substeps))
+    names = [job.name for job in jobs]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"LUT job(s) {', '.join(duplicates)} would be built twice")
+    return jobs
+
+
+def split_rows(m_size: int, n_blocks: int) -> List[slice]:
+    """Split the M grid into at most n_blocks contiguous row blocks"""
+    bounds = np.linspace(0, m_size, min(n_blocks, m_size) + 1).round().astype(int)
+    return [slice(lo, hi) for lo, hi in zip(bounds[:-1], bounds[1:]) if hi > lo]
+
+
+def simulate_lut_rows(
+    job: LUTJob,
+    physics: PhysicsParams,
+    bias_amplitude: float,
+    m_rows: np.ndarray,
+    h_grid: np.ndarray,
+    engine: str = 'vector',
+    backend: str = 'numpy',
+    derivatives: bool = False
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Simulate a block of M-grid rows for one job (process-pool task)"""
+    bias_lut = remainder_bias_lut(job.phase_span, job.total_substeps, job.real_substeps)
+
+    if derivatives:
+        return compute_remainder_sensitivities_grid(
+            m_rows[:, np.newaxis], h_grid[np.newaxis, :],
+            bias_lut, bias_amplitude, physics
+        )
+
+    if engine == 'vector':
+        return compute_remainder_response_grid(
+            m_rows[:, np.newaxis], h_grid[np.newaxis, :],
+            bias_lut, bias_amplitude, physics, backend=backend
+        )
+
+    lut_M_end = np.zeros((len(m_rows), len(h_grid)))
+    lut_sumM_rest = np.zeros((len(m_rows), len(h_grid)))
+    for i, M_in in enumerate(m_rows):
+        for j, H_audio in enumerate(h_grid):
+            lut_M_end[i, j], lut_sumM_rest[i, j] = compute_remainder_response(
+                M_in, H_audio, bias_lut, bias_amplitude, physics
+            )
+    return lut_M_end, lut_sumM_rest
+
+
+# Blocks per worker submitted to the pool at a time (running or queued)
+IN_FLIGHT_PER_WORKER = 2
+
+
+def generate_2d_luts_parallel(
+    jobs: List[LUTJob],
+    physics: PhysicsParams,
+    workers: int,
+    bias_level: float = 0.41,
+    bias_scale: float = 11.0,
+    m_size: int = 65,
+    h_size: int = 129,
+    h_range: Tuple[float, float] = (-1.0, 1.0),
+    engine: str = 'vector',
+    axis_warp: AxisWarp = (None, None),
+    backend: str = 'numpy',
+    derivatives: bool = False,
+    settings: Optional[Dict[str, Tuple[PhysicsParams, float]]] = None,
+    checkpoints: Optional[Dict[str, 'LUTCheckpoint']] = None,
+    block_rows: int = CHECKPOINT_ROWS
+) -> Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Build several LUTs on a process pool.
+
+    Every job is split into blocks of M-grid rows, so a single large mode
+    also spreads across workers. Rows are independent and each block runs
+    the same element-wise arithmetic, so the assembled tables are
+    bit-identical to a serial generate_2d_lut() build.
+
+    settings maps job names to their own (physics, bias amplitude), so the
+    LUTs of several tape formulations share one pool (--sweep).
+    checkpoints maps job names to their LUTCheckpoint: only the unfinished
+    rows are simulated, in blocks of block_rows, and each block goes to
+    disk as it completes instead of into in-memory tables. Only
+    IN_FLIGHT_PER_WORKER blocks per worker are in flight, so peak memory
+    follows the block size, not the number of blocks.
+
+    Returns {job name: (m_grid, h_grid, lut_M_end, lut_sumM_rest)}.
+    """
+    bias_amplitude = bias_level * bias_scale
+    if settings is None:
+        settings = {job.name: (physics, bias_amplitude) for job in jobs}
+    m_grid = axis_grid(-1.0, 1.0, m_size, axis_warp[0])
+    h_grid = axis_grid(h_range[0], h_range[1], h_size, axis_warp[1])
+    row_blocks = split_rows(m_size, workers)
+
+    shape = (m_size, h_size, 4) if derivatives else (m_size, h_size)
+    tables = {} if checkpoints else {job.name: (np.zeros(shape), np.zeros(shape)) for job in jobs}
+
+    # Most expensive jobs first so the pool drains evenly
+    tasks = [(job, rows)
+             for job in sorted(jobs, key=lambda j: j.total_substeps, reverse=True)
+             for rows in (checkpoints[job.name].pending_blocks(block_rows) if checkpoints else row_blocks)]
+
+    print(f"Generating {len(jobs)} LUTs on {workers} workers: "
+          f"{len(tasks)} blocks of {m_size}x{h_size} grids")
+    amplitudes = sorted({amplitude for _, amplitude in settings.values()})
+    print("Bias amplitude: " + ", ".join(f"{amplitude:.3f}" for amplitude in amplitudes))
+    print("Engine: vector (numpy, forward-mode derivatives)" if derivatives else
+          f"Engine: {engine}" + (f" ({backend})" if engine == 'vector' else ""))
+
+    # At most IN_FLIGHT_PER_WORKER blocks per worker are submitted or
+    # waiting to be stored: a finished future holds its block's arrays, so
+    # submitting every block at once would keep them all in memory
+    pending = iter(tasks)
+    futures = {}
+    done = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while True:
+            for job, rows in itertools.islice(pending, IN_FLIGHT_PER_WORKER * workers - len(futures)):
+                futures[pool.submit(simulate_lut_rows, job, *settings[job.name],
+                                    m_grid[rows], h_grid, engine, backend, derivatives)] = (job, rows)
+            if not futures:
+                break
+            finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in finished:
+                job, rows = futures.pop(future)
+                if checkpoints:
+                    checkpoints[job.name].store(rows, *future.result())
+                else:
+                    lut_M_end, lut_sumM_rest = tables[job.name]
+                    lut_M_end[rows], lut_sumM_rest[rows] = future.result()
+                done += 1
+                print(f"  Progress: {done}/{len(tasks)} blocks "
+                      f"({job.name} rows {rows.start}..{rows.stop - 1})")
+
+    if checkpoints:
+        return {job.name: checkpoints[job.name].result() for job in jobs}
+    return {name: (m_grid, h_grid, lut_M_end, lut_sumM_rest)
+            for name, (lut_M_end, lut_sumM_rest) in tables.items()}
+
+
+def generate_2d_lut_checkpointed(
+    job: LUTJob,
+    checkpoint: 'LUTCheckpoint',
+    physics: PhysicsParams,
+    bias_amplitude: float,
     m_grid: np.ndarray,
     h_grid: np.ndarray,
-    lut_M_end: np.ndarray,
-    lut_sumM_rest: np.ndarray,
-    name: str,
-    total_substeps: int,
-    output_path: Path
-):
-    """Export LUT as C++ header file"""
+    engine: str = 'vector',
+    backend: str = 'numpy',
+    derivatives: bool = False,
+    block_rows: int = CHECKPOINT_ROWS
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Serial generate_2d_lut() through a LUTCheckpoint: the unfinished M rows
+    are simulated block_rows at a time (simulate_lut_rows(), bit-identical
+    to the whole-grid build) and stored as each block completes.
+    Returns the tables as memmaps (LUTCheckpoint.result()).
+    """
+    blocks = checkpoint.pending_blocks(block_rows)
+    print(f"Generating LUT for {job.name}: {len(m_grid)}x{len(h_grid)} = {len(m_grid) * len(h_grid)} points "
+          f"in {len(blocks)} blocks of <= {block_rows} rows ({checkpoint.path})")
+    print(f"Bias amplitude: {bias_amplitude:.3f}")
+    print("Engine: vector (numpy, forward-mode derivatives)" if derivatives else
+          f"Engine: {engine}" + (f" ({backend})" if engine == 'vector' else ""))
+    for done, rows in enumerate(blocks, 1):
+        checkpoint.store(rows, *simulate_lut_rows(job, physics, bias_amplitude, m_grid[rows], h_grid,
+                                                  engine, backend, derivatives))
+        print(f"  Progress: {done}/{len(blocks)} blocks (rows {rows.start}..{rows.stop - 1}, "
+              f"{checkpoint.rows_done}/{len(m_grid)} rows on disk)")
+    return checkpoint.result()
+
+
+def report_svd_compression(job, m_grid: np.ndarray, h_grid: np.ndarray,
+                           lut_M_end: np.ndarray, lut_sumM_rest: np.ndarray,
+                           physics: PhysicsParams, bias_amplitude: float,
+                           axis_warp: AxisWarp = (None, None), dtype: str = 'float64',
+                           svd_tol: float = SVD_TOL, backend: str = 'numpy'):
+    """
+    Print the --lookup svd factors against the node table they replace,
+    per output: rank, memory, table reads and 1D interpolations per lookup
+    (Catmull-Rom: 16 reads and 5 interpolations on nodes, 8 reads and 2
+    per rank term on factors; bilinear: 4 reads on nodes, 4 per rank term)
+    and the worst lookup error of both against exact simulation.
+    """
     m_size, h_size = lut_M_end.shape
+    itemsize = np.dtype(dtype).itemsize
+    args = (job, m_grid, h_grid, lut_M_end, lut_sumM_rest, physics, bias_amplitude, axis_warp, dtype)
+    errors = {lookup: lookup_error_stats(*args, lookup=lookup, backend=backend, svd_tol=svd_tol)
+              for lookup in ('stencil', 'svd')}
+
+    print(f"  SVD factors vs node table ({job.name}, node error <= {svd_tol:.1e} x table range):")
+    print(f"    {'table':<10} {'form':<5} {'rank':>4} {'KB':>7} {'CR reads/interp':>16} {'CR max err':>11} "
+          f"{'bilin reads':>12} {'bilin max err':>14}")
+    for label, table in (('M_end', lut_M_end), ('sumM_rest', lut_sumM_rest)):
+        rank = svd_factors(table, svd_tol).shape[1]
+        rows = (('node', '-', m_size * h_size, 16, 5, 4),
+                ('svd', rank, (m_size + h_size) * rank, 8 * rank, 2 * rank, 4 * rank))
+        for (form, shown_rank, values, reads, interps, bilinear_reads), lookup in zip(rows, ('stencil', 'svd')):
+            stats = errors[lookup]
+            print(f"    {label:<10} {form:<5} {shown_rank:>4} {values * itemsize / 1024:7.1f} "
+                  f"{f'{reads} / {interps}':>16} {stats['catmull-rom'][label]['max']:11.2e} "
+                  f"{bilinear_reads:12d} {stats['bilinear'][label]['max']:14.2e}")
+
+
+def report_symmetry(job, m_grid: np.ndarray, h_grid: np.ndarray,
+                    lut_M_end: np.ndarray, lut_sumM_rest: np.ndarray,
+                    physics: PhysicsParams, bias_amplitude: float,
+                    tol: float = SYMMETRY_TOL, n_points: int = 2000,
+                    backend: str = 'numpy') -> Dict[str, float]:
+    """
+    Print the phase-flip residual of one LUT, relative to each table's
+    range: at random points against exact simulation, how far the response
+    of a sample starting at bias phase pi is from the mirror -T(-M, -H)
+    that JAHysteresisSchedulerLUT::process() and ja_loop_state read for it
+    (the JA step is odd in (M, H, bias)). tol is the limit the mirror
+    accepts. Returns the residual per table.
+    """
+    rng = np.random.default_rng(0)
+    m = rng.uniform(m_grid[0], m_grid[-1], n_points)
+    h = rng.uniform(h_grid[0], h_grid[-1], n_points)
+    bias_lut = remainder_bias_lut(job.phase_span, job.total_substeps, job.real_substeps)
+    exact = compute_remainder_response_grid(m, h, bias_lut, bias_amplitude, physics, backend=backend)
+    flipped = compute_remainder_response_grid(-m, -h, -bias_lut, bias_amplitude, physics, backend=backend)
+
+    residuals = {}
+    print(f"  Phase-flip residual / table range ({job.name}, limit {tol:.1e}):")
+    for label, table, ref, mirror in zip(('M_end', 'sumM_rest'), (lut_M_end, lut_sumM_rest), exact, flipped):
+        span = max(float(table.max() - table.min()), 1e-300)
+        residuals[label] = float(np.max(np.abs(mirror + ref))) / span
+        print(f"    {label:<10} {residuals[label]:.2e}")
+    if max(residuals.values()) > tol:
+        print(f"  {job.name} is not phase-flip symmetric within {tol:.1e}: its pi-state lookups are inexact")
+    return residuals
+
+
+def export_lut(job: LUTJob, m_grid: np.ndarray, h_grid: np.ndarray,
+               lut_M_end: np.ndarray, lut_sumM_rest: np.ndarray, output_dir: Path,
+               formats: Tuple[str, ...] = ('cpp', 'faust'),
+               axis_warp: AxisWarp = (None, None),
+               dtype: str = 'float64', lookup: str = 'stencil', layout: str = 'separate',
+               manifest: Optional[dict] = None, svd_tol: float = SVD_TOL,
+               faust_kernel: str = 'bilinear') -> List[str]:
+    """
+    Write the per-LUT text formats (C++ header, FAUST library) for one
+    generated LUT, with the generator settings of manifest embedded.
+    faust_kernel is the FAUST node-table lookup (FAUST_KERNELS).
+    Returns the names of the files written.
+    """
+    files = []
+    if 'cpp' in formats:
+        cpp_path = output_dir / f"JAHysteresisLUT_{job.name}.h"
+        with profile_phase('export-cpp', job.name):
+            export_cpp_header(m_grid, h_grid, lut_M_end, lut_sumM_rest, job.name, job.total_substeps, cpp_path,
+                              axis_warp, dtype, lookup, layout, manifest, job.real_substeps, svd_tol,
+                              job.phase_span)
+        files.append(cpp_path.name)
+    if 'faust' in formats:
+        faust_path = output_dir / f"ja_lut_{job.name.lower()}.lib"
+        with profile_phase('export-faust', job.name):
+            export_faust_lib(m_grid, h_grid, lut_M_end, lut_sumM_rest, job.name, job.total_substeps, faust_path,
+                             axis_warp, dtype, lookup, layout, manifest, job.real_substeps, svd_tol,
+                             faust_kernel)
+        files.append(faust_path.name)
+
+    m_size, h_size = lut_M_end.shape[:2]
+    values = 2 * ((m_size - 1) * (h_size - 1) if lookup == 'bicubic' else m_size * h_size)
+    values *= LOOKUP_ENTRY_SIZES.get(lookup, 1)
+    if lookup == 'svd':
+        values = sum(lookup_table(table, lookup, m_grid, h_grid, svd_tol).size
+                     for table in (lut_M_end, lut_sumM_rest))
+    if lookup == 'hermite':
+        lut_M_end, lut_sumM_rest = lut_M_end[..., 0], lut_sumM_rest[..., 0]
+    print(f"  M_end range: [{lut_M_end.min():.6f}, {lut_M_end.max():.6f}]")
+    print(f"  sumM_rest range: [{lut_sumM_rest.min():.6f}, {lut_sumM_rest.max():.6f}]")
+    print(f"  Memory: {values * np.dtype(dtype).itemsize / 1024:.1f} KB" +
+          (f" ({dtype})" if dtype != 'float64' else "") +
+          {'bicubic': " (bicubic coefficients)", 'hermite': " (Hermite nodes)",
+           'svd': " (SVD factors)"}.get(lookup, ""))
+    return files
+
+
+def export_lut_slices(job: LUTJob, s_grid: np.ndarray, m_grid: np.ndarray, h_grid: np.ndarray,
+                      lut_M_end: np.ndarray, lut_sumM_rest: np.ndarray, output_dir: Path,
+                      formats: Tuple[str, ...] = ('cpp', 'faust'),
+                      axis_warp: AxisWarp = (None, None), axis: str = 'bias',
+                      manifest: Optional[dict] = None, faust_kernel: str = 'bilinear') -> List[str]:
+    """
+    Write the third-axis (SLICE_AXES[axis]) text formats for one LUT and
+    report its memory footprint. Returns the names of the files written.
+    """
+    slice_axis = SLICE_AXES[axis]
+    files = []
+    if 'cpp' in formats:
+        cpp_path = output_dir / f"JAHysteresisLUT_{job.name}_{slice_axis.suffix}.h"
+        with profile_phase('export-cpp', job.name):
+            export_cpp_header_slices(s_grid, m_grid, h_grid, lut_M_end, lut_sumM_rest,
+                                     job.name, job.total_substeps, cpp_path, axis_warp, axis, manifest,
+                                     job.real_substeps)
+        files.append(cpp_path.name)
+    if 'faust' in formats:
+        faust_path = output_dir / f"ja_lut_{job.name.lower()}_{slice_axis.suffix.lower()}.lib"
+        with profile_phase('export-faust', job.name):
+            export_faust_lib_slices(s_grid, m_grid, h_grid, lut_M_end, lut_sumM_rest,
+                                    job.name, job.total_substeps, faust_path, axis_warp, axis, manifest,
+                                    job.real_substeps, faust_kernel)
+        files.append(faust_path.name)
+
+    slice_bytes = lut_M_end[0].nbytes * 2
+    print(f"  {slice_axis.name.capitalize()} axis: {len(s_grid)} slices, "
+          f"{slice_axis.short} [{s_grid[0]:.3f}, {s_grid[-1]:.3f}]")
+    print(f"  M_end range: [{lut_M_end.min():.6f}, {lut_M_end.max():.6f}]")
+    print(f"  sumM_rest range: [{lut_sumM_rest.min():.6f}, {lut_sumM_rest.max():.6f}]")
+    print(f"  Memory: {lut_M_end.nbytes * 2 / 1024:.1f} KB total, "
+          f"{slice_bytes / 1024:.1f} KB per slice, {2 * slice_bytes / 1024:.1f} KB touched per lookup")
+    return files
+
+
+MANIFEST_VERSION = 1
+
+
+def table_hash(*arrays: np.ndarray) -> str:
+    """SHA-256 of the float64 grids and tables a LUT is exported from"""
+    digest = hashlib.sha256()
+    for array in arrays:
+        digest.update(np.ascontiguousarray(array, dtype='<f8').tobytes())
+    return digest.hexdigest()
+
+
+def lut_manifest(job: LUTJob, m_grid: np.ndarray, h_grid: np.ndarray,
+                 lut_M_end: np.ndarray, lut_sumM_rest: np.ndarray,
+                 physics: PhysicsParams, args, axis_warp: AxisWarp = (None, None),
+                 axis: Optional[str] = None, s_grid: Optional[np.ndarray] = None,
+                 symmetry: Optional[Dict[str, float]] = None) -> dict:
+    """
+    Everything a runtime must agree with to use one LUT: physics, bias,
+    grid sizes and ranges, substep count and phase span, storage, a hash
+    of the tables and their measured lookup error (lookup_error_stats()).
+    Only inputs that shape the tables are recorded, not the generator
+    source, so editing the generator leaves unchanged exports alone.
+    symmetry holds the residuals of report_symmetry().
+    For a third-axis LUT (axis, s_grid) the tables are stacked slices and
+    the error is measured per slice. Written next to the exports as JSON
+    (export_manifest()) and embedded in the C++ and FAUST files.
+    """
+    slice_axis = SLICE_AXES[axis] if axis is not None else None
+    stem = f"JAHysteresisLUT_{job.name}" + (f"_{slice_axis.suffix}" if slice_axis else "")
+    manifest = {
+        'manifest_version': MANIFEST_VERSION,
+        'file': f"{stem}.json",
+        'name': job.name,
+        'total_substeps': job.total_substeps,
+        'real_substeps': job.real_substeps,
+        'phase_span': float(job.phase_span),
+        'bias_cycles': float(job.phase_span / (2.0 * np.pi)),
+        'physics': physics._asdict(),
+        'bias': {'level': args.bias_level, 'scale': args.bias_scale,
+                 'amplitude': args.bias_level * args.bias_scale},
+        'grid': {
+            'm_size': len(m_grid), 'h_size': len(h_grid),
+            'm_range': [float(m_grid[0]), float(m_grid[-1])],
+            'h_range': [float(h_grid[0]), float(h_grid[-1])],
+            'm_warp': None if axis_warp[0] is None else axis_warp[0].tolist(),
+            'h_warp': None if axis_warp[1] is None else axis_warp[1].tolist(),
+        },
+        'storage': {'dtype': args.dtype, 'lookup': args.lookup, 'layout': args.layout},
+        'table_sha256': table_hash(m_grid, h_grid, lut_M_end, lut_sumM_rest),
+    }
+    if args.lookup == 'svd':
+        manifest['storage']['svd'] = {'tol': args.svd_tol, 'rank': {
+            label: int(svd_factors(table, args.svd_tol).shape[1])
+            for label, table in (('M_end', lut_M_end), ('sumM_rest', lut_sumM_rest))}}
+    if symmetry is not None:
+        manifest['symmetry'] = {'phase_flip_residual': symmetry, 'tol': args.symmetry_tol}
+    error_args = dict(axis_warp=axis_warp, dtype=args.dtype, lookup=args.lookup, backend=args.backend,
+                      svd_tol=args.svd_tol)
+    if slice_axis is None:
+        manifest['substeps_covered'] = [job.real_substeps, job.total_substeps - 1]
+        manifest['errors'] = lookup_error_stats(job, m_grid, h_grid, lut_M_end, lut_sumM_rest, physics,
+                                                args.bias_level * args.bias_scale, **error_args)
+        return manifest
+
+    manifest['slice_axis'] = {'name': slice_axis.name, 'units': slice_axis.units,
+                              'values': [float(v) for v in s_grid]}
+    manifest['errors'] = []
+    for value, slice_M_end, slice_sumM_rest in zip(s_grid, lut_M_end, lut_sumM_rest):
+        slice_job, amplitude = job, args.bias_level * args.bias_scale
+        if axis == 'bias':
+            amplitude = float(value)
+        else:
+            slice_job = LUTJob(f"{job.name}@{value:.0f}", job.phase_span, int(value), job.real_substeps)
+        manifest['errors'].append({
+            'value': float(value),
+            **lookup_error_stats(slice_job, m_grid, h_grid, slice_M_end, slice_sumM_rest, physics,
+                                 amplitude, **error_args)
+        })
+    return manifest
+
+
+def build_luts(jobs: List[LUTJob], physics: PhysicsParams, args,
+               cache: Optional[LUTCache] = None,
+               bias_level: Optional[float] = None,
+               axis_warp: AxisWarp = (None, None),
+               derivatives: bool = False,
+               settings: Optional[Dict[str, Tuple[PhysicsParams, float, float]]] = None
+               ) -> Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Produce the arrays for every job, serving unchanged LUTs from the cache
+    and simulating only the misses (serially or on the process pool).
+
+    bias_level overrides args.bias_level (used to build bias-axis slices).
+    derivatives=True adds the forward-mode derivative channels (tables
+    shaped (m_size, h_size, 4), see compute_remainder_sensitivities_grid()).
+    settings maps job names to their own (physics, bias level, bias scale)
+    (used to build sweep formulations); jobs with identical inputs are
+    simulated once. With args.checkpoint_dir the misses are built out of
+    core (LUTCheckpoint): resumed where an interrupted run stopped and
+    returned as memmaps.
+    """
+    h_range = tuple(args.h_range)
+    if bias_level is None:
+        bias_level = args.bias_level
+    if settings is None:
+        settings = {job.name: (physics, bias_level, args.bias_scale) for job in jobs}
+    keys = {job.name: lut_cache_key(job.phase_span, job.total_substeps, settings[job.name][0],
+                                    settings[job.name][1], settings[job.name][2],
+                                    args.m_size, args.h_size, h_range, axis_warp, args.backend,
+                                    derivatives, job.real_substeps)
+            for job in jobs}
+
+    results = {}
+    pending = []
+    duplicates = []
+    first_by_key = {}
+    for job in jobs:
+        if keys[job.name] in first_by_key:
+            duplicates.append((job.name, first_by_key[keys[job.name]]))
+            continue
+        first_by_key[keys[job.name]] = job.name
+        cached = None
+        if cache is not None:
+            with profile_phase('cache-load', job.name):
+                cached = cache.get(keys[job.name])
+        if cached is not None:
+            print(f"Cache hit: {job.name} ({keys[job.name][:12]})")
+            results[job.name] = cached
+        else:
+            pending.append(job)
+
+    checkpoints = {}
+    checkpoint_dir = getattr(args, 'checkpoint_dir', None)
+    block_rows = getattr(args, 'checkpoint_rows', CHECKPOINT_ROWS)
+    if checkpoint_dir is not None and pending:
+        m_grid = axis_grid(-1.0, 1.0, args.m_size, axis_warp[0])
+        h_grid = axis_grid(h_range[0], h_range[1], args.h_size, axis_warp[1])
+        shape = (args.m_size, args.h_size, 4) if derivatives else (args.m_size, args.h_size)
+        for job in pending:
+            checkpoints[job.name] = LUTCheckpoint(checkpoint_dir, keys[job.name], m_grid, h_grid, shape)
+            if checkpoints[job.name].rows_done:
+                print(f"Checkpoint: {job.name} resumes with {checkpoints[job.name].rows_done}/{args.m_size} "
+                      f"rows done ({keys[job.name][:12]})")
+
+    if pending and args.workers > 1:
+        with profile_phase('simulate', ','.join(job.name for job in pending),
+                           sum(simulation_work(job, args.m_size, args.h_size) for job in pending)):
+            results.update(generate_2d_luts_parallel(
+                pending, physics, args.workers,
+                bias_level=bias_level,
+                bias_scale=args.bias_scale,
+                m_size=args.m_size,
+                h_size=args.h_size,
+                h_range=h_range,
+                engine=args.engine,
+                axis_warp=axis_warp,
+                backend=args.backend,
+                derivatives=derivatives,
+                settings={job.name: (settings[job.name][0], settings[job.name][1] * settings[job.name][2])
+                          for job in pending},
+                checkpoints=checkpoints or None,
+                block_rows=block_rows
+            ))
+    else:
+        for job in pending:
+            job_physics, job_bias_level, job_bias_scale = settings[job.name]
+            print(f"\n--- Generating {job.name} ({job.total_substeps} substeps, phase span {job.phase_span/np.pi:.2f}π) ---")
+            if checkpoints:
+                with profile_phase('simulate', job.name, simulation_work(job, args.m_size, args.h_size)):
+                    results[job.name] = generate_2d_lut_checkpointed(
+                        job, checkpoints[job.name], job_physics, job_bias_level * job_bias_scale,
+                        m_grid, h_grid, args.engine, args.backend, derivatives, block_rows
+                    )
+                continue
+            with profile_phase('simulate', job.name, simulation_work(job, args.m_size, args.h_size)):
+                results[job.name] = generate_2d_lut(
+                    name=job.name,
+                    phase_span=job.phase_span,
+                    total_substeps=job.total_substeps,
+                    physics=job_physics,
+                    bias_level=job_bias_level,
+                    bias_scale=job_bias_scale,
+                    m_size=args.m_size,
+                    h_size=args.h_size,
+                    h_range=h_range,
+                    engine=args.engine,
+                    axis_warp=axis_warp,
+                    backend=args.backend,
+                    derivatives=derivatives,
+                    real_substeps=job.real_substeps
+                )
+
+    if cache is not None:
+        for job in pending:
+            with profile_phase('cache-store', job.name):
+                cache.put(keys[job.name], *results[job.name])
+
+    for name, source in duplicates:
+        print(f"Shared: {name} = {source}")
+        results[name] = results[source]
+
+    return results
+
+
+WARP_DENSITY_RATIOS = (2.0, 4.0, 8.0)
+WARP_EDGE_BOOSTS = (0.0, 2.0, 4.0)
+
+
+def bias_slice_levels(n_slices: int, level_range: Tuple[float, float]) -> np.ndarray:
+    """Bias levels of the slices along the bias axis (uniform, endpoints included)"""
+    return np.linspace(level_range[0], level_range[1], n_slices)
+
+
+def build_bias_luts(jobs: List[LUTJob], physics: PhysicsParams, args,
+                    cache: Optional[LUTCache], levels: np.ndarray,
+                    axis_warp: AxisWarp = (None, None)
+                    ) -> Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Build every job with a third axis over bias amplitude.
+
+    Each slice is an ordinary 2D LUT at one bias level, so slices are built,
+    parallelised and cached exactly like fixed-bias LUTs. Slices are stacked
+    slice-major ([bias][M][H]): one slice is a contiguous block, and a lookup
+    only reads the two slices around the current bias amplitude.
+
+    Returns {job name: (b_grid, m_grid, h_grid, lut_M_end, lut_sumM_rest)}
+    with b_grid in bias amplitude units (level * scale).
+    """
+    slices = []
+    for level in levels:
+        print(f"\n=== Bias slice: level={level:.4f} (amplitude {level * args.bias_scale:.3f}) ===")
+        slices.append(build_luts(jobs, physics, args, cache, bias_level=float(level),
+                                 axis_warp=axis_warp))
+
+    b_grid = np.asarray(levels, dtype=np.float64) * args.bias_scale
+    results = {}
+    for job in jobs:
+        m_grid, h_grid = slices[0][job.name][:2]
+        results[job.name] = (
+            b_grid, m_grid, h_grid,
+            np.stack([s[job.name][2] for s in slices]),
+            np.stack([s[job.name][3] for s in slices]),
+        )
+    return results
+
+
+def build_substep_luts(jobs: List[LUTJob], physics: PhysicsParams, args,
+                       cache: Optional[LUTCache], offsets: Tuple[int, int],
+                       axis_warp: AxisWarp = (None, None)
+                       ) -> Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Build every job with a third axis over the substep count.
+
+    Slice k is the ordinary 2D LUT for N + k substeps over the job's phase
+    span (offsets -1..1 are the --variants tables), so all slices of all
+    jobs are built, parallelised and cached in one build_luts() call. A
+    runtime with a fractional substep cursor blends the two slices around
+    its current substep count in one lookup instead of crossfading
+    separate variant LUTs.
+
+    Returns {job name: (n_grid, m_grid, h_grid, lut_M_end, lut_sumM_rest)}
+    with n_grid in substeps.
+    """
+    counts = {job.name: np.arange(job.total_substeps + offsets[0], job.total_substeps + offsets[1] + 1)
+              for job in jobs}
+    slice_jobs = [LUTJob(f"{job.name}@{n}", job.phase_span, int(n), job.real_substeps)
+                  for job in jobs for n in counts[job.name]]
+    print(f"\n=== Substep slices: {', '.join(job.name for job in slice_jobs)} ===")
+    slices = build_luts(slice_jobs, physics, args, cache, axis_warp=axis_warp)
+
+    results = {}
+    for job in jobs:
+        names = [f"{job.name}@{n}" for n in counts[job.name]]
+        m_grid, h_grid = slices[names[0]][:2]
+        results[job.name] = (
+            counts[job.name].astype(np.float64), m_grid, h_grid,
+            np.stack([slices[name][2] for name in names]),
+            np.stack([slices[name][3] for name in names]),
+        )
+    return results
+
+
+def select_axis_warp(jobs: List[LUTJob], physics: PhysicsParams, args,
+                     cache: Optional[LUTCache], n_check: int = 4000,
+                     schemes: Tuple[str, ...] = ('bilinear',)) -> AxisWarp:
+    """
+    Choose (M, H) warp knots for a table of args.m_size x args.h_size.
+
+    Second derivatives of every job's M_end and sumM_rest, measured on a
+    uniform probe at least as dense as the shipped 65x129 grid (usually a
+    cache hit), propose candidate warps per axis (several density floors and
+    edge refinements, see warp_from_curvature()). Each candidate table is
+    built and scored by its measured worst lookup error at random points
+    against exact simulation, under every runtime lookup in schemes
+    (export_lookup_schemes()); the uniform axis stays unless a warp beats it.
+    H is chosen first (with M uniform), then M. One warp pair is shared by
+    all jobs, so they still fit a unified bank.
+    """
+    probe_args = argparse.Namespace(**{**vars(args),
+                                       'm_size': max(args.m_size, 65),
+                                       'h_size': max(args.h_size, 129)})
+    print(f"\n=== Measuring curvature on uniform {probe_args.m_size}x{probe_args.h_size} probe ===")
+    probe = build_luts(jobs, physics, probe_args, cache)
+
+    curv_m = np.zeros(probe_args.m_size - 2)
+    curv_h = np.zeros(probe_args.h_size - 2)
+    for m_grid, h_grid, lut_M_end, lut_sumM_rest in probe.values():
+        for table in (lut_M_end, lut_sumM_rest):
+            curv_m = np.maximum(curv_m, axis_curvature(table, m_grid, axis=0))
+            curv_h = np.maximum(curv_h, axis_curvature(table, h_grid, axis=1))
+
+    h_range = tuple(args.h_range)
+    bias_amplitude = args.bias_level * args.bias_scale
+    rng = np.random.default_rng(0)
+    m_check = rng.uniform(-1.0, 1.0, n_check)
+    h_check = rng.uniform(h_range[0], h_range[1], n_check)
+    exact = {}
+    for job in jobs:
+        bias_lut = remainder_bias_lut(job.phase_span, job.total_substeps, job.real_substeps)
+        M_end, sumM_rest = compute_remainder_response_grid(m_check, h_check, bias_lut, bias_amplitude, physics,
+                                                           backend=args.backend)
+        exact[job.name] = (M_end, sumM_rest, max(np.ptp(M_end), 1e-12), max(np.ptp(sumM_rest), 1e-12))
+
+    def score(axis_warp):
+        """Worst lookup error relative to each table's range, over all jobs"""
+        worst = 0.0
+        for job in jobs:
+            bias_lut = remainder_bias_lut(job.phase_span, job.total_substeps, job.real_substeps)
+            m_grid = axis_grid(-1.0, 1.0, args.m_size, axis_warp[0])
+            h_grid = axis_grid(h_range[0], h_range[1], args.h_size, axis_warp[1])
+            tables = compute_remainder_response_grid(m_grid[:, np.newaxis], h_grid[np.newaxis, :],
+                                                     bias_lut, bias_amplitude, physics, backend=args.backend)
+            M_end, sumM_rest, M_scale, sum_scale = exact[job.name]
+            for table, ref, scale in zip(tables, (M_end, sumM_rest), (M_scale, sum_scale)):
+                for scheme in schemes:
+                    approx = lut_lookup(table, m_check, h_check, (-1.0, 1.0), h_range, axis_warp, scheme)
+                    worst = max(worst, float(np.max(np.abs(approx - ref))) / scale)
+        return worst
+
+    best = (None, None)
+    best_score = uniform_score = score(best)
+    for axis, curvature, probe_grid in ((1, curv_h, h_grid), (0, curv_m, m_grid)):
+        for ratio, edge_boost in ((r, e) for r in WARP_DENSITY_RATIOS for e in WARP_EDGE_BOOSTS):
+            knots = warp_from_curvature(curvature, probe_grid, args.warp_segments, ratio, edge_boost)
+            if knots is None:
+                continue
+            candidate = tuple(knots if i == axis else best[i] for i in range(2))
+            candidate_score = score(candidate)
+            if candidate_score < best_score:
+                best, best_score = candidate, candidate_score
+
+    for name, warp in zip('MH', best):
+        print(f"Axis warp {name}: {'uniform' if warp is None else f'{len(warp) - 1} segments'}")
+    print(f"Measured worst {'/'.join(schemes)} lookup error (relative to table range): "
+          f"{best_score:.3e} warped vs {uniform_score:.3e} uniform")
+    return best
+
+
+def refine_luts(jobs: List[LUTJob], physics: PhysicsParams, args, n_check: int = 4000,
+                schemes: Tuple[str, ...] = ('bilinear',)
+                ) -> Tuple[Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]], AxisWarp]:
+    """
+    Build every job by coarse-to-fine refinement instead of on a fixed grid.
+
+    Both axes start uniform with args.refine_start points on a lattice
+    args.refine_levels halvings finer. Each level simulates the points a
+    uniform doubling would add (edge midpoints and cell centres) and
+    compares them with the lookups of the current table under every
+    runtime lookup in schemes (export_lookup_schemes()). An interval is
+    halved where that error, relative to the table's range and maximised
+    over jobs and schemes, exceeds args.refine; a cell centre over the
+    tolerance halves both of its intervals. Every simulated point is kept
+    (rejected midpoints included) and never simulated again, so a level
+    only adds the points its splits introduce. Refinement stops once no
+    interval exceeds the tolerance or the lattice is exhausted.
+
+    The refined axes are piecewise uniform and are exported exactly as axis
+    warps (warp_from_lattice()), so the tables work with every exporter and
+    runtime lookup like a --warp auto build. One grid is shared by all jobs.
+
+    Returns ({job name: (m_grid, h_grid, lut_M_end, lut_sumM_rest)}, axis_warp).
+    """
+    h_range = tuple(args.h_range)
+    ranges = ((-1.0, 1.0), h_range)
+    bias_amplitude = args.bias_level * args.bias_scale
+    bias_luts = {job.name: remainder_bias_lut(job.phase_span, job.total_substeps, job.real_substeps)
+                 for job in jobs}
+
+    lattice = [(size - 1) << args.refine_levels for size in args.refine_start]
+    values = [lo + (hi - lo) * np.arange(n + 1) / n for (lo, hi), n in zip(ranges, lattice)]
+    known = np.zeros((lattice[0] + 1, lattice[1] + 1), dtype=bool)
+    store = {job.name: (np.zeros(known.shape), np.zeros(known.shape)) for job in jobs}
+    simulated = 0
+
+    def simulate(m_pos, h_pos):
+        """Simulate the points of the m_pos x h_pos block that are not known yet"""
+        nonlocal simulated
+        mi, hi = np.meshgrid(m_pos, h_pos, indexing='ij')
+        missing = ~known[mi, hi]
+        mi, hi = mi[missing], hi[missing]
+        if len(mi) == 0:
+            return
+        for job in jobs:
+            lut_M_end, lut_sumM_rest = store[job.name]
+            with profile_phase('simulate', job.name, len(mi) * (job.total_substeps - job.real_substeps)):
+                lut_M_end[mi, hi], lut_sumM_rest[mi, hi] = compute_remainder_response_grid(
+                    values[0][mi], values[1][hi], bias_luts[job.name], bias_amplitude, physics,
+                    backend=args.backend
+                )
+        known[mi, hi] = True
+        simulated += len(mi)
+
+    print(f"\n=== Refining from {args.refine_start[0]}x{args.refine_start[1]} "
+          f"(tolerance {args.refine:.1e}, up to {args.refine_levels} levels) ===")
+    pos = [np.arange(0, n + 1, 1 << args.refine_levels) for n in lattice]
+    simulate(*pos)
+    for iteration in itertools.count(1):
+        axis_warp = tuple(warp_from_lattice(p, n) for p, n in zip(pos, lattice))
+
+        def lookup_error(m_pos, h_pos):
+            """Lookup error of the current table at the m_pos x h_pos block, relative to its range"""
+            simulate(m_pos, h_pos)
+            mi, hi = np.meshgrid(m_pos, h_pos, indexing='ij')
+            error = np.zeros(mi.shape)
+            if error.size == 0:
+                return error
+            for lut_M_end, lut_sumM_rest in store.values():
+                for table in (lut_M_end, lut_sumM_rest):
+                    current = table[np.ix_(*pos)]
+                    for scheme in schemes:
+                        approx = lut_lookup(current, values[0][mi], values[1][hi], ranges[0], ranges[1],
+                                            axis_warp, scheme)
+                        error = np.maximum(error, np.abs(approx - table[mi, hi]) / max(np.ptp(current), 1e-12))
+            return error
+
+        # Every pass retests all splittable intervals: splitting a neighbour
+        # changes an interval's stencil, and known midpoints cost nothing.
+        # Edge midpoints test one axis. A failing cell centre splits the axis
+        # whose adjacent edge midpoints are worse (both on a tie).
+        mids = [(p[:-1] + p[1:]) // 2 for p in pos]
+        splittable = [np.diff(p) > 1 for p in pos]
+        edge_m = np.zeros((len(mids[0]), len(pos[1])))
+        edge_h = np.zeros((len(pos[0]), len(mids[1])))
+        centre = np.zeros((len(mids[0]), len(mids[1])))
+        edge_m[splittable[0]] = lookup_error(mids[0][splittable[0]], pos[1])
+        edge_h[:, splittable[1]] = lookup_error(pos[0], mids[1][splittable[1]])
+        centre[np.ix_(*splittable)] = lookup_error(mids[0][splittable[0]], mids[1][splittable[1]])
+        cell_m = np.maximum(edge_m[:, :-1], edge_m[:, 1:])
+        cell_h = np.maximum(edge_h[:-1], edge_h[1:])
+        failing = centre > args.refine
+        errors = [np.maximum(edge_m.max(axis=1), np.where(failing & (cell_m >= cell_h), centre, 0.0).max(axis=1)),
+                  np.maximum(edge_h.max(axis=0), np.where(failing & (cell_h >= cell_m), centre, 0.0).max(axis=0))]
+        splits = [error > args.refine for error in errors]
+        print(f"  Pass {iteration}: {len(pos[0])}x{len(pos[1])} grid, max midpoint error "
+              f"{max(edge_m.max(), edge_h.max(), centre.max()):.2e}, splitting "
+              f"{splits[0].sum()}/{splittable[0].sum()} M and {splits[1].sum()}/{splittable[1].sum()} H intervals")
+        if not any(split.any() for split in splits):
+            if not any(s.any() for s in splittable):
+                print("  Lattice exhausted (raise --refine-levels for a finer limit)")
+            break
+        pos = [np.union1d(p, mid[split]) for p, mid, split in zip(pos, mids, splits)]
+        simulate(*pos)
+
+    axis_warp = tuple(warp_from_lattice(p, n) for p, n in zip(pos, lattice))
+    m_grid, h_grid = values[0][pos[0]], values[1][pos[1]]
+    results = {name: (m_grid, h_grid, lut_M_end[np.ix_(*pos)], lut_sumM_rest[np.ix_(*pos)])
+               for name, (lut_M_end, lut_sumM_rest) in store.items()}
+
+    rng = np.random.default_rng(0)
+    m_check = rng.uniform(-1.0, 1.0, n_check)
+    h_check = rng.uniform(h_range[0], h_range[1], n_check)
+    worst = 0.0
+    for job in jobs:
+        exact = compute_remainder_response_grid(m_check, h_check, bias_luts[job.name], bias_amplitude, physics,
+                                                backend=args.backend)
+        for table, ref in zip(results[job.name][2:], exact):
+            for scheme in schemes:
+                approx = lut_lookup(table, m_check, h_check, ranges[0], ranges[1], axis_warp, scheme)
+                worst = max(worst, float(np.max(np.abs(approx - ref))) / max(np.ptp(table), 1e-12))
+
+    table_points = len(m_grid) * len(h_grid)
+    uniform_points = np.prod([n // int(np.diff(p).min()) + 1 for p, n in zip(pos, lattice)])
+    print(f"Refined grid: M[{len(m_grid)}] x H[{len(h_grid)}] = {table_points} points "
+          f"(uniform at the finest spacing: {uniform_points})")
+    for name, warp in zip('MH', axis_warp):
+        print(f"Axis warp {name}: {'uniform' if warp is None else f'{len(warp) - 1} segments'}")
+    print(f"Simulated {simulated} points per LUT ({simulated - table_points} probes not kept in the table)")
+    print(f"Measured worst {'/'.join(schemes)} lookup error (relative to table range): {worst:.3e}")
+    return results, axis_warp
+
+
+class Formulation(NamedTuple):
+    """One tape formulation of a --sweep: physics and bias preset, built into its own bank"""
+    name: str
+    physics: PhysicsParams
+    bias_level: float
+    bias_scale: float
 
-    with open(output_path, 'w') as f:
-        f.write(f"// Auto-generated JA Hysteresis LUT for {name}\n")
-        f.write(f"// Grid: {m_size} x {h_size} = {m_size * h_size} points\n")
-        f.write(f"// Substeps covered: 1..{total_substeps - 1}\n\n")
 
+SWEEP_NAME_CHARS = set('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_.-')
+
+
+def load_sweep(path: Path, bias_level: float, bias_scale: float) -> List[Formulation]:
+    """
+    Read a sweep file (JSON) into formulations.
+
+    "formulations" lists presets, each {"name", "physics": {field: value},
+    "bias_level", "bias_scale"}; "grid" adds the Cartesian product of its
+    "physics" value lists and "bias_level"/"bias_scale" lists, named by the
+    format string "name" (fields: the physics fields, bias_level, bias_scale,
+    index; default "grid{index:03d}"). Anything left out takes the
+    PhysicsParams defaults and the --bias-level/--bias-scale values.
+    """
+    spec = json.loads(Path(path).read_text())
+    unknown = set(spec) - {'formulations', 'grid'}
+    if unknown:
+        raise ValueError(f"{path}: unknown key(s) {', '.join(sorted(unknown))}")
+
+    def formulation(name, physics, level, scale):
+        bad = set(physics) - set(PhysicsParams._fields)
+        if bad:
+            raise ValueError(f"{path}: {name}: unknown physics field(s) {', '.join(sorted(bad))} "
+                             f"(choose from {', '.join(PhysicsParams._fields)})")
+        if not name or not set(name) <= SWEEP_NAME_CHARS:
+            raise ValueError(f"{path}: formulation name {name!r} must be letters, digits, '_', '.' or '-'")
+        return Formulation(name, PhysicsParams(**{k: float(v) for k, v in physics.items()}),
+                           float(level), float(scale))
+
+    formulations = [
+        formulation(entry.get('name', ''), entry.get('physics', {}),
+                    entry.get('bias_level', bias_level), entry.get('bias_scale', bias_scale))
+        for entry in spec.get('formulations', [])
+    ]
+
+    grid = spec.get('grid')
+    if grid is not None:
+        axes = dict(grid.get('physics', {}))
+        axes['bias_level'] = grid.get('bias_level', [bias_level])
+        axes['bias_scale'] = grid.get('bias_scale', [bias_scale])
+        template = grid.get('name', 'grid{index:03d}')
+        for index, values in enumerate(itertools.product(*axes.values())):
+            point = dict(zip(axes, values))
+            level, scale = point.pop('bias_level'), point.pop('bias_scale')
+            name = template.format(index=index, bias_level=level, bias_scale=scale,
+                                   **{**PhysicsParams()._asdict(), **point})
+            formulations.append(formulation(name, point, level, scale))
+
+    names = [f.name for f in formulations]
+    repeated = sorted({name for name in names if names.count(name) > 1})
+    if repeated:
+        raise ValueError(f"{path}: duplicate formulation name(s) {', '.join(repeated)}")
+    if not formulations:
+        raise ValueError(f"{path}: no formulations")
+    return formulations
+
+
+def sweep_bank_name(formulation: Formulation) -> str:
+    return f"JAHysteresisLUTBank_{formulation.name}.jalut"
+
+
+def build_sweep_luts(jobs: List[LUTJob], formulations: List[Formulation], args,
+                     cache: Optional[LUTCache]
+                     ) -> Dict[str, Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]]:
+    """
+    Build every job for every formulation in one build_luts() call.
+
+    All (formulation, job) LUTs go through the same cache lookup and process
+    pool, and formulations that share a table (same physics and bias for a
+    mode) simulate it once. Cache keys do not include the formulation name,
+    so re-running a sweep with one formulation added only simulates that one.
+
+    Returns {formulation name: {job name: (m_grid, h_grid, lut_M_end, lut_sumM_rest)}}.
+    """
+    sweep_jobs = []
+    settings = {}
+    for formulation in formulations:
+        for job in jobs:
+            sweep_job = LUTJob(f"{formulation.name}/{job.name}", *job[1:])
+            sweep_jobs.append(sweep_job)
+            settings[sweep_job.name] = (formulation.physics, formulation.bias_level, formulation.bias_scale)
+
+    print(f"\n=== Sweep: {len(formulations)} formulations x {len(jobs)} LUTs ===")
+    results = build_luts(sweep_jobs, PhysicsParams(), args, cache, settings=settings)
+    return {formulation.name: {job.name: results[f"{formulation.name}/{job.name}"] for job in jobs}
+            for formulation in formulations}
+
+
+def export_sweep_index(formulations: List[Formulation], jobs: List[LUTJob],
+                       results: Dict[str, Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]],
+                       sweep_path: Path, output_dir: Path):
+    """
+    Write the sweep index: JAHysteresisLUTSweep.json (formulation -> bank,
+    physics, bias and per-LUT table hashes) and JAHysteresisLUTFormulations.h,
+    the same list as C++ constants to select a bank and configure the
+    scheduler to match it.
+    """
+    index = {
+        'manifest_version': MANIFEST_VERSION,
+        'sweep': Path(sweep_path).name,
+        'formulations': [
+            {
+                'index': i,
+                'name': formulation.name,
+                'bank': sweep_bank_name(formulation),
+                'physics': formulation.physics._asdict(),
+                'bias': {'level': formulation.bias_level, 'scale': formulation.bias_scale,
+                         'amplitude': formulation.bias_level * formulation.bias_scale},
+                'luts': {
+                    job.name: {
+                        'total_substeps': job.total_substeps,
+                        'real_substeps': job.real_substeps,
+                        'phase_span': float(job.phase_span),
+                        'table_sha256': table_hash(*results[formulation.name][job.name]),
+                    }
+                    for job in jobs
+                },
+            }
+            for i, formulation in enumerate(formulations)
+        ],
+    }
+    index_path = output_dir / "JAHysteresisLUTSweep.json"
+    write_export(index_path, json.dumps(index, indent=2) + "\n", "sweep index", f" ({len(formulations)} formulations)")
+
+    with io.StringIO() as f:
+        f.write(f"// Auto-generated by generate_ja_lut.py --sweep {Path(sweep_path).name}\n")
+        f.write("// Tape formulations: one binary LUT bank each (JAHysteresisLUTFile)\n\n")
         f.write("#pragma once\n\n")
+        f.write("#include \"JAHysteresisSchedulerLUT.h\"\n\n")
         f.write("#include <array>\n\n")
-        f.write(f"namespace JAHysteresisLUT_{name} {{\n\n")
-
-        f.write(f"constexpr int M_SIZE = {m_size};\n")
-        f.write(f"constexpr int H_SIZE = {h_size};\n")
-        f.write(f"constexpr double M_MIN = {m_grid[0]:.6f};\n")
-        f.write(f"constexpr double M_MAX = {m_grid[-1]:.6f};\n")
-        f.write(f"constexpr double H_MIN = {h_grid[0]:.6f};\n")
-        f.write(f"constexpr double H_MAX = {h_grid[-1]:.6f};\n\n")
-
-        # Flatten for 1D array storage
-        flat_M_end = lut_M_end.flatten()
-        flat_sumM_rest = lut_sumM_rest.flatten()
-
-        f.write(f"constexpr std::array<double, {len(flat_M_end)}> LUT_M_END = {{\n")
-        for i, val in enumerate(flat_M_end):
-            f.write(f"    {val:.10e}")
-            if i < len(flat_M_end) - 1:
-                f.write(",")
-            if (i + 1) % 4 == 0:
-                f.write("\n")
+        f.write("namespace JAHysteresisLUTFormulations {\n\n")
+        f.write("struct Formulation\n{\n")
+        f.write("    const char* name;\n")
+        f.write("    const char* bankFile;   // JAHysteresisLUTFile::open()\n")
+        f.write("    JAHysteresisSchedulerLUT::PhysicsParams physics;   // setPhysics() before applyTo()\n")
+        f.write("    double biasLevel;       // setBiasControls() before applyTo()\n")
+        f.write("    double biasScale;\n")
         f.write("};\n\n")
+        f.write("// Real substeps of every bank: setRealSubsteps() before applyTo()\n")
+        f.write(f"constexpr int REAL_SUBSTEPS = {jobs[0].real_substeps};\n\n")
+        f.write(f"constexpr std::array<Formulation, {len(formulations)}> FORMULATIONS = {{{{\n")
+        for formulation in formulations:
+            physics = ", ".join(repr(float(v)) for v in formulation.physics)
+            f.write(f"    {{ \"{formulation.name}\", \"{sweep_bank_name(formulation)}\", {{ {physics} }}, "
+                    f"{formulation.bias_level!r}, {formulation.bias_scale!r} }},\n")
+        f.write("}};\n\n")
+        f.write("} // namespace\n")
+        header_path = output_dir / "JAHysteresisLUTFormulations.h"
+        write_export(header_path, f.getvalue(), "C++ formulations header")
 
-        f.write(f"constexpr std::array<double, {len(flat_sumM_rest)}> LUT_SUM_M_REST = {{\n")
-        for i, val in enumerate(flat_sumM_rest):
-            f.write(f"    {val:.10e}")
-            if i < len(flat_sumM_rest) - 1:
-                f.write(",")
-            if (i + 1) % 4 == 0:
-                f.write("\n")
-        f.write("};\n\n")
 
-        f.write("} // namespace\n")
+def generate_sweep(args, mode_names: List[str], formulations: List[Formulation]):
+    """Build and export one binary bank per sweep formulation (main() with --sweep)"""
+    jobs = resolve_jobs(mode_names, args.variants, args.real_substeps)
 
-    print(f"Exported C++ header: {output_path}")
+    print(f"\n=== JA Hysteresis LUT Sweep ===")
+    print(f"Modes: {', '.join(job.name for job in jobs)}")
+    print(f"Grid: M[{args.m_size}] x H[{args.h_size}], H range: [{args.h_range[0]}, {args.h_range[1]}]")
+    if args.real_substeps > 1:
+        print(f"Real substeps: {args.real_substeps} before the lookup")
+    for formulation in formulations:
+        physics = formulation.physics
+        print(f"  {formulation.name}: Ms={physics.Ms}, a={physics.a_density}, k={physics.k_pinning}, "
+              f"c={physics.c_reversibility}, α={physics.alpha_coupling}, "
+              f"bias level={formulation.bias_level}, scale={formulation.bias_scale}")
 
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    cache = None if args.no_cache else LUTCache(args.cache_dir, int(args.cache_max_mb * 1024 * 1024))
+    results = build_sweep_luts(jobs, formulations, args, cache)
+
+    print(f"\n--- Exporting {len(formulations)} formulation banks ---")
+    for formulation in formulations:
+        with profile_phase('export-binary', formulation.name):
+            export_binary_bank(
+                [(job.name, job.total_substeps, job.phase_span, *results[formulation.name][job.name])
+                 for job in jobs],
+                formulation.physics, formulation.bias_level, formulation.bias_scale,
+                args.output_dir / sweep_bank_name(formulation),
+                real_substeps=jobs[0].real_substeps
+            )
+    export_sweep_index(formulations, jobs, results, args.sweep, args.output_dir)
 
-def export_faust_lib(
-    m_grid: np.ndarray,
-    h_grid: np.ndarray,
-    lut_M_end: np.ndarray,
-    lut_sumM_rest: np.ndarray,
-    name: str,
-    total_substeps: int,
-    output_path: Path
-):
-    """Export LUT as FAUST library file"""
-    m_size, h_size = lut_M_end.shape
+    print("\nDone!")
 
-    # Flatten for 1D waveform storage
-    flat_M_end = lut_M_end.flatten()
-    flat_sumM_rest = lut_sumM_rest.flatten()
-
-    with open(output_path, 'w') as f:
-        f.write(f"// Auto-generated JA Hysteresis LUT for {name}\n")
-        f.write(f"// Grid: {m_size} x {h_size} = {m_size * h_size} points\n")
-        f.write(f"// Substeps covered: 1..{total_substeps - 1}\n\n")
-
-        f.write("import(\"stdfaust.lib\");\n\n")
-
-        prefix = name.lower()
-        f.write(f"// Grid parameters for {name}\n")
-        f.write(f"ja_lut_{prefix}_m_size = {m_size};\n")
-        f.write(f"ja_lut_{prefix}_h_size = {h_size};\n")
-        f.write(f"ja_lut_{prefix}_m_min = {m_grid[0]:.6f};\n")
-        f.write(f"ja_lut_{prefix}_m_max = {m_grid[-1]:.6f};\n")
-        f.write(f"ja_lut_{prefix}_h_min = {h_grid[0]:.6f};\n")
-        f.write(f"ja_lut_{prefix}_h_max = {h_grid[-1]:.6f};\n\n")
-
-        # Write waveform for M_end
-        f.write(f"// M_end LUT ({len(flat_M_end)} values)\n")
-        f.write(f"ja_lut_{prefix}_m_end = waveform{{\n")
-        for i, val in enumerate(flat_M_end):
-            f.write(f"    {val:.10e}")
-            if i < len(flat_M_end) - 1:
-                f.write(",")
-            if (i + 1) % 4 == 0:
-                f.write("\n")
-        f.write("};\n\n")
 
-        # Write waveform for sumM_rest
-        f.write(f"// sumM_rest LUT ({len(flat_sumM_rest)} values)\n")
-        f.write(f"ja_lut_{prefix}_sum_m_rest = waveform{{\n")
-        for i, val in enumerate(flat_sumM_rest):
-            f.write(f"    {val:.10e}")
-            if i < len(flat_sumM_rest) - 1:
-                f.write(",")
-            if (i + 1) % 4 == 0:
-                f.write("\n")
-        f.write("};\n\n")
+def generate(args, mode_names: List[str], formats: Tuple[str, ...]):
+    """Build and export every requested LUT (main() after argument checks)"""
+    physics = PhysicsParams()
 
-        # Write lookup helper functions
-        f.write("// 2D index computation\n")
-        f.write(f"ja_lut_{prefix}_idx(m_idx, h_idx) = m_idx * ja_lut_{prefix}_h_size + h_idx;\n\n")
-
-        f.write("// Normalize M to [0, 1] range\n")
-        f.write(f"ja_lut_{prefix}_m_norm(m) = (m - ja_lut_{prefix}_m_min) / (ja_lut_{prefix}_m_max - ja_lut_{prefix}_m_min);\n\n")
-
-        f.write("// Normalize H to [0, 1] range\n")
-        f.write(f"ja_lut_{prefix}_h_norm(h) = (h - ja_lut_{prefix}_h_min) / (ja_lut_{prefix}_h_max - ja_lut_{prefix}_h_min);\n\n")
-
-        # Write 1D Catmull-Rom helper function
-        f.write("// 1D Catmull-Rom interpolation: p0,p1,p2,p3 are 4 consecutive points, t in [0,1]\n")
-        f.write(f"ja_catmull_rom_{prefix}(p0, p1, p2, p3, t) = 0.5 * (\n")
-        f.write("    2.0*p1 +\n")
-        f.write("    (-p0 + p2) * t +\n")
-        f.write("    (2.0*p0 - 5.0*p1 + 4.0*p2 - p3) * t * t +\n")
-        f.write("    (-p0 + 3.0*p1 - 3.0*p2 + p3) * t * t * t\n")
-        f.write(");\n\n")
-
-        # Write Catmull-Rom interpolation for M_end table
-        f.write("// Separable Catmull-Rom interpolation lookup for M_end\n")
-        f.write(f"ja_lookup_m_end_{prefix}(m, h) = result\n")
-        f.write("with {\n")
-        f.write(f"    m_n = max(0.0, min(1.0, ja_lut_{prefix}_m_norm(m)));\n")
-        f.write(f"    h_n = max(0.0, min(1.0, ja_lut_{prefix}_h_norm(h)));\n")
-        f.write("    \n")
-        f.write(f"    m_scaled = m_n * (ja_lut_{prefix}_m_size - 1);\n")
-        f.write(f"    h_scaled = h_n * (ja_lut_{prefix}_h_size - 1);\n")
-        f.write("    \n")
-        f.write("    m_idx = int(floor(m_scaled));\n")
-        f.write("    h_idx = int(floor(h_scaled));\n")
-        f.write("    \n")
-        f.write("    m_frac = m_scaled - float(m_idx);\n")
-        f.write("    h_frac = h_scaled - float(h_idx);\n")
-        f.write("    \n")
-        f.write("    // Clamp indices for 4x4 Catmull-Rom (need p-1, p, p+1, p+2)\n")
-        f.write(f"    m0 = max(0, m_idx - 1);\n")
-        f.write(f"    m1 = max(0, min(m_idx, ja_lut_{prefix}_m_size - 1));\n")
-        f.write(f"    m2 = max(0, min(m_idx + 1, ja_lut_{prefix}_m_size - 1));\n")
-        f.write(f"    m3 = min(m_idx + 2, ja_lut_{prefix}_m_size - 1);\n")
-        f.write("    \n")
-        f.write(f"    h0 = max(0, h_idx - 1);\n")
-        f.write(f"    h1 = max(0, min(h_idx, ja_lut_{prefix}_h_size - 1));\n")
-        f.write(f"    h2 = max(0, min(h_idx + 1, ja_lut_{prefix}_h_size - 1));\n")
-        f.write(f"    h3 = min(h_idx + 2, ja_lut_{prefix}_h_size - 1);\n")
-        f.write("    \n")
-        f.write("    // Fetch 16 points (4x4 grid)\n")
-        for mi in range(4):
-            for hi in range(4):
-                f.write(f"    v{mi}{hi} = ja_lut_{prefix}_m_end, ja_lut_{prefix}_idx(m{mi}, h{hi}) : rdtable;\n")
-        f.write("    \n")
-        f.write("    // Interpolate 4 columns along H axis\n")
-        for mi in range(4):
-            f.write(f"    col{mi} = ja_catmull_rom_{prefix}(v{mi}0, v{mi}1, v{mi}2, v{mi}3, h_frac);\n")
-        f.write("    \n")
-        f.write("    // Interpolate along M axis\n")
-        f.write(f"    result = ja_catmull_rom_{prefix}(col0, col1, col2, col3, m_frac);\n")
-        f.write("};\n\n")
+    print(f"\n=== JA Hysteresis LUT Generator ===")
+    for mode_name in mode_names:
+        mode = MODES[mode_name]
+        print(f"Mode: {mode.name} (base: {mode.total_substeps} substeps)")
+        print(f"Phase span: {mode.phase_span:.4f} rad ({mode.phase_span/np.pi:.2f}π)")
+    print(f"Physics: Ms={physics.Ms}, a={physics.a_density}, k={physics.k_pinning}, c={physics.c_reversibility}, α={physics.alpha_coupling}")
+    if args.refine is None:
+        print(f"Grid: M[{args.m_size}] x H[{args.h_size}]")
+    else:
+        print(f"Grid: refined from M[{args.refine_start[0]}] x H[{args.refine_start[1]}] to tolerance {args.refine}")
+    print(f"H range: [{args.h_range[0]}, {args.h_range[1]}]")
+    print(f"Bias: level={args.bias_level}, scale={args.bias_scale}")
+    if args.real_substeps > 1:
+        print(f"Real substeps: {args.real_substeps} before the lookup")
 
-        # Write Catmull-Rom interpolation for sumM_rest table
-        f.write("// Separable Catmull-Rom interpolation lookup for sumM_rest\n")
-        f.write(f"ja_lookup_sum_m_rest_{prefix}(m, h) = result\n")
-        f.write("with {\n")
-        f.write(f"    m_n = max(0.0, min(1.0, ja_lut_{prefix}_m_norm(m)));\n")
-        f.write(f"    h_n = max(0.0, min(1.0, ja_lut_{prefix}_h_norm(h)));\n")
-        f.write("    \n")
-        f.write(f"    m_scaled = m_n * (ja_lut_{prefix}_m_size - 1);\n")
-        f.write(f"    h_scaled = h_n * (ja_lut_{prefix}_h_size - 1);\n")
-        f.write("    \n")
-        f.write("    m_idx = int(floor(m_scaled));\n")
-        f.write("    h_idx = int(floor(h_scaled));\n")
-        f.write("    \n")
-        f.write("    m_frac = m_scaled - float(m_idx);\n")
-        f.write("    h_frac = h_scaled - float(h_idx);\n")
-        f.write("    \n")
-        f.write("    // Clamp indices for 4x4 Catmull-Rom\n")
-        f.write(f"    m0 = max(0, m_idx - 1);\n")
-        f.write(f"    m1 = max(0, min(m_idx, ja_lut_{prefix}_m_size - 1));\n")
-        f.write(f"    m2 = max(0, min(m_idx + 1, ja_lut_{prefix}_m_size - 1));\n")
-        f.write(f"    m3 = min(m_idx + 2, ja_lut_{prefix}_m_size - 1);\n")
-        f.write("    \n")
-        f.write(f"    h0 = max(0, h_idx - 1);\n")
-        f.write(f"    h1 = max(0, min(h_idx, ja_lut_{prefix}_h_size - 1));\n")
-        f.write(f"    h2 = max(0, min(h_idx + 1, ja_lut_{prefix}_h_size - 1));\n")
-        f.write(f"    h3 = min(h_idx + 2, ja_lut_{prefix}_h_size - 1);\n")
-        f.write("    \n")
-        f.write("    // Fetch 16 points (4x4 grid)\n")
-        for mi in range(4):
-            for hi in range(4):
-                f.write(f"    v{mi}{hi} = ja_lut_{prefix}_sum_m_rest, ja_lut_{prefix}_idx(m{mi}, h{hi}) : rdtable;\n")
-        f.write("    \n")
-        f.write("    // Interpolate 4 columns along H axis\n")
-        for mi in range(4):
-            f.write(f"    col{mi} = ja_catmull_rom_{prefix}(v{mi}0, v{mi}1, v{mi}2, v{mi}3, h_frac);\n")
-        f.write("    \n")
-        f.write("    // Interpolate along M axis\n")
-        f.write(f"    result = ja_catmull_rom_{prefix}(col0, col1, col2, col3, m_frac);\n")
-        f.write("};\n")
-
-    print(f"Exported FAUST library: {output_path}")
-
-
-def generate_single_lut(name: str, phase_span: float, total_substeps: int,
-                        physics: PhysicsParams, args, output_dir: Path):
-    """Generate a single LUT with given parameters"""
-    print(f"\n--- Generating {name} ({total_substeps} substeps, phase span {phase_span/np.pi:.2f}π) ---")
-
-    m_grid, h_grid, lut_M_end, lut_sumM_rest = generate_2d_lut(
-        name=name,
-        phase_span=phase_span,
-        total_substeps=total_substeps,
-        physics=physics,
-        bias_level=args.bias_level,
-        bias_scale=args.bias_scale,
-        m_size=args.m_size,
-        h_size=args.h_size,
-        h_range=tuple(args.h_range)
-    )
+    if args.variants:
+        print(f"\n=== VARIANT MODE: Generating N-1, N, N+1 ===")
 
-    cpp_path = output_dir / f"JAHysteresisLUT_{name}.h"
-    faust_path = output_dir / f"ja_lut_{name.lower()}.lib"
+    # Create output directory
+    args.output_dir.mkdir(parents=True, exist_ok=True)
 
-    export_cpp_header(m_grid, h_grid, lut_M_end, lut_sumM_rest, name, total_substeps, cpp_path)
-    export_faust_lib(m_grid, h_grid, lut_M_end, lut_sumM_rest, name, total_substeps, faust_path)
+    jobs = resolve_jobs(mode_names, args.variants, args.real_substeps)
+    cache = None if args.no_cache else LUTCache(args.cache_dir, int(args.cache_max_mb * 1024 * 1024))
+
+    axis_warp = (None, None)
+    if args.warp == 'auto':
+        with profile_phase('warp'):
+            axis_warp = select_axis_warp(jobs, physics, args, cache,
+                                         schemes=export_lookup_schemes(formats, args.lookup, args.faust_kernel))
+
+    if args.bias_slices or args.substep_axis:
+        if args.bias_slices:
+            levels = bias_slice_levels(args.bias_slices, tuple(args.bias_level_range))
+            print(f"Bias axis: {args.bias_slices} slices, level [{levels[0]}, {levels[-1]}]")
+            results = build_bias_luts(jobs, physics, args, cache, levels, axis_warp)
+            axis = 'bias'
+        else:
+            print(f"Substep axis: N{args.substep_axis[0]:+d}..N{args.substep_axis[1]:+d} substeps")
+            results = build_substep_luts(jobs, physics, args, cache, tuple(args.substep_axis), axis_warp)
+            axis = 'substep'
+        for job in jobs:
+            print(f"\n--- Exporting {job.name} {axis} axis ({job.total_substeps} substeps, phase span {job.phase_span/np.pi:.2f}π) ---")
+            s_grid, m_grid, h_grid, lut_M_end, lut_sumM_rest = results[job.name]
+            with profile_phase('manifest', job.name):
+                manifest = lut_manifest(job, m_grid, h_grid, lut_M_end, lut_sumM_rest, physics, args, axis_warp,
+                                        axis, s_grid)
+            files = export_lut_slices(job, *results[job.name], args.output_dir, formats, axis_warp, axis, manifest,
+                                      args.faust_kernel)
+            export_manifest(manifest, args.output_dir, files)
+
+        print("\nDone!")
+        return
+
+    if args.refine is not None:
+        with profile_phase('refine'):
+            results, axis_warp = refine_luts(jobs, physics, args, schemes=export_lookup_schemes(
+                formats, args.lookup, args.faust_kernel))
+    else:
+        results = build_luts(jobs, physics, args, cache, axis_warp=axis_warp,
+                             derivatives=args.lookup == 'hermite')
+
+    # Export serially in job order so output is identical to a serial run
+    manifests = {}
+    files = {}
+    for job in jobs:
+        print(f"\n--- Exporting {job.name} ({job.total_substeps} substeps, phase span {job.phase_span/np.pi:.2f}π) ---")
+        symmetry = None
+        if args.symmetry_report:
+            with profile_phase('symmetry-report', job.name):
+                symmetry = report_symmetry(job, *results[job.name], physics, args.bias_level * args.bias_scale,
+                                           args.symmetry_tol, backend=args.backend)
+        with profile_phase('manifest', job.name):
+            manifests[job.name] = lut_manifest(job, *results[job.name], physics, args, axis_warp,
+                                               symmetry=symmetry)
+        files[job.name] = export_lut(job, *results[job.name], args.output_dir, formats, axis_warp, args.dtype,
+                                     args.lookup, args.layout, manifests[job.name], args.svd_tol,
+                                     args.faust_kernel)
+        if args.lookup == 'svd':
+            with profile_phase('svd-report', job.name):
+                report_svd_compression(job, *results[job.name], physics, args.bias_level * args.bias_scale,
+                                       axis_warp, args.dtype, args.svd_tol, args.backend)
+        elif args.dtype != 'float64' or args.dtype_report:
+            with profile_phase('dtype-report', job.name):
+                report_dtype_errors(job, *results[job.name], physics, args.bias_level * args.bias_scale,
+                                    axis_warp, lookup=args.lookup,
+                                    schemes=export_lookup_schemes(formats, args.lookup, args.faust_kernel))
+
+    if 'faust-unified' in formats:
+        print(f"\n--- Exporting unified FAUST bank ---")
+        with profile_phase('export-faust-unified', ','.join(job.name for job in jobs)):
+            export_faust_unified_lib(
+                [(job.name, job.total_substeps, job.phase_span, *results[job.name]) for job in jobs],
+                args.output_dir / "ja_lut_unified.lib",
+                axis_warp,
+                args.dtype,
+                args.lookup,
+                args.layout,
+                manifests[jobs[0].name],
+                args.real_substeps,
+                args.svd_tol,
+                args.faust_kernel
+            )
+        for job in jobs:
+            files[job.name].append("ja_lut_unified.lib")
+
+    if 'binary' in formats:
+        bin_name = f"JAHysteresisLUT_{jobs[0].name}.jalut" if len(jobs) == 1 else "JAHysteresisLUTBank.jalut"
+        print(f"\n--- Exporting binary bank ---")
+        with profile_phase('export-binary', ','.join(job.name for job in jobs)):
+            export_binary_bank(
+                [(job.name, job.total_substeps, job.phase_span, *results[job.name]) for job in jobs],
+                physics, args.bias_level, args.bias_scale, args.output_dir / bin_name,
+                axis_warp, args.real_substeps
+            )
+        for job in jobs:
+            files[job.name].append(bin_name)
 
-    print(f"  M_end range: [{lut_M_end.min():.6f}, {lut_M_end.max():.6f}]")
-    print(f"  sumM_rest range: [{lut_sumM_rest.min():.6f}, {lut_sumM_rest.max():.6f}]")
-    print(f"  Memory: {lut_M_end.nbytes * 2 / 1024:.1f} KB")
+    for job in jobs:
+        export_manifest(manifests[job.name], args.output_dir, files[job.name])
 
-    return m_grid, h_grid, lut_M_end, lut_sumM_rest
+    if len(jobs) > 1:
+        print(f"\n=== Generated {len(jobs)} LUTs ===")
+        for job in jobs:
+            print(f"  {job.name}: {job.total_substeps} substeps")
+
+    print("\nDone!")
 
 
 def main():
     parser = argparse.ArgumentParser(description='Generate JA Hysteresis 2D LUT')
     parser.add_argument('--mode', choices=list(MODES.keys()), default='K121',
                         help='Bias mode (default: K121)')
+    mode_group = parser.add_mutually_exclusive_group()
+    mode_group.add_argument('--modes', type=str,
+                            help='Comma-separated modes to build in one run, e.g. K28,K121 (overrides --mode)')
+    mode_group.add_argument('--all-modes', action='store_true',
+                            help='Build every mode K28..K2101 in one run (overrides --mode)')
     parser.add_argument('--variants', action='store_true',
                         help='Generate N-1, N, N+1 variants (same phase span, different substeps)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Worker processes; >1 builds all jobs as M-row blocks on a process pool (default: 1)')
     parser.add_argument('--m-size', type=int, default=65,
                         help='M grid size (default: 65)')
     parser.add_argument('--h-size', type=int, default=129,
                         help='H grid size (default: 129)')
     parser.add_argument('--h-range', type=float, nargs=2, default=[-1.0, 1.0],
-                        help='H audio range (default: -1.0 1.0)')
+                        help='H audio range, symmetric about 0 for modes with bias phase pi states '
+                             '(default: -1.0 1.0)')
     parser.add_argument('--bias-level', type=float, default=0.41,
                         help='Bias level (default: 0.41)')
     parser.add_argument('--bias-scale', type=float, default=11.0,
                         help='Bias scale (default: 11.0)')
+    parser.add_argument('--bias-slices', type=int, default=0,
+                        help='Add a bias-amplitude axis with this many slices (>=2) for runtime bias control; '
+                             'exports *_Bias.h / ja_lut_*_bias.lib (default: 0, fixed bias)')
+    parser.add_argument('--bias-level-range', type=float, nargs=2, default=[0.0, 1.0],
+                        help='Bias level range covered by the bias axis (default: 0.0 1.0, the runtime clamp)')
+    parser.add_argument('--substep-axis', type=int, nargs=2, metavar=('LO', 'HI'),
+                        help='Add a substep-count axis with slices for N+LO..N+HI substeps over the same phase '
+                             'span, for a fractional substep cursor; exports *_Substeps.h / ja_lut_*_substeps.lib '
+                             '(-1 1 replaces the three --variants LUTs)')
+    parser.add_argument('--real-substeps', type=int, default=1, metavar='R',
+                        help='Substeps the runtime computes with real physics before the lookup; the LUT '
+                             'covers substeps R..N-1 (default: 1)')
+    parser.add_argument('--warp', choices=['none', 'auto'], default='none',
+                        help="Axis spacing: uniform, or non-uniform warps fitted to the measured "
+                             "curvature of M_end/sumM_rest (default: none)")
+    parser.add_argument('--warp-segments', type=int, default=16,
+                        help='Piecewise-linear segments per warped axis (default: 16)')
+    parser.add_argument('--refine', type=float, metavar='TOL',
+                        help='Build by coarse-to-fine refinement instead of on a fixed --m-size x --h-size grid: '
+                             'halve intervals whose lookup error, relative to the table range, exceeds TOL '
+                             '(exported as axis warps)')
+    parser.add_argument('--refine-start', type=int, nargs=2, default=[9, 17], metavar=('M', 'H'),
+                        help='Coarsest grid for --refine (default: 9 17)')
+    parser.add_argument('--refine-levels', type=int, default=4,
+                        help='Maximum halvings per axis for --refine (default: 4, up to 129x257)')
+    parser.add_argument('--engine', choices=['vector', 'scalar'], default='vector',
+                        help='Simulation engine: lockstep NumPy grid or per-point scalar reference (default: vector)')
+    parser.add_argument('--backend', choices=['auto', *BACKENDS], default='auto',
+                        help='Vector engine backend: NumPy arrays or compiled Numba kernel; '
+                             'auto uses numba when installed (default: auto)')
+    parser.add_argument('--dtype', choices=LUT_DTYPES, default='float64',
+                        help='Table storage precision for cpp/faust/faust-unified; int16 adds a per-table '
+                             'scale and offset (default: float64)')
+    parser.add_argument('--lookup', choices=LUT_LOOKUPS, default='stencil',
+                        help='Exported lookup for cpp/faust/faust-unified: node values (bilinear in C++, '
+                             '--faust-kernel in FAUST), 16 precomputed bicubic coefficients per cell '
+                             '(one contiguous fetch, 16x memory), or node values with exact derivatives '
+                             'for a bicubic Hermite patch (4x memory, much smaller grids), or truncated-SVD '
+                             'factors per axis at the rank --svd-tol needs (default: stencil)')
+    parser.add_argument('--faust-kernel', choices=FAUST_KERNELS, default='bilinear',
+                        help='Interpolation of node tables (--lookup stencil) in the faust and faust-unified '
+                             'lookups: bilinear like the C++ scheduler, or a 4x4 Catmull-Rom stencil '
+                             '(default: bilinear)')
+    parser.add_argument('--svd-tol', type=float, default=SVD_TOL, metavar='TOL',
+                        help='Node error budget of --lookup svd relative to each table\'s range; sets the '
+                             f'SVD rank per table and mode (default: {SVD_TOL:g})')
+    parser.add_argument('--layout', choices=LUT_LAYOUTS, default='separate',
+                        help='Table layout for cpp/faust/faust-unified: one table per output, or both '
+                             'interleaved with a fused lookup returning M_end and sumM_rest (default: separate)')
+    parser.add_argument('--symmetry-tol', type=float, default=SYMMETRY_TOL, metavar='TOL',
+                        help='Largest phase-flip residual, relative to each table\'s range, that '
+                             f'--symmetry-report accepts for the pi-state mirror (default: {SYMMETRY_TOL:g})')
+    parser.add_argument('--symmetry-report', action='store_true',
+                        help='Report the phase-flip residual of every mode, which the pi-state mirror relies on')
+    parser.add_argument('--dtype-report', action='store_true',
+                        help='Report the output error of every reduced precision (implied by --dtype)')
     parser.add_argument('--output-dir', type=Path, default=Path('.'),
                         help='Output directory (default: current)')
+    parser.add_argument('--formats', type=str, default='cpp,faust',
+                        help='Comma-separated export formats: cpp, faust, faust-unified, binary (default: cpp,faust)')
+    parser.add_argument('--cache-dir', type=Path, default=Path(__file__).parent / '.lut_cache',
+                        help='LUT array cache directory (default: scripts/.lut_cache)')
+    parser.add_argument('--cache-max-mb', type=float, default=512.0,
+                        help='Evict least recently used cache entries above this size (default: 512)')
+    parser.add_argument('--checkpoint-dir', type=Path, metavar='DIR',
+                        help='Build out of core: stream finished M rows into memory-mapped .npy tables under '
+                             'DIR/<cache key>/ with a record of the rows done, resume an interrupted build '
+                             'and export from the memmaps')
+    parser.add_argument('--checkpoint-rows', type=int, default=CHECKPOINT_ROWS, metavar='N',
+                        help=f'M rows per checkpointed block (default: {CHECKPOINT_ROWS})')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Always re-simulate and do not touch the cache')
+    parser.add_argument('--profile', type=Path, nargs='?', const=Path('ja_lut_profile.json'), metavar='REPORT',
+                        help='Record wall time, throughput and peak memory per phase, mode and variant, '
+                             'and write a JSON report (default: ja_lut_profile.json)')
+    parser.add_argument('--sweep', type=Path, metavar='FILE',
+                        help='Build one binary bank per tape formulation (physics and bias preset) listed '
+                             'in the JSON sweep FILE, for the selected modes, plus JAHysteresisLUTSweep.json '
+                             'and JAHysteresisLUTFormulations.h; --formats is not used. Every bank entry '
+                             'records its physics, bias and --real-substeps, so JAHysteresisLUTFile::applyTo() '
+                             'rejects a bank paired with other settings')
+    parser.add_argument('--modes-header', type=Path, metavar='PATH',
+                        help='Write the C++ mode table (JAHysteresisLUTModes.h, included by '
+                             'JAHysteresisSchedulerLUT.cpp) to PATH and exit')
+    parser.add_argument('--cprofile', type=Path, metavar='STATS',
+                        help='Also capture a cProfile of the run to STATS (pstats format); '
+                             'the --profile report then lists the top functions')
 
     args = parser.parse_args()
 
-    mode = MODES[args.mode]
-    physics = PhysicsParams()
-
-    print(f"\n=== JA Hysteresis LUT Generator ===")
-    print(f"Mode: {mode.name} (base: {mode.total_substeps} substeps)")
-    print(f"Phase span: {mode.phase_span:.4f} rad ({mode.phase_span/np.pi:.2f}π)")
-    print(f"Physics: Ms={physics.Ms}, a={physics.a_density}, k={physics.k_pinning}, c={physics.c_reversibility}, α={physics.alpha_coupling}")
-    print(f"Grid: M[{args.m_size}] x H[{args.h_size}]")
-    print(f"H range: [{args.h_range[0]}, {args.h_range[1]}]")
-    print(f"Bias: level={args.bias_level}, scale={args.bias_scale}")
-
-    if args.variants:
-        print(f"\n=== VARIANT MODE: Generating N-1, N, N+1 ===")
-
-    # Create output directory
-    args.output_dir.mkdir(parents=True, exist_ok=True)
-
-    if args.variants:
-        # Generate N-1, N, N+1 variants with SAME phase span
-        variants = mode.get_variants()
-        for variant in variants:
-            generate_single_lut(
-                name=variant.name,
-                phase_span=variant.phase_span,
-                total_substeps=variant.total_substeps,
-                physics=physics,
-                args=args,
-                output_dir=args.output_dir
-            )
-        print(f"\n=== Generated {len(variants)} variants ===")
-        for v in variants:
-            print(f"  {v.name}: {v.total_substeps} substeps")
+    if args.modes_header is not None:
+        export_cpp_modes_header(args.modes_header)
+        return
+
+    if args.all_modes:
+        mode_names = list(MODES.keys())
+    elif args.modes:
+        mode_names = [m.strip() for m in args.modes.split(',') if m.strip()]
+        unknown = [m for m in mode_names if m not in MODES]
+        if unknown:
+            parser.error(f"unknown mode(s): {', '.join(unknown)} (choose from {', '.join(MODES)})")
     else:
-        # Generate single LUT (original behavior)
-        generate_single_lut(
-            name=mode.name,
-            phase_span=mode.phase_span,
-            total_substeps=mode.total_substeps,
-            physics=physics,
-            args=args,
-            output_dir=args.output_dir
-        )
-
-    print("\nDone!")
+        mode_names = [args.mode]
+    try:
+        resolve_jobs(mode_names, args.variants)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.workers < 1:
+        parser.error("--workers must be >= 1")
+    formats = tuple(f.strip() for f in args.formats.split(',') if f.strip())
+    unknown = [f for f in formats if f not in EXPORT_FORMATS]
+    if unknown:
+        parser.error(f"unknown format(s): {', '.join(unknown)} (choose from {', '.join(EXPORT_FORMATS)})")
+
+    if args.warp_segments < 1:
+        parser.error("--warp-segments must be >= 1")
+    if args.h_range[0] != -args.h_range[1]:
+        mirrored = [m for m in mode_names
+                    if len(bias_phase_states(MODES[m].phase_span, MODES[m].total_substeps)[0]) > 1]
+        if mirrored:
+            parser.error(f"--h-range must be symmetric (-X X): {', '.join(mirrored)} samples starting at bias "
+                         f"phase pi read the table at (-M, -H)")
+    sliced = args.bias_slices or args.substep_axis
+    if args.refine is not None:
+        if args.refine <= 0.0:
+            parser.error("--refine must be > 0")
+        if min(args.refine_start) < 2 or args.refine_levels < 1:
+            parser.error("--refine-start needs >= 2 points per axis and --refine-levels >= 1")
+        if args.warp != 'none' or sliced or args.lookup == 'hermite':
+            parser.error("--refine chooses its own non-uniform axes: it does not combine with --warp, "
+                         "--bias-slices, --substep-axis or --lookup hermite")
+    if args.dtype != 'float64':
+        unsupported = [f for f in formats if f not in ('cpp', 'faust', 'faust-unified')]
+        if unsupported or sliced:
+            parser.error(f"--dtype {args.dtype} supports only the cpp, faust and faust-unified formats "
+                         f"without --bias-slices or --substep-axis")
+    if args.lookup != 'stencil':
+        unsupported = [f for f in formats if f not in ('cpp', 'faust', 'faust-unified')]
+        if unsupported or sliced or args.dtype == 'int16':
+            parser.error(f"--lookup {args.lookup} supports only the cpp, faust and faust-unified formats "
+                         f"without --bias-slices, --substep-axis or --dtype int16")
+        if args.lookup == 'hermite' and args.warp != 'none':
+            parser.error("--lookup hermite needs uniform axes (no --warp)")
+        if args.lookup == 'svd' and args.layout != 'separate':
+            parser.error("--lookup svd factors each table at its own rank: use --layout separate")
+    if args.svd_tol <= 0.0:
+        parser.error("--svd-tol must be > 0")
+    if args.checkpoint_rows < 1:
+        parser.error("--checkpoint-rows must be >= 1")
+    if args.checkpoint_dir is not None and args.refine is not None:
+        parser.error("--checkpoint-dir builds fixed grids: it does not combine with --refine")
+    if args.symmetry_tol < 0.0:
+        parser.error("--symmetry-tol must be >= 0")
+    if args.layout != 'separate':
+        unsupported = [f for f in formats if f not in ('cpp', 'faust', 'faust-unified')]
+        if unsupported or sliced:
+            parser.error(f"--layout {args.layout} supports only the cpp, faust and faust-unified formats "
+                         f"without --bias-slices or --substep-axis")
+    if args.bias_slices:
+        if args.bias_slices < 2:
+            parser.error("--bias-slices must be >= 2")
+        if args.bias_level_range[1] <= args.bias_level_range[0]:
+            parser.error("--bias-level-range must be increasing")
+        unsupported = [f for f in formats if f not in ('cpp', 'faust')]
+        if unsupported:
+            parser.error(f"format(s) {', '.join(unsupported)} do not support --bias-slices")
+    if 'faust-unified' in formats and (args.variants or mode_names != list(MODES)):
+        parser.error("faust-unified indexes the modes 0-9 of jahysteresis.lib: it needs --all-modes "
+                     "without --variants")
+    if args.substep_axis:
+        if args.bias_slices or args.variants:
+            parser.error("--substep-axis does not combine with --bias-slices or --variants")
+        if args.substep_axis[1] <= args.substep_axis[0]:
+            parser.error("--substep-axis needs LO < HI")
+        if min(MODES[m].total_substeps for m in mode_names) + args.substep_axis[0] < 2:
+            parser.error("--substep-axis LO leaves fewer than 2 substeps")
+        unsupported = [f for f in formats if f not in ('cpp', 'faust')]
+        if unsupported:
+            parser.error(f"format(s) {', '.join(unsupported)} do not support --substep-axis")
+
+    formulations = None
+    if args.sweep is not None:
+        if (sliced or args.refine is not None or args.warp != 'none' or args.dtype != 'float64'
+                or args.lookup != 'stencil' or args.layout != 'separate'):
+            parser.error("--sweep builds plain float64 binary banks: it does not combine with --bias-slices, "
+                         "--substep-axis, --refine, --warp, --dtype, --lookup or --layout")
+        try:
+            formulations = load_sweep(args.sweep, args.bias_level, args.bias_scale)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            parser.error(f"--sweep: {e}")
+
+    if args.real_substeps != 1:
+        if args.real_substeps < 1:
+            parser.error("--real-substeps must be >= 1")
+        fewest = min(MODES[m].total_substeps for m in mode_names) - (1 if args.variants else 0)
+        if args.substep_axis:
+            fewest += args.substep_axis[0]
+        if args.real_substeps >= fewest:
+            parser.error(f"--real-substeps must leave at least one LUT substep (fewest substeps: {fewest})")
+
+    try:
+        args.backend = resolve_backend(args.backend)
+    except ValueError as e:
+        parser.error(str(e))
+
+    global _active_profile
+    if args.profile is not None or args.cprofile is not None:
+        _active_profile = GeneratorProfile(cprofile=args.cprofile is not None)
+        ja_lut_export.write_hook = _active_profile.record_write
+    if formulations is not None:
+        generate_sweep(args, mode_names, formulations)
+    else:
+        generate(args, mode_names, formats)
+    if _active_profile is not None:
+        report = _active_profile.finish(args, args.cprofile)
+        _active_profile = None
+        ja_lut_export.write_hook = None
+        print_profile(report)
+        if args.profile is not None:
+            args.profile.write_text(json.dumps(report, indent=2) + "\n")
+            print(f"\nWrote {args.profile} ({len(report['phases'])} phases)")
+        if args.cprofile is not None:
+            print(f"Wrote {args.cprofile} (view with: python -m pstats {args.cprofile})")
 
 
 if __name__ == '__main__':
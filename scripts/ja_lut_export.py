@@ -0,0 +1,1458 @@
+"""
+JA Hysteresis LUT Export Formats
+
+The stored forms of a generated LUT (node values, bicubic coefficients,
+Hermite nodes, truncated-SVD factors, quantised storage) and their
+exports: C++ headers, FAUST libraries (per mode, unified bank and
+third-axis slices), the memory-mappable binary bank and the JSON
+manifests. generate_ja_lut.py builds the tables and calls these writers.
+"""
+
+import numpy as np
+import io
+import json
+import struct
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from ja_lut_modes import MODES, bias_phase_states
+
+
+# (M, H) axis warp knots; None means a uniform axis
+AxisWarp = Tuple[Optional[np.ndarray], Optional[np.ndarray]]
+
+
+# Power basis of the 1D Catmull-Rom polynomial (generate_ja_lut.catmull_rom()):
+# p(t) = [1, t, t^2, t^3] @ CATMULL_ROM_BASIS @ [p0, p1, p2, p3]
+CATMULL_ROM_BASIS = 0.5 * np.array([[0.0, 2.0, 0.0, 0.0],
+                                    [-1.0, 0.0, 1.0, 0.0],
+                                    [2.0, -5.0, 4.0, -1.0],
+                                    [-1.0, 3.0, -3.0, 1.0]])
+
+
+def bicubic_coefficients(table: np.ndarray) -> np.ndarray:
+    """
+    Precompute the clamped-stencil Catmull-Rom lookup as one bicubic
+    polynomial per grid cell, shaped (m_size - 1, h_size - 1, 16):
+    coefficient [i * 4 + j] multiplies m_frac^i * h_frac^j.
+
+    A lookup then reads one contiguous 16-value block and runs Horner's
+    scheme instead of gathering a 4x4 stencil from four table rows and
+    blending it with five Catmull-Rom evaluations.
+    """
+    m_size, h_size = table.shape
+    stencil = np.arange(-1, 3)
+    rows = np.clip(np.arange(m_size - 1)[:, np.newaxis] + stencil, 0, m_size - 1)
+    cols = np.clip(np.arange(h_size - 1)[:, np.newaxis] + stencil, 0, h_size - 1)
+    points = table[rows[:, np.newaxis, :, np.newaxis], cols[np.newaxis, :, np.newaxis, :]]
+    coeffs = np.einsum('ia,mhab,jb->mhij', CATMULL_ROM_BASIS, points, CATMULL_ROM_BASIS)
+    return coeffs.reshape(m_size - 1, h_size - 1, 16)
+
+
+def hermite_node_table(table: np.ndarray, m_grid: np.ndarray, h_grid: np.ndarray) -> np.ndarray:
+    """
+    Node table for bicubic Hermite lookups (--lookup hermite) from a
+    generate_ja_lut.compute_remainder_sensitivities_grid() table: per node
+    [f, df/dm, df/dh, d2f/dm dh] with the derivatives scaled to grid-index
+    units, so the runtime lookup needs no axis spacing. Uniform axes only.
+    """
+    dm = (m_grid[-1] - m_grid[0]) / (len(m_grid) - 1)
+    dh = (h_grid[-1] - h_grid[0]) / (len(h_grid) - 1)
+    return table * np.array([1.0, dm, dh, dm * dh])
+
+
+# Exported lookups: node values + interpolation stencil, per-cell bicubic
+# coefficients, node values with exact derivatives for a Hermite patch, or
+# truncated-SVD factors interpolated per axis
+LUT_LOOKUPS = ('stencil', 'bicubic', 'hermite', 'svd')
+
+# Values per node (hermite) or per cell (bicubic) of one exported table
+LOOKUP_ENTRY_SIZES = {'stencil': 1, 'bicubic': 16, 'hermite': 4}
+
+# Exported table layouts: one table per output, or (M_end, sumM_rest) interleaved
+LUT_LAYOUTS = ('separate', 'interleaved')
+
+# Interpolation of node tables (--lookup stencil) in the exported FAUST
+# lookups: bilinear like JAHysteresisSchedulerLUT, or a 4x4 Catmull-Rom stencil
+FAUST_KERNELS = ('bilinear', 'catmull-rom')
+
+
+LUT_DTYPES = ('float64', 'float32', 'int16')
+
+# Storage type of each LUT dtype in the C++ headers
+CPP_TABLE_TYPES = {'float64': 'double', 'float32': 'float', 'int16': 'std::int16_t'}
+
+
+def interleave_tables(lut_M_end: np.ndarray, lut_sumM_rest: np.ndarray) -> np.ndarray:
+    """
+    Both tables in one array (--layout interleaved): an (M_end, sumM_rest)
+    pair per node, per cell 16 M_end then 16 sumM_rest coefficients for
+    bicubic coefficient tables, or per node 4 M_end then 4 sumM_rest
+    values for Hermite tables. One lookup then reads both outputs from
+    the same cache lines.
+    """
+    if lut_M_end.ndim == 2:
+        return np.stack((lut_M_end, lut_sumM_rest), axis=-1)
+    return np.concatenate((lut_M_end, lut_sumM_rest), axis=-1)
+
+
+# Default node error budget of --lookup svd, relative to the table range:
+# half the worst Catmull-Rom lookup error of the default 65 x 129 grid
+SVD_TOL = 2.5e-4
+
+
+def svd_factors(table: np.ndarray, tol: float = SVD_TOL) -> np.ndarray:
+    """
+    Truncated SVD of a node table (--lookup svd) at the smallest rank r
+    whose worst node error is at most tol times the table range, as one
+    (m_size + h_size, r) array: the M factor of every M node, then the H
+    factor of every H node (singular values split evenly between them).
+
+    Both runtime lookups are linear in the node values and separable, so
+    interpolating each factor along its own axis and summing the r
+    products is exactly the Catmull-Rom (or bilinear) lookup of the
+    rank-r table (svd_table()).
+    """
+    u, s, vt = np.linalg.svd(table, full_matrices=False)
+    limit = tol * float(table.max() - table.min())
+    approx = np.zeros_like(table)
+    rank = len(s)
+    for r in range(len(s)):
+        approx += s[r] * np.outer(u[:, r], vt[r])
+        if np.max(np.abs(approx - table)) <= limit:
+            rank = r + 1
+            break
+    root = np.sqrt(s[:rank])
+    return np.concatenate((u[:, :rank] * root, vt[:rank].T * root))
+
+
+def svd_table(factors: np.ndarray, m_size: int) -> np.ndarray:
+    """The rank-r node table an svd_factors() array represents"""
+    return factors[:m_size] @ factors[m_size:].T
+
+
+def lookup_table(table: np.ndarray, lookup: str, m_grid: np.ndarray, h_grid: np.ndarray,
+                 svd_tol: float = SVD_TOL) -> np.ndarray:
+    """
+    The array an exported lookup reads: node values (stencil), per-cell
+    coefficients (bicubic), Hermite nodes (hermite, from a table with
+    derivative channels) or truncated-SVD factors (svd)
+    """
+    if lookup == 'bicubic':
+        return bicubic_coefficients(table)
+    if lookup == 'hermite':
+        return hermite_node_table(table, m_grid, h_grid)
+    if lookup == 'svd':
+        return svd_factors(table, svd_tol)
+    return table
+
+
+def table_value_format(dtype: str) -> str:
+    """Format spec writing each dtype's values exactly (float32: 9 significant digits)"""
+    return {'float64': '.10e', 'float32': '.8e', 'int16': 'd'}[dtype]
+
+
+class QuantizedTable(NamedTuple):
+    """A LUT at export precision: value = data * scale + offset"""
+    data: np.ndarray
+    scale: float
+    offset: float
+
+    def dequantize(self) -> np.ndarray:
+        return self.data.astype(np.float64) * self.scale + self.offset
+
+
+def quantize_table(table: np.ndarray, dtype: str) -> QuantizedTable:
+    """
+    Store a table as float64, float32 (rounded, scale 1) or int16 with a
+    per-table scale and offset mapping [min, max] onto [-32767, 32767].
+    Interpolation weights sum to 1, so lookups can interpolate the raw
+    values and apply scale/offset once afterwards.
+    """
+    table = np.asarray(table, dtype=np.float64)
+    if dtype == 'float64':
+        return QuantizedTable(table, 1.0, 0.0)
+    if dtype == 'float32':
+        return QuantizedTable(table.astype(np.float32), 1.0, 0.0)
+    if dtype != 'int16':
+        raise ValueError(f"Unknown LUT dtype: {dtype}")
+    lo, hi = float(table.min()), float(table.max())
+    offset = 0.5 * (lo + hi)
+    scale = (hi - lo) / 65534.0 if hi > lo else 1.0
+    data = np.clip(np.round((table - offset) / scale), -32767, 32767).astype(np.int16)
+    return QuantizedTable(data, scale, offset)
+
+
+# Called with (seconds, bytes, changed) after every write_if_changed();
+# generate_ja_lut.py points it at its --profile report
+write_hook: Optional[Callable[[float, int, bool], None]] = None
+
+# A LUT of a bank: (name, total_substeps, phase_span, m_grid, h_grid, lut_M_end, lut_sumM_rest)
+BankEntry = Tuple[str, int, float, np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+
+def write_if_changed(path: Path, content: Union[str, bytes]) -> bool:
+    """Write content to path unless the file already holds exactly that content"""
+    start = time.perf_counter()
+    path = Path(path)
+    if isinstance(content, str):
+        content = content.encode()
+    changed = not (path.exists() and path.read_bytes() == content)
+    if changed:
+        path.write_bytes(content)
+    if write_hook is not None:
+        write_hook(time.perf_counter() - start, len(content), changed)
+    return changed
+
+
+def write_export(output_path: Path, content: Union[str, bytes], what: str, detail: str = ''):
+    """write_if_changed() and report it as 'Exported|Unchanged {what}: {output_path}{detail}'"""
+    changed = write_if_changed(output_path, content)
+    print(f"{'Exported' if changed else 'Unchanged'} {what}: {output_path}{detail}")
+
+
+def faust_library_text(f: io.StringIO) -> str:
+    """A FAUST library written with a blank line after every definition, minus the last one"""
+    return f.getvalue()[:-1]
+
+
+def write_storage_notes(f, m_size: int, h_size: int, dtype: str, lookup: str,
+                        ranks: Optional[Tuple[int, int]], interleaved: bool, bank: bool = False):
+    """
+    Write the header comment lines on how the tables are stored: dtype,
+    lookup (ranks: SVD rank of M_end and sumM_rest, used for 'svd') and
+    layout. bank describes the mode blocks of a unified bank.
+    """
+    if dtype != 'float64':
+        f.write(f"// Storage: {dtype}\n")
+    if lookup == 'bicubic':
+        f.write(f"// Lookup: bicubic coefficients, {m_size - 1} x {h_size - 1} cells x 16"
+                f"{' per mode' if bank else ''}\n")
+    if lookup == 'hermite':
+        f.write("// Lookup: bicubic Hermite, value + exact derivatives x 4 per node\n")
+    if lookup == 'svd':
+        f.write(f"// Lookup: truncated SVD, rank {ranks[0]} (M_end) / {ranks[1]} (sumM_rest)"
+                f"{' for every mode' if bank else ''}\n")
+    if interleaved:
+        f.write("// Layout: interleaved (M_end, sumM_rest)\n")
+
+
+def write_lut_banner(f, name: str, m_size: int, h_size: int, real_substeps: int, total_substeps: int,
+                     dtype: str, lookup: str, ranks: Tuple[int, int], interleaved: bool):
+    """Write the header comment of a per-mode export (write_storage_notes()) and a blank line"""
+    f.write(f"// Auto-generated JA Hysteresis LUT for {name}\n")
+    f.write(f"// Grid: {m_size} x {h_size} = {m_size * h_size} points\n")
+    f.write(f"// Substeps covered: {real_substeps}..{total_substeps - 1}\n")
+    write_storage_notes(f, m_size, h_size, dtype, lookup, ranks, interleaved)
+    f.write("\n")
+
+
+def slice_substeps_covered(s_grid: np.ndarray, axis: str, real_substeps: int, total_substeps: int) -> str:
+    """The substeps a third-axis LUT covers (per slice on the substep axis)"""
+    if axis == 'substep':
+        return f"{real_substeps}..n-1 per slice, n = {s_grid[0]:.0f}..{s_grid[-1]:.0f}"
+    return f"{real_substeps}..{total_substeps - 1}"
+
+
+def write_cpp_grid_range(f, m_grid: np.ndarray, h_grid: np.ndarray):
+    """Write the M_MIN / M_MAX / H_MIN / H_MAX constants"""
+    f.write(f"constexpr double M_MIN = {m_grid[0]:.6f};\n")
+    f.write(f"constexpr double M_MAX = {m_grid[-1]:.6f};\n")
+    f.write(f"constexpr double H_MIN = {h_grid[0]:.6f};\n")
+    f.write(f"constexpr double H_MAX = {h_grid[-1]:.6f};\n")
+
+
+def write_faust_grid_range(f, const_prefix: str, m_grid: np.ndarray, h_grid: np.ndarray):
+    """Write the {const_prefix}_{m,h}_{min,max} constants"""
+    f.write(f"{const_prefix}_m_min = {m_grid[0]:.6f};\n")
+    f.write(f"{const_prefix}_m_max = {m_grid[-1]:.6f};\n")
+    f.write(f"{const_prefix}_h_min = {h_grid[0]:.6f};\n")
+    f.write(f"{const_prefix}_h_max = {h_grid[-1]:.6f};\n")
+
+
+def export_cpp_header(
+    m_grid: np.ndarray,
+    h_grid: np.ndarray,
+    lut_M_end: np.ndarray,
+    lut_sumM_rest: np.ndarray,
+    name: str,
+    total_substeps: int,
+    output_path: Path,
+    axis_warp: AxisWarp = (None, None),
+    dtype: str = 'float64',
+    lookup: str = 'stencil',
+    layout: str = 'separate',
+    manifest: Optional[dict] = None,
+    real_substeps: int = 1,
+    svd_tol: float = SVD_TOL,
+    phase_span: Optional[float] = None
+):
+    """
+    Export LUT as C++ header file.
+
+    dtype 'float32' stores float tables; 'int16' stores int16_t tables plus
+    LUT_*_SCALE / LUT_*_OFFSET (value = stored * scale + offset).
+    lookup 'bicubic' stores per-cell coefficients (LUT_*_BICUBIC, for
+    setBicubicLUT) instead of the node values; 'hermite' stores 4 values
+    per node (LUT_*_HERMITE, for setHermiteLUT) from tables with derivative
+    channels; 'svd' stores truncated-SVD factors at the rank svd_tol needs
+    (LUT_*_SVD and LUT_*_RANK, for setSVDLUT). layout 'interleaved' stores
+    both tables in one LUT_INTERLEAVED[_BICUBIC|_HERMITE] array
+    (setInterleaved*LUT).
+    manifest (lut_manifest()) adds the Manifest struct for validateLUT().
+    phase_span adds the bias of every phase state (bias_phase_states(),
+    for setBiasPhaseTable).
+    """
+    m_size, h_size = lut_M_end.shape[:2]
+    interleaved = layout == 'interleaved'
+    suffix = {'bicubic': "_BICUBIC", 'hermite': "_HERMITE", 'svd': "_SVD"}.get(lookup, "")
+    tables = tuple((lookup_table(table, lookup, m_grid, h_grid, svd_tol), f"{const}{suffix}")
+                   for table, const in ((lut_M_end, "LUT_M_END"), (lut_sumM_rest, "LUT_SUM_M_REST")))
+
+    with io.StringIO() as f:
+        write_lut_banner(f, name, m_size, h_size, real_substeps, total_substeps, dtype, lookup,
+                         tuple(table.shape[1] for table, _ in tables), interleaved)
+
+        f.write("#pragma once\n\n")
+        f.write("#include <array>\n")
+        if dtype == 'int16':
+            f.write("#include <cstdint>\n")
+        f.write("\n")
+        f.write(f"namespace JAHysteresisLUT_{name} {{\n\n")
+
+        f.write(f"constexpr int M_SIZE = {m_size};\n")
+        f.write(f"constexpr int H_SIZE = {h_size};\n")
+        write_cpp_grid_range(f, m_grid, h_grid)
+        f.write("\n")
+        write_cpp_axis_warp(f, 'M', axis_warp[0])
+        write_cpp_axis_warp(f, 'H', axis_warp[1])
+        if manifest is not None:
+            write_cpp_manifest(f, manifest)
+        if phase_span is not None:
+            write_cpp_bias_phase_states(f, phase_span, total_substeps, real_substeps)
+
+        cpp_type = CPP_TABLE_TYPES[dtype]
+        fmt = table_value_format(dtype)
+        value_suffix = 'f' if dtype == 'float32' else ''
+        stride = " * 2" if interleaved else ""
+        if lookup == 'bicubic':
+            f.write(f"// Cell (mi, hi) starts at (mi * (H_SIZE - 1) + hi) * COEFFS_PER_CELL{stride};\n")
+            f.write("// value = sum of c[i * 4 + j] * mFrac^i * hFrac^j\n")
+            f.write("constexpr int COEFFS_PER_CELL = 16;\n\n")
+        if lookup == 'hermite':
+            f.write(f"// Node (mi, hi) starts at (mi * H_SIZE + hi) * VALUES_PER_NODE{stride}:\n")
+            f.write("// f, df/dm, df/dh, d2f/dm dh with derivatives in grid-index units\n")
+            f.write("constexpr int VALUES_PER_NODE = 4;\n\n")
+        if lookup == 'svd':
+            f.write("// Per table: M_SIZE x RANK M factors, then H_SIZE x RANK H factors;\n")
+            f.write("// value = sum over k of M factor k (interpolated at m) * H factor k (at h)\n")
+            for table, const in tables:
+                f.write(f"constexpr int {const[:-len(suffix)]}_RANK = {table.shape[1]};\n")
+            f.write("\n")
+
+        if interleaved:
+            quantized = [(quantize_table(table, dtype), const) for table, const in tables]
+            if dtype == 'int16':
+                f.write("// value = stored * LUT_X_SCALE + LUT_X_OFFSET, per interleaved table X\n")
+                for q, const in quantized:
+                    f.write(f"constexpr double {const}_SCALE = {q.scale:.17g};\n")
+                    f.write(f"constexpr double {const}_OFFSET = {q.offset:.17g};\n")
+                f.write("\n")
+            const = f"LUT_INTERLEAVED{suffix}"
+            if lookup == 'bicubic':
+                f.write("// Per cell: 16 M_end coefficients, then 16 sumM_rest coefficients\n")
+            elif lookup == 'hermite':
+                f.write("// Per node: 4 M_end values, then 4 sumM_rest values\n")
+            else:
+                f.write("// Per node: M_end, sumM_rest\n")
+            flat = interleave_tables(quantized[0][0].data, quantized[1][0].data).flatten()
+            write_cpp_array(f, cpp_type, const, flat, fmt, value_suffix)
+        else:
+            for table, const in tables:
+                quantized = quantize_table(table, dtype)
+                if dtype == 'int16':
+                    f.write(f"// value = {const}[i] * {const}_SCALE + {const}_OFFSET\n")
+                    f.write(f"constexpr double {const}_SCALE = {quantized.scale:.17g};\n")
+                    f.write(f"constexpr double {const}_OFFSET = {quantized.offset:.17g};\n")
+
+                # Flatten for 1D array storage
+                write_cpp_array(f, cpp_type, const, quantized.data.flatten(), fmt, value_suffix)
+
+        f.write("} // namespace\n")
+
+        write_export(output_path, f.getvalue(), "C++ header")
+
+
+def write_value_list(f, values: np.ndarray, fmt: str = '.10e', suffix: str = '', close_line: bool = False):
+    """Write comma-separated table values, four per line (close_line also ends a partial last line)"""
+    for i, val in enumerate(values):
+        f.write(f"    {val:{fmt}}{suffix}")
+        if i < len(values) - 1:
+            f.write(",")
+        if (i + 1) % 4 == 0:
+            f.write("\n")
+    if close_line and len(values) % 4:
+        f.write("\n")
+
+
+def write_cpp_array(f, cpp_type: str, const: str, values: np.ndarray, fmt: str = '.10e', suffix: str = '',
+                    close_line: bool = False, end: str = "\n\n"):
+    """Write values as a constexpr std::array {const} (write_value_list()), followed by end"""
+    f.write(f"constexpr std::array<{cpp_type}, {len(values)}> {const} = {{\n")
+    write_value_list(f, values, fmt, suffix, close_line)
+    f.write("};" + end)
+
+
+def write_faust_waveform(f, name: str, values: np.ndarray, fmt: str = '.10e',
+                         close_line: bool = False, end: str = "\n\n"):
+    """Write values as the FAUST waveform {name} (write_value_list()), followed by end"""
+    f.write(f"{name} = waveform{{\n")
+    write_value_list(f, values, fmt, close_line=close_line)
+    f.write("};" + end)
+
+
+def write_cpp_bias_phase_states(f, phase_span: float, total_substeps: int, real_substeps: int):
+    """Write BIAS_PHASE_STATES and the per-state bias tables (bias_phase_states())"""
+    start, real, last = bias_phase_states(phase_span, total_substeps, real_substeps)
+    f.write("// Bias phase states, for JAHysteresisSchedulerLUT::setBiasPhaseTable(): the bias starts\n")
+    f.write("// sample k at BIAS_PHASE_START[k % BIAS_PHASE_STATES]; BIAS_REAL holds sin() at the real\n")
+    f.write("// substeps of each state (state-major), BIAS_LAST at substep N-1\n")
+    f.write(f"constexpr int BIAS_PHASE_STATES = {len(start)};\n")
+    f.write(f"constexpr int BIAS_REAL_SUBSTEPS = {real_substeps};\n")
+    for const, values in (("BIAS_PHASE_START", start), ("BIAS_REAL", real.flatten()), ("BIAS_LAST", last)):
+        write_cpp_array(f, 'double', const, values, '.17g', close_line=True, end="\n")
+    f.write("\n")
+
+
+def write_cpp_axis_warp(f, axis: str, warp: Optional[np.ndarray]):
+    """Write {axis}_WARP_SEGMENTS and the {axis}_WARP knots (1 segment = uniform axis)"""
+    knots = np.array([0.0, 1.0]) if warp is None else warp
+    f.write(f"// {axis} axis warp: normalised {axis} -> grid coordinate, {axis}_WARP_SEGMENTS "
+            f"linear segments (1 = uniform)\n")
+    f.write(f"constexpr int {axis}_WARP_SEGMENTS = {len(knots) - 1};\n")
+    write_cpp_array(f, 'double', f"{axis}_WARP", knots, close_line=True)
+
+
+# (Manifest key, C++ Manifest member, FAUST constant suffix) of the PhysicsParams fields
+MANIFEST_PHYSICS = (('Ms', 'Ms', 'ms'), ('a_density', 'aDensity', 'a_density'),
+                    ('k_pinning', 'kPinning', 'k_pinning'), ('c_reversibility', 'cReversibility', 'c_reversibility'),
+                    ('alpha_coupling', 'alphaCoupling', 'alpha_coupling'))
+
+
+def write_cpp_manifest(f, manifest: dict):
+    """Write the generator settings as a Manifest struct for JAHysteresisSchedulerLUT::validateLUT<Manifest>()"""
+    grid = manifest['grid']
+    members = [
+        ('int', 'mSize', grid['m_size']),
+        ('int', 'hSize', grid['h_size']),
+        ('double', 'mMin', grid['m_range'][0]),
+        ('double', 'mMax', grid['m_range'][1]),
+        ('double', 'hMin', grid['h_range'][0]),
+        ('double', 'hMax', grid['h_range'][1]),
+        ('int', 'totalSubsteps', manifest['total_substeps']),
+        ('int', 'realSubsteps', manifest['real_substeps']),
+        ('double', 'phaseSpan', manifest['phase_span']),
+        ('double', 'biasLevel', manifest['bias']['level']),
+        ('double', 'biasScale', manifest['bias']['scale']),
+        *(('double', member, manifest['physics'][key]) for key, member, _ in MANIFEST_PHYSICS),
+    ]
+    f.write(f"// Generator settings (JSON manifest {manifest['file']}), checked once at load time by\n")
+    f.write("// JAHysteresisSchedulerLUT::validateLUT<Manifest>()\n")
+    f.write("struct Manifest\n{\n")
+    for cpp_type, member, value in members:
+        value = repr(float(value)) if cpp_type == 'double' else value
+        f.write(f"    static constexpr {cpp_type} {member} = {value};\n")
+    f.write(f"    static constexpr const char* tableHash = \"{manifest['table_sha256'][:16]}\";\n")
+    f.write("};\n\n")
+
+
+def write_faust_manifest(f, const_prefix: str, manifest: dict):
+    """Write the generator settings as {const_prefix}_* constants (substeps, phase span, bias, physics)"""
+    f.write(f"// Generator settings (JSON manifest {manifest['file']}, tables {manifest['table_sha256'][:16]})\n")
+    f.write(f"{const_prefix}_total_substeps = {manifest['total_substeps']};\n")
+    f.write(f"{const_prefix}_real_substeps = {manifest['real_substeps']};\n")
+    f.write(f"{const_prefix}_phase_span = {float(manifest['phase_span'])!r};\n")
+    f.write(f"{const_prefix}_bias_level = {float(manifest['bias']['level'])!r};\n")
+    f.write(f"{const_prefix}_bias_scale = {float(manifest['bias']['scale'])!r};\n")
+    for key, _, suffix in MANIFEST_PHYSICS:
+        f.write(f"{const_prefix}_{suffix} = {float(manifest['physics'][key])!r};\n")
+    f.write("\n")
+
+
+def write_faust_bank_manifest(f, manifest: dict):
+    """Write the bias and physics settings shared by a unified bank as ja_lut_* constants"""
+    f.write("// Generator settings shared by all modes (see the per-mode JSON manifests)\n")
+    f.write(f"ja_lut_bias_level = {float(manifest['bias']['level'])!r};\n")
+    f.write(f"ja_lut_bias_scale = {float(manifest['bias']['scale'])!r};\n")
+    for key, _, suffix in MANIFEST_PHYSICS:
+        f.write(f"ja_lut_{suffix} = {float(manifest['physics'][key])!r};\n")
+    f.write("\n")
+
+
+def write_faust_axis_norm(f, const_prefix: str, axis: str, warp: Optional[np.ndarray] = None):
+    """
+    Write {const_prefix}_{axis}_norm(): the [0, 1] grid coordinate of a value.
+    Uniform axes normalise linearly; warped axes also emit their knot table
+    and map through it (one segment lookup and a lerp).
+    """
+    label = axis.upper()
+    lo, hi = f"{const_prefix}_{axis}_min", f"{const_prefix}_{axis}_max"
+    if warp is None:
+        f.write(f"// Normalize {label} to [0, 1] range\n")
+        f.write(f"{const_prefix}_{axis}_norm({axis}) = ({axis} - {lo}) / ({hi} - {lo});\n\n")
+        return
+    segments = len(warp) - 1
+    f.write(f"// {label} axis warp knots: normalised {label} -> grid coordinate, {segments} uniform segments\n")
+    f.write(f"{const_prefix}_{axis}_warp_segments = {segments};\n")
+    write_faust_waveform(f, f"{const_prefix}_{axis}_warp", warp, close_line=True)
+    f.write(f"// Normalize {label} to [0, 1] grid coordinate through the axis warp\n")
+    f.write(f"{const_prefix}_{axis}_norm({axis}) = k0 + (k1 - k0) * (s - float(i))\n")
+    f.write("with {\n")
+    f.write(f"    s = max(0.0, min(1.0, ({axis} - {lo}) / ({hi} - {lo}))) * {const_prefix}_{axis}_warp_segments;\n")
+    f.write(f"    i = min(int(s), {const_prefix}_{axis}_warp_segments - 1);\n")
+    f.write(f"    k0 = {const_prefix}_{axis}_warp, i : rdtable;\n")
+    f.write(f"    k1 = {const_prefix}_{axis}_warp, i + 1 : rdtable;\n")
+    f.write("};\n\n")
+
+
+def write_faust_lookup_head(f, title: str, signature: str, outputs: Tuple[str, ...], setup: Tuple[str, ...]):
+    """Write a lookup's comment line, its definition returning outputs and the with-block setup lines"""
+    f.write(f"// {title}\n")
+    f.write(f"{signature} = {', '.join(outputs)}\n")
+    f.write("with {\n")
+    for line in setup:
+        f.write(f"    {line}\n")
+    if setup:
+        f.write("    \n")
+
+
+def write_faust_grid_position(f, const_prefix: str):
+    """Write the with-block lines mapping (m, h) to clamped fractional grid positions m_scaled, h_scaled"""
+    f.write(f"    m_n = max(0.0, min(1.0, {const_prefix}_m_norm(m)));\n")
+    f.write(f"    h_n = max(0.0, min(1.0, {const_prefix}_h_norm(h)));\n")
+    f.write("    \n")
+    f.write(f"    m_scaled = m_n * ({const_prefix}_m_size - 1);\n")
+    f.write(f"    h_scaled = h_n * ({const_prefix}_h_size - 1);\n")
+    f.write("    \n")
+
+
+def write_faust_cell_position(f, const_prefix: str,
+                              note: str = "Cell indices (the last node falls into the last cell at frac 1)"):
+    """Write the with-block lines locating the grid cell (m_idx, h_idx) and the fractions within it"""
+    write_faust_grid_position(f, const_prefix)
+    f.write(f"    // {note}\n")
+    f.write(f"    m_idx = min(int(floor(m_scaled)), {const_prefix}_m_size - 2);\n")
+    f.write(f"    h_idx = min(int(floor(h_scaled)), {const_prefix}_h_size - 2);\n")
+    f.write("    \n")
+    f.write("    m_frac = m_scaled - float(m_idx);\n")
+    f.write("    h_frac = h_scaled - float(h_idx);\n")
+    f.write("    \n")
+
+
+def write_faust_catmull_rom_stencil(f, const_prefix: str):
+    """Write the with-block lines computing the clamped 4x4 stencil (m0..m3, h0..h3) and fractions"""
+    write_faust_grid_position(f, const_prefix)
+    f.write("    m_idx = int(floor(m_scaled));\n")
+    f.write("    h_idx = int(floor(h_scaled));\n")
+    f.write("    \n")
+    f.write("    m_frac = m_scaled - float(m_idx);\n")
+    f.write("    h_frac = h_scaled - float(h_idx);\n")
+    f.write("    \n")
+    f.write("    // Clamp indices for 4x4 Catmull-Rom (need p-1, p, p+1, p+2)\n")
+    f.write(f"    m0 = max(0, m_idx - 1);\n")
+    f.write(f"    m1 = max(0, min(m_idx, {const_prefix}_m_size - 1));\n")
+    f.write(f"    m2 = max(0, min(m_idx + 1, {const_prefix}_m_size - 1));\n")
+    f.write(f"    m3 = min(m_idx + 2, {const_prefix}_m_size - 1);\n")
+    f.write("    \n")
+    f.write(f"    h0 = max(0, h_idx - 1);\n")
+    f.write(f"    h1 = max(0, min(h_idx, {const_prefix}_h_size - 1));\n")
+    f.write(f"    h2 = max(0, min(h_idx + 1, {const_prefix}_h_size - 1));\n")
+    f.write(f"    h3 = min(h_idx + 2, {const_prefix}_h_size - 1);\n")
+    f.write("    \n")
+
+
+def write_faust_catmull_rom_lookup(f, signature: str, label: str, table: str,
+                                   const_prefix: str, catmull_rom: str, index,
+                                   setup: Tuple[str, ...] = (),
+                                   dequantize: Optional[Tuple[Tuple[str, str], ...]] = None,
+                                   outputs: Tuple[str, ...] = ('result',)):
+    """
+    Write a separable 4x4 Catmull-Rom lookup function in FAUST.
+
+    const_prefix names the grid constants ({prefix}_m_size, _m_norm, ...),
+    index(m, h) returns the rdtable index expression for the node at row
+    and column expressions m, h, and setup lines are emitted first in the
+    with block.
+    dequantize holds one (scale, offset) expression pair per output,
+    mapping an int16 table's interpolated value back to the table range.
+
+    Several outputs read an interleaved table (--layout interleaved):
+    output k sits k slots after index(mi, hi), and all outputs share one
+    set of indices and weights.
+    """
+    fused = len(outputs) > 1
+    write_faust_lookup_head(f, f"Separable Catmull-Rom interpolation lookup for {label}", signature, outputs, setup)
+    write_faust_catmull_rom_stencil(f, const_prefix)
+    if fused:
+        f.write("    // Stencil slots, shared by all outputs\n")
+        for mi in range(4):
+            for hi in range(4):
+                f.write(f"    i{mi}{hi} = {index(f'm{mi}', f'h{hi}')};\n")
+        f.write("    \n")
+    for k, out in enumerate(outputs):
+        sfx = f"_{out}" if fused else ""
+        f.write(f"    // Fetch 16 points (4x4 grid){f' of {out}' if fused else ''}\n")
+        for mi in range(4):
+            for hi in range(4):
+                slot = (f"i{mi}{hi} + {k}" if k else f"i{mi}{hi}") if fused else index(f"m{mi}", f"h{hi}")
+                f.write(f"    v{mi}{hi}{sfx} = {table}, {slot} : rdtable;\n")
+        f.write("    \n")
+        f.write("    // Interpolate 4 columns along H axis\n")
+        for mi in range(4):
+            f.write(f"    col{mi}{sfx} = {catmull_rom}(v{mi}0{sfx}, v{mi}1{sfx}, v{mi}2{sfx}, v{mi}3{sfx}, h_frac);\n")
+        f.write("    \n")
+        f.write("    // Interpolate along M axis\n")
+        value = f"{catmull_rom}(col0{sfx}, col1{sfx}, col2{sfx}, col3{sfx}, m_frac)"
+        if dequantize is not None:
+            value += f" * {dequantize[k][0]} + {dequantize[k][1]}"
+        f.write(f"    {out} = {value};\n")
+        if k < len(outputs) - 1:
+            f.write("    \n")
+    f.write("};\n\n")
+
+
+def write_faust_catmull_rom_helper(f, name: str):
+    """Write the 1D Catmull-Rom helper used by the Catmull-Rom and SVD lookups"""
+    f.write("// 1D Catmull-Rom interpolation: p0,p1,p2,p3 are 4 consecutive points, t in [0,1]\n")
+    f.write(f"{name}(p0, p1, p2, p3, t) = 0.5 * (\n")
+    f.write("    2.0*p1 +\n")
+    f.write("    (-p0 + p2) * t +\n")
+    f.write("    (2.0*p0 - 5.0*p1 + 4.0*p2 - p3) * t * t +\n")
+    f.write("    (-p0 + 3.0*p1 - 3.0*p2 + p3) * t * t * t\n")
+    f.write(");\n\n")
+
+
+def write_faust_bilinear_lookup(f, signature: str, label: str, table: str,
+                                const_prefix: str, index,
+                                setup: Tuple[str, ...] = (),
+                                dequantize: Optional[Tuple[Tuple[str, str], ...]] = None,
+                                outputs: Tuple[str, ...] = ('result',)):
+    """
+    Write a bilinear lookup function in FAUST, the lookup of
+    JAHysteresisSchedulerLUT: the 2x2 nodes of the clamped cell.
+
+    Arguments as for write_faust_catmull_rom_lookup(); index(m, h) gets the
+    cell's row and column expressions.
+    """
+    fused = len(outputs) > 1
+    write_faust_lookup_head(f, f"Bilinear interpolation lookup for {label}", signature, outputs, setup)
+    write_faust_cell_position(f, const_prefix, "Last cell at the upper edge, so the fraction reaches 1 there")
+    corners = ((0, 0), (0, 1), (1, 0), (1, 1))
+    node = {0: "m_idx", 1: "m_idx + 1"}, {0: "h_idx", 1: "h_idx + 1"}
+    if fused:
+        f.write("    // Cell corner slots, shared by all outputs\n")
+        for mi, hi in corners:
+            f.write(f"    i{mi}{hi} = {index(node[0][mi], node[1][hi])};\n")
+        f.write("    \n")
+    for k, out in enumerate(outputs):
+        sfx = f"_{out}" if fused else ""
+        for mi, hi in corners:
+            slot = (f"i{mi}{hi} + {k}" if k else f"i{mi}{hi}") if fused else index(node[0][mi], node[1][hi])
+            f.write(f"    v{mi}{hi}{sfx} = {table}, {slot} : rdtable;\n")
+        f.write("    \n")
+        target = f"lerp{sfx}" if dequantize is not None else out
+        f.write(f"    {target} = v00{sfx} * (1.0 - m_frac) * (1.0 - h_frac) +\n")
+        pad = " " * (len(target) + 7)
+        f.write(f"{pad}v01{sfx} * (1.0 - m_frac) * h_frac +\n")
+        f.write(f"{pad}v10{sfx} * m_frac * (1.0 - h_frac) +\n")
+        f.write(f"{pad}v11{sfx} * m_frac * h_frac;\n")
+        if dequantize is not None:
+            f.write(f"    {out} = {target} * {dequantize[k][0]} + {dequantize[k][1]};\n")
+        if k < len(outputs) - 1:
+            f.write("    \n")
+    f.write("};\n\n")
+
+
+def write_faust_node_lookup(f, kernel: str, signature: str, label: str, table: str,
+                            const_prefix: str, catmull_rom: str, index,
+                            setup: Tuple[str, ...] = (),
+                            dequantize: Optional[Tuple[Tuple[str, str], ...]] = None,
+                            outputs: Tuple[str, ...] = ('result',)):
+    """Write the node-table lookup of a FAUST_KERNELS kernel (catmull_rom names its helper)"""
+    if kernel == 'catmull-rom':
+        write_faust_catmull_rom_lookup(f, signature, label, table, const_prefix, catmull_rom, index,
+                                       setup, dequantize, outputs)
+    elif kernel == 'bilinear':
+        write_faust_bilinear_lookup(f, signature, label, table, const_prefix, index,
+                                    setup, dequantize, outputs)
+    else:
+        raise ValueError(f"Unknown FAUST kernel: {kernel}")
+
+
+def write_faust_bicubic_lookup(f, signature: str, label: str, table: str,
+                               const_prefix: str, cell: str, setup: Tuple[str, ...] = (),
+                               outputs: Tuple[str, ...] = ('result',)):
+    """
+    Write a bicubic coefficient lookup function in FAUST (--lookup bicubic).
+
+    cell is the rdtable index expression of the first coefficient of cell
+    (m_idx, h_idx); the 16 coefficients follow contiguously, ordered
+    c[i * 4 + j] for m_frac^i * h_frac^j. With several outputs (interleaved
+    layout) output k's 16 coefficients start 16 * k slots into the cell.
+    """
+    fused = len(outputs) > 1
+    write_faust_lookup_head(f, f"Bicubic coefficient lookup for {label}: Catmull-Rom precomputed per cell",
+                            signature, outputs, setup)
+    write_faust_cell_position(f, const_prefix)
+    f.write(f"    // Fetch the cell's {16 * len(outputs)} coefficients (one contiguous block)\n")
+    f.write(f"    cell = {cell};\n")
+    for k, out in enumerate(outputs):
+        sfx = f"_{out}" if fused else ""
+        for j in range(16):
+            f.write(f"    c{j}{sfx} = {table}, cell + {16 * k + j} : rdtable;\n")
+    for out in outputs:
+        sfx = f"_{out}" if fused else ""
+        f.write("    \n")
+        f.write(f"    // Horner along H for each power of m_frac, then along M{f' ({out})' if fused else ''}\n")
+        for i in range(4):
+            f.write(f"    r{i}{sfx} = ((c{4 * i + 3}{sfx} * h_frac + c{4 * i + 2}{sfx}) * h_frac"
+                    f" + c{4 * i + 1}{sfx}) * h_frac + c{4 * i}{sfx};\n")
+        f.write(f"    {out} = ((r3{sfx} * m_frac + r2{sfx}) * m_frac + r1{sfx}) * m_frac + r0{sfx};\n")
+    f.write("};\n\n")
+
+
+def write_faust_hermite_lookup(f, signature: str, label: str, table: str,
+                               const_prefix: str, hermite: str, node, setup: Tuple[str, ...] = (),
+                               outputs: Tuple[str, ...] = ('result',)):
+    """
+    Write a bicubic Hermite lookup function in FAUST (--lookup hermite).
+
+    node(m, h) returns the rdtable index expression of the first value of
+    node (m, h); its f, df/dm, df/dh, d2f/dm dh follow contiguously. With
+    several outputs (interleaved layout) output k's values start 4 * k
+    slots into the node.
+    """
+    fused = len(outputs) > 1
+    write_faust_lookup_head(f, f"Bicubic Hermite lookup for {label}: node values and exact derivatives",
+                            signature, outputs, setup)
+    write_faust_cell_position(f, const_prefix)
+    f.write("    // Corner nodes\n")
+    for mi in range(2):
+        for hi in range(2):
+            m_expr = "m_idx + 1" if mi else "m_idx"
+            h_expr = "h_idx + 1" if hi else "h_idx"
+            f.write(f"    n{mi}{hi} = {node(m_expr, h_expr)};\n")
+    for k, out in enumerate(outputs):
+        sfx = f"_{out}" if fused else ""
+        f.write("    \n")
+        f.write(f"    // Fetch f, df/dm, df/dh, d2f/dm dh at the 4 corners{f' ({out})' if fused else ''}\n")
+        for mi in range(2):
+            for hi in range(2):
+                for j, value in enumerate(("f", "dm", "dh", "dmh")):
+                    slot = 4 * k + j
+                    f.write(f"    {value}{mi}{hi}{sfx} = {table}, n{mi}{hi}{f' + {slot}' if slot else ''} : rdtable;\n")
+        f.write("    \n")
+        f.write("    // Along H for the value and M slope of both rows, then along M\n")
+        for mi in range(2):
+            f.write(f"    r{mi}{sfx} = {hermite}(f{mi}0{sfx}, dh{mi}0{sfx}, f{mi}1{sfx}, dh{mi}1{sfx}, h_frac);\n")
+            f.write(f"    s{mi}{sfx} = {hermite}(dm{mi}0{sfx}, dmh{mi}0{sfx}, dm{mi}1{sfx}, dmh{mi}1{sfx}, h_frac);\n")
+        f.write(f"    {out} = {hermite}(r0{sfx}, s0{sfx}, r1{sfx}, s1{sfx}, m_frac);\n")
+    f.write("};\n\n")
+
+
+def write_faust_hermite_helper(f, name: str):
+    """Write the 1D cubic Hermite helper used by write_faust_hermite_lookup()"""
+    f.write("// 1D cubic Hermite interpolation: values p0, p1 and slopes d0, d1 at t = 0, 1\n")
+    f.write(f"{name}(p0, d0, p1, d1, t) = (2.0*t3 - 3.0*t2 + 1.0) * p0 + (t3 - 2.0*t2 + t) * d0\n")
+    f.write("    + (3.0*t2 - 2.0*t3) * p1 + (t3 - t2) * d1\n")
+    f.write("with {\n")
+    f.write("    t2 = t * t;\n")
+    f.write("    t3 = t2 * t;\n")
+    f.write("};\n\n")
+
+
+def write_faust_svd_lookup(f, signature: str, label: str, table: str,
+                           const_prefix: str, catmull_rom: str, rank: str,
+                           setup: Tuple[str, ...] = (), base: str = ''):
+    """
+    Write a truncated-SVD lookup function in FAUST (--lookup svd).
+
+    table holds the svd_factors() of one output: {const_prefix}_m_size x
+    rank M factors, then {const_prefix}_h_size x rank H factors, starting
+    at index base (an expression ending in ' + ', or ''). Each factor is
+    Catmull-Rom interpolated along its axis and the rank products summed,
+    which equals the Catmull-Rom lookup of the rank-r table.
+    """
+    write_faust_lookup_head(f, f"Truncated-SVD lookup for {label}: Catmull-Rom per factor, rank products summed",
+                            signature, ('result',), setup)
+    write_faust_catmull_rom_stencil(f, const_prefix)
+    f.write("    // Factor k of M node i and of H node j (H factors follow the M factors)\n")
+    f.write(f"    m_factor(i, k) = {table}, {base}i * {rank} + k : rdtable;\n")
+    f.write(f"    h_factor(j, k) = {table}, {base}({const_prefix}_m_size + j) * {rank} + k : rdtable;\n")
+    f.write("    \n")
+    f.write("    // Interpolate both factors of each rank term, then sum their products\n")
+    f.write(f"    term(k) = {catmull_rom}(m_factor(m0, k), m_factor(m1, k), m_factor(m2, k), m_factor(m3, k), m_frac)\n")
+    f.write(f"            * {catmull_rom}(h_factor(h0, k), h_factor(h1, k), h_factor(h2, k), h_factor(h3, k), h_frac);\n")
+    f.write(f"    result = sum(k, {rank}, term(k));\n")
+    f.write("};\n\n")
+
+
+def write_faust_lookups(f, suffix: str, lookup: str, kernel: str, layout: str, dtype: str,
+                        axis_warp: AxisWarp = (None, None), bank: bool = False):
+    """
+    Write the lookup half of a FAUST LUT library over the grid constants
+    and tables named ja_lut{suffix}_*: the index function of the stored
+    table, the axis normalisation, the interpolation helper and
+    ja_lookup_m_end{suffix} / ja_lookup_sum_m_rest{suffix}. An interleaved
+    table gets one fused ja_lookup{suffix} that both of them select from.
+
+    bank writes the mode-indexed lookups of a unified bank: they take the
+    mode first, read its block from ja_mode_offset() (SVD factors:
+    ja_mode_factor_offset()) and dequantise int16 with per-mode tables.
+    """
+    const_prefix = f"ja_lut{suffix}"
+    interleaved = layout == 'interleaved'
+    within, block, base = (" within a mode block", "base, ", "base + ") if bank else ("", "", "")
+    slots = 2 if interleaved else 1
+    if lookup == 'bicubic':
+        f.write(f"// First coefficient of a grid cell{within}\n")
+        f.write(f"{const_prefix}_cell({block}m_idx, h_idx) = "
+                f"{base}(m_idx * ({const_prefix}_h_size - 1) + h_idx) * {16 * slots};\n\n")
+    elif lookup == 'hermite':
+        f.write(f"// First value (f, df/dm, df/dh, d2f/dm dh) of a grid node{within}\n")
+        f.write(f"{const_prefix}_node({block}m_idx, h_idx) = "
+                f"{base}(m_idx * {const_prefix}_h_size + h_idx) * {4 * slots};\n\n")
+    elif interleaved:
+        f.write(f"// 2D index computation{within} (first of the node's two slots)\n")
+        f.write(f"{const_prefix}_idx({block}m_idx, h_idx) = {base}(m_idx * {const_prefix}_h_size + h_idx) * 2;\n\n")
+    elif lookup != 'svd':
+        f.write(f"// 2D index computation{within}\n")
+        f.write(f"{const_prefix}_idx({block}m_idx, h_idx) = {base}m_idx * {const_prefix}_h_size + h_idx;\n\n")
+
+    write_faust_axis_norm(f, const_prefix, 'm', axis_warp[0])
+    write_faust_axis_norm(f, const_prefix, 'h', axis_warp[1])
+
+    if lookup == 'hermite':
+        write_faust_hermite_helper(f, f"ja_hermite{suffix}")
+    elif lookup == 'svd' or (lookup == 'stencil' and kernel == 'catmull-rom'):
+        write_faust_catmull_rom_helper(f, f"ja_catmull_rom{suffix}")
+
+    # One lookup per table, or one fused lookup of the interleaved table:
+    # (signature, label, table, output variables, dequantisation names)
+    mode, indexed = ("mode, ", " (mode-indexed)") if bank else ("", "")
+    setup = ("base = ja_mode_offset(mode);",) if bank else ()
+    if interleaved:
+        lookups = [(f"ja_lookup{suffix}({mode}m, h)", f"M_end and sumM_rest{indexed}", const_prefix,
+                    ("m_end", "sum_m_rest"), ("m_end", "sum_m_rest"))]
+    else:
+        lookups = [(f"ja_lookup_{lookup_name}{suffix}({mode}m, h)", f"{label}{indexed}",
+                    f"{const_prefix}_{lookup_name}", ("result",), (lookup_name,))
+                   for lookup_name, label in (("m_end", "M_end"), ("sum_m_rest", "sumM_rest"))]
+    for signature, label, table, outputs, names in lookups:
+        if lookup == 'bicubic':
+            write_faust_bicubic_lookup(
+                f, signature, label, table,
+                const_prefix=const_prefix,
+                cell=f"{const_prefix}_cell({block}m_idx, h_idx)",
+                setup=setup,
+                outputs=outputs
+            )
+        elif lookup == 'hermite':
+            write_faust_hermite_lookup(
+                f, signature, label, table,
+                const_prefix=const_prefix,
+                hermite=f"ja_hermite{suffix}",
+                node=lambda m, h: f"{const_prefix}_node({block}{m}, {h})",
+                setup=setup,
+                outputs=outputs
+            )
+        elif lookup == 'svd':
+            rank = f"{const_prefix}_{names[0]}_rank"
+            write_faust_svd_lookup(
+                f, signature, label, table,
+                const_prefix=const_prefix,
+                catmull_rom=f"ja_catmull_rom{suffix}",
+                rank=rank,
+                setup=(f"base = ja_mode_factor_offset(mode, {rank});",) if bank else (),
+                base=base
+            )
+        else:
+            if dtype != 'int16':
+                dequantize = None
+            elif bank:
+                dequantize = tuple((f"ja_mode_param(ja_mode_{n}_scale, mode)",
+                                    f"ja_mode_param(ja_mode_{n}_offset, mode)") for n in names)
+            else:
+                dequantize = tuple((f"{const_prefix}_{n}_scale", f"{const_prefix}_{n}_offset") for n in names)
+            write_faust_node_lookup(
+                f, kernel, signature, label, table,
+                const_prefix=const_prefix,
+                catmull_rom=f"ja_catmull_rom{suffix}",
+                index=lambda m, h: f"{const_prefix}_idx({block}{m}, {h})",
+                setup=setup,
+                dequantize=dequantize,
+                outputs=outputs
+            )
+
+    if interleaved:
+        f.write("// Single-table lookups (FAUST shares the fused lookup between them)\n")
+        f.write(f"ja_lookup_m_end{suffix}({mode}m, h) = ja_lookup{suffix}({mode}m, h) : _, !;\n")
+        f.write(f"ja_lookup_sum_m_rest{suffix}({mode}m, h) = ja_lookup{suffix}({mode}m, h) : !, _;\n\n")
+
+
+def export_faust_lib(
+    m_grid: np.ndarray,
+    h_grid: np.ndarray,
+    lut_M_end: np.ndarray,
+    lut_sumM_rest: np.ndarray,
+    name: str,
+    total_substeps: int,
+    output_path: Path,
+    axis_warp: AxisWarp = (None, None),
+    dtype: str = 'float64',
+    lookup: str = 'stencil',
+    layout: str = 'separate',
+    manifest: Optional[dict] = None,
+    real_substeps: int = 1,
+    svd_tol: float = SVD_TOL,
+    kernel: str = 'bilinear'
+):
+    """
+    Export LUT as FAUST library file.
+
+    Node tables (lookup 'stencil') are interpolated with kernel, one of
+    FAUST_KERNELS: bilinear, the C++ lookup, or a 4x4 Catmull-Rom stencil.
+
+    dtype 'float32' writes float32-rounded values (halves the tables in
+    -single builds); 'int16' writes integer waveforms plus per-table
+    _scale/_offset applied after interpolation. lookup 'bicubic' writes
+    per-cell coefficient waveforms and Horner lookups with the same
+    ja_lookup_* signatures; 'hermite' writes 4 values per node (from
+    tables with derivative channels) and bicubic Hermite lookups; 'svd'
+    writes truncated-SVD factors (rank set by svd_tol) and a per-factor
+    Catmull-Rom lookup.
+    layout 'interleaved' writes one waveform and a
+    fused ja_lookup_{mode}(m, h) : M_end, sumM_rest; the single-table
+    lookups select its outputs, so FAUST computes it once for both.
+    manifest (lut_manifest()) adds the generator settings as constants.
+    """
+    m_size, h_size = lut_M_end.shape[:2]
+    lut_M_end = lookup_table(lut_M_end, lookup, m_grid, h_grid, svd_tol)
+    lut_sumM_rest = lookup_table(lut_sumM_rest, lookup, m_grid, h_grid, svd_tol)
+
+    # Stored at export precision, flattened for 1D waveform storage below
+    q_M_end = quantize_table(lut_M_end, dtype)
+    q_sumM_rest = quantize_table(lut_sumM_rest, dtype)
+    fmt = table_value_format(dtype)
+    interleaved = layout == 'interleaved'
+
+    with io.StringIO() as f:
+        write_lut_banner(f, name, m_size, h_size, real_substeps, total_substeps, dtype, lookup,
+                         (lut_M_end.shape[1], lut_sumM_rest.shape[1]), interleaved)
+
+        f.write("import(\"stdfaust.lib\");\n\n")
+
+        prefix = name.lower()
+        f.write(f"// Grid parameters for {name}\n")
+        f.write(f"ja_lut_{prefix}_m_size = {m_size};\n")
+        f.write(f"ja_lut_{prefix}_h_size = {h_size};\n")
+        write_faust_grid_range(f, f"ja_lut_{prefix}", m_grid, h_grid)
+        f.write("\n")
+        if lookup == 'svd':
+            f.write("// SVD rank per table (factors: m_size x rank, then h_size x rank)\n")
+            f.write(f"ja_lut_{prefix}_m_end_rank = {lut_M_end.shape[1]};\n")
+            f.write(f"ja_lut_{prefix}_sum_m_rest_rank = {lut_sumM_rest.shape[1]};\n\n")
+        if manifest is not None:
+            write_faust_manifest(f, f"ja_lut_{prefix}", manifest)
+
+        if dtype == 'int16':
+            f.write("// int16 dequantisation: value = interpolated * scale + offset\n")
+            for lookup_name, quantized in (("m_end", q_M_end), ("sum_m_rest", q_sumM_rest)):
+                f.write(f"ja_lut_{prefix}_{lookup_name}_scale = {quantized.scale:.17g};\n")
+                f.write(f"ja_lut_{prefix}_{lookup_name}_offset = {quantized.offset:.17g};\n")
+            f.write("\n")
+
+        table_kind = {'bicubic': "bicubic coefficients", 'hermite': "Hermite nodes",
+                      'svd': "SVD factors"}.get(lookup, "LUT")
+
+        if interleaved:
+            flat = interleave_tables(q_M_end.data, q_sumM_rest.data).flatten()
+            f.write(f"// Interleaved M_end / sumM_rest {table_kind} ({len(flat)} values)\n")
+            write_faust_waveform(f, f"ja_lut_{prefix}", flat, fmt)
+        else:
+            for label, lookup_name, quantized in (("M_end", "m_end", q_M_end),
+                                                   ("sumM_rest", "sum_m_rest", q_sumM_rest)):
+                flat = quantized.data.flatten()
+                f.write(f"// {label} {table_kind} ({len(flat)} values)\n")
+                write_faust_waveform(f, f"ja_lut_{prefix}_{lookup_name}", flat, fmt)
+
+        write_faust_lookups(f, f"_{prefix}", lookup, kernel, layout, dtype, axis_warp)
+
+        write_export(output_path, faust_library_text(f), "FAUST library")
+
+
+def export_faust_unified_lib(
+    entries: List[BankEntry],
+    output_path: Path,
+    axis_warp: AxisWarp = (None, None),
+    dtype: str = 'float64',
+    lookup: str = 'stencil',
+    layout: str = 'separate',
+    manifest: Optional[dict] = None,
+    real_substeps: int = 1,
+    svd_tol: float = SVD_TOL,
+    kernel: str = 'bilinear'
+):
+    """
+    Export several LUTs as one FAUST library with a mode-indexed lookup.
+
+    All modes are concatenated into one waveform per table; a per-mode
+    offset table selects the block, so a single lookup serves any mode and
+    per-sample cost no longer grows with the number of shipped modes.
+    With dtype 'int16' each mode's block has its own scale/offset, read
+    from per-mode tables like the other metadata. With lookup 'bicubic'
+    each mode block holds per-cell coefficients instead of node values,
+    with 'hermite' 4 values per node (tables with derivative channels),
+    with 'svd' truncated-SVD factors, zero-padded to the highest rank any
+    mode needs so every mode block has the same size.
+    layout 'interleaved' stores both tables in one waveform and adds a
+    fused ja_lookup(mode, m, h) : M_end, sumM_rest. Node tables use the
+    kernel lookup as in export_faust_lib().
+
+    entries: (name, total_substeps, phase_span, m_grid, h_grid, lut_M_end, lut_sumM_rest)
+    of exactly the MODES, in mode-index order: jahysteresis.lib selects a
+    block by that index, so any other bank raises ValueError. manifest
+    (any entry's lut_manifest()) adds the shared bias and physics settings
+    as ja_lut_* constants.
+    """
+    names = [name for name, *_ in entries]
+    if names != list(MODES):
+        raise ValueError(f"a unified bank holds the modes {', '.join(MODES)} in this order, "
+                         f"not {', '.join(names)}")
+    _, _, _, m_grid, h_grid, first_M_end, _ = entries[0]
+    m_size, h_size = first_M_end.shape[:2]
+    interleaved = layout == 'interleaved'
+    if lookup != 'svd':
+        table_size = (m_size - 1) * (h_size - 1) if lookup == 'bicubic' else m_size * h_size
+        table_size *= LOOKUP_ENTRY_SIZES[lookup] * (2 if interleaved else 1)
+    for name, _, _, e_m_grid, e_h_grid, lut_M_end, _ in entries:
+        if lut_M_end.shape != first_M_end.shape or not (
+                np.array_equal(e_m_grid, m_grid) and np.array_equal(e_h_grid, h_grid)):
+            raise ValueError(f"{name}: all modes in a unified bank must share one grid")
+
+    substeps = [total_substeps for _, total_substeps, _, _, _, _, _ in entries]
+    phase_states = [bias_phase_states(phase_span, total_substeps, real_substeps)
+                    for _, total_substeps, phase_span, _, _, _, _ in entries]
+    # Every mode block holds max_states states; modes with fewer repeat theirs
+    state_counts = [len(start) for start, _, _ in phase_states]
+    max_states = max(state_counts)
+    bias_real = np.concatenate([np.resize(real, (max_states, real_substeps)).flatten()
+                                for _, real, _ in phase_states])
+    bias_last = np.concatenate([np.resize(last, max_states) for _, _, last in phase_states])
+    # States starting nearer phase pi than 0 see the negated bias: they look up -T(-M, -H)
+    bias_sign = np.concatenate([np.resize(np.where(np.abs(start - np.pi) < 0.5 * np.pi, -1, 1), max_states)
+                                for start, _, _ in phase_states])
+
+    stored = [[lookup_table(table, lookup, m_grid, h_grid, svd_tol) for table in e[5:7]] for e in entries]
+    if lookup == 'svd':
+        ranks = tuple(max(tables[k].shape[1] for tables in stored) for k in (0, 1))
+        stored = [[np.pad(table, ((0, 0), (0, rank - table.shape[1]))) for table, rank in zip(tables, ranks)]
+                  for tables in stored]
+        table_sizes = [(m_size + h_size) * rank for rank in ranks]
+    else:
+        ranks, table_sizes = None, [table_size, table_size]
+    quantized = [tuple(quantize_table(table, dtype) for table in tables) for tables in stored]
+    fmt = table_value_format(dtype)
+
+    with io.StringIO() as f:
+        f.write(f"// Auto-generated unified JA Hysteresis LUT bank ({len(entries)} modes)\n")
+        f.write(f"// Grid: {m_size} x {h_size} = {m_size * h_size} points per mode\n")
+        write_storage_notes(f, m_size, h_size, dtype, lookup, ranks, interleaved, bank=True)
+        f.write("// Mode index: " + ", ".join(
+            f"{i}={name} ({n} substeps)" for i, (name, n, *_) in enumerate(entries)) + "\n\n")
+
+        f.write("import(\"stdfaust.lib\");\n\n")
+
+        f.write("// Grid parameters (shared by all modes)\n")
+        f.write(f"ja_lut_num_modes = {len(entries)};\n")
+        f.write(f"ja_lut_m_size = {m_size};\n")
+        f.write(f"ja_lut_h_size = {h_size};\n")
+        if lookup == 'svd':
+            f.write(f"ja_lut_m_end_rank = {ranks[0]};  // factors per mode: m_size x rank, then h_size x rank\n")
+            f.write(f"ja_lut_sum_m_rest_rank = {ranks[1]};\n")
+        else:
+            f.write(f"ja_lut_table_size = {table_size};\n")
+        write_faust_grid_range(f, "ja_lut", m_grid, h_grid)
+        f.write(f"ja_lut_real_substeps = {real_substeps};  // computed by ja_loop before the lookup\n\n")
+        if manifest is not None:
+            write_faust_bank_manifest(f, manifest)
+
+        f.write("// Per-mode metadata, indexed by mode\n")
+        f.write("ja_mode_substeps = waveform{" + ", ".join(str(n) for n in substeps) + "};\n")
+        write_faust_waveform(f, "ja_mode_inv_substeps", np.array([1.0 / n for n in substeps]), end="\n")
+        f.write("// Bias phase states: with p/q bias cycles per sample the oscillator starts each\n")
+        f.write("// sample in one of q states (state 0 = phase 0, the state the LUTs are built for)\n")
+        f.write(f"ja_lut_phase_states = {max_states};  // states per mode block\n")
+        f.write("ja_mode_phase_states = waveform{" + ", ".join(str(n) for n in state_counts) + "};\n")
+        f.write("// Bias oscillator value at the real substeps 0..ja_lut_real_substeps-1\n")
+        f.write("// and at substep N-1 (mode-major, then state)\n")
+        write_faust_waveform(f, "ja_mode_bias_real", bias_real, end="\n")
+        write_faust_waveform(f, "ja_mode_bias_last", bias_last, end="\n")
+        f.write("// Lookup sign per state: the LUTs are built for phase 0, a state starting nearer\n")
+        f.write("// phase pi sees the negated bias and reads the phase-flip mirror -T(-M, -H)\n")
+        f.write("ja_mode_bias_sign = waveform{" + ", ".join(str(s) for s in bias_sign) + "};\n\n")
+
+        if dtype == 'int16':
+            f.write("// int16 dequantisation per mode: value = interpolated * scale + offset\n")
+            for i, lookup_name in enumerate(("m_end", "sum_m_rest")):
+                for field in ("scale", "offset"):
+                    write_faust_waveform(f, f"ja_mode_{lookup_name}_{field}",
+                                         np.array([getattr(q[i], field) for q in quantized]), '.17g',
+                                         close_line=True, end="\n")
+            f.write("\n")
+
+        f.write("// Clamp a (possibly fractional) mode value to a valid mode index\n")
+        f.write("ja_mode_index(mode) = max(0, min(ja_lut_num_modes - 1, int(mode + 0.5)));\n\n")
+        f.write("// Read a per-mode metadata table\n")
+        f.write("ja_mode_param(table, mode) = table, ja_mode_index(mode) : rdtable;\n\n")
+        f.write("// Phase state of a mode's free-running bias oscillator, advanced every sample\n")
+        f.write("// (state 0 on the first sample)\n")
+        f.write("ja_mode_phase_state(mode) = _ ~ (+(1) : %(ja_mode_param(ja_mode_phase_states, mode))) : mem;\n\n")
+        f.write("// Bias value of real substep i and of substep N-1 of a mode in a phase state\n")
+        f.write("ja_mode_state_index(mode, state) = ja_mode_index(mode) * ja_lut_phase_states + "
+                "max(0, min(ja_lut_phase_states - 1, int(state)));\n")
+        f.write("ja_mode_real_bias(mode, state, i) = ja_mode_bias_real, "
+                "ja_mode_state_index(mode, state) * ja_lut_real_substeps + i : rdtable;\n")
+        f.write("ja_mode_last_bias(mode, state) = ja_mode_bias_last, ja_mode_state_index(mode, state) : rdtable;\n")
+        f.write("ja_mode_phase_sign(mode, state) = ja_mode_bias_sign, ja_mode_state_index(mode, state) : rdtable;\n\n")
+        if lookup == 'svd':
+            f.write("// First factor of a mode's block in a table of the given rank\n")
+            f.write("ja_mode_factor_offset(mode, rank) = ja_mode_index(mode) * (ja_lut_m_size + ja_lut_h_size) * rank;\n\n")
+        else:
+            f.write("// First table index of a mode's block\n")
+            f.write("ja_mode_offset(mode) = ja_mode_index(mode) * ja_lut_table_size;\n\n")
+
+        if interleaved:
+            f.write(f"// Interleaved M_end / sumM_rest LUT ({len(entries)} modes x {table_size} values)\n")
+            write_faust_waveform(f, "ja_lut", np.concatenate([interleave_tables(q[0].data, q[1].data).flatten()
+                                                              for q in quantized]), fmt)
+        else:
+            for i, (label, lookup_name) in enumerate((("M_end", "m_end"), ("sumM_rest", "sum_m_rest"))):
+                f.write(f"// {label} LUT ({len(entries)} modes x {table_sizes[i]} values)\n")
+                write_faust_waveform(f, f"ja_lut_{lookup_name}",
+                                     np.concatenate([q[i].data.flatten() for q in quantized]), fmt)
+
+        write_faust_lookups(f, "", lookup, kernel, layout, dtype, axis_warp, bank=True)
+
+        write_export(output_path, faust_library_text(f), "unified FAUST library", f" ({len(entries)} modes)")
+
+
+class SliceAxis(NamedTuple):
+    """A third LUT axis made of stacked 2D slices ([slice][M][H], slice-major)"""
+    name: str       # used in comments and messages
+    suffix: str     # C++ namespace / file name suffix
+    const: str      # C++ constant prefix
+    var: str        # FAUST axis argument
+    quantity: str   # what the axis values are
+    short: str      # their short name in messages
+    units: str
+    note: str
+
+
+SLICE_AXES = {
+    'bias': SliceAxis('bias', 'Bias', 'BIAS', 'b', 'bias amplitude', 'amplitude', 'amplitude units', 'level * scale'),
+    'substep': SliceAxis('substep', 'Substeps', 'SUBSTEP', 'n', 'substep count', 'substeps', 'substeps',
+                         'same phase span'),
+}
+
+
+def export_cpp_header_slices(
+    s_grid: np.ndarray,
+    m_grid: np.ndarray,
+    h_grid: np.ndarray,
+    lut_M_end: np.ndarray,
+    lut_sumM_rest: np.ndarray,
+    name: str,
+    total_substeps: int,
+    output_path: Path,
+    axis_warp: AxisWarp = (None, None),
+    axis: str = 'bias',
+    manifest: Optional[dict] = None,
+    real_substeps: int = 1
+):
+    """Export a LUT with a third axis (SLICE_AXES[axis], slice-major) as C++ header file"""
+    slice_axis = SLICE_AXES[axis]
+    const = slice_axis.const
+    s_size, m_size, h_size = lut_M_end.shape
+    covered = slice_substeps_covered(s_grid, axis, real_substeps, total_substeps)
+
+    with io.StringIO() as f:
+        f.write(f"// Auto-generated JA Hysteresis {slice_axis.name}-axis LUT for {name}\n")
+        f.write(f"// Grid: {s_size} x {m_size} x {h_size} = {lut_M_end.size} points ({slice_axis.name} x M x H)\n")
+        f.write(f"// Substeps covered: {covered}\n")
+        f.write("// Layout: slice-major, slice b starts at b * M_SIZE * H_SIZE\n\n")
+
+        f.write("#pragma once\n\n")
+        f.write("#include <array>\n\n")
+        f.write(f"namespace JAHysteresisLUT_{name}_{slice_axis.suffix} {{\n\n")
+
+        f.write(f"constexpr int {const}_SIZE = {s_size};\n")
+        f.write(f"constexpr int M_SIZE = {m_size};\n")
+        f.write(f"constexpr int H_SIZE = {h_size};\n")
+        f.write(f"constexpr double {const}_MIN = {s_grid[0]:.6f};  // {slice_axis.quantity} ({slice_axis.note})\n")
+        f.write(f"constexpr double {const}_MAX = {s_grid[-1]:.6f};\n")
+        write_cpp_grid_range(f, m_grid, h_grid)
+        f.write("\n")
+        write_cpp_axis_warp(f, 'M', axis_warp[0])
+        write_cpp_axis_warp(f, 'H', axis_warp[1])
+        if manifest is not None:
+            write_cpp_manifest(f, manifest)
+
+        for table_const, table in (("LUT_M_END", lut_M_end), ("LUT_SUM_M_REST", lut_sumM_rest)):
+            write_cpp_array(f, 'double', table_const, table.flatten())
+
+        f.write("} // namespace\n")
+
+        write_export(output_path, f.getvalue(), f"C++ {slice_axis.name}-axis header")
+
+
+def export_faust_lib_slices(
+    s_grid: np.ndarray,
+    m_grid: np.ndarray,
+    h_grid: np.ndarray,
+    lut_M_end: np.ndarray,
+    lut_sumM_rest: np.ndarray,
+    name: str,
+    total_substeps: int,
+    output_path: Path,
+    axis_warp: AxisWarp = (None, None),
+    axis: str = 'bias',
+    manifest: Optional[dict] = None,
+    real_substeps: int = 1,
+    kernel: str = 'bilinear'
+):
+    """
+    Export a LUT with a third axis (SLICE_AXES[axis]) as FAUST library file.
+
+    Each table lookup evaluates the 2D lookup (kernel, FAUST_KERNELS) on
+    the two slices around the axis value and blends them linearly.
+    """
+    slice_axis = SLICE_AXES[axis]
+    var = slice_axis.var
+    s_size, m_size, h_size = lut_M_end.shape
+    covered = slice_substeps_covered(s_grid, axis, real_substeps, total_substeps)
+    prefix = f"{name.lower()}_{slice_axis.suffix.lower()}"
+
+    with io.StringIO() as f:
+        f.write(f"// Auto-generated JA Hysteresis {slice_axis.name}-axis LUT for {name}\n")
+        f.write(f"// Grid: {s_size} x {m_size} x {h_size} = {lut_M_end.size} points ({slice_axis.name} x M x H)\n")
+        f.write(f"// Substeps covered: {covered}\n\n")
+
+        f.write("import(\"stdfaust.lib\");\n\n")
+
+        f.write(f"// Grid parameters for {name} ({slice_axis.name} axis in {slice_axis.units}: {slice_axis.note})\n")
+        f.write(f"ja_lut_{prefix}_{var}_size = {s_size};\n")
+        f.write(f"ja_lut_{prefix}_m_size = {m_size};\n")
+        f.write(f"ja_lut_{prefix}_h_size = {h_size};\n")
+        f.write(f"ja_lut_{prefix}_{var}_min = {s_grid[0]:.6f};\n")
+        f.write(f"ja_lut_{prefix}_{var}_max = {s_grid[-1]:.6f};\n")
+        write_faust_grid_range(f, f"ja_lut_{prefix}", m_grid, h_grid)
+        f.write("\n")
+        if manifest is not None:
+            write_faust_manifest(f, f"ja_lut_{prefix}", manifest)
+
+        for table, label in ((lut_M_end, "m_end"), (lut_sumM_rest, "sum_m_rest")):
+            f.write(f"// {'M_end' if label == 'm_end' else 'sumM_rest'} LUT ({table.size} values, slice-major)\n")
+            write_faust_waveform(f, f"ja_lut_{prefix}_{label}", table.flatten())
+
+        f.write("// 3D index computation: slice s, row m_idx, column h_idx\n")
+        f.write(f"ja_lut_{prefix}_idx(s, m_idx, h_idx) = (s * ja_lut_{prefix}_m_size + m_idx) * ja_lut_{prefix}_h_size + h_idx;\n\n")
+
+        write_faust_axis_norm(f, f"ja_lut_{prefix}", 'm', axis_warp[0])
+        write_faust_axis_norm(f, f"ja_lut_{prefix}", 'h', axis_warp[1])
+
+        lo, hi, size = (f"ja_lut_{prefix}_{var}_{c}" for c in ('min', 'max', 'size'))
+        f.write(f"// Fractional slice position of a {slice_axis.quantity}, clamped to the table\n")
+        f.write(f"ja_lut_{prefix}_{var}_pos({var}) = max(0.0, min(1.0, ({var} - {lo}) / ({hi} - {lo}))) * ({size} - 1);\n\n")
+
+        if kernel == 'catmull-rom':
+            write_faust_catmull_rom_helper(f, f"ja_catmull_rom_{prefix}")
+
+        for label, lookup in (("M_end", "m_end"), ("sumM_rest", "sum_m_rest")):
+            write_faust_node_lookup(
+                f, kernel, f"ja_lookup_{lookup}_{prefix}_slice(s, m, h)", f"{label} (one {slice_axis.name} slice)",
+                f"ja_lut_{prefix}_{lookup}",
+                const_prefix=f"ja_lut_{prefix}",
+                catmull_rom=f"ja_catmull_rom_{prefix}",
+                index=lambda m, h: f"ja_lut_{prefix}_idx(s, {m}, {h})"
+            )
+            f.write(f"// {label} lookup at {slice_axis.quantity} {var}: blend of the two neighbouring slices\n")
+            f.write(f"ja_lookup_{lookup}_{prefix}({var}, m, h) = v0 + (v1 - v0) * {var}_frac\n")
+            f.write("with {\n")
+            f.write(f"    {var}_scaled = ja_lut_{prefix}_{var}_pos({var});\n")
+            f.write(f"    s0 = min(int(floor({var}_scaled)), {size} - 2);\n")
+            f.write(f"    {var}_frac = {var}_scaled - float(s0);\n")
+            f.write(f"    v0 = ja_lookup_{lookup}_{prefix}_slice(s0, m, h);\n")
+            f.write(f"    v1 = ja_lookup_{lookup}_{prefix}_slice(s0 + 1, m, h);\n")
+            f.write("};\n\n")
+
+        write_export(output_path, faust_library_text(f), f"FAUST {slice_axis.name}-axis library")
+
+
+# Binary LUT bank layout (little-endian, see cpp_reference/JAHysteresisLUTFile.h)
+#   file header : magic, version, header size, entry count, entry size, alignment
+#   entry table : one fixed-size record per mode/variant
+#   table data  : each table starts on its own page so only the active mode
+#                 is paged in when the file is memory-mapped
+LUT_BIN_MAGIC = b'JALUTBIN'
+LUT_BIN_VERSION = 2
+LUT_BIN_ALIGN = 4096
+LUT_BIN_HEADER = struct.Struct('<8s5I36x')       # 64 bytes
+LUT_BIN_ENTRY = struct.Struct('<16s7I4x12d4Q')    # 176 bytes
+LUT_BIN_DTYPES = {1: np.dtype('<f8')}
+
+
+def _align(offset: int, alignment: int = LUT_BIN_ALIGN) -> int:
+    return (offset + alignment - 1) // alignment * alignment
+
+
+def export_binary_bank(
+    entries: List[BankEntry],
+    physics: Sequence[float],
+    bias_level: float,
+    bias_scale: float,
+    output_path: Path,
+    axis_warp: AxisWarp = (None, None),
+    real_substeps: int = 1
+):
+    """
+    Export one or more LUTs as a memory-mappable binary bank.
+
+    entries: (name, total_substeps, phase_span, m_grid, h_grid, lut_M_end, lut_sumM_rest)
+    physics: (Ms, a_density, k_pinning, c_reversibility, alpha_coupling), recorded
+    in every entry with real_substeps so the loader can validate them.
+    """
+    physics = tuple(float(value) for value in physics)
+    if len(physics) != 5:
+        raise ValueError(f"binary bank physics needs 5 values, got {len(physics)}")
+    dtype_code = 1
+    table_offset = _align(LUT_BIN_HEADER.size + LUT_BIN_ENTRY.size * len(entries))
+
+    records = []
+    tables = []
+    for name, total_substeps, phase_span, m_grid, h_grid, lut_M_end, lut_sumM_rest in entries:
+        m_size, h_size = lut_M_end.shape
+        encoded_name = name.encode('ascii')
+        if len(encoded_name) >= 16:
+            raise ValueError(f"LUT name too long for binary bank: {name}")
+
+        offsets = []
+        for table in (lut_M_end, lut_sumM_rest):
+            data = np.ascontiguousarray(table, dtype=LUT_BIN_DTYPES[dtype_code]).tobytes()
+            offsets.append(table_offset)
+            tables.append((table_offset, data))
+            table_offset = _align(table_offset + len(data))
+
+        # Axis warp knots (float64, offset 0 = uniform axis) share the segment
+        # count; a warp is piecewise linear, so resampling it onto a multiple
+        # of its own segment count is exact
+        counts = [len(w) - 1 for w in axis_warp if w is not None]
+        warp_segments = int(np.lcm.reduce(counts)) if counts else 0
+        for warp in axis_warp:
+            if warp is None:
+                offsets.append(0)
+                continue
+            warp = np.interp(np.linspace(0.0, 1.0, warp_segments + 1), np.linspace(0.0, 1.0, len(warp)), warp)
+            data = np.ascontiguousarray(warp, dtype='<f8').tobytes()
+            offsets.append(table_offset)
+            tables.append((table_offset, data))
+            table_offset = _align(table_offset + len(data))
+
+        records.append(LUT_BIN_ENTRY.pack(
+            encoded_name, dtype_code, m_size, h_size, total_substeps, 2, warp_segments, real_substeps,
+            m_grid[0], m_grid[-1], h_grid[0], h_grid[-1],
+            phase_span, bias_level, bias_scale, *physics,
+            *offsets
+        ))
+
+    buf = bytearray(tables[-1][0] + len(tables[-1][1]) if tables else table_offset)
+    LUT_BIN_HEADER.pack_into(buf, 0, LUT_BIN_MAGIC, LUT_BIN_VERSION, LUT_BIN_HEADER.size,
+                             len(entries), LUT_BIN_ENTRY.size, LUT_BIN_ALIGN)
+    for i, record in enumerate(records):
+        start = LUT_BIN_HEADER.size + i * LUT_BIN_ENTRY.size
+        buf[start:start + LUT_BIN_ENTRY.size] = record
+    for offset, data in tables:
+        buf[offset:offset + len(data)] = data
+
+    write_export(output_path, bytes(buf), "binary LUT bank", f" ({len(entries)} LUTs, {len(buf) / 1024:.1f} KB)")
+
+
+def load_binary_bank(path: Path) -> Dict[str, dict]:
+    """Read a binary bank back (memory-mapped) as {name: fields and table arrays}"""
+    raw = np.memmap(path, dtype=np.uint8, mode='r')
+    magic, version, header_size, count, entry_size, _ = LUT_BIN_HEADER.unpack_from(raw, 0)
+    if magic != LUT_BIN_MAGIC or version != LUT_BIN_VERSION:
+        raise ValueError(f"{path}: not a version {LUT_BIN_VERSION} JA LUT bank")
+
+    bank = {}
+    for i in range(count):
+        (name, dtype_code, m_size, h_size, total_substeps, _, warp_segments, real_substeps,
+         m_min, m_max, h_min, h_max, phase_span, bias_level, bias_scale, *physics,
+         off_m_end, off_sum, off_m_warp, off_h_warp) = LUT_BIN_ENTRY.unpack_from(raw, header_size + i * entry_size)
+        dtype = LUT_BIN_DTYPES[dtype_code]
+        n = m_size * h_size
+        name = name.rstrip(b'\0').decode('ascii')
+        bank[name] = {
+            'total_substeps': total_substeps,
+            'real_substeps': real_substeps,
+            'phase_span': phase_span,
+            'physics': tuple(physics),
+            'bias_level': bias_level,
+            'bias_scale': bias_scale,
+            'm_range': (m_min, m_max),
+            'h_range': (h_min, h_max),
+            'axis_warp': tuple(np.frombuffer(raw, '<f8', warp_segments + 1, off) if off else None
+                               for off in (off_m_warp, off_h_warp)),
+            'lut_M_end': np.frombuffer(raw, dtype, n, off_m_end).reshape(m_size, h_size),
+            'lut_sumM_rest': np.frombuffer(raw, dtype, n, off_sum).reshape(m_size, h_size),
+        }
+    return bank
+
+
+def export_manifest(manifest: dict, output_dir: Path, files: List[str]):
+    """Write a lut_manifest() as JSON, listing the files that carry the LUT"""
+    output_path = output_dir / manifest['file']
+    worst = {}
+    for entry in manifest['errors'] if 'slice_axis' in manifest else [manifest['errors']]:
+        for scheme, stats in entry.items():
+            if scheme != 'value':
+                worst[scheme] = max(worst.get(scheme, 0.0), stats['sumM_rest']['max'])
+    write_export(output_path, json.dumps({**manifest, 'files': files}, indent=2) + "\n", "manifest",
+                 f" (tables {manifest['table_sha256'][:16]}, max sumM_rest error " +
+                 ", ".join(f"{scheme} {err:.2e}" for scheme, err in worst.items()) + ")")
+
+
+def export_cpp_modes_header(output_path: Path):
+    """
+    Write the MODES table as C++ (JAHysteresisLUTModes.h), in the order of
+    JAHysteresisSchedulerLUT::Mode, so the scheduler's per-mode bias cycles
+    and substep counts come from the same table as the generated LUTs.
+    """
+    with io.StringIO() as f:
+        f.write("// Auto-generated by generate_ja_lut.py --modes-header from its MODES table\n")
+        f.write("// Order matches JAHysteresisSchedulerLUT::Mode\n\n")
+        f.write("#pragma once\n\n")
+        f.write("#include <array>\n\n")
+        f.write("namespace JAHysteresisLUTModes {\n\n")
+        f.write("struct ModeInfo\n{\n")
+        f.write("    const char* name;\n")
+        f.write("    double biasCycles;   // bias cycles per sample (phase span / 2 pi)\n")
+        f.write("    int totalSubsteps;   // substeps per sample, including substep 0\n")
+        f.write("};\n\n")
+        f.write(f"constexpr std::array<ModeInfo, {len(MODES)}> MODES = {{{{\n")
+        for mode in MODES.values():
+            f.write(f"    {{ \"{mode.name}\", {mode.cycles_per_sample!r}, {mode.total_substeps} }},\n")
+        f.write("}};\n\n")
+        f.write("} // namespace\n")
+        write_export(output_path, f.getvalue(), "C++ modes header")
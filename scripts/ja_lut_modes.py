@@ -0,0 +1,94 @@
+"""
+JA Hysteresis LUT Modes
+
+The bias modes the LUTs are built for (MODES, in the order of
+JAHysteresisSchedulerLUT::Mode) and the bias phase states a free-running
+oscillator visits in each. Shared by generate_ja_lut.py and the exporters
+in ja_lut_export.py.
+"""
+
+import numpy as np
+import math
+from fractions import Fraction
+from typing import NamedTuple, Tuple
+
+
+class ModeConfig(NamedTuple):
+    """Bias mode configuration"""
+    name: str
+    cycles_per_sample: float
+    substeps_per_cycle: int
+
+    @property
+    def total_substeps(self) -> int:
+        return int(self.cycles_per_sample * self.substeps_per_cycle)
+
+    @property
+    def phase_span(self) -> float:
+        """Total phase span in radians"""
+        return 2.0 * np.pi * self.cycles_per_sample
+
+    def get_variants(self) -> list:
+        """
+        Returns variants with N-1, N, N+1 substeps.
+        Each variant has the SAME phase span but different substep count.
+        This changes the phase step size (dphi = phase_span / substeps).
+        """
+        base = self.total_substeps
+        return [
+            ModeConfigVariant(f"K{base-1}", self.phase_span, base - 1),
+            ModeConfigVariant(f"K{base}", self.phase_span, base),
+            ModeConfigVariant(f"K{base+1}", self.phase_span, base + 1),
+        ]
+
+
+class ModeConfigVariant(NamedTuple):
+    """Variant mode config with fixed phase span and variable substeps"""
+    name: str
+    phase_span: float
+    total_substeps: int
+
+
+# Mode configurations
+# Pattern: half-integer cycles + odd substeps = rich harmonic content
+# This ensures opposite bias polarity between adjacent samples
+MODES = {
+    # Low-res group (18 steps/cycle) - lofi character
+    'K28': ModeConfig('K28', 1.5, 18),      # 27 substeps (ultra lofi)
+    'K45': ModeConfig('K45', 2.5, 18),      # 45 substeps (lofi)
+    'K63': ModeConfig('K63', 3.5, 18),      # 63 substeps (vintage)
+    # High-res group (22 steps/cycle) - cleaner character
+    'K99': ModeConfig('K99', 4.5, 22),      # 99 substeps (warm)
+    'K121': ModeConfig('K121', 5.5, 22),    # 121 substeps (standard)
+    'K187': ModeConfig('K187', 8.5, 22),    # 187 substeps (high quality)
+    'K253': ModeConfig('K253', 11.5, 22),   # 253 substeps (detailed)
+    'K495': ModeConfig('K495', 22.5, 22),   # 495 substeps (ultra detailed)
+    'K1045': ModeConfig('K1045', 47.5, 22), # 1045 substeps (extreme)
+    'K2101': ModeConfig('K2101', 95.5, 22), # 2101 substeps (beyond physical)
+}
+
+
+MAX_PHASE_STATES = 64
+
+
+def bias_phase_states(phase_span: float, total_substeps: int,
+                      real_substeps: int = 1) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Bias values of every phase state a free-running bias oscillator
+    (JAHysteresisSchedulerLUT::process) starts a sample in: with p/q bias
+    cycles per sample, state k starts at 2 pi * (k p mod q) / q.
+
+    Returns (start, real, last): the start phase of each state, sin() at
+    the real substeps 0..real_substeps-1 (q x real_substeps) and at substep
+    N-1, which sets the end-of-sample H. Uses the scheduler's phase
+    arithmetic, so state 0 matches its sin() path exactly.
+    """
+    cycles = Fraction(phase_span / (2.0 * math.pi)).limit_denominator(MAX_PHASE_STATES)
+    if not math.isclose(2.0 * math.pi * float(cycles), phase_span, rel_tol=1e-9):
+        raise ValueError(f"phase span {phase_span} is not 2 pi * p/q with q <= {MAX_PHASE_STATES}")
+    q = cycles.denominator
+    dphi = (2.0 * math.pi) / (total_substeps / float(cycles))
+    start = np.array([2.0 * math.pi * ((k * cycles.numerator) % q) / q for k in range(q)])
+    real = np.array([[math.sin(phase + dphi * (i + 0.5)) for i in range(real_substeps)] for phase in start])
+    last = np.array([math.sin(phase + dphi * (total_substeps - 0.5)) for phase in start])
+    return start, real, last
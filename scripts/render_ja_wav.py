@@ -0,0 +1,642 @@
+#!/usr/bin/env python3
+"""
+Offline JA Hysteresis WAV renderer and null tester
+
+Streams a WAV file through the tape stage in fixed-size blocks (bounded
+memory, any file length), one worker process per channel, and writes the
+rendered output of each selected signal path plus null residuals.
+
+Signal paths (same physics as generate_ja_lut.ja_substep):
+  lut        One real substep + 2D LUT lookup per sample (jahysteresis.lib)
+  physics    All N substeps real, bias phase-locked to each sample; this is
+             exactly what the LUT tabulates, so lut vs physics isolates
+             interpolation error
+  scheduler  Free-running bias oscillator with fractional substep cursor
+             (JAHysteresisScheduler::process); with half-integer cycles per
+             sample its bias polarity alternates between samples, so it does
+             not null against the phase-locked paths
+
+Each path runs inside the tape_channel gain structure: input gain and drive,
+hysteresis, 10 Hz DC blocker, drive compensation, output gain and dry/wet mix.
+
+Usage:
+    python render_ja_wav.py input.wav [--mode K121] [--paths lut,physics] [--output-dir renders]
+    python render_ja_wav.py input.wav --lut-bank ../faust/JAHysteresisLUTBank.jalut --scheme bilinear
+    python render_ja_wav.py input.wav --paths lut,physics,scheduler --max-null-db -80
+"""
+
+import argparse
+import math
+import os
+import sys
+import tempfile
+import time
+import wave
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from generate_ja_lut import (
+    LOOKUP_SCHEMES,
+    LUTCache,
+    PhysicsParams,
+    build_luts,
+    generate_bias_lut,
+    resolve_backend,
+    resolve_jobs,
+)
+from ja_lut_export import bicubic_coefficients, load_binary_bank
+from ja_lut_modes import MODES
+
+
+RENDER_PATHS = ('lut', 'physics', 'scheduler')
+
+# WAV sample width (bytes) -> full-scale value of the signed integer format
+PCM_FULL_SCALE = {1: 128.0, 2: 32768.0, 3: 8388608.0, 4: 2147483648.0}
+
+
+# =============================================================================
+# WAV I/O (stdlib wave, integer PCM)
+# =============================================================================
+
+def pcm_to_float(data: bytes, sample_width: int, channels: int) -> np.ndarray:
+    """Interleaved PCM bytes -> float64 array of shape (frames, channels)"""
+    if sample_width == 1:
+        samples = np.frombuffer(data, dtype=np.uint8).astype(np.float64) - 128.0
+    elif sample_width == 3:
+        raw = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        samples = (raw[:, 0] | (raw[:, 1] << 8) | (raw[:, 2] << 16)).astype(np.float64)
+        samples[samples >= 8388608.0] -= 16777216.0
+    else:
+        samples = np.frombuffer(data, dtype=f'<i{sample_width}').astype(np.float64)
+    return samples.reshape(-1, channels) / PCM_FULL_SCALE[sample_width]
+
+
+def float_to_pcm(samples: np.ndarray, sample_width: int) -> bytes:
+    """float64 array (frames, channels) -> interleaved PCM bytes (clipped, rounded)"""
+    full_scale = PCM_FULL_SCALE[sample_width]
+    ints = np.clip(np.round(samples.ravel() * full_scale), -full_scale, full_scale - 1).astype(np.int64)
+    if sample_width == 1:
+        return (ints + 128).astype(np.uint8).tobytes()
+    if sample_width == 3:
+        ints = ints & 0xFFFFFF
+        return np.stack([ints & 0xFF, (ints >> 8) & 0xFF, (ints >> 16) & 0xFF], axis=1).astype(np.uint8).tobytes()
+    return ints.astype(f'<i{sample_width}').tobytes()
+
+
+def read_blocks(path: Path, block_size: int):
+    """Yield float64 (frames, channels) blocks of a WAV file"""
+    with wave.open(str(path), 'rb') as wav:
+        channels, sample_width = wav.getnchannels(), wav.getsampwidth()
+        while True:
+            data = wav.readframes(block_size)
+            if not data:
+                break
+            yield pcm_to_float(data, sample_width, channels)
+
+
+# =============================================================================
+# Scalar DSP (per-sample loops on Python floats)
+# =============================================================================
+
+def make_substep(physics: PhysicsParams, bias_amplitude: float):
+    """
+    Scalar JA substep with constants folded in. Same operations, in the same
+    order, as generate_ja_lut.ja_substep() and C++ executeSubstep().
+    """
+    Ms_safe = max(physics.Ms, 1e-6)
+    alpha_norm = physics.alpha_coupling
+    a_norm = physics.a_density / Ms_safe
+    inv_a_norm = 1.0 / max(a_norm, 1e-9)
+    k_norm = physics.k_pinning / Ms_safe
+    c_norm = physics.c_reversibility
+    tanh = math.tanh
+
+    def substep(M_prev: float, H_prev: float, H_audio: float, bias_offset: float) -> Tuple[float, float]:
+        H_new = H_audio + bias_amplitude * bias_offset
+        dH = H_new - H_prev
+        He = H_new + alpha_norm * M_prev
+
+        Man_e = tanh(He * inv_a_norm)
+        dMan_dH = (1.0 - Man_e * Man_e) * inv_a_norm
+
+        direction = 1.0 if dH >= 0.0 else -1.0
+        pin = direction * k_norm - alpha_norm * (Man_e - M_prev)
+        inv_pin = 1.0 / (pin + 1e-6)
+
+        denom = 1.0 - c_norm * alpha_norm * dMan_dH
+        inv_denom = 1.0 / (denom + 1e-9)
+        dMdH = (c_norm * dMan_dH + (Man_e - M_prev) * inv_pin) * inv_denom
+
+        M_new = M_prev + dMdH * dH
+        if M_new > 1.0:
+            M_new = 1.0
+        elif M_new < -1.0:
+            M_new = -1.0
+        return M_new, H_new
+
+    return substep
+
+
+def make_axis_position(lo: float, hi: float, size: int, warp: Optional[np.ndarray]):
+    """Scalar generate_ja_lut.axis_position()"""
+    scale = 1.0 / (hi - lo)
+    last = size - 1
+    if warp is None:
+        def position(x: float) -> float:
+            n = min(max((x - lo) * scale, 0.0), 1.0)
+            return n * last
+        return position
+
+    knots = [float(k) for k in warp]
+    segments = len(knots) - 1
+
+    def position(x: float) -> float:
+        n = min(max((x - lo) * scale, 0.0), 1.0)
+        s = n * segments
+        i = min(int(s), segments - 1)
+        return (knots[i] + (knots[i + 1] - knots[i]) * (s - i)) * last
+    return position
+
+
+def catmull_rom_weights(t: float) -> Tuple[float, float, float, float]:
+    """Weights of p0..p3 in generate_ja_lut.catmull_rom(p0, p1, p2, p3, t)"""
+    t2 = t * t
+    t3 = t2 * t
+    return (0.5 * (-t + 2.0 * t2 - t3),
+            0.5 * (2.0 - 5.0 * t2 + 3.0 * t3),
+            0.5 * (t + 4.0 * t2 - 3.0 * t3),
+            0.5 * (t3 - t2))
+
+
+def make_lookup(tables: Tuple[np.ndarray, np.ndarray], m_range: Tuple[float, float],
+                h_range: Tuple[float, float], axis_warp, scheme: str):
+    """
+    Scalar generate_ja_lut.lut_lookup() of two same-grid tables at once
+    (M_end, sumM_rest share positions and weights). Returns lookup(m, h) -> (a, b).
+    The bicubic scheme takes node tables too and precomputes their coefficients.
+    """
+    m_size, h_size = tables[0].shape
+    rows_a, rows_b = tables[0].tolist(), tables[1].tolist()
+    m_position = make_axis_position(m_range[0], m_range[1], m_size, axis_warp[0])
+    h_position = make_axis_position(h_range[0], h_range[1], h_size, axis_warp[1])
+
+    if scheme == 'bicubic':
+        cells_a = bicubic_coefficients(tables[0]).tolist()
+        cells_b = bicubic_coefficients(tables[1]).tolist()
+
+        def lookup(m: float, h: float) -> Tuple[float, float]:
+            m_pos, h_pos = m_position(m), h_position(h)
+            mi = min(int(m_pos), m_size - 2)
+            hi = min(int(h_pos), h_size - 2)
+            mf, hf = m_pos - mi, h_pos - hi
+            ca, cb = cells_a[mi][hi], cells_b[mi][hi]
+            a = b = 0.0
+            for i in (12, 8, 4, 0):
+                a = a * mf + (((ca[i + 3] * hf + ca[i + 2]) * hf + ca[i + 1]) * hf + ca[i])
+                b = b * mf + (((cb[i + 3] * hf + cb[i + 2]) * hf + cb[i + 1]) * hf + cb[i])
+            return a, b
+        return lookup
+
+    if scheme == 'bilinear':
+        def lookup(m: float, h: float) -> Tuple[float, float]:
+            m_pos, h_pos = m_position(m), h_position(h)
+            mi = min(int(m_pos), m_size - 2)
+            hi = min(int(h_pos), h_size - 2)
+            mf, hf = m_pos - mi, h_pos - hi
+            w00, w01 = (1.0 - mf) * (1.0 - hf), (1.0 - mf) * hf
+            w10, w11 = mf * (1.0 - hf), mf * hf
+            a0, a1, b0, b1 = rows_a[mi], rows_a[mi + 1], rows_b[mi], rows_b[mi + 1]
+            return (a0[hi] * w00 + a0[hi + 1] * w01 + a1[hi] * w10 + a1[hi + 1] * w11,
+                    b0[hi] * w00 + b0[hi + 1] * w01 + b1[hi] * w10 + b1[hi + 1] * w11)
+        return lookup
+
+    m_last, h_last = m_size - 1, h_size - 1
+
+    def lookup(m: float, h: float) -> Tuple[float, float]:
+        m_pos, h_pos = m_position(m), h_position(h)
+        mi, hi = int(m_pos), int(h_pos)
+        wm = catmull_rom_weights(m_pos - mi)
+        wh = catmull_rom_weights(h_pos - hi)
+        c0, c1 = (hi - 1 if hi > 0 else 0), hi
+        c2, c3 = min(hi + 1, h_last), min(hi + 2, h_last)
+        a = b = 0.0
+        for k, w in zip((mi - 1, mi, mi + 1, mi + 2), wm):
+            r = min(max(k, 0), m_last)
+            ra, rb = rows_a[r], rows_b[r]
+            a += w * (wh[0] * ra[c0] + wh[1] * ra[c1] + wh[2] * ra[c2] + wh[3] * ra[c3])
+            b += w * (wh[0] * rb[c0] + wh[1] * rb[c1] + wh[2] * rb[c2] + wh[3] * rb[c3])
+        return a, b
+    return lookup
+
+
+class LUTPath:
+    """One real substep + table lookup of the remaining N-1 (ja_loop)"""
+
+    def __init__(self, tables: dict, bias_lut: np.ndarray, bias_amplitude: float,
+                 physics: PhysicsParams, scheme: str):
+        self.substep = make_substep(physics, bias_amplitude)
+        self.lookup = make_lookup((tables['lut_M_end'], tables['lut_sumM_rest']),
+                                  tables['m_range'], tables['h_range'], tables['axis_warp'], scheme)
+        self.bias_first = float(bias_lut[0])
+        self.H_end_offset = bias_amplitude * float(bias_lut[-1])
+        self.inv_substeps = 1.0 / len(bias_lut)
+        self.M = 0.0
+        self.H = 0.0
+
+    def process(self, x: List[float]) -> List[float]:
+        substep, lookup = self.substep, self.lookup
+        bias_first, H_end_offset, inv_n = self.bias_first, self.H_end_offset, self.inv_substeps
+        M, H = self.M, self.H
+        out = []
+        for H_audio in x:
+            M1, _ = substep(M, H, H_audio, bias_first)
+            M, sumM_rest = lookup(M1, H_audio)
+            out.append((M1 + sumM_rest) * inv_n)
+            H = H_audio + H_end_offset
+        self.M, self.H = M, H
+        return out
+
+
+class PhysicsPath:
+    """All N substeps real, bias restarted every sample (what the LUT tabulates)"""
+
+    def __init__(self, bias_lut: np.ndarray, bias_amplitude: float, physics: PhysicsParams):
+        self.substep = make_substep(physics, bias_amplitude)
+        self.bias = [float(b) for b in bias_lut]
+        self.inv_substeps = 1.0 / len(bias_lut)
+        self.M = 0.0
+        self.H = 0.0
+
+    def process(self, x: List[float]) -> List[float]:
+        substep, bias, inv_n = self.substep, self.bias, self.inv_substeps
+        M, H = self.M, self.H
+        out = []
+        for H_audio in x:
+            sum_M = 0.0
+            for b in bias:
+                M, H = substep(M, H, H_audio, b)
+                sum_M += M
+            out.append(sum_M * inv_n)
+        self.M, self.H = M, H
+        return out
+
+
+class SchedulerPath:
+    """Free-running bias oscillator with fractional substep cursor (JAHysteresisScheduler)"""
+
+    def __init__(self, cycles_per_sample: float, substeps_per_cycle: int,
+                 bias_amplitude: float, physics: PhysicsParams):
+        self.substep = make_substep(physics, bias_amplitude)
+        self.cursor_step = cycles_per_sample * substeps_per_cycle
+        self.substep_phase = 2.0 * math.pi / max(substeps_per_cycle, 4)
+        self.phase = 0.0
+        self.cursor = 0.0
+        self.M = 0.0
+        self.H = 0.0
+
+    def process(self, x: List[float]) -> List[float]:
+        substep, dphi, two_pi = self.substep, self.substep_phase, 2.0 * math.pi
+        half_dphi = 0.5 * dphi
+        sin, fmod, floor = math.sin, math.fmod, math.floor
+        M, H, phase, cursor = self.M, self.H, self.phase, self.cursor
+        out = []
+        for H_audio in x:
+            cursor += self.cursor_step
+            steps = int(floor(cursor))
+            cursor -= steps
+
+            sum_M = 0.0
+            for _ in range(steps):
+                M, H = substep(M, H, H_audio, sin(fmod(phase + half_dphi, two_pi)))
+                sum_M += M
+                phase += dphi
+                if phase >= two_pi:
+                    phase -= two_pi
+
+            # Leftover fractional substep so the next sample starts in the right place
+            phase += cursor * dphi
+            if phase >= two_pi:
+                phase = fmod(phase, two_pi)
+
+            if steps == 0:
+                M, H = substep(M, H, H_audio, sin(fmod(phase + half_dphi, two_pi)))
+                sum_M += M
+                steps = 1
+
+            out.append(sum_M / steps)
+        self.M, self.H, self.phase, self.cursor = M, H, phase, cursor
+        return out
+
+
+class DCBlocker:
+    """fi.SVFTPT.HP2(10.0, 0.7071): topology-preserving 2-pole highpass"""
+
+    def __init__(self, sample_rate: float, cutoff: float = 10.0, q: float = 0.7071):
+        g = math.tan(math.pi * cutoff / sample_rate)
+        r = 1.0 / (2.0 * q)
+        self.g = g
+        self.G1 = 1.0 / (1.0 + 2.0 * r * g + g * g)
+        self.G2 = 2.0 * r + g
+        self.s1 = 0.0
+        self.s2 = 0.0
+
+    def process(self, x: List[float]) -> List[float]:
+        g, G1, G2 = self.g, self.G1, self.G2
+        s1, s2 = self.s1, self.s2
+        out = []
+        for v in x:
+            hp = (v - s1 * G2 - s2) * G1
+            v1 = g * hp
+            bp = s1 + v1
+            s1 = bp + v1
+            v2 = g * bp
+            s2 = s2 + v2 + v2
+            out.append(hp)
+        self.s1, self.s2 = s1, s2
+        return out
+
+
+class TapeStage:
+    """tape_channel gain structure around one hysteresis path"""
+
+    def __init__(self, core, sample_rate: float, input_gain_db: float, drive_db: float,
+                 output_gain_db: float, mix: float, dc_block: bool):
+        drive = 10.0 ** (drive_db / 20.0)
+        self.core = core
+        self.pre_gain = 10.0 ** (input_gain_db / 20.0) * drive
+        self.post_gain = 10.0 ** (output_gain_db / 20.0) / drive
+        self.mix = mix
+        self.dc_blocker = DCBlocker(sample_rate) if dc_block else None
+
+    def process(self, x: np.ndarray) -> np.ndarray:
+        wet = self.core.process((x * self.pre_gain).tolist())
+        if self.dc_blocker is not None:
+            wet = self.dc_blocker.process(wet)
+        wet = np.asarray(wet) * self.post_gain
+        if self.mix >= 1.0:
+            return wet
+        return x * (1.0 - self.mix) + wet * self.mix
+
+
+# =============================================================================
+# Rendering
+# =============================================================================
+
+def build_path(name: str, settings: dict):
+    """Instantiate one signal path (inside a worker)"""
+    physics = PhysicsParams(**settings['physics'])
+    bias_amplitude = settings['bias_amplitude']
+    bias_lut = generate_bias_lut(settings['phase_span'], settings['total_substeps'])
+    if name == 'lut':
+        core = LUTPath(settings['tables'], bias_lut, bias_amplitude, physics, settings['scheme'])
+    elif name == 'physics':
+        core = PhysicsPath(bias_lut, bias_amplitude, physics)
+    else:
+        core = SchedulerPath(settings['cycles_per_sample'], settings['substeps_per_cycle'],
+                             bias_amplitude, physics)
+    return TapeStage(core, settings['sample_rate'], settings['input_gain_db'], settings['drive_db'],
+                     settings['output_gain_db'], settings['mix'], settings['dc_block'])
+
+
+def render_channel(input_path: Path, channel: int, paths: List[str], settings: dict,
+                   scratch_dir: Path) -> Dict[str, float]:
+    """
+    Worker: stream one channel through every path, appending float64 output
+    to scratch_dir/<path>_<channel>.f64. Returns seconds spent per path.
+    """
+    stages = {name: build_path(name, settings) for name in paths}
+    outputs = {name: open(scratch_dir / f"{name}_{channel}.f64", 'wb') for name in paths}
+    seconds = dict.fromkeys(paths, 0.0)
+    try:
+        for block in read_blocks(input_path, settings['block_size']):
+            x = np.ascontiguousarray(block[:, channel])
+            for name, stage in stages.items():
+                start = time.perf_counter()
+                y = stage.process(x)
+                seconds[name] += time.perf_counter() - start
+                outputs[name].write(np.asarray(y, dtype='<f8').tobytes())
+    finally:
+        for f in outputs.values():
+            f.close()
+    return seconds
+
+
+def read_scratch_blocks(scratch_dir: Path, name: str, channels: int, block_size: int):
+    """Yield interleaved (frames, channels) blocks from the per-channel scratch files"""
+    files = [open(scratch_dir / f"{name}_{ch}.f64", 'rb') for ch in range(channels)]
+    try:
+        while True:
+            columns = [np.frombuffer(f.read(block_size * 8), dtype='<f8') for f in files]
+            if len(columns[0]) == 0:
+                break
+            yield np.stack(columns, axis=1)
+    finally:
+        for f in files:
+            f.close()
+
+
+def level_db(value: float) -> float:
+    """Linear amplitude in dBFS (floor -400)"""
+    return 20.0 * math.log10(max(value, 1e-20))
+
+
+def write_outputs(scratch_dir: Path, paths: List[str], reference: Optional[str], params,
+                  output_dir: Path, stem: str, sample_width: int, block_size: int) -> Dict[str, dict]:
+    """Interleave scratch files into WAVs (renders and null residuals); return residual stats"""
+    channels, sample_rate = params.nchannels, params.framerate
+    jobs = [(name, None) for name in paths]
+    if reference is not None:
+        jobs += [(name, reference) for name in paths if name != reference]
+
+    stats = {}
+    for name, ref in jobs:
+        filename = f"{stem}.{name}.wav" if ref is None else f"{stem}.null_{name}_vs_{ref}.wav"
+        peak, sum_sq, frames = 0.0, 0.0, 0
+        with wave.open(str(output_dir / filename), 'wb') as wav:
+            wav.setnchannels(channels)
+            wav.setsampwidth(sample_width)
+            wav.setframerate(sample_rate)
+            blocks = read_scratch_blocks(scratch_dir, name, channels, block_size)
+            if ref is not None:
+                blocks = (a - b for a, b in zip(blocks, read_scratch_blocks(scratch_dir, ref, channels, block_size)))
+            for block in blocks:
+                wav.writeframes(float_to_pcm(block, sample_width))
+                peak = max(peak, float(np.abs(block).max()))
+                sum_sq += float(np.sum(block * block))
+                frames += len(block)
+        rms = math.sqrt(sum_sq / max(frames * channels, 1))
+        print(f"  {filename}: peak {level_db(peak):7.1f} dBFS, RMS {level_db(rms):7.1f} dBFS")
+        if ref is not None:
+            stats[f"{name}_vs_{ref}"] = {'peak_db': level_db(peak), 'rms_db': level_db(rms)}
+    return stats
+
+
+def load_tables(args, mode_name: str, physics: PhysicsParams) -> dict:
+    """Tables for the LUT path: an exported binary bank entry, or built via the cache"""
+    if args.lut_bank:
+        bank = load_binary_bank(args.lut_bank)
+        if mode_name not in bank:
+            raise SystemExit(f"{args.lut_bank} has no {mode_name} entry (has: {', '.join(bank)})")
+        entry = bank[mode_name]
+        if entry['physics'] != tuple(physics) or entry['real_substeps'] != 1:
+            raise SystemExit(f"{args.lut_bank} {mode_name} was built with physics {entry['physics']} and "
+                             f"{entry['real_substeps']} real substeps; the renderer runs {tuple(physics)} with 1")
+        return {key: entry[key] for key in ('lut_M_end', 'lut_sumM_rest', 'm_range', 'h_range',
+                                            'axis_warp', 'bias_level', 'bias_scale')}
+
+    build_args = argparse.Namespace(m_size=args.m_size, h_size=args.h_size, h_range=list(args.h_range),
+                                    bias_level=args.bias_level, bias_scale=args.bias_scale,
+                                    workers=1, engine='vector', backend=resolve_backend('auto'))
+    cache = None if args.no_cache else LUTCache(args.cache_dir, int(args.cache_max_mb * 1024 * 1024))
+    job = resolve_jobs([mode_name], variants=False)[0]
+    m_grid, h_grid, lut_M_end, lut_sumM_rest = build_luts([job], physics, build_args, cache)[job.name]
+    return {
+        'lut_M_end': np.ascontiguousarray(lut_M_end),
+        'lut_sumM_rest': np.ascontiguousarray(lut_sumM_rest),
+        'm_range': (float(m_grid[0]), float(m_grid[-1])),
+        'h_range': (float(h_grid[0]), float(h_grid[-1])),
+        'axis_warp': (None, None),
+        'bias_level': args.bias_level,
+        'bias_scale': args.bias_scale,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render WAV files through the JA hysteresis tape stage')
+    parser.add_argument('input', type=Path, help='Input WAV file (integer PCM)')
+    parser.add_argument('--mode', type=str, default='K121', choices=list(MODES.keys()),
+                        help='Bias mode (default: K121)')
+    parser.add_argument('--paths', type=str, default='lut,physics',
+                        help=f"Comma-separated signal paths: {', '.join(RENDER_PATHS)} (default: lut,physics)")
+    parser.add_argument('--reference', type=str,
+                        help='Path the others are nulled against (default: physics if rendered, else none)')
+    parser.add_argument('--scheme', choices=LOOKUP_SCHEMES, default='catmull-rom',
+                        help='LUT interpolation: catmull-rom (FAUST --faust-kernel catmull-rom) or bilinear (C++, '
+                             'FAUST default) (default: catmull-rom)')
+    parser.add_argument('--lut-bank', type=Path,
+                        help='Binary LUT bank (--formats binary) to take the tables from')
+    parser.add_argument('--m-size', type=int, default=65,
+                        help='M grid size when building tables (default: 65)')
+    parser.add_argument('--h-size', type=int, default=129,
+                        help='H grid size when building tables (default: 129)')
+    parser.add_argument('--h-range', type=float, nargs=2, default=[-1.0, 1.0],
+                        help='H audio range when building tables (default: -1.0 1.0)')
+    parser.add_argument('--bias-level', type=float, default=0.41,
+                        help='Bias level (default: 0.41)')
+    parser.add_argument('--bias-scale', type=float, default=11.0,
+                        help='Bias scale (default: 11.0)')
+    parser.add_argument('--input-gain-db', type=float, default=0.0,
+                        help='Input gain in dB (default: 0.0)')
+    parser.add_argument('--drive-db', type=float, default=0.0,
+                        help='Drive in dB, compensated after the stage (default: 0.0)')
+    parser.add_argument('--output-gain-db', type=float, default=15.9,
+                        help='Output gain in dB (default: 15.9)')
+    parser.add_argument('--mix', type=float, default=1.0,
+                        help='Dry/wet mix 0..1 (default: 1.0)')
+    parser.add_argument('--no-dc-block', action='store_true',
+                        help='Skip the 10 Hz DC blocker')
+    parser.add_argument('--block-size', type=int, default=8192,
+                        help='Frames per streamed block (default: 8192)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes, one channel each (default: CPU count)')
+    parser.add_argument('--output-dir', type=Path, default=Path('renders'),
+                        help='Output directory (default: ./renders)')
+    parser.add_argument('--bits', type=int, choices=[16, 24, 32], default=24,
+                        help='Output PCM bit depth (default: 24)')
+    parser.add_argument('--max-null-db', type=float,
+                        help='Exit with status 1 if any null residual peak exceeds this level (dBFS)')
+    parser.add_argument('--cache-dir', type=Path, default=Path(__file__).parent / '.lut_cache',
+                        help='LUT array cache directory (default: scripts/.lut_cache)')
+    parser.add_argument('--cache-max-mb', type=float, default=512.0,
+                        help='Evict least recently used cache entries above this size (default: 512)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Always re-simulate and do not touch the cache')
+
+    args = parser.parse_args()
+
+    paths = [p.strip() for p in args.paths.split(',') if p.strip()]
+    unknown = [p for p in paths if p not in RENDER_PATHS]
+    if not paths or unknown:
+        parser.error(f"--paths must list some of: {', '.join(RENDER_PATHS)}")
+    reference = args.reference or ('physics' if 'physics' in paths and len(paths) > 1 else None)
+    if reference is not None and reference not in paths:
+        parser.error(f"--reference {reference} is not among the rendered paths")
+    if args.block_size < 1:
+        parser.error("--block-size must be positive")
+
+    with wave.open(str(args.input), 'rb') as wav:
+        params = wav.getparams()
+    if params.comptype != 'NONE':
+        parser.error(f"{args.input}: only uncompressed PCM WAV is supported")
+
+    physics = PhysicsParams()
+    mode = MODES[args.mode]
+    tables = load_tables(args, mode.name, physics) if 'lut' in paths else None
+    bias_level = tables['bias_level'] if tables else args.bias_level
+    bias_scale = tables['bias_scale'] if tables else args.bias_scale
+
+    settings = {
+        'physics': physics._asdict(),
+        'bias_amplitude': bias_level * bias_scale,
+        'phase_span': mode.phase_span,
+        'total_substeps': mode.total_substeps,
+        'cycles_per_sample': mode.cycles_per_sample,
+        'substeps_per_cycle': mode.substeps_per_cycle,
+        'tables': tables,
+        'scheme': args.scheme,
+        'sample_rate': float(params.framerate),
+        'input_gain_db': args.input_gain_db,
+        'drive_db': args.drive_db,
+        'output_gain_db': args.output_gain_db,
+        'mix': min(max(args.mix, 0.0), 1.0),
+        'dc_block': not args.no_dc_block,
+        'block_size': args.block_size,
+    }
+
+    duration = params.nframes / params.framerate
+    print(f"\n=== JA Hysteresis Render: {args.input.name} ===")
+    print(f"{params.nchannels} ch, {params.framerate} Hz, {params.sampwidth * 8}-bit, {duration:.1f} s")
+    print(f"Mode: {mode.name} ({mode.total_substeps} substeps), bias amplitude {bias_level * bias_scale:.3f}")
+    print(f"Paths: {', '.join(paths)}" + (f" (null reference: {reference})" if reference else ""))
+    if tables is not None:
+        print(f"LUT: {tables['lut_M_end'].shape[0]}x{tables['lut_M_end'].shape[1]} {args.scheme}"
+              + (f" from {args.lut_bank}" if args.lut_bank else ""))
+
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory(prefix='ja_render_', dir=args.output_dir) as scratch:
+        scratch_dir = Path(scratch)
+        workers = max(1, min(args.workers, params.nchannels))
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(render_channel, args.input, ch, paths, settings, scratch_dir)
+                           for ch in range(params.nchannels)]
+                timings = [f.result() for f in futures]
+        else:
+            timings = [render_channel(args.input, ch, paths, settings, scratch_dir)
+                       for ch in range(params.nchannels)]
+        render_seconds = time.perf_counter() - start
+
+        for name in paths:
+            seconds = sum(t[name] for t in timings)
+            print(f"  {name}: {seconds:.2f} s CPU ({duration * params.nchannels / max(seconds, 1e-9):.1f}x realtime per channel)")
+        print(f"Rendered in {render_seconds:.2f} s wall ({workers} worker{'s' if workers > 1 else ''})")
+
+        print(f"\nWriting to {args.output_dir}/")
+        stats = write_outputs(scratch_dir, paths, reference, params, args.output_dir,
+                              args.input.stem, args.bits // 8, args.block_size)
+
+    if args.max_null_db is not None:
+        failed = {k: v for k, v in stats.items() if v['peak_db'] > args.max_null_db}
+        if failed:
+            for name, v in failed.items():
+                print(f"FAIL: null {name} peak {v['peak_db']:.1f} dBFS > {args.max_null_db:.1f} dBFS")
+            sys.exit(1)
+        print(f"All null residuals below {args.max_null_db:.1f} dBFS")
+
+
+if __name__ == '__main__':
+    main()
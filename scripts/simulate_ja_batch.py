@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Batched full-physics reference simulator for parameter sweeps
+
+Runs the free-running bias oscillator with fractional substep cursor
+(JAHysteresisScheduler::process, render_ja_wav.SchedulerPath) for many
+independent configurations and channels at once. A configuration is one
+tape formulation (physics and bias, from a --sweep file as read by
+generate_ja_lut.load_sweep) in one mode at one quality; every
+configuration sees the same test signals (feedback_test_signals, one
+channel per amplitude).
+
+Configurations with the same cycles per sample and substeps per cycle
+share their cursor and bias phase sample for sample, so each such group
+runs as one lockstep loop with a lane per (configuration, channel).
+Physics and bias amplitude are per-lane arrays. The cost of a group is
+set by the number of NumPy calls per substep, not by the lane count:
+256 formulations x 3 channels in K121 take 13 s for 2400 samples, against
+8 s for 3 formulations, 18x faster per configuration than the scalar
+path. Below about 25 lanes per group the scalar path is faster.
+
+Modes:
+  K32, K48, K60   JAHysteresisScheduler modes; --qualities picks the
+                  substeps per cycle (eco, normal, ultra) as in C++
+  K28 ... K2101   LUT modes (ja_lut_modes.MODES), one substep count each
+
+--tanh rational uses the clamped rational fastTanh of the C++ scheduler
+(JAHysteresisScheduler.cpp); the default exact tanh matches the generator
+and render_ja_wav. --check N reruns the first N configurations through
+the scalar render_ja_wav.SchedulerPath (exact tanh) for parity and speed.
+
+Usage:
+    python simulate_ja_batch.py [--modes K32,K48,K60] [--qualities eco,normal,ultra]
+    python simulate_ja_batch.py --sweep tape_formulations.json --modes K121 --check 2
+    python simulate_ja_batch.py --sweep grid.json --samples 48000 --output sweep.npz
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Tuple
+
+import numpy as np
+
+from generate_ja_lut import (
+    Formulation,
+    PhysicsParams,
+    fast_tanh,
+    feedback_test_signals,
+    load_sweep,
+)
+from ja_lut_modes import MODES
+
+
+# JAHysteresisScheduler::updateModeDerived(): bias cycles per sample and
+# substeps per cycle at each quality
+SCHEDULER_MODES = {
+    'K32': (2.0, {'eco': 16, 'normal': 18, 'ultra': 20}),
+    'K48': (3.0, {'eco': 16, 'normal': 18, 'ultra': 19}),
+    'K60': (3.0, {'eco': 20, 'normal': 22, 'ultra': 24}),
+}
+
+QUALITIES = ('eco', 'normal', 'ultra')
+
+TANH_KINDS = ('exact', 'rational')
+
+
+class SchedulerConfig(NamedTuple):
+    """One independent scheduler instance of a batch"""
+    name: str
+    physics: PhysicsParams
+    bias_level: float
+    bias_scale: float
+    cycles_per_sample: float
+    substeps_per_cycle: int
+
+    @property
+    def bias_amplitude(self) -> float:
+        """setBiasControls(): level clamped to [0, 1], scale to >= 0"""
+        return min(max(self.bias_level, 0.0), 1.0) * max(self.bias_scale, 0.0)
+
+    @property
+    def steps_per_cycle(self) -> int:
+        """Substeps per bias cycle as the scheduler uses them (at least 4)"""
+        return max(self.substeps_per_cycle, 4)
+
+
+def rational_tanh(x: np.ndarray) -> np.ndarray:
+    """JAHysteresisScheduler::fastTanh(): clamped rational approximation"""
+    clamped = np.clip(x, -3.0, 3.0)
+    x2 = clamped * clamped
+    return clamped * (27.0 + x2) / (27.0 + 9.0 * x2)
+
+
+def scheduler_configs(formulations: List[Formulation], modes: List[str],
+                      qualities: List[str]) -> List[SchedulerConfig]:
+    """Every formulation in every mode (and quality, for the scheduler modes)"""
+    configs = []
+    for formulation in formulations:
+        for mode_name in modes:
+            if mode_name in SCHEDULER_MODES:
+                cycles, steps = SCHEDULER_MODES[mode_name]
+                variants = [(f"{mode_name}-{quality}", steps[quality]) for quality in qualities]
+            else:
+                mode = MODES[mode_name]
+                cycles, variants = mode.cycles_per_sample, [(mode_name, mode.substeps_per_cycle)]
+            for label, substeps_per_cycle in variants:
+                configs.append(SchedulerConfig(f"{formulation.name}/{label}", formulation.physics,
+                                               formulation.bias_level, formulation.bias_scale,
+                                               cycles, substeps_per_cycle))
+    return configs
+
+
+def lane_constants(configs: List[SchedulerConfig], channels: int) -> Dict[str, np.ndarray]:
+    """
+    Derived constants of JAHysteresisScheduler::updateDerived() per lane,
+    configuration-major (lane = config * channels + channel)
+    """
+    def per_lane(values):
+        return np.repeat(np.asarray(values, dtype=np.float64), channels)
+
+    Ms_safe = [max(c.physics.Ms, 1e-6) for c in configs]
+    a_norm = [c.physics.a_density / ms for c, ms in zip(configs, Ms_safe)]
+    k = {
+        'alpha_norm': per_lane([c.physics.alpha_coupling for c in configs]),
+        'inv_a_norm': per_lane([1.0 / max(a, 1e-9) for a in a_norm]),
+        'k_norm': per_lane([c.physics.k_pinning / ms for c, ms in zip(configs, Ms_safe)]),
+        'c_norm': per_lane([c.physics.c_reversibility for c in configs]),
+        'bias_amplitude': per_lane([c.bias_amplitude for c in configs]),
+    }
+    # c_norm * alpha_norm * dMan_dH evaluates left to right, so the product folds exactly
+    k['c_alpha'] = k['c_norm'] * k['alpha_norm']
+    return k
+
+
+def ja_substep_lanes(M_prev: np.ndarray, H_prev: np.ndarray, H_audio: np.ndarray, bias_offset: float,
+                     k: Dict[str, np.ndarray], tanh=fast_tanh) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    One JA substep for every lane, each with its own physics and bias
+    amplitude (lane_constants()). Same arithmetic, in the same order, as
+    generate_ja_lut.ja_substep_grid() and C++ executeSubstep(), with the
+    per-call NumPy work cut down: a lane batch is small, so the cost is
+    the number of array operations rather than their length.
+    """
+    H_new = H_audio + k['bias_amplitude'] * bias_offset
+    dH = H_new - H_prev
+
+    Man_e = tanh((H_new + k['alpha_norm'] * M_prev) * k['inv_a_norm'])
+    dMan_dH = (1.0 - Man_e * Man_e) * k['inv_a_norm']
+    Man_gap = Man_e - M_prev
+
+    # direction * k_norm; copysign differs from dH >= 0.0 only at dH = -0.0, where dM is 0 either way
+    pin = np.copysign(k['k_norm'], dH) - k['alpha_norm'] * Man_gap
+    inv_pin = 1.0 / (pin + 1e-6)
+
+    inv_denom = 1.0 / ((1.0 - k['c_alpha'] * dMan_dH) + 1e-9)
+    dMdH = (k['c_norm'] * dMan_dH + Man_gap * inv_pin) * inv_denom
+
+    M_new = np.minimum(np.maximum(M_prev + dMdH * dH, -1.0), 1.0)
+    return M_new, H_new
+
+
+def simulate_group(configs: List[SchedulerConfig], H_in: np.ndarray, tanh=fast_tanh) -> np.ndarray:
+    """
+    Lockstep JAHysteresisScheduler::process() over H_in (channels, samples)
+    for configurations that share cycles per sample and substeps per cycle
+    (so one cursor and bias phase serve them all). Returns
+    (configs, channels, samples) averaged magnetisation.
+    """
+    channels, n_samples = H_in.shape
+    k = lane_constants(configs, channels)
+    lanes = len(configs) * channels
+    H_lanes = np.ascontiguousarray(np.tile(H_in, (len(configs), 1)).T)  # (samples, lanes)
+
+    two_pi = 2.0 * math.pi
+    dphi = two_pi / configs[0].steps_per_cycle
+    half_dphi = 0.5 * dphi
+    cursor_step = configs[0].cycles_per_sample * configs[0].steps_per_cycle
+    sin, fmod, floor = math.sin, math.fmod, math.floor
+
+    M = np.zeros(lanes)
+    H = np.zeros(lanes)
+    phase, cursor = 0.0, 0.0
+    out = np.empty((n_samples, lanes))
+    for t in range(n_samples):
+        H_audio = H_lanes[t]
+        cursor += cursor_step
+        steps = int(floor(cursor))
+        cursor -= steps
+
+        sum_M = np.zeros(lanes)
+        for _ in range(steps):
+            M, H = ja_substep_lanes(M, H, H_audio, sin(fmod(phase + half_dphi, two_pi)), k, tanh)
+            sum_M += M
+            phase += dphi
+            if phase >= two_pi:
+                phase -= two_pi
+
+        # Leftover fractional substep so the next sample starts in the right place
+        phase += cursor * dphi
+        if phase >= two_pi:
+            phase = fmod(phase, two_pi)
+
+        if steps == 0:
+            M, H = ja_substep_lanes(M, H, H_audio, sin(fmod(phase + half_dphi, two_pi)), k, tanh)
+            sum_M += M
+            steps = 1
+
+        out[t] = sum_M / steps
+    return out.T.reshape(len(configs), channels, n_samples)
+
+
+def simulate_batch(configs: List[SchedulerConfig], H_in: np.ndarray,
+                   tanh: str = 'exact') -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Run every configuration over the same H_in (channels, samples), one
+    lockstep group per (cycles per sample, substeps per cycle). Returns the
+    (configs, channels, samples) outputs and the seconds per configuration
+    (its group's wall time shared evenly between the group's members).
+    """
+    tanh_fn = rational_tanh if tanh == 'rational' else fast_tanh
+    groups: Dict[Tuple[float, int], List[int]] = {}
+    for i, config in enumerate(configs):
+        groups.setdefault((config.cycles_per_sample, config.steps_per_cycle), []).append(i)
+
+    outputs = np.empty((len(configs),) + H_in.shape)
+    seconds = np.empty(len(configs))
+    for members in groups.values():
+        start = time.perf_counter()
+        outputs[members] = simulate_group([configs[i] for i in members], H_in, tanh_fn)
+        seconds[members] = (time.perf_counter() - start) / len(members)
+    return outputs, seconds
+
+
+def check_scalar(configs: List[SchedulerConfig], H_in: np.ndarray,
+                 outputs: np.ndarray) -> List[Tuple[str, float, float]]:
+    """(name, max |batch - scalar|, scalar seconds) against render_ja_wav.SchedulerPath per config"""
+    from render_ja_wav import SchedulerPath
+
+    results = []
+    for config, batch in zip(configs, outputs):
+        start = time.perf_counter()
+        worst = 0.0
+        for channel, x in enumerate(H_in):
+            path = SchedulerPath(config.cycles_per_sample, config.steps_per_cycle,
+                                 config.bias_amplitude, config.physics)
+            scalar = np.asarray(path.process([float(v) for v in x]))
+            worst = max(worst, float(np.max(np.abs(scalar - batch[channel]))))
+        results.append((config.name, worst, time.perf_counter() - start))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Batched JAHysteresisScheduler reference over many configurations')
+    parser.add_argument('--sweep', type=Path,
+                        help='Formulation file (generate_ja_lut --sweep format; default: the default physics only)')
+    parser.add_argument('--modes', type=str, default='K32,K48,K60',
+                        help=f"Comma-separated modes: {', '.join(SCHEDULER_MODES)} or LUT modes "
+                             f"{', '.join(MODES)} (default: K32,K48,K60)")
+    parser.add_argument('--qualities', type=str, default='normal',
+                        help=f"Comma-separated qualities of the scheduler modes: {', '.join(QUALITIES)} "
+                             f"(default: normal)")
+    parser.add_argument('--bias-level', type=float, default=0.41,
+                        help='Bias level of formulations that do not set one (default: 0.41)')
+    parser.add_argument('--bias-scale', type=float, default=11.0,
+                        help='Bias scale of formulations that do not set one (default: 11.0)')
+    parser.add_argument('--amplitudes', type=str, default='0.1,0.5,1.0',
+                        help='Test signal peak amplitudes, one channel each (default: 0.1,0.5,1.0)')
+    parser.add_argument('--samples', type=int, default=4800,
+                        help='Samples per channel (default: 4800)')
+    parser.add_argument('--sample-rate', type=float, default=48000.0,
+                        help='Test signal sample rate (default: 48000)')
+    parser.add_argument('--tanh', choices=TANH_KINDS, default='exact',
+                        help='Anhysteretic tanh: exact (generator, renderer) or the C++ scheduler\'s '
+                             'rational fastTanh (default: exact)')
+    parser.add_argument('--check', type=int, default=0, metavar='N',
+                        help='Rerun the first N configurations through the scalar render_ja_wav '
+                             'SchedulerPath for parity and speed (needs --tanh exact)')
+    parser.add_argument('--tolerance', type=float, default=1e-12,
+                        help='Largest batch vs scalar difference --check accepts (default: 1e-12)')
+    parser.add_argument('--output', type=Path,
+                        help='Write outputs, signals and timing to this .npz file')
+    args = parser.parse_args()
+
+    modes = [m.strip() for m in args.modes.split(',') if m.strip()]
+    unknown = [m for m in modes if m not in SCHEDULER_MODES and m not in MODES]
+    if not modes or unknown:
+        parser.error(f"--modes must list some of: {', '.join([*SCHEDULER_MODES, *MODES])}")
+    qualities = [q.strip() for q in args.qualities.split(',') if q.strip()]
+    if not qualities or any(q not in QUALITIES for q in qualities):
+        parser.error(f"--qualities must list some of: {', '.join(QUALITIES)}")
+    try:
+        amplitudes = [float(a) for a in args.amplitudes.split(',') if a.strip()]
+    except ValueError:
+        parser.error("--amplitudes must be comma-separated numbers")
+    if not amplitudes or args.samples < 1:
+        parser.error("need at least one amplitude and one sample")
+    if args.check and args.tanh != 'exact':
+        parser.error("--check compares against the exact-tanh scalar path: use --tanh exact")
+
+    if args.sweep is not None:
+        try:
+            formulations = load_sweep(args.sweep, args.bias_level, args.bias_scale)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            parser.error(f"--sweep: {e}")
+    else:
+        formulations = [Formulation('default', PhysicsParams(), args.bias_level, args.bias_scale)]
+
+    configs = scheduler_configs(formulations, modes, qualities)
+    H_in = feedback_test_signals(args.samples, args.sample_rate, amplitudes)
+
+    print(f"\n=== Batched JA Scheduler Reference ===")
+    print(f"{len(formulations)} formulation(s) x {len(configs) // len(formulations)} mode/quality "
+          f"= {len(configs)} configurations, {len(amplitudes)} channels x {args.samples} samples, "
+          f"tanh {args.tanh}")
+
+    start = time.perf_counter()
+    outputs, seconds = simulate_batch(configs, H_in, args.tanh)
+    total = time.perf_counter() - start
+    audio_seconds = args.samples / args.sample_rate
+
+    print(f"\n{'config':<28} {'substeps':>8} {'peak':>8} {'rms':>8} {'ms':>9}")
+    for config, out, sec in zip(configs, outputs, seconds):
+        print(f"{config.name:<28} {config.cycles_per_sample * config.steps_per_cycle:8.1f} "
+              f"{np.max(np.abs(out)):8.4f} {np.sqrt(np.mean(out * out)):8.4f} {sec * 1e3:9.2f}")
+    lane_seconds = len(configs) * len(amplitudes) * audio_seconds
+    print(f"\nSimulated {len(configs) * len(amplitudes)} lanes in {total:.2f} s "
+          f"({lane_seconds / max(total, 1e-9):.1f}x realtime per lane)")
+
+    failed = False
+    if args.check:
+        print(f"\nScalar SchedulerPath parity (first {min(args.check, len(configs))}):")
+        for name, worst, sec in check_scalar(configs[:args.check], H_in, outputs[:args.check]):
+            batch_sec = seconds[[c.name for c in configs].index(name)]
+            status = 'ok' if worst <= args.tolerance else 'FAIL'
+            failed |= status == 'FAIL'
+            print(f"  {name:<28} max diff {worst:.2e}  scalar {sec:.2f} s  batch {batch_sec:.3f} s  "
+                  f"({sec / max(batch_sec, 1e-9):.1f}x)  {status}")
+
+    if args.output is not None:
+        np.savez(args.output, outputs=outputs, signals=H_in, seconds=seconds,
+                 names=np.array([c.name for c in configs]),
+                 configs=json.dumps([{**c._asdict(), 'physics': c.physics._asdict()} for c in configs]))
+        print(f"\nWrote {args.output}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
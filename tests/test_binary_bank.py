@@ -0,0 +1,76 @@
+"""Binary LUT banks: write, memory-map back, and the page-aligned table layout"""
+
+import numpy as np
+import pytest
+
+from ja_lut_export import (
+    LUT_BIN_ALIGN,
+    LUT_BIN_ENTRY,
+    LUT_BIN_HEADER,
+    export_binary_bank,
+    load_binary_bank,
+)
+from ja_lut_modes import MODES
+
+PHYSICS = (1.2e6, 900.0, 1100.0, 0.25, 1.5e-3)
+
+
+def bank_entries(names, m_size=5, h_size=9):
+    """Entries with distinct random tables, so a swapped offset shows up"""
+    rng = np.random.default_rng(0)
+    m_grid = np.linspace(-1.0, 1.0, m_size)
+    h_grid = np.linspace(-2.0, 2.0, h_size)
+    return [(name, MODES[name].total_substeps, MODES[name].phase_span, m_grid, h_grid,
+             rng.standard_normal((m_size, h_size)), rng.standard_normal((m_size, h_size)))
+            for name in names]
+
+
+@pytest.mark.parametrize('axis_warp', [
+    (None, None),
+    (np.array([0.0, 0.3, 1.0]), np.array([0.0, 0.25, 0.5, 1.0])),
+])
+def test_binary_bank_round_trip(axis_warp, tmp_path):
+    entries = bank_entries(['K28', 'K121'])
+    path = tmp_path / 'ja_lut_bank.bin'
+    export_binary_bank(entries, PHYSICS, 0.41, 11.0, path, axis_warp, real_substeps=2)
+
+    bank = load_binary_bank(path)
+    assert list(bank) == ['K28', 'K121']
+    for name, total_substeps, phase_span, m_grid, h_grid, lut_M_end, lut_sumM_rest in entries:
+        lut = bank[name]
+        assert lut['total_substeps'] == total_substeps
+        assert lut['real_substeps'] == 2
+        assert lut['phase_span'] == phase_span
+        assert lut['physics'] == PHYSICS
+        assert (lut['bias_level'], lut['bias_scale']) == (0.41, 11.0)
+        assert lut['m_range'] == (m_grid[0], m_grid[-1])
+        assert lut['h_range'] == (h_grid[0], h_grid[-1])
+        np.testing.assert_array_equal(lut['lut_M_end'], lut_M_end)
+        np.testing.assert_array_equal(lut['lut_sumM_rest'], lut_sumM_rest)
+        for warp, stored in zip(axis_warp, lut['axis_warp']):
+            if warp is None:
+                assert stored is None
+            else:
+                # Both warps are resampled onto the lcm of their segment counts
+                assert len(stored) == 7
+                np.testing.assert_allclose(np.interp(np.linspace(0.0, 1.0, len(warp)),
+                                                     np.linspace(0.0, 1.0, len(stored)), stored), warp)
+
+
+def test_binary_bank_tables_start_on_pages(tmp_path):
+    path = tmp_path / 'ja_lut_bank.bin'
+    export_binary_bank(bank_entries(list(MODES)), PHYSICS, 0.41, 11.0, path)
+
+    raw = path.read_bytes()
+    _, _, header_size, count, entry_size, alignment = LUT_BIN_HEADER.unpack_from(raw, 0)
+    assert (header_size, count, entry_size, alignment) == (LUT_BIN_HEADER.size, len(MODES),
+                                                           LUT_BIN_ENTRY.size, LUT_BIN_ALIGN)
+    for i in range(count):
+        *_, off_m_end, off_sum, off_m_warp, off_h_warp = LUT_BIN_ENTRY.unpack_from(raw, header_size + i * entry_size)
+        assert off_m_end % LUT_BIN_ALIGN == 0 and off_sum % LUT_BIN_ALIGN == 0
+        assert off_m_warp == off_h_warp == 0
+
+
+def test_binary_bank_rejects_incomplete_physics(tmp_path):
+    with pytest.raises(ValueError, match='5 values'):
+        export_binary_bank(bank_entries(['K28']), PHYSICS[:4], 0.41, 11.0, tmp_path / 'bank.bin')
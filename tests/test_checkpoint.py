@@ -0,0 +1,82 @@
+"""Checkpointed builds: interrupted partway, resumed, and bit-identical to one pass"""
+
+import numpy as np
+import pytest
+
+from generate_ja_lut import (
+    LUTCheckpoint,
+    PhysicsParams,
+    axis_grid,
+    generate_2d_lut_checkpointed,
+    generate_2d_luts_parallel,
+    resolve_jobs,
+    simulate_lut_rows,
+)
+
+BIAS_AMPLITUDE = 0.41 * 11.0
+M_SIZE, H_SIZE, BLOCK_ROWS = 17, 9, 4
+
+
+@pytest.fixture
+def build():
+    job = resolve_jobs(['K28'], variants=False)[0]
+    m_grid = axis_grid(-1.0, 1.0, M_SIZE)
+    h_grid = axis_grid(-1.0, 1.0, H_SIZE)
+    expected = simulate_lut_rows(job, PhysicsParams(), BIAS_AMPLITUDE, m_grid, h_grid)
+    return job, m_grid, h_grid, expected
+
+
+def interrupted(root, job, m_grid, h_grid, n_blocks):
+    """A checkpoint with only its first n_blocks stored, as a killed run leaves it"""
+    checkpoint = LUTCheckpoint(root, 'key', m_grid, h_grid, (M_SIZE, H_SIZE))
+    for rows in checkpoint.pending_blocks(BLOCK_ROWS)[:n_blocks]:
+        checkpoint.store(rows, *simulate_lut_rows(job, PhysicsParams(), BIAS_AMPLITUDE, m_grid[rows], h_grid))
+    return checkpoint
+
+
+def test_serial_resume_is_bit_identical(build, tmp_path):
+    job, m_grid, h_grid, expected = build
+    interrupted(tmp_path, job, m_grid, h_grid, 2)
+
+    checkpoint = LUTCheckpoint(tmp_path, 'key', m_grid, h_grid, (M_SIZE, H_SIZE))
+    assert checkpoint.rows_done == 2 * BLOCK_ROWS
+    assert checkpoint.pending_blocks(BLOCK_ROWS)[0].start == 2 * BLOCK_ROWS
+    result = generate_2d_lut_checkpointed(job, checkpoint, PhysicsParams(), BIAS_AMPLITUDE, m_grid, h_grid,
+                                          block_rows=BLOCK_ROWS)
+
+    np.testing.assert_array_equal(result[0], m_grid)
+    np.testing.assert_array_equal(result[1], h_grid)
+    for table, reference in zip(result[2:], expected):
+        assert np.array_equal(table, reference)
+
+
+def test_parallel_resume_is_bit_identical(build, tmp_path):
+    job, m_grid, h_grid, expected = build
+    interrupted(tmp_path, job, m_grid, h_grid, 3)
+
+    checkpoints = {job.name: LUTCheckpoint(tmp_path, 'key', m_grid, h_grid, (M_SIZE, H_SIZE))}
+    result = generate_2d_luts_parallel([job], PhysicsParams(), 2, m_size=M_SIZE, h_size=H_SIZE,
+                                       checkpoints=checkpoints, block_rows=BLOCK_ROWS)[job.name]
+
+    for table, reference in zip(result[2:], expected):
+        assert np.array_equal(table, reference)
+
+
+def test_finished_checkpoint_has_nothing_pending(build, tmp_path):
+    job, m_grid, h_grid, _ = build
+    interrupted(tmp_path, job, m_grid, h_grid, len(range(0, M_SIZE, BLOCK_ROWS)))
+
+    checkpoint = LUTCheckpoint(tmp_path, 'key', m_grid, h_grid, (M_SIZE, H_SIZE))
+    assert checkpoint.rows_done == M_SIZE
+    assert checkpoint.pending_blocks(BLOCK_ROWS) == []
+
+
+def test_mismatched_record_starts_fresh(build, tmp_path):
+    job, m_grid, h_grid, _ = build
+    interrupted(tmp_path, job, m_grid, h_grid, 2)
+    record = tmp_path / 'key' / 'rows.json'
+    record.write_text(record.read_text().replace(f'[{M_SIZE}, {H_SIZE}]', f'[{M_SIZE}, {H_SIZE + 1}]'))
+
+    checkpoint = LUTCheckpoint(tmp_path, 'key', m_grid, h_grid, (M_SIZE, H_SIZE))
+    assert checkpoint.rows_done == 0
+    assert len(checkpoint.pending_blocks(BLOCK_ROWS)) == 5
@@ -0,0 +1,59 @@
+"""FAUST exports: the unified bank's mode index, phase-state signs and node-table kernels"""
+
+import re
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import generate_ja_lut
+from ja_lut_export import export_faust_unified_lib
+from ja_lut_modes import MODES
+
+
+def bank_entries(names):
+    """Unified-bank entries with small placeholder tables"""
+    grid = np.linspace(-1.0, 1.0, 3)
+    table = np.zeros((3, 3))
+    return [(name, MODES[name].total_substeps, MODES[name].phase_span, grid, grid, table, table)
+            for name in names]
+
+
+@pytest.mark.parametrize('names', [
+    ['K28', 'K121'],
+    list(MODES)[::-1],
+    [*MODES, 'K121'],
+])
+def test_unified_bank_needs_every_mode_in_order(names, tmp_path):
+    with pytest.raises(ValueError, match='unified bank'):
+        export_faust_unified_lib(bank_entries(names), tmp_path / 'ja_lut_unified.lib')
+
+
+@pytest.mark.parametrize('kernel, lookup', [
+    ('bilinear', 'Bilinear interpolation lookup'),
+    ('catmull-rom', 'Separable Catmull-Rom interpolation lookup'),
+])
+def test_unified_bank_kernel(kernel, lookup, tmp_path):
+    path = tmp_path / 'ja_lut_unified.lib'
+    export_faust_unified_lib(bank_entries(MODES), path, kernel=kernel)
+    text = path.read_text()
+    assert text.count(lookup) == 2
+    assert ('ja_catmull_rom(' in text) == (kernel == 'catmull-rom')
+
+
+def test_unified_bank_mirrors_pi_states(tmp_path):
+    path = tmp_path / 'ja_lut_unified.lib'
+    export_faust_unified_lib(bank_entries(MODES), path)
+    signs = re.search(r'ja_mode_bias_sign = waveform\{(.*)\};', path.read_text()).group(1)
+    # Half-integer bias cycles per sample: states 0 (phase 0) and 1 (phase pi) in every mode
+    assert [int(s) for s in signs.split(',')] == [1, -1] * len(MODES)
+
+
+def test_substep_axis_fixture_is_current(tmp_path, monkeypatch):
+    fixture = Path(__file__).resolve().parents[1] / 'faust' / 'test' / 'ja_lut_k121_substeps.lib'
+    monkeypatch.setattr(sys, 'argv', ['generate_ja_lut.py', '--mode', 'K121', '--substep-axis', '-1', '1',
+                                      '--m-size', '5', '--h-size', '9', '--format', 'faust',
+                                      '--no-cache', '--output-dir', str(tmp_path)])
+    generate_ja_lut.main()
+    assert (tmp_path / fixture.name).read_text() == fixture.read_text()
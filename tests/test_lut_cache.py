@@ -0,0 +1,78 @@
+"""Content-addressed LUT cache: key hits and misses, storage and eviction"""
+
+import os
+
+import numpy as np
+import pytest
+
+import ja_lut_modes
+from generate_ja_lut import LUTCache, PhysicsParams, generator_fingerprint, lut_cache_key
+
+KEY_ARGS = dict(phase_span=np.pi, total_substeps=28, physics=PhysicsParams(), bias_level=0.41,
+                bias_scale=11.0, m_size=65, h_size=129, h_range=(-1.0, 1.0))
+
+
+def test_cache_key_hits_for_the_same_inputs():
+    assert lut_cache_key(**KEY_ARGS) == lut_cache_key(**{**KEY_ARGS, 'total_substeps': np.int64(28)})
+
+
+@pytest.mark.parametrize('change', [
+    dict(phase_span=1.5 * np.pi),
+    dict(total_substeps=27),
+    dict(physics=PhysicsParams()._replace(k_pinning=PhysicsParams().k_pinning * 1.01)),
+    dict(bias_level=0.42),
+    dict(bias_scale=12.0),
+    dict(m_size=33),
+    dict(h_size=65),
+    dict(h_range=(-1.5, 1.5)),
+    dict(axis_warp=(np.array([0.0, 0.4, 1.0]), None)),
+    dict(backend='numba'),
+    dict(derivatives=True),
+    dict(real_substeps=2),
+])
+def test_cache_key_misses_for_any_changed_input(change):
+    assert lut_cache_key(**KEY_ARGS) != lut_cache_key(**{**KEY_ARGS, **change})
+
+
+def test_fingerprint_covers_imported_modules(tmp_path, monkeypatch):
+    edited = tmp_path / 'ja_lut_modes.py'
+    edited.write_bytes(open(ja_lut_modes.__file__, 'rb').read() + b'\n')
+    before = generator_fingerprint()
+    monkeypatch.setattr(ja_lut_modes, '__file__', str(edited))
+    assert generator_fingerprint() != before
+
+
+def cache_entry(seed):
+    rng = np.random.default_rng(seed)
+    return np.linspace(-1.0, 1.0, 5), np.linspace(-1.0, 1.0, 9), rng.random((5, 9)), rng.random((5, 9))
+
+
+def test_cache_round_trip(tmp_path):
+    cache = LUTCache(tmp_path, max_bytes=1 << 20)
+    key = lut_cache_key(**KEY_ARGS)
+    assert cache.get(key) is None
+    entry = cache_entry(0)
+    cache.put(key, *entry)
+    for stored, expected in zip(cache.get(key), entry):
+        np.testing.assert_array_equal(stored, expected)
+
+
+def test_cache_drops_unreadable_entries(tmp_path):
+    cache = LUTCache(tmp_path, max_bytes=1 << 20)
+    (tmp_path / 'broken.npz').write_bytes(b'not an npz')
+    assert cache.get('broken') is None
+    assert not (tmp_path / 'broken.npz').exists()
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = LUTCache(tmp_path, max_bytes=1 << 20)
+    cache.put('a', *cache_entry(0))
+    entry_size = (tmp_path / 'a.npz').stat().st_size
+    cache.max_bytes = 2 * entry_size
+    cache.put('b', *cache_entry(1))
+    # Backdate 'b' past 'a', then hit 'a': 'b' is the one 'c' evicts
+    stamp = (tmp_path / 'a.npz').stat().st_mtime - 10
+    os.utime(tmp_path / 'b.npz', (stamp, stamp))
+    assert cache.get('a') is not None
+    cache.put('c', *cache_entry(2))
+    assert sorted(p.stem for p in tmp_path.glob('*.npz')) == ['a', 'c']
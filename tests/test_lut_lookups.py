@@ -0,0 +1,87 @@
+"""Exported lookup tables: bicubic, Hermite and SVD reconstruction"""
+
+import numpy as np
+import pytest
+
+from generate_ja_lut import lut_lookup
+from ja_lut_export import bicubic_coefficients, hermite_node_table, svd_factors, svd_table
+
+M_GRID = np.linspace(-1.0, 1.0, 9)
+H_GRID = np.linspace(-2.0, 2.0, 17)
+H_RANGE = (H_GRID[0], H_GRID[-1])
+
+
+def random_points(n=500):
+    rng = np.random.default_rng(1)
+    return rng.uniform(-1.0, 1.0, n), rng.uniform(*H_RANGE, n)
+
+
+def random_table():
+    return np.random.default_rng(0).standard_normal((len(M_GRID), len(H_GRID)))
+
+
+def cubic(m, h):
+    """A bicubic polynomial and its [f, df/dm, df/dh, d2f/dm dh] channels"""
+    return np.stack((m ** 3 * h ** 2 - 2.0 * m * h ** 3 + m ** 2,
+                     3.0 * m ** 2 * h ** 2 - 2.0 * h ** 3 + 2.0 * m,
+                     2.0 * m ** 3 * h - 6.0 * m * h ** 2,
+                     6.0 * m ** 2 * h - 6.0 * h ** 2), axis=-1)
+
+
+def stored_table(table, scheme):
+    """The array the scheme's lookup reads for a node table (Hermite: zero derivatives)"""
+    if scheme == 'bicubic':
+        return bicubic_coefficients(table)
+    if scheme == 'hermite':
+        channels = np.zeros(table.shape + (4,))
+        channels[..., 0] = table
+        return hermite_node_table(channels, M_GRID, H_GRID)
+    return table
+
+
+def test_bicubic_coefficients_reproduce_catmull_rom():
+    table = random_table()
+    m, h = random_points()
+    expected = lut_lookup(table, m, h, h_range=H_RANGE, scheme='catmull-rom')
+    actual = lut_lookup(bicubic_coefficients(table), m, h, h_range=H_RANGE, scheme='bicubic')
+    np.testing.assert_allclose(actual, expected, rtol=0.0, atol=1e-12)
+
+
+def test_hermite_is_exact_for_bicubic_polynomials():
+    nodes = cubic(M_GRID[:, np.newaxis], H_GRID[np.newaxis, :])
+    m, h = random_points()
+    actual = lut_lookup(hermite_node_table(nodes, M_GRID, H_GRID), m, h, h_range=H_RANGE, scheme='hermite')
+    np.testing.assert_allclose(actual, cubic(m, h)[:, 0], rtol=0.0, atol=1e-12)
+
+
+@pytest.mark.parametrize('scheme', ['catmull-rom', 'bilinear', 'bicubic', 'hermite'])
+def test_lookups_interpolate_the_nodes(scheme):
+    table = random_table()
+    m, h = np.meshgrid(M_GRID, H_GRID, indexing='ij')
+    np.testing.assert_allclose(lut_lookup(stored_table(table, scheme), m, h, h_range=H_RANGE, scheme=scheme),
+                               table, rtol=0.0, atol=1e-12)
+
+
+@pytest.mark.parametrize('tol', [1e-2, 1e-4, 0.0])
+def test_svd_factors_meet_the_node_tolerance(tol):
+    # Smooth plus a little noise: only approximately low rank
+    m, h = np.meshgrid(M_GRID, H_GRID, indexing='ij')
+    table = np.tanh(2.0 * m + h) + 1e-3 * random_table()
+    factors = svd_factors(table, tol)
+    error = np.max(np.abs(svd_table(factors, len(M_GRID)) - table)) / np.ptp(table)
+    assert error <= max(tol, 1e-12)
+    assert factors.shape[0] == len(M_GRID) + len(H_GRID)
+
+
+def test_svd_lookup_is_separable():
+    table = random_table()
+    factors = svd_factors(table, 1e-3)
+    m, h = random_points()
+    m_factor, h_factor = factors[:len(M_GRID)], factors[len(M_GRID):]
+    # Interpolating each factor along its own axis, then summing the products
+    along_m = np.stack([lut_lookup(np.repeat(m_factor[:, r:r + 1], 2, axis=1), m, np.zeros_like(m))
+                        for r in range(factors.shape[1])])
+    along_h = np.stack([lut_lookup(np.repeat(h_factor[np.newaxis, :, r], 2, axis=0), np.zeros_like(h), h,
+                                   h_range=H_RANGE) for r in range(factors.shape[1])])
+    expected = lut_lookup(svd_table(factors, len(M_GRID)), m, h, h_range=H_RANGE)
+    np.testing.assert_allclose(np.sum(along_m * along_h, axis=0), expected, rtol=0.0, atol=1e-12)
@@ -0,0 +1,41 @@
+"""LUT export precision: float64, float32 and int16 with scale and offset"""
+
+import numpy as np
+import pytest
+
+from ja_lut_export import quantize_table
+
+
+def random_table():
+    return np.random.default_rng(0).standard_normal((9, 17))
+
+
+def test_quantize_float64_is_lossless():
+    table = random_table()
+    quantized = quantize_table(table, 'float64')
+    assert np.array_equal(quantized.dequantize(), table)
+
+
+def test_quantize_float32_rounds_to_nearest():
+    table = random_table()
+    quantized = quantize_table(table, 'float32')
+    assert quantized.data.dtype == np.float32
+    np.testing.assert_allclose(quantized.dequantize(), table, rtol=np.finfo(np.float32).eps / 2, atol=0.0)
+
+
+def test_quantize_int16_uses_the_full_range():
+    table = random_table()
+    quantized = quantize_table(table, 'int16')
+    assert quantized.data.dtype == np.int16
+    assert (quantized.data.min(), quantized.data.max()) == (-32767, 32767)
+    assert np.max(np.abs(quantized.dequantize() - table)) <= 0.5 * quantized.scale * (1.0 + 1e-9)
+
+
+def test_quantize_int16_constant_table():
+    quantized = quantize_table(np.full((3, 5), 0.25), 'int16')
+    assert np.array_equal(quantized.dequantize(), np.full((3, 5), 0.25))
+
+
+def test_quantize_rejects_unknown_dtype():
+    with pytest.raises(ValueError, match='Unknown LUT dtype'):
+        quantize_table(random_table(), 'float16')
@@ -0,0 +1,61 @@
+"""Coarse-to-fine grid refinement: convergence, exact nodes and warp export"""
+
+import argparse
+
+import numpy as np
+import pytest
+
+from generate_ja_lut import (
+    PhysicsParams,
+    axis_grid,
+    compute_remainder_response_grid,
+    lut_lookup,
+    refine_luts,
+    remainder_bias_lut,
+    resolve_jobs,
+)
+
+BIAS_LEVEL, BIAS_SCALE = 0.41, 11.0
+
+
+def refine(tol, levels=4):
+    args = argparse.Namespace(refine=tol, refine_start=(5, 9), refine_levels=levels, h_range=(-1.0, 1.0),
+                              bias_level=BIAS_LEVEL, bias_scale=BIAS_SCALE, backend='numpy')
+    job = resolve_jobs(['K28'], variants=False)[0]
+    results, axis_warp = refine_luts([job], PhysicsParams(), args, n_check=200)
+    return job, results[job.name], axis_warp
+
+
+def exact(job, m, h):
+    bias_lut = remainder_bias_lut(job.phase_span, job.total_substeps, job.real_substeps)
+    return compute_remainder_response_grid(m, h, bias_lut, BIAS_LEVEL * BIAS_SCALE, PhysicsParams())
+
+
+def test_loose_tolerance_keeps_the_start_grid():
+    _, (m_grid, h_grid, _, _), axis_warp = refine(1e-2)
+    assert (len(m_grid), len(h_grid)) == (5, 9)
+    assert axis_warp == (None, None)
+
+
+def test_refined_grid_is_exported_exactly_as_warps():
+    job, (m_grid, h_grid, lut_M_end, lut_sumM_rest), axis_warp = refine(1e-3)
+    np.testing.assert_allclose(axis_grid(-1.0, 1.0, len(m_grid), axis_warp[0]), m_grid, rtol=0.0, atol=1e-12)
+    np.testing.assert_allclose(axis_grid(-1.0, 1.0, len(h_grid), axis_warp[1]), h_grid, rtol=0.0, atol=1e-12)
+    # Nodes are the simulation at the refined points, not an interpolation
+    for table, reference in zip((lut_M_end, lut_sumM_rest), exact(job, m_grid[:, np.newaxis], h_grid)):
+        assert np.array_equal(table, reference)
+
+
+@pytest.mark.parametrize('tol', [1e-3, 3e-4])
+def test_refinement_meets_the_tolerance_at_every_splittable_midpoint(tol):
+    levels = 4
+    job, (m_grid, h_grid, *tables), axis_warp = refine(tol, levels)
+    assert len(m_grid) * len(h_grid) > 5 * 9
+    # Intervals at the finest lattice spacing cannot be split, so their midpoints are not held to tol
+    m_mid, h_mid = [0.5 * (grid[:-1] + grid[1:])[np.diff(grid) > 1.5 * (grid[-1] - grid[0]) / (n << levels)]
+                    for grid, n in ((m_grid, 4), (h_grid, 8))]
+    for m, h in ((m_mid[:, np.newaxis], h_grid), (m_grid[:, np.newaxis], h_mid), (m_mid[:, np.newaxis], h_mid)):
+        m, h = np.broadcast_arrays(m, h)
+        for table, reference in zip(tables, exact(job, m, h)):
+            approx = lut_lookup(table, m, h, axis_warp=axis_warp, scheme='bilinear')
+            assert np.max(np.abs(approx - reference)) / np.ptp(table) <= tol
@@ -0,0 +1,89 @@
+"""Parity of the LUT simulation engines against the scalar ja_substep() reference"""
+
+import numpy as np
+import pytest
+
+import generate_ja_lut
+from generate_ja_lut import (
+    PhysicsParams,
+    compute_remainder_response,
+    compute_remainder_response_grid,
+    remainder_bias_lut,
+)
+from ja_lut_modes import MODES
+
+BIAS_AMPLITUDE = 0.41 * 11.0
+TOLERANCE = 1e-12
+KERNEL_TOLERANCE = 1e-9  # compiled tanh may differ from NumPy's in the last bits
+
+
+def small_grid(m_size=7, h_size=9):
+    """M x H points covering both clip rails and the origin"""
+    m = np.linspace(-1.0, 1.0, m_size)
+    h = np.linspace(-1.0, 1.0, h_size)
+    return np.meshgrid(m, h, indexing='ij')
+
+
+def scalar_reference(M1, H_audio, bias_lut, physics):
+    """(M_end, sumM_rest) point by point with compute_remainder_response()"""
+    M_end = np.empty_like(M1)
+    sumM_rest = np.empty_like(M1)
+    for idx in np.ndindex(M1.shape):
+        M_end[idx], sumM_rest[idx] = compute_remainder_response(
+            M1[idx], H_audio[idx], bias_lut, BIAS_AMPLITUDE, physics)
+    return M_end, sumM_rest
+
+
+@pytest.mark.parametrize('mode, real_substeps', [('K28', 1), ('K28', 3), ('K121', 1), ('K121', 2)])
+def test_lockstep_matches_scalar(mode, real_substeps):
+    config = MODES[mode]
+    bias_lut = remainder_bias_lut(config.phase_span, config.total_substeps, real_substeps)
+    physics = PhysicsParams()
+    M1, H_audio = small_grid()
+
+    expected = scalar_reference(M1, H_audio, bias_lut, physics)
+    actual = compute_remainder_response_grid(M1, H_audio, bias_lut, BIAS_AMPLITUDE, physics)
+
+    for a, e in zip(actual, expected):
+        np.testing.assert_allclose(a, e, rtol=0.0, atol=TOLERANCE)
+
+
+def test_lockstep_broadcasts_axes():
+    config = MODES['K28']
+    bias_lut = remainder_bias_lut(config.phase_span, config.total_substeps)
+    physics = PhysicsParams(k_pinning=300.0)
+    M1, H_audio = small_grid(5, 6)
+
+    full = compute_remainder_response_grid(M1, H_audio, bias_lut, BIAS_AMPLITUDE, physics)
+    broadcast = compute_remainder_response_grid(M1[:, :1], H_audio[:1, :], bias_lut, BIAS_AMPLITUDE, physics)
+
+    for a, e in zip(broadcast, full):
+        np.testing.assert_array_equal(a, e)
+
+
+@pytest.mark.parametrize('mode', ['K28', 'K121'])
+def test_kernel_matches_scalar(mode):
+    """The numba kernel (plain Python when numba is not installed)"""
+    config = MODES[mode]
+    bias_lut = remainder_bias_lut(config.phase_span, config.total_substeps)
+    physics = PhysicsParams()
+    M1, H_audio = small_grid()
+
+    expected = scalar_reference(M1, H_audio, bias_lut, physics)
+    actual = compute_remainder_response_grid(M1, H_audio, bias_lut, BIAS_AMPLITUDE, physics, backend='numba')
+
+    for a, e in zip(actual, expected):
+        np.testing.assert_allclose(a, e, rtol=0.0, atol=KERNEL_TOLERANCE)
+
+
+def test_numba_backend_is_compiled():
+    pytest.importorskip('numba')
+    assert generate_ja_lut.resolve_backend('auto') == 'numba'
+    assert generate_ja_lut._remainder_response_jit is not None
+
+
+def test_numba_backend_without_numba(monkeypatch):
+    monkeypatch.setattr(generate_ja_lut, 'numba', None)
+    assert generate_ja_lut.resolve_backend('auto') == 'numpy'
+    with pytest.raises(ValueError, match='numba'):
+        generate_ja_lut.resolve_backend('numba')
@@ -0,0 +1,70 @@
+"""Third-axis LUTs: slice-major layout of the exports and the slices they hold"""
+
+import re
+import sys
+
+import numpy as np
+import pytest
+
+import generate_ja_lut
+from generate_ja_lut import PhysicsParams, compute_remainder_response_grid, remainder_bias_lut
+from ja_lut_export import SLICE_AXES, export_cpp_header_slices, export_faust_lib_slices
+from ja_lut_modes import MODES
+
+S_SIZE, M_SIZE, H_SIZE = 3, 5, 9
+
+
+def cpp_array(text, const):
+    values = re.search(rf'{const} = \{{(.*?)\}};', text, re.S).group(1)
+    return np.array([float(v) for v in values.replace('\n', '').split(',')])
+
+
+def faust_waveform(text, name):
+    values = re.search(rf'{name} = waveform\{{(.*?)\}};', text, re.S).group(1)
+    return np.array([float(v) for v in values.replace('\n', '').split(',')])
+
+
+@pytest.fixture
+def coded_tables():
+    """Tables whose value encodes its (slice, M, H) index"""
+    s, m, h = np.meshgrid(np.arange(S_SIZE), np.arange(M_SIZE), np.arange(H_SIZE), indexing='ij')
+    lut_M_end = 10000.0 * s + 100.0 * m + h
+    return (np.arange(S_SIZE, dtype=np.float64), np.linspace(-1.0, 1.0, M_SIZE), np.linspace(-1.0, 1.0, H_SIZE),
+            lut_M_end, -lut_M_end)
+
+
+@pytest.mark.parametrize('axis', sorted(SLICE_AXES))
+def test_exports_are_slice_major(axis, coded_tables, tmp_path):
+    s_grid, m_grid, h_grid, lut_M_end, lut_sumM_rest = coded_tables
+    cpp_path = tmp_path / 'lut.h'
+    faust_path = tmp_path / 'lut.lib'
+    export_cpp_header_slices(s_grid, m_grid, h_grid, lut_M_end, lut_sumM_rest, 'K121', 121, cpp_path, axis=axis)
+    export_faust_lib_slices(s_grid, m_grid, h_grid, lut_M_end, lut_sumM_rest, 'K121', 121, faust_path, axis=axis)
+
+    prefix = f"k121_{SLICE_AXES[axis].suffix.lower()}"
+    faust = faust_path.read_text()
+    index = re.search(rf'ja_lut_{prefix}_idx\(s, m_idx, h_idx\) = (.*);', faust).group(1)
+    index = index.replace(f'ja_lut_{prefix}_m_size', str(M_SIZE)).replace(f'ja_lut_{prefix}_h_size', str(H_SIZE))
+    for flat in (cpp_array(cpp_path.read_text(), 'LUT_M_END'), faust_waveform(faust, f'ja_lut_{prefix}_m_end')):
+        for s, m, h in np.ndindex(lut_M_end.shape):
+            assert flat[eval(index, {'s': s, 'm_idx': m, 'h_idx': h})] == lut_M_end[s, m, h]
+
+
+def test_substep_slices_are_the_integer_count_tables(tmp_path, monkeypatch):
+    monkeypatch.setattr(sys, 'argv', ['generate_ja_lut.py', '--mode', 'K28', '--substep-axis', '-1', '1',
+                                      '--m-size', str(M_SIZE), '--h-size', str(H_SIZE), '--format', 'cpp',
+                                      '--no-cache', '--output-dir', str(tmp_path)])
+    generate_ja_lut.main()
+    text = (tmp_path / 'JAHysteresisLUT_K28_Substeps.h').read_text()
+    lut_M_end = cpp_array(text, 'LUT_M_END').reshape(S_SIZE, M_SIZE, H_SIZE)
+    lut_sumM_rest = cpp_array(text, 'LUT_SUM_M_REST').reshape(S_SIZE, M_SIZE, H_SIZE)
+
+    mode = MODES['K28']
+    m_grid = np.linspace(-1.0, 1.0, M_SIZE)
+    h_grid = np.linspace(-1.0, 1.0, H_SIZE)
+    for s, n in enumerate(range(mode.total_substeps - 1, mode.total_substeps + 2)):
+        expected = compute_remainder_response_grid(m_grid[:, np.newaxis], h_grid,
+                                                   remainder_bias_lut(mode.phase_span, n), 0.41 * 11.0, PhysicsParams())
+        # Exported at 11 significant digits
+        np.testing.assert_allclose(lut_M_end[s], expected[0], rtol=1e-10, atol=1e-12)
+        np.testing.assert_allclose(lut_sumM_rest[s], expected[1], rtol=1e-10, atol=1e-12)
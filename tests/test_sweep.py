@@ -0,0 +1,75 @@
+"""Formulation sweeps: one binary bank per formulation, with its own physics and bias"""
+
+import json
+import sys
+
+import numpy as np
+import pytest
+
+import generate_ja_lut
+from generate_ja_lut import PhysicsParams, compute_remainder_response_grid, load_sweep, remainder_bias_lut
+from ja_lut_export import load_binary_bank
+from ja_lut_modes import MODES
+
+SWEEP = {
+    'formulations': [
+        {'name': 'ferric'},
+        {'name': 'metal', 'physics': {'Ms': 380.0, 'k_pinning': 420.0}, 'bias_level': 0.62},
+    ],
+    'grid': {'physics': {'c_reversibility': [0.1, 0.2]}, 'name': 'c{c_reversibility:.1f}'},
+}
+
+
+@pytest.fixture
+def sweep_path(tmp_path):
+    path = tmp_path / 'sweep.json'
+    path.write_text(json.dumps(SWEEP))
+    return path
+
+
+def test_load_sweep_expands_presets_and_grid(sweep_path):
+    formulations = load_sweep(sweep_path, 0.41, 11.0)
+    assert [f.name for f in formulations] == ['ferric', 'metal', 'c0.1', 'c0.2']
+    assert formulations[0].physics == PhysicsParams()
+    assert formulations[1].physics == PhysicsParams(Ms=380.0, k_pinning=420.0)
+    assert (formulations[1].bias_level, formulations[1].bias_scale) == (0.62, 11.0)
+    assert [f.physics.c_reversibility for f in formulations[2:]] == [0.1, 0.2]
+
+
+@pytest.mark.parametrize('spec, match', [
+    ({'formulations': [{'name': 'a'}, {'name': 'a'}]}, 'duplicate'),
+    ({'formulations': [{'name': 'a', 'physics': {'mu': 1.0}}]}, 'unknown physics'),
+    ({'formulations': [{'name': 'a/b'}]}, 'must be letters'),
+    ({'formulations': []}, 'no formulations'),
+    ({'presets': []}, 'unknown key'),
+])
+def test_load_sweep_rejects_bad_files(spec, match, tmp_path):
+    path = tmp_path / 'sweep.json'
+    path.write_text(json.dumps(spec))
+    with pytest.raises(ValueError, match=match):
+        load_sweep(path, 0.41, 11.0)
+
+
+def test_sweep_banks_hold_each_formulation(sweep_path, tmp_path, monkeypatch):
+    monkeypatch.setattr(sys, 'argv', ['generate_ja_lut.py', '--modes', 'K28,K121', '--sweep', str(sweep_path),
+                                      '--m-size', '5', '--h-size', '9', '--real-substeps', '2',
+                                      '--no-cache', '--output-dir', str(tmp_path)])
+    generate_ja_lut.main()
+    index = json.loads((tmp_path / 'JAHysteresisLUTSweep.json').read_text())
+    m_grid = np.linspace(-1.0, 1.0, 5)
+    h_grid = np.linspace(-1.0, 1.0, 9)
+
+    for formulation, entry in zip(load_sweep(sweep_path, 0.41, 11.0), index['formulations']):
+        assert entry['name'] == formulation.name
+        bank = load_binary_bank(tmp_path / entry['bank'])
+        assert list(bank) == ['K28', 'K121']
+        for name, lut in bank.items():
+            assert lut['physics'] == tuple(formulation.physics)
+            assert (lut['bias_level'], lut['bias_scale']) == (formulation.bias_level, formulation.bias_scale)
+            assert lut['real_substeps'] == entry['luts'][name]['real_substeps'] == 2
+            mode = MODES[name]
+            expected = compute_remainder_response_grid(
+                m_grid[:, np.newaxis], h_grid, remainder_bias_lut(mode.phase_span, mode.total_substeps, 2),
+                formulation.bias_level * formulation.bias_scale, formulation.physics)
+            assert np.array_equal(lut['lut_M_end'], expected[0])
+            assert np.array_equal(lut['lut_sumM_rest'], expected[1])
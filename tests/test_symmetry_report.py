@@ -0,0 +1,32 @@
+"""The phase-flip relation behind the pi-state mirror, on every mode"""
+
+import numpy as np
+import pytest
+
+from generate_ja_lut import (
+    SYMMETRY_TOL,
+    PhysicsParams,
+    compute_remainder_response_grid,
+    remainder_bias_lut,
+    report_symmetry,
+    resolve_jobs,
+)
+from ja_lut_modes import MODES
+
+BIAS_AMPLITUDE = 0.41 * 11.0
+
+
+@pytest.mark.parametrize('mode', sorted(MODES))
+def test_phase_flip_residual_within_tol(mode):
+    job = resolve_jobs([mode], variants=False)[0]
+    physics = PhysicsParams()
+    m_grid = np.linspace(-1.0, 1.0, 9)
+    h_grid = np.linspace(-1.0, 1.0, 17)
+    tables = compute_remainder_response_grid(m_grid[:, np.newaxis], h_grid[np.newaxis, :],
+                                             remainder_bias_lut(job.phase_span, job.total_substeps),
+                                             BIAS_AMPLITUDE, physics)
+
+    residuals = report_symmetry(job, m_grid, h_grid, *tables, physics, BIAS_AMPLITUDE, n_points=200)
+
+    assert set(residuals) == {'M_end', 'sumM_rest'}
+    assert max(residuals.values()) <= SYMMETRY_TOL